@@ -1,5 +1,7 @@
 """Utilities for Area Notice messages."""
 
+from collections.abc import Sequence
+
 from BitVector import BitVector
 
 from . import ais_string, binary
@@ -9,15 +11,120 @@ class Error(Exception):
     """Base exception for bit packing and unpacking utilities."""
 
 
+class BitBuffer:
+    """Message payload converted once to an int for reading fields by offset.
+
+    Slicing a BitVector builds a new BitVector for every field.  Decoding a
+    whole message from one BitBuffer reads each field with a shift and a
+    mask instead, and lets sub-areas share the payload by bit offset.
+
+    Attributes:
+        value: The bits as an unsigned int, first bit most significant.
+        size: Number of bits.
+    """
+
+    __slots__ = ("size", "value")
+
+    value: int
+    size: int
+
+    def __init__(self, bits: BitVector | str | Sequence[int]) -> None:
+        """Convert the bits.
+
+        Args:
+            bits: A BitVector, a string of 0 and 1 characters or a sequence of
+                0 and 1 ints.
+        """
+        if isinstance(bits, BitVector):
+            self.size = len(bits)
+            self.value = int(bits) if self.size else 0
+            return
+        if not isinstance(bits, str):
+            bits = "".join("1" if bit else "0" for bit in bits)
+        self.size = len(bits)
+        self.value = int(bits, 2) if bits else 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get_uint(self, offset: int, length: int) -> int:
+        """Read an unsigned integer.
+
+        Args:
+            offset: Bit offset of the field from the start of the buffer.
+            length: Number of bits to read.
+
+        Returns:
+            The unsigned integer value of the field.
+
+        Raises:
+            Error: If the field extends past the end of the buffer.
+        """
+        shift = self.size - offset - length
+        if shift < 0 or offset < 0:
+            raise Error(f"Field {offset}+{length} is outside of {self.size} bits")
+        return (self.value >> shift) & ((1 << length) - 1)
+
+    def get_int(self, offset: int, length: int) -> int:
+        """Read a two's complement signed integer.
+
+        Args:
+            offset: Bit offset of the field from the start of the buffer.
+            length: Number of bits to read.
+
+        Returns:
+            The signed integer value of the field.
+        """
+        value = self.get_uint(offset, length)
+        if value >> (length - 1):
+            return value - (1 << length)
+        return value
+
+    def get_text(self, offset: int, length: int) -> str:
+        """Read 6-bit AIS characters without removing any padding.
+
+        Args:
+            offset: Bit offset of the field from the start of the buffer.
+            length: Number of bits to read (must be a multiple of 6).
+
+        Returns:
+            The decoded string.
+
+        Raises:
+            Error: If length is not 6-bit aligned.
+        """
+        if length % 6 != 0:
+            raise Error("Bits for text must be six bit aligned.")
+        value = self.get_uint(offset, length)
+        lut = ais_string.character_lut
+        return "".join(
+            lut[(value >> shift) & 0x3F] for shift in range(length - 6, -1, -6)
+        )
+
+
 class DecodeBits:
-    """Sequential bitstream reader for unpacking integer and text fields."""
+    """Sequential bitstream reader for unpacking integer and text fields.
 
-    bits: BitVector
+    Attributes:
+        bits: The bits passed to the constructor.
+        pos: Current bit position, relative to the starting offset.
+    """
+
+    bits: BitVector | BitBuffer
     pos: int
 
-    def __init__(self, bits: BitVector) -> None:
+    def __init__(self, bits: BitVector | BitBuffer, offset: int = 0) -> None:
+        """Start reading.
+
+        Args:
+            bits: Bits to read.  Pass a BitBuffer to share one conversion
+                between several readers.
+            offset: Bit offset in bits where reading starts.
+        """
         self.bits = bits
         self.pos = 0
+        self._buffer = bits if isinstance(bits, BitBuffer) else BitBuffer(bits)
+        self._offset = offset
 
     # TODO(schwehr): This method name should be get_uint.
     def get_int(self, length: int) -> int:
@@ -29,8 +136,7 @@ class DecodeBits:
         Returns:
             The unsigned integer value decoded from the bit slice.
         """
-        end = self.pos + length
-        value = int(self.bits[self.pos : end])
+        value = self._buffer.get_uint(self._offset + self.pos, length)
         self.pos += length
         return value
 
@@ -46,8 +152,7 @@ class DecodeBits:
         Returns:
             The signed integer value decoded from the bit slice.
         """
-        end = self.pos + length
-        value = binary.signed_int_from_bv(self.bits[self.pos : end])
+        value = self._buffer.get_int(self._offset + self.pos, length)
         self.pos += length
         return value
 
@@ -66,10 +171,7 @@ class DecodeBits:
         Raises:
             Error: If length is not 6-bit aligned.
         """
-        if length % 6 != 0:
-            raise Error("Bits for text must be six bit aligned.")
-        end = self.pos + length
-        text = ais_string.decode(self.bits[self.pos : end])
+        text = self._buffer.get_text(self._offset + self.pos, length)
         at = text.find("@")
         if strip and at != -1:
             text = text[:at]
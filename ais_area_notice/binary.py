@@ -121,15 +121,19 @@ def join_bv(bv_seq: Sequence[BitVector]) -> BitVector:
     Returns:
         An aggregated BitVector.
     """
-    if not bv_seq:
+    # Shift ints rather than copying the bits one at a time.
+    value = 0
+    size = 0
+    for bv in bv_seq:
+        length = len(bv)
+        if length:
+            value = (value << length) | int(bv)
+            size += length
+
+    if not size:
         return BitVector(size=0)
 
-    lst = [bit for bv in bv_seq for bit in bv]
-
-    if not lst:
-        return BitVector(size=0)
-
-    return BitVector(bitlist=lst)
+    return BitVector.from_int(value, size)
 
 
 joinBV = join_bv  # pylint: disable=invalid-name
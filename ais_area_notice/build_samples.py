@@ -380,8 +380,7 @@ def main() -> None:
 
     with open("samples.kml", "w", encoding="utf-8") as kmlfile:
         kmlfile.write(an.kml_head)
-        with open("areanotice_styles.kml", encoding="utf-8") as f:
-            kmlfile.write(f.read())
+        kmlfile.write(an.kml_styles())
 
         lat = 42.0
         delta = 0.05
@@ -727,8 +726,7 @@ def main() -> None:
 
     with open("samples.kml", "w", encoding="utf-8") as kmlfile:
         kmlfile.write(an.kml_head)
-        with open("areanotice_styles.kml", encoding="utf-8") as f:
-            kmlfile.write(f.read())
+        kmlfile.write(an.kml_styles())
 
         lat = 42.0
         delta = 0.05
@@ -0,0 +1,349 @@
+"""Columnar storage for decoded IMO 8:1:22 Area Notices.
+
+Keeping months of decoded notices as AreaNotice objects costs far more
+memory than the data itself.  AreaNoticeTable copies each decoded notice
+into three NumPy structured arrays and lets the objects go, and can decode
+NMEA or message bits into them without keeping the objects:
+
+- notices: one row per notice with an offset and count into sub_areas.
+- sub_areas: one row per sub-area with an offset and count into points.
+- points: the (angle, distance) pairs of polylines and polygons.
+
+Fields that do not apply to a shape are NaN.  The arrays grow in chunks
+that double in size and can be saved as .npy files that np.load can memory
+map.
+"""
+
+import math
+import pathlib
+from collections.abc import Sequence
+from typing import Any, Literal, Self
+
+import numpy as np
+import numpy.typing as npt
+from BitVector import BitVector
+
+from .an_util import BitBuffer
+from .decode_context import DecodeContext, nmea_context
+from .imo_001_22_area_notice import (
+    AreaNotice,
+    AreaNoticeCirclePt,
+    AreaNoticeFreeText,
+    AreaNoticePolyline,
+    AreaNoticeRectangle,
+    AreaNoticeSector,
+    AreaNoticeSubArea,
+    nmea_payload,
+)
+
+NOTICE_DTYPE = np.dtype(
+    [
+        ("mmsi", "<u4"),
+        ("dac", "<u2"),
+        ("fi", "u1"),
+        ("link_id", "<u2"),
+        ("area_type", "u1"),
+        ("start", "<i8"),  # UNIX time in seconds.
+        ("duration", "<u4"),  # Minutes.
+        ("sub_area_offset", "<i8"),
+        ("sub_area_count", "u1"),
+    ]
+)
+
+SUB_AREA_DTYPE = np.dtype(
+    [
+        ("shape", "u1"),
+        ("lon", "<f8"),
+        ("lat", "<f8"),
+        ("radius", "<f8"),
+        ("e_dim", "<f8"),
+        ("n_dim", "<f8"),
+        ("orientation", "<f8"),
+        ("left_bound", "<f8"),
+        ("right_bound", "<f8"),
+        ("point_offset", "<i8"),
+        ("point_count", "u1"),
+        ("text", "S14"),
+    ]
+)
+
+POINT_DTYPE = np.dtype([("angle", "<f8"), ("dist", "<f8")])
+
+NOTICES_FILENAME: str = "notices.npy"
+SUB_AREAS_FILENAME: str = "sub_areas.npy"
+POINTS_FILENAME: str = "points.npy"
+
+
+class _GrowableArray:
+    """Structured array that doubles its capacity when full."""
+
+    def __init__(self, dtype: np.dtype[Any], chunk_size: int) -> None:
+        self._data: npt.NDArray[Any] = np.empty(chunk_size, dtype=dtype)
+        self._size = 0
+
+    @classmethod
+    def wrap(cls, data: npt.NDArray[Any]) -> Self:
+        """Use an existing array, possibly memory mapped, as the contents."""
+        result = cls.__new__(cls)
+        result._data = data
+        result._size = len(data)
+        return result
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, row: tuple[Any, ...]) -> int:
+        """Add a row and return its index."""
+        if self._size == len(self._data):
+            grown = np.empty(max(2 * len(self._data), 1), dtype=self._data.dtype)
+            grown[: self._size] = self._data
+            self._data = grown
+        self._data[self._size] = row
+        self._size += 1
+        return self._size - 1
+
+    @property
+    def array(self) -> npt.NDArray[Any]:
+        """View of the rows that are in use."""
+        return self._data[: self._size]
+
+
+class AreaNoticeTable:
+    """Column store of decoded 8:1:22 Area Notices.
+
+    Attributes:
+        chunk_size: Initial number of rows allocated for each table.
+    """
+
+    chunk_size: int
+
+    def __init__(self, chunk_size: int = 1024) -> None:
+        """Initialize empty tables.
+
+        Args:
+            chunk_size: Initial number of rows allocated for each table.
+        """
+        self.chunk_size = chunk_size
+        self._notices = _GrowableArray(NOTICE_DTYPE, chunk_size)
+        self._sub_areas = _GrowableArray(SUB_AREA_DTYPE, chunk_size)
+        self._points = _GrowableArray(POINT_DTYPE, chunk_size)
+
+    def __len__(self) -> int:
+        return len(self._notices)
+
+    @property
+    def notices(self) -> npt.NDArray[Any]:
+        """Notice table with NOTICE_DTYPE."""
+        return self._notices.array
+
+    @property
+    def sub_areas(self) -> npt.NDArray[Any]:
+        """Sub-area table with SUB_AREA_DTYPE."""
+        return self._sub_areas.array
+
+    @property
+    def points(self) -> npt.NDArray[Any]:
+        """Polyline and polygon points with POINT_DTYPE."""
+        return self._points.array
+
+    def notice_sub_areas(self, index: int) -> npt.NDArray[Any]:
+        """Return the sub-area rows of one notice.
+
+        Args:
+            index: Row in the notice table.
+
+        Returns:
+            A view into the sub-area table.
+        """
+        notice = self.notices[index]
+        offset = int(notice["sub_area_offset"])
+        return self.sub_areas[offset : offset + int(notice["sub_area_count"])]
+
+    def sub_area_points(self, index: int) -> npt.NDArray[Any]:
+        """Return the points of one polyline or polygon sub-area.
+
+        Args:
+            index: Row in the sub-area table.
+
+        Returns:
+            A view into the point table.
+        """
+        sub_area = self.sub_areas[index]
+        offset = int(sub_area["point_offset"])
+        return self.points[offset : offset + int(sub_area["point_count"])]
+
+    def append(self, notice: AreaNotice) -> int:
+        """Copy a decoded notice into the tables.
+
+        Args:
+            notice: The Area Notice to add.
+
+        Returns:
+            The row of the notice in the notice table.
+        """
+        sub_area_offset = len(self._sub_areas)
+        for area in notice.areas:
+            self._append_sub_area(area)
+        return self._notices.append(
+            (
+                notice.source_mmsi or 0,
+                notice.dac,
+                notice.fi,
+                notice.link_id,
+                notice.area_type,
+                int(notice.when.timestamp()),
+                notice.duration,
+                sub_area_offset,
+                len(notice.areas),
+            )
+        )
+
+    def _append_sub_area(self, area: AreaNoticeSubArea) -> None:
+        fields: dict[str, Any] = {}
+        if isinstance(area, AreaNoticeCirclePt):
+            fields = {"radius": area.radius}
+        elif isinstance(area, AreaNoticeRectangle):
+            fields = {
+                "e_dim": area.e_dim,
+                "n_dim": area.n_dim,
+                "orientation": area.orientation_deg,
+            }
+        elif isinstance(area, AreaNoticeSector):
+            fields = {
+                "radius": area.radius,
+                "left_bound": area.left_bound_deg,
+                "right_bound": area.right_bound_deg,
+            }
+        elif isinstance(area, AreaNoticePolyline):
+            fields = {"points": area.points}
+        elif isinstance(area, AreaNoticeFreeText):
+            fields = {"text": area.text.encode("ascii")}
+
+        lon = getattr(area, "lon", None)
+        lat = getattr(area, "lat", None)
+        self._append_row(
+            area.area_shape,
+            math.nan if lon is None else lon,
+            math.nan if lat is None else lat,
+            **fields,
+        )
+
+    def _append_row(
+        self,
+        shape: int,
+        lon: float = math.nan,
+        lat: float = math.nan,
+        *,
+        radius: float = math.nan,
+        e_dim: float = math.nan,
+        n_dim: float = math.nan,
+        orientation: float = math.nan,
+        left_bound: float = math.nan,
+        right_bound: float = math.nan,
+        points: Sequence[tuple[float, float]] = (),
+        text: bytes = b"",
+    ) -> None:
+        point_offset = len(self._points)
+        for point in points:
+            self._points.append(point)
+        self._sub_areas.append(
+            (
+                shape,
+                lon,
+                lat,
+                radius,
+                e_dim,
+                n_dim,
+                orientation,
+                left_bound,
+                right_bound,
+                point_offset,
+                len(points),
+                text,
+            )
+        )
+
+    def decode_nmea(
+        self, strings: Sequence[str], context: DecodeContext | None = None
+    ) -> int:
+        """Decode NMEA sentences straight into the tables.
+
+        See decode_bits.
+
+        Args:
+            strings: NMEA sentences of one message.
+            context: Shared decode state.  The NMEA time_stamp, if present,
+                becomes its reference time.
+
+        Returns:
+            The row of the notice in the notice table.
+
+        Raises:
+            AisUnpackingException: If parsing or checksum fails.
+        """
+        bits, msgs = nmea_payload(strings)
+        return self.decode_bits(bits, nmea_context(msgs, context))
+
+    def decode_bits(
+        self, bits: BitVector | BitBuffer, context: DecodeContext | None = None
+    ) -> int:
+        """Decode a message into the tables.
+
+        The message is decoded with AreaNotice.from_bits, so the fields and
+        the checks of reserved values are those of AreaNotice, and only the
+        rows are kept.
+
+        Args:
+            bits: The whole message, starting with the message id.
+            context: Shared decode state that supplies the missing year.
+
+        Returns:
+            The row of the notice in the notice table.
+
+        Raises:
+            AisPackingException: If a polyline does not follow a point or
+                another polyline.
+            AisUnpackingException: If a field holds a reserved value.
+        """
+        return self.append(AreaNotice.from_bits(bits, context))
+
+    def save(self, directory: str | pathlib.Path) -> None:
+        """Write the tables as .npy files.
+
+        Args:
+            directory: Existing directory for notices.npy, sub_areas.npy and
+                points.npy.
+        """
+        directory = pathlib.Path(directory)
+        np.save(directory / NOTICES_FILENAME, self.notices)
+        np.save(directory / SUB_AREAS_FILENAME, self.sub_areas)
+        np.save(directory / POINTS_FILENAME, self.points)
+
+    @classmethod
+    def load(
+        cls,
+        directory: str | pathlib.Path,
+        mmap_mode: Literal["r", "r+", "c"] | None = "r",
+    ) -> Self:
+        """Read tables written by save.
+
+        Args:
+            directory: Directory passed to save.
+            mmap_mode: Passed to np.load.  The default maps the files read
+                only.  Appending copies the mapped table into memory.
+
+        Returns:
+            A table backed by the files.
+        """
+        directory = pathlib.Path(directory)
+        table = cls()
+        table._notices = _GrowableArray.wrap(
+            np.load(directory / NOTICES_FILENAME, mmap_mode=mmap_mode)
+        )
+        table._sub_areas = _GrowableArray.wrap(
+            np.load(directory / SUB_AREAS_FILENAME, mmap_mode=mmap_mode)
+        )
+        table._points = _GrowableArray.wrap(
+            np.load(directory / POINTS_FILENAME, mmap_mode=mmap_mode)
+        )
+        return table
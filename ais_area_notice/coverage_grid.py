@@ -0,0 +1,301 @@
+"""Raster of the cells that active Area Notices cover.
+
+An STRtree query costs microseconds per position.  CoverageGrid answers
+the same question with a lookup in a regular lat/lon grid, so most
+positions never touch a geometry.  Each notice gets one bit, and each
+cell has two bitsets:
+
+- inside: the cell is entirely inside a geometry of the notice.
+- boundary: the cell crosses the edge of a geometry.  Positions in these
+  cells are checked against the exact geometry.
+
+Notices are rasterized from the sub-area geom() methods when they are
+inserted, and their bits are cleared when they are removed or expire.
+Only the part of a notice within the grid bounds is rasterized, and
+positions outside the bounds never match.
+
+The bitsets take 16 bytes per cell for every 64 notices, so a 10 by 10
+degree grid with the default 0.01 degree cells needs 16 MB per 64
+notices.
+"""
+
+import datetime
+import math
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+import shapely.geometry.base
+
+from .imo_001_22_area_notice import AreaNotice
+from .interval_index import _timestamp
+from .notice_index import ActiveNotices, NoticeKey
+
+# Cell size in degrees.
+DEFAULT_CELL_SIZE: float = 0.01
+
+_WORD_BITS = 64
+_WORD = np.dtype("<u8")
+
+
+def _set_bits(
+    rows: npt.NDArray[np.intp],
+    words: npt.NDArray[np.intp],
+    values: npt.NDArray[np.uint64],
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Return the row and bit number of each bit set in words of rows."""
+    found_rows = []
+    found_bits = []
+    keep = values != 0
+    while keep.any():
+        rows, words, values = rows[keep], words[keep], values[keep]
+        # The lowest bit that is set, which converts to float exactly.
+        low = values & (~values + np.uint64(1))
+        _, exponent = np.frexp(low.astype(np.float64))
+        found_rows.append(rows)
+        found_bits.append(words * _WORD_BITS + exponent - 1)
+        values = values ^ low
+        keep = values != 0
+    if not found_rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(found_rows), np.concatenate(found_bits)
+
+
+class CoverageGrid(ActiveNotices):
+    """Lat/lon grid of the Area Notices that cover each cell.
+
+    Attributes:
+        lon_min: West edge of the grid in degrees.
+        lat_min: South edge of the grid in degrees.
+        cell_size: Width and height of a cell in degrees.
+        shape: Number of rows and columns of cells.
+    """
+
+    lon_min: float
+    lat_min: float
+    cell_size: float
+    shape: tuple[int, int]
+
+    def __init__(
+        self,
+        lon_min: float,
+        lat_min: float,
+        lon_max: float,
+        lat_max: float,
+        cell_size: float = DEFAULT_CELL_SIZE,
+    ) -> None:
+        """Initialize an empty grid.
+
+        Args:
+            lon_min: West edge in degrees.
+            lat_min: South edge in degrees.
+            lon_max: East edge in degrees.
+            lat_max: North edge in degrees.
+            cell_size: Width and height of a cell in degrees.
+
+        Raises:
+            ValueError: If the cell size is not positive or the bounds are
+                empty.
+        """
+        if not cell_size > 0 or not (lon_min < lon_max and lat_min < lat_max):
+            raise ValueError(
+                f"Invalid grid: {lon_min}, {lat_min}, {lon_max}, {lat_max} "
+                f"with cells of {cell_size}"
+            )
+        self.lon_min = lon_min
+        self.lat_min = lat_min
+        self.cell_size = cell_size
+        self.shape = (
+            math.ceil((lat_max - lat_min) / cell_size),
+            math.ceil((lon_max - lon_min) / cell_size),
+        )
+        super().__init__()
+        self._inside = np.zeros((*self.shape, 0), dtype=_WORD)
+        self._boundary = np.zeros((*self.shape, 0), dtype=_WORD)
+        # Number of notices with an inside or boundary bit in each cell.
+        self._counts = np.zeros(self.shape, dtype=np.int32)
+        # Per bit.
+        self._notices: list[AreaNotice | None] = []
+        self._geoms: list[shapely.geometry.base.BaseGeometry | None] = []
+        self._windows: list[tuple[int, int, int, int]] = []
+        self._starts = np.empty(0)
+        self._ends = np.empty(0)
+        self._free: list[int] = []
+        self._bits: dict[NoticeKey, int] = {}
+
+    def _add(
+        self, key: NoticeKey, notice: AreaNotice, start: float, end: float
+    ) -> None:
+        """Rasterize a notice into a free bit."""
+        bit = self._allocate()
+        word, shift = divmod(bit, _WORD_BITS)
+        mask = np.uint64(1 << shift)
+        geom = shapely.union_all(notice.geoms())
+        shapely.prepare(geom)
+        window = self._window(geom)
+        row0, row1, col0, col1 = window
+        inside, boundary = self._rasterize(geom, window)
+        self._inside[row0:row1, col0:col1, word][inside] |= mask
+        self._boundary[row0:row1, col0:col1, word][boundary] |= mask
+        self._counts[row0:row1, col0:col1] += inside | boundary
+
+        self._notices[bit] = notice
+        self._geoms[bit] = geom
+        self._windows[bit] = window
+        self._starts[bit] = start
+        self._ends[bit] = end
+        self._bits[key] = bit
+
+    def _discard(self, key: NoticeKey) -> None:
+        """Clear the cells of a notice and free its bit."""
+        bit = self._bits.pop(key)
+        word, shift = divmod(bit, _WORD_BITS)
+        mask = np.uint64(1 << shift)
+        row0, row1, col0, col1 = self._windows[bit]
+        inside = self._inside[row0:row1, col0:col1, word]
+        boundary = self._boundary[row0:row1, col0:col1, word]
+        self._counts[row0:row1, col0:col1] -= (inside | boundary) & mask != 0
+        inside &= ~mask
+        boundary &= ~mask
+        self._notices[bit] = None
+        self._geoms[bit] = None
+        self._free.append(bit)
+
+    def _allocate(self) -> int:
+        """Return a free bit, adding a word to every cell if needed."""
+        if not self._free:
+            words = self._inside.shape[2]
+            extra = np.zeros((*self.shape, 1), dtype=_WORD)
+            self._inside = np.concatenate((self._inside, extra), axis=2)
+            self._boundary = np.concatenate((self._boundary, extra), axis=2)
+            self._notices.extend([None] * _WORD_BITS)
+            self._geoms.extend([None] * _WORD_BITS)
+            self._windows.extend([(0, 0, 0, 0)] * _WORD_BITS)
+            self._starts = np.resize(self._starts, (words + 1) * _WORD_BITS)
+            self._ends = np.resize(self._ends, (words + 1) * _WORD_BITS)
+            start = words * _WORD_BITS
+            self._free = list(range(start + _WORD_BITS - 1, start - 1, -1))
+        return self._free.pop()
+
+    def _window(
+        self, geom: shapely.geometry.base.BaseGeometry
+    ) -> tuple[int, int, int, int]:
+        """Rows and columns of the cells that the bounds of geom overlap."""
+        if shapely.is_empty(geom):
+            return 0, 0, 0, 0
+        rows, cols = self.shape
+        lon0, lat0, lon1, lat1 = shapely.bounds(geom).tolist()
+        size = self.cell_size
+
+        def clip(value: float, limit: int) -> int:
+            return min(max(math.floor(value), 0), limit)
+
+        return (
+            clip((lat0 - self.lat_min) / size, rows),
+            clip((lat1 - self.lat_min) / size + 1, rows),
+            clip((lon0 - self.lon_min) / size, cols),
+            clip((lon1 - self.lon_min) / size + 1, cols),
+        )
+
+    def _rasterize(
+        self,
+        geom: shapely.geometry.base.BaseGeometry,
+        window: tuple[int, int, int, int],
+    ) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        """Classify the cells of a window as inside or boundary cells."""
+        row0, row1, col0, col1 = window
+        size = self.cell_size
+        lats = self.lat_min + size * np.arange(row0, row1 + 1)
+        lons = self.lon_min + size * np.arange(col0, col1 + 1)
+        south, west = np.meshgrid(lats[:-1], lons[:-1], indexing="ij")
+        north, east = np.meshgrid(lats[1:], lons[1:], indexing="ij")
+        boxes = np.asarray(shapely.box(west, south, east, north))
+        if shapely.get_dimensions(geom) == 2:
+            # A cell that does not cross the edge is all in or all out.
+            boundary = np.asarray(shapely.intersects(geom.boundary, boxes))
+            centers = shapely.contains_xy(geom, (west + east) / 2, (south + north) / 2)
+            return centers & ~boundary, boundary
+        return (
+            np.zeros(boxes.shape, dtype=np.bool_),
+            np.asarray(shapely.intersects(geom, boxes)),
+        )
+
+    def query_many(
+        self,
+        lons: npt.ArrayLike,
+        lats: npt.ArrayLike,
+        times: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.intp], list[AreaNotice]]:
+        """Find the notices that affect many positions.
+
+        Args:
+            lons: Longitude of each position in degrees.
+            lats: Latitude of each position in degrees.
+            times: UNIX time in seconds of each position.
+
+        Returns:
+            The index of the position and the notice of each hit, sorted by
+            position.
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        rows = np.floor((lats - self.lat_min) / self.cell_size)
+        cols = np.floor((lons - self.lon_min) / self.cell_size)
+        on_grid = (
+            (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+        )
+        positions = np.flatnonzero(on_grid)
+        cells = rows[positions].astype(np.intp) * self.shape[1] + cols[
+            positions
+        ].astype(np.intp)
+        covered = self._counts.ravel()[cells] > 0
+        positions = positions[covered]
+        cells = cells[covered]
+
+        # Only unpack the words that have a bit set.
+        words = self._inside.shape[2]
+        inside = self._inside.reshape(-1, words)[cells]
+        boundary = self._boundary.reshape(-1, words)[cells]
+        rows_index, word_index = np.nonzero(inside | boundary)
+        inside = inside[rows_index, word_index]
+        boundary = boundary[rows_index, word_index] & ~inside
+        hit_rows, hit_bits = _set_bits(rows_index, word_index, inside)
+        check_rows, check_bits = _set_bits(rows_index, word_index, boundary)
+        check = positions[check_rows]
+        exact = shapely.intersects_xy(
+            np.array(self._geoms, dtype=object)[check_bits],
+            lons[check],
+            lats[check],
+        )
+        hit_rows = np.concatenate((hit_rows, check_rows[exact]))
+        hit_bits = np.concatenate((hit_bits, check_bits[exact]))
+
+        hits = positions[hit_rows]
+        when = times[hits]
+        active = (self._starts[hit_bits] <= when) & (when < self._ends[hit_bits])
+        hits = hits[active]
+        hit_bits = hit_bits[active]
+        order = np.lexsort((hit_bits, hits))
+        notices: list[AreaNotice] = []
+        for bit in hit_bits[order].tolist():
+            notice = self._notices[bit]
+            assert notice is not None
+            notices.append(notice)
+        return hits[order], notices
+
+    def query(
+        self, lon: float, lat: float, when: datetime.datetime | float
+    ) -> list[AreaNotice]:
+        """Find the notices that affect one position.
+
+        Args:
+            lon: Longitude in degrees.
+            lat: Latitude in degrees.
+            when: Datetime or UNIX time in seconds.
+
+        Returns:
+            The active notices with a sub-area that contains the position.
+        """
+        _, notices = self.query_many([lon], [lat], [_timestamp(when)])
+        return notices
@@ -0,0 +1,252 @@
+"""Shared state for decoding a batch of AIS binary messages.
+
+The AIS binary messages only carry part of their timestamps.  8:1:22 and
+the USCG area notices send month, day, hour and minute, while the 8:1:26
+sensor reports only send day, hour and minute.  The missing fields have to
+come from a reference time: ideally the receive time in the NMEA
+time_stamp trailer and otherwise the wall clock, read once per batch.
+
+A DecodeContext also holds resources that are worth sharing between
+messages of a batch: interned strings and counters.  It hands out the
+process-wide UTM projections from the utm module.
+
+Decoders that are not given a context use default_context(), which is
+shared by the process and reads the clock at most once a minute.
+"""
+
+import collections
+import copy
+import datetime
+import math
+import time
+from collections.abc import Iterable, Mapping
+from typing import Self
+
+from .utm import UtmProjection, utm_projection
+
+# Seconds that default_context() reuses a reading of the clock for.
+CLOCK_REFRESH_SECONDS: float = 60.0
+
+
+class DecodeContext:
+    """Reference time and per-batch resources for message decoders.
+
+    Attributes:
+        stats: Counters of decoded items keyed by name.
+    """
+
+    stats: collections.Counter[str]
+
+    def __init__(self, reference_time: datetime.datetime | None = None) -> None:
+        """Initialize a decode context.
+
+        Args:
+            reference_time: Time used to fill in the missing year and month.
+                A naive time is taken as UTC.  If None, the clock is read
+                the first time it is needed.
+        """
+        self._reference_time: datetime.datetime | None = None
+        if reference_time is not None:
+            self.reference_time = reference_time
+        self._strings: dict[str, str] = {}
+        self.stats = collections.Counter()
+
+    @property
+    def reference_time(self) -> datetime.datetime:
+        """Time that partial message timestamps are resolved against."""
+        if self._reference_time is None:
+            self._reference_time = datetime.datetime.now(datetime.UTC)
+        return self._reference_time
+
+    @reference_time.setter
+    def reference_time(self, value: datetime.datetime) -> None:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.UTC)
+        self._reference_time = value
+
+    def with_reference_time(self, reference_time: datetime.datetime) -> Self:
+        """Return a copy that resolves timestamps against another time.
+
+        The copy shares the interned strings and counters of this context.
+
+        Args:
+            reference_time: Time used to fill in the missing year and month.
+        """
+        context = copy.copy(self)
+        context.reference_time = reference_time
+        return context
+
+    def update_from_nmea(self, msg_dict: Mapping[str, str | None]) -> None:
+        """Use the receive time from a parsed NMEA sentence when it has one.
+
+        Args:
+            msg_dict: Groups from ais_nmea_regex.  The time_stamp group is
+                the UNIX time that the receiving station logged.
+        """
+        time_stamp = msg_dict.get("time_stamp")
+        if time_stamp:
+            self._reference_time = datetime.datetime.fromtimestamp(
+                float(time_stamp), datetime.UTC
+            )
+
+    def infer_datetime(
+        self, month: int, day: int, hour: int, minute: int
+    ) -> datetime.datetime:
+        """Add the year to a timestamp that only has month through minute.
+
+        Picks the year that puts the time closest to the reference time so
+        that notices sent around New Year land in the correct year.
+
+        Args:
+            month: Month (1-12).
+            day: Day of month (1-31).
+            hour: Hour (0-23).
+            minute: Minute (0-59).
+
+        Returns:
+            A timezone aware datetime in UTC.
+
+        Raises:
+            ValueError: If no year gives a valid date.
+        """
+        ref = self.reference_time
+        best: datetime.datetime | None = None
+        for year in (ref.year, ref.year - 1, ref.year + 1):
+            try:
+                when = datetime.datetime(
+                    year, month, day, hour, minute, tzinfo=datetime.UTC
+                )
+            except ValueError:
+                continue
+            if best is None or abs(when - ref) < abs(best - ref):
+                best = when
+        if best is None:
+            raise ValueError(
+                f"Invalid timestamp: month={month} day={day} "
+                f"hour={hour} minute={minute}"
+            )
+        return best
+
+    def infer_year_month(
+        self, day: int, hour: int = 0, minute: int = 0
+    ) -> tuple[int, int]:
+        """Find the year and month for a timestamp that starts at the day.
+
+        Args:
+            day: Day of month (1-31).
+            hour: Hour (0-23).
+            minute: Minute (0-59).
+
+        Returns:
+            Tuple of year and month closest to the reference time.  Falls back
+            to the reference year and month if the day is not valid in any of
+            the neighboring months.
+        """
+        ref = self.reference_time
+        best: datetime.datetime | None = None
+        for delta in (0, -1, 1):
+            month_index = ref.year * 12 + ref.month - 1 + delta
+            year, month = divmod(month_index, 12)
+            try:
+                when = datetime.datetime(
+                    year, month + 1, day, hour, minute, tzinfo=datetime.UTC
+                )
+            except ValueError:
+                continue
+            if best is None or abs(when - ref) < abs(best - ref):
+                best = when
+        if best is None:
+            return ref.year, ref.month
+        return best.year, best.month
+
+    def intern(self, text: str) -> str:
+        """Return a shared copy of a decoded string.
+
+        Args:
+            text: Decoded string such as free text or a station id.
+
+        Returns:
+            The first equal string seen by this context.
+        """
+        return self._strings.setdefault(text, text)
+
+    def get_proj(self, zone: int) -> UtmProjection:
+        """Return the UTM projection for the zone.
+
+        Args:
+            zone: UTM zone number (1 to 60).
+
+        Returns:
+            The process-wide projection for the zone.
+        """
+        return utm_projection(zone)
+
+    def count(self, key: str, num: int = 1) -> None:
+        """Increment a statistics counter.
+
+        Args:
+            key: Counter name.
+            num: Amount to add.
+        """
+        self.stats[key] += num
+
+
+class _SharedContext:
+    """Holder of the context that decoders use when they are given none."""
+
+    def __init__(self) -> None:
+        self.context: DecodeContext | None = None
+        self.read_at = -math.inf
+
+    def get(self) -> DecodeContext:
+        now = time.monotonic()
+        if self.context is None or now - self.read_at >= CLOCK_REFRESH_SECONDS:
+            self.context = DecodeContext(datetime.datetime.now(datetime.UTC))
+            self.read_at = now
+        return self.context
+
+
+_shared = _SharedContext()
+
+
+def default_context() -> DecodeContext:
+    """Return the context for decoders that are not given one.
+
+    The context is shared by the process.  It is replaced by one with a new
+    reading of the clock every CLOCK_REFRESH_SECONDS, so decoding without a
+    context does not read the clock for each message and still follows it
+    in long running processes.  Decoders never change its reference time.
+
+    Returns:
+        The shared context.
+    """
+    return _shared.get()
+
+
+def nmea_context(
+    msg_dicts: Iterable[Mapping[str, str | None]],
+    context: DecodeContext | None = None,
+) -> DecodeContext:
+    """Return the context to decode the sentences of one message with.
+
+    Args:
+        msg_dicts: Groups from ais_nmea_regex for each sentence.
+        context: Shared decode state.  It takes the receive time of the
+            sentences, if they have one.
+
+    Returns:
+        The context, or without one a new context at the receive time of
+        the sentences, or default_context() if they have none.
+    """
+    if context is not None:
+        for msg_dict in msg_dicts:
+            context.update_from_nmea(msg_dict)
+        return context
+    time_stamp = None
+    for msg_dict in msg_dicts:
+        time_stamp = msg_dict.get("time_stamp") or time_stamp
+    if time_stamp is None:
+        return default_context()
+    return DecodeContext(
+        datetime.datetime.fromtimestamp(float(time_stamp), datetime.UTC)
+    )
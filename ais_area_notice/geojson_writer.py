@@ -0,0 +1,371 @@
+"""Stream decoded messages to GeoJSON.
+
+AreaNotice.__geo_interface__ builds nested dicts of every coordinate that
+are then serialized one message at a time.  GeoJsonWriter writes each
+feature straight from the decoded fields instead, as a FeatureCollection
+(RFC 7946) or as GeoJSON text sequences with one feature per line
+(RFC 8142), which can be appended to and read back a line at a time.
+
+Features:
+
+- AreaNotice: one feature per sub-area with a geometry.
+- Environment: a point for each SensorReportLocation site.
+- MetHydro31: a point at the station.
+- AreaNoticeTable: a point at the anchor of each sub-area, with the shape
+  parameters as properties, written column by column.
+
+Coordinates can be rounded to a number of decimals.  Five decimals are
+about a meter.  TRANSMITTED_PRECISION rounds each sub-area to the precision
+it was sent with, and drops the vertices of lines and polygons that round
+to the previous one.
+"""
+
+import json
+import math
+import operator
+import os
+from collections.abc import Iterable
+from typing import Any, Self, TextIO
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+
+from .columnar import AreaNoticeTable
+from .imo_001_22_area_notice import (
+    TRANSMITTED_PRECISION,
+    AreaNotice,
+    AreaNoticeSubArea,
+    check_precision,
+    round_vertices,
+)
+from .imo_001_26_environment import Environment, SensorReportLocation
+from .imo_001_31_met_hydro import CURRENT_FIELDS, SCALAR_FIELDS, MetHydro31
+
+# Prefix of each record in a GeoJSON text sequence.
+RECORD_SEPARATOR: str = "\x1e"
+
+# Longitude and latitude that mean not available.
+_NO_LON = 181
+_NO_LAT = 91
+
+# Decoded values are finite numbers, which str.format writes as JSON.
+_met_hydro_values = operator.attrgetter(*SCALAR_FIELDS)
+_MET_HYDRO_PROPERTIES = ",".join(
+    f'"{name}":{{}}' for name in ("mmsi", *SCALAR_FIELDS, *CURRENT_FIELDS)
+)
+
+# Rows of a table that write_table formats at a time.
+TABLE_CHUNK_SIZE: int = 65536
+
+# Sub-area columns written as properties by write_table.
+TABLE_SHAPE_FIELDS: tuple[str, ...] = (
+    "radius",
+    "e_dim",
+    "n_dim",
+    "orientation",
+    "left_bound",
+    "right_bound",
+)
+
+
+def _value(value: float | None) -> str:
+    """JSON for a number, with null for NaN and None."""
+    if value is None or not math.isfinite(value):
+        return "null"
+    return repr(value)
+
+
+class GeoJsonWriter:
+    """Stream the features of decoded messages to a file.
+
+    Attributes:
+        features: Number of features written so far.
+    """
+
+    features: int
+
+    def __init__(
+        self,
+        out: TextIO | str | os.PathLike[str],
+        seq: bool = False,
+        precision: int | str | None = None,
+        record_separator: bool = True,
+    ) -> None:
+        """Start writing.
+
+        Args:
+            out: File object or the path of a file to create.
+            seq: Write a GeoJSON text sequence instead of a FeatureCollection.
+            precision: Decimals in each coordinate.  None writes them as is.
+                TRANSMITTED_PRECISION uses the precision that each sub-area
+                was sent with and writes the other features as is.
+            record_separator: Start each record of a sequence with
+                RECORD_SEPARATOR as RFC 8142 asks.  False writes plain
+                newline-delimited features.
+
+        Raises:
+            ValueError: If precision is negative or an unknown string.
+        """
+        check_precision(precision)
+        if isinstance(out, (str, os.PathLike)):
+            self._out: TextIO = open(out, "w", encoding="utf-8")  # noqa: SIM115
+            self._close_out = True
+        else:
+            self._out = out
+            self._close_out = False
+        self._seq = seq
+        self._precision = precision
+        self._closed = False
+        self.features = 0
+        if seq:
+            self._prefix = RECORD_SEPARATOR if record_separator else ""
+        else:
+            self._prefix = ""
+            self._out.write('{"type":"FeatureCollection","features":[\n')
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _decimals(self, area: AreaNoticeSubArea | None = None) -> int | None:
+        """Decimals to round the coordinates of a feature to."""
+        if self._precision == TRANSMITTED_PRECISION:
+            return None if area is None else area.coordinate_decimals()
+        return self._precision  # type: ignore[return-value]
+
+    def _coords(
+        self,
+        coords: npt.NDArray[np.float64],
+        decimals: int | None,
+        closed: bool = False,
+    ) -> str:
+        """JSON of an array of coordinates."""
+        if decimals is not None:
+            coords = round_vertices(coords, decimals, closed)
+        return json.dumps(coords.tolist(), separators=(",", ":"))
+
+    def _write_features(self, features: list[str]) -> None:
+        """Write the JSON of complete features with one write call."""
+        if self._seq:
+            self._out.write(
+                "".join(f"{self._prefix}{feature}\n" for feature in features)
+            )
+        else:
+            separator = ",\n" if self.features else ""
+            self._out.write(separator + ",\n".join(features))
+        self.features += len(features)
+
+    def _feature(self, geometry: str, properties: str) -> None:
+        """Write one feature from the JSON of its geometry and properties."""
+        self._write_features(
+            [
+                f'{{"type":"Feature","geometry":{geometry},"properties":{{{properties}}}}}'
+            ]
+        )
+
+    def _point(self, lon: float, lat: float, decimals: int | None) -> str:
+        """JSON of a Point geometry."""
+        if decimals is not None:
+            lon = round(lon, decimals)
+            lat = round(lat, decimals)
+        return f'{{"type":"Point","coordinates":[{lon!r},{lat!r}]}}'
+
+    def write(self, msg: AreaNotice | Environment | MetHydro31) -> int:
+        """Write the features of a message.
+
+        Args:
+            msg: Decoded message.
+
+        Returns:
+            The number of features written.
+
+        Raises:
+            TypeError: If the message type has no features.
+        """
+        before = self.features
+        if isinstance(msg, AreaNotice):
+            self._write_area_notice(msg)
+        elif isinstance(msg, Environment):
+            self._write_environment(msg)
+        elif isinstance(msg, MetHydro31):
+            self._write_met_hydro(msg)
+        else:
+            raise TypeError(f"No GeoJSON features for {type(msg).__name__}")
+        return self.features - before
+
+    def write_all(self, msgs: Iterable[AreaNotice | Environment | MetHydro31]) -> int:
+        """Write the features of many messages.
+
+        Returns:
+            The number of features written.
+        """
+        return sum(self.write(msg) for msg in msgs)
+
+    def _write_area_notice(self, notice: AreaNotice) -> None:
+        start = int(notice.when.timestamp())
+        head = (
+            f'"mmsi":{_value(notice.source_mmsi)},"link_id":{notice.link_id},'
+            f'"area_type":{notice.area_type},'
+            f'"start":{start},"stop":{start + 60 * notice.duration}'
+        )
+        for index, area in enumerate(notice.areas):
+            geom = area.geom()
+            if geom is None:  # Free text has no position.
+                continue
+            coords = shapely.get_coordinates(geom)
+            geom_type = geom.geom_type
+            decimals = self._decimals(area)
+            if geom_type == "Point":
+                lon, lat = coords[0].tolist()
+                geometry = self._point(lon, lat, decimals)
+            elif geom_type == "Polygon":
+                ring = self._coords(coords, decimals, closed=True)
+                geometry = f'{{"type":"Polygon","coordinates":[{ring}]}}'
+            else:
+                line = self._coords(coords, decimals)
+                geometry = f'{{"type":"{geom_type}","coordinates":{line}}}'
+            self._feature(
+                geometry, f'{head},"sub_area":{index},"area_shape":{area.area_shape}'
+            )
+
+    def _write_environment(self, msg: Environment) -> None:
+        for report in msg.sensor_reports:
+            if not isinstance(report, SensorReportLocation):
+                continue
+            if report.lon == _NO_LON or report.lat == _NO_LAT:
+                continue
+            self._feature(
+                self._point(report.lon, report.lat, self._decimals()),
+                f'"mmsi":{_value(msg.source_mmsi)},"site_id":{report.site_id},'
+                f'"day":{report.day},"hour":{report.hour},'
+                f'"minute":{report.minute},"alt":{_value(report.alt)},'
+                f'"owner":{report.owner},"timeout":{report.timeout}',
+            )
+
+    def _write_met_hydro(self, msg: MetHydro31) -> None:
+        if msg.lon == _NO_LON or msg.lat == _NO_LAT:
+            return
+        currents = [
+            value
+            for current in msg.cur
+            for value in (current["speed"], current["dir"], current["level"])
+        ]
+        self._feature(
+            self._point(msg.lon, msg.lat, self._decimals()),
+            _MET_HYDRO_PROPERTIES.format(
+                _value(msg.source_mmsi), *_met_hydro_values(msg), *currents
+            ),
+        )
+
+    def write_table(self, table: AreaNoticeTable) -> int:
+        """Write a point at the anchor of each sub-area of a table.
+
+        The properties match those of write for the AreaNotice, plus the
+        TABLE_SHAPE_FIELDS, which are null where they do not apply.
+
+        Free text sub-areas have no position and are skipped.  The columns
+        are converted with NumPy and each feature is one string format.
+
+        Args:
+            table: Column store of Area Notices.
+
+        Returns:
+            The number of features written.
+        """
+        notices = table.notices
+        counts = notices["sub_area_count"].astype(np.intp)
+        offsets = notices["sub_area_offset"].astype(np.intp)
+        owner = np.repeat(np.arange(len(notices)), counts)
+        first = np.cumsum(counts) - counts
+        rows = np.arange(len(owner)) - np.repeat(first - offsets, counts)
+        index = rows - offsets[owner]
+
+        sub_areas = table.sub_areas[rows]
+        keep = ~np.isnan(sub_areas["lon"])
+        sub_areas = sub_areas[keep]
+        owner = owner[keep]
+        index = index[keep]
+
+        for chunk in range(0, len(sub_areas), TABLE_CHUNK_SIZE):
+            part = slice(chunk, chunk + TABLE_CHUNK_SIZE)
+            self._write_table_rows(
+                notices[owner[part]], sub_areas[part], index[part].tolist()
+            )
+        return len(sub_areas)
+
+    def _write_table_rows(
+        self,
+        notices: npt.NDArray[Any],
+        sub_areas: npt.NDArray[Any],
+        index: list[int],
+    ) -> None:
+        lons = sub_areas["lon"]
+        lats = sub_areas["lat"]
+        # The table has no precision column, so TRANSMITTED_PRECISION
+        # writes the anchors as is.
+        decimals = self._decimals()
+        if decimals is not None:
+            lons = np.round(lons, decimals)
+            lats = np.round(lats, decimals)
+        start = notices["start"]
+        stop = start + 60 * notices["duration"].astype(np.int64)
+        # Numbers as JSON, with null for the fields that a shape does not use.
+        shape_columns = [
+            np.where(
+                np.isnan(sub_areas[name]), "null", sub_areas[name].astype(str)
+            ).tolist()
+            for name in TABLE_SHAPE_FIELDS
+        ]
+        self._write_features(
+            [
+                '{"type":"Feature","geometry":{"type":"Point","coordinates":'
+                f'[{lon!r},{lat!r}]}},"properties":{{"mmsi":{mmsi},'
+                f'"link_id":{link_id},"area_type":{area_type},"start":{t0},'
+                f'"stop":{t1},"sub_area":{i},"area_shape":{shape},'
+                f'"radius":{radius},"e_dim":{e_dim},"n_dim":{n_dim},'
+                f'"orientation":{orientation},"left_bound":{left},'
+                f'"right_bound":{right}}}}}'
+                for (
+                    lon,
+                    lat,
+                    mmsi,
+                    link_id,
+                    area_type,
+                    t0,
+                    t1,
+                    i,
+                    shape,
+                    radius,
+                    e_dim,
+                    n_dim,
+                    orientation,
+                    left,
+                    right,
+                ) in zip(
+                    lons.tolist(),
+                    lats.tolist(),
+                    notices["mmsi"].tolist(),
+                    notices["link_id"].tolist(),
+                    notices["area_type"].tolist(),
+                    start.tolist(),
+                    stop.tolist(),
+                    index,
+                    sub_areas["shape"].tolist(),
+                    *shape_columns,
+                    strict=True,
+                )
+            ]
+        )
+
+    def close(self) -> None:
+        """Finish the collection and close the file if the writer opened it."""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._seq:
+            self._out.write("\n]}\n")
+        if self._close_out:
+            self._out.close()
@@ -0,0 +1,172 @@
+"""Build the geometries of many 8:1:22 sub-areas at once.
+
+AreaNoticeSubArea.geom projects the vertices of one sub-area at a time.
+build_geometries collects the local vertices of all of the sub-areas and
+converts them together: with one forward and one inverse transform call
+per UTM zone, or with a single tangent_plane call for all zones.  Then it
+creates the shapely geometries with the vectorized constructors.
+"""
+
+import collections
+from collections.abc import Callable, Iterable
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+import shapely.geometry.base
+
+from . import tangent_plane
+from .imo_001_22_area_notice import (
+    AreaNotice,
+    AreaNoticeCirclePt,
+    AreaNoticeFreeText,
+    AreaNoticePolygon,
+    AreaNoticePolyline,
+    AreaNoticeSubArea,
+    get_geometry_engine,
+    lon_to_utm_zone,
+)
+from .utm import utm_projection
+
+
+class _Parts:
+    """Coordinates of geometries of one type and the sub-area of each vertex."""
+
+    def __init__(self) -> None:
+        self.coords: list[npt.NDArray[np.float64]] = []
+        self.indices: list[npt.NDArray[np.intp]] = []
+
+    def add(
+        self, coords: npt.NDArray[np.float64], indices: npt.NDArray[np.intp]
+    ) -> None:
+        if len(indices):
+            self.coords.append(coords)
+            self.indices.append(indices)
+
+    def build(
+        self,
+        constructor: Callable[..., npt.NDArray[np.object_]],
+        result: list[shapely.geometry.base.BaseGeometry | None],
+    ) -> None:
+        """Create all of the geometries with one call of constructor."""
+        if not self.coords:
+            return
+        indices = np.concatenate(self.indices)
+        # The shapely constructors want the vertices grouped in order.
+        order = np.argsort(indices, kind="stable")
+        targets, compact = np.unique(indices[order], return_inverse=True)
+        coords = np.concatenate(self.coords)[order]
+        for target, geom in zip(
+            targets.tolist(), constructor(coords, indices=compact), strict=True
+        ):
+            result[target] = geom
+
+
+def _polygons(
+    coords: npt.NDArray[np.float64], indices: npt.NDArray[np.intp]
+) -> npt.NDArray[np.object_]:
+    return np.asarray(shapely.polygons(shapely.linearrings(coords, indices=indices)))
+
+
+def _to_ll(
+    areas: list[AreaNoticeSubArea], indices: list[int], engine: str
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.intp]]:
+    """Convert the local vertices of the sub-areas at indices together.
+
+    Returns:
+        The (lon, lat) of the vertices and the position in indices of the
+        sub-area of each vertex.
+    """
+    lons = np.array([areas[i].lon for i in indices])
+    lats = np.array([areas[i].lat for i in indices])
+    offsets = [areas[i].local_vertices() for i in indices]
+    owner = np.repeat(np.arange(len(indices)), [len(offset) for offset in offsets])
+    local = np.concatenate(offsets)
+    if engine == "tangent_plane":
+        return tangent_plane.local_to_ll_many(lons[owner], lats[owner], local), owner
+
+    proj = utm_projection(lon_to_utm_zone(areas[indices[0]].lon))
+    xs, ys = proj(lons, lats)
+    lons, lats = proj(local[:, 0] + xs[owner], local[:, 1] + ys[owner], inverse=True)
+    return np.column_stack((lons, lats)), owner
+
+
+def build_geometries(
+    areas: Iterable[AreaNoticeSubArea], engine: str | None = None
+) -> list[shapely.geometry.base.BaseGeometry | None]:
+    """Build the geometries of sub-areas with vectorized projections.
+
+    Args:
+        areas: Sub-areas from any number of Area Notices.
+        engine: One of GEOMETRY_ENGINES.  Defaults to the engine set with
+            set_geometry_engine.
+
+    Returns:
+        One geometry per sub-area, the same as its geom() with that engine,
+        or None for free text.
+    """
+    if engine is None:
+        engine = get_geometry_engine()
+    areas = list(areas)
+    result: list[shapely.geometry.base.BaseGeometry | None] = [None] * len(areas)
+    points: list[int] = []
+    groups: dict[int, list[int]] = collections.defaultdict(list)
+    for i, area in enumerate(areas):
+        if isinstance(area, AreaNoticeFreeText):
+            continue
+        if isinstance(area, AreaNoticeCirclePt) and area.radius <= 0.01:
+            points.append(i)
+        elif engine == "tangent_plane":
+            groups[0].append(i)
+        else:
+            groups[lon_to_utm_zone(area.lon)].append(i)
+
+    if points:
+        geoms = shapely.points([(areas[i].lon, areas[i].lat) for i in points])
+        for i, geom in zip(points, geoms.tolist(), strict=True):
+            result[i] = geom
+
+    lines = _Parts()
+    polygons = _Parts()
+    for group in groups.values():
+        coords, owner = _to_ll(areas, group, engine)
+        is_line = np.array(
+            [
+                isinstance(areas[i], AreaNoticePolyline)
+                and not isinstance(areas[i], AreaNoticePolygon)
+                for i in group
+            ]
+        )[owner]
+        indices = np.asarray(group)[owner]
+        lines.add(coords[is_line], indices[is_line])
+        polygons.add(coords[~is_line], indices[~is_line])
+
+    lines.build(shapely.linestrings, result)
+    polygons.build(_polygons, result)
+    return result
+
+
+def build_notice_geometries(
+    notices: Iterable[AreaNotice], engine: str | None = None
+) -> list[list[shapely.geometry.base.BaseGeometry | None]]:
+    """Build the geometries of the sub-areas of many Area Notices.
+
+    Args:
+        notices: Area Notices.
+        engine: Passed to build_geometries.
+
+    Returns:
+        For each notice, the geometries of its sub-areas as build_geometries
+        returns them.
+    """
+    notices = list(notices)
+    geoms = build_geometries(
+        (area for notice in notices for area in notice.areas), engine
+    )
+    result = []
+    start = 0
+    for notice in notices:
+        end = start + len(notice.areas)
+        result.append(geoms[start:end])
+        start = end
+    return result
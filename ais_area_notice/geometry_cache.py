@@ -0,0 +1,169 @@
+"""Memoized sub-area geometry.
+
+Building the geometry of a sub-area projects its vertices, and the
+__geo_interface__ and kml() output of a notice ask for it again on every
+call.  Methods decorated with memoize_geometry keep their result on the
+object until the attributes that define the shape change, which the
+object reports with geometry_key().
+
+Decoded notices often repeat the same shapes, so a process-wide LRU cache
+keyed by geometry_key() can also be turned on with set_geometry_cache.
+Shapely geometries are immutable, so they are safe to share.
+"""
+
+import collections
+import functools
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, Protocol
+
+
+class _Shape(Protocol):
+    """Object with a memoizable geometry."""
+
+    __dict__: dict[str, Any]
+
+    def geometry_key(self) -> Hashable:
+        """Return the class and the attributes that define the shape."""
+        ...  # pragma: no cover
+
+
+class GeometryCache:
+    """Thread-safe LRU cache of geometries shared by all sub-areas.
+
+    Attributes:
+        maxsize: Number of results to keep.
+        hits: Number of lookups that found a result.
+        misses: Number of lookups that did not.
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Number of results to keep.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: collections.OrderedDict[Hashable, Any] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Look up a result and mark it as recently used.
+
+        Args:
+            key: Method name and geometry key.
+
+        Returns:
+            The cached result or None.
+        """
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Add a result, dropping the least recently used if full.
+
+        Args:
+            key: Method name and geometry key.
+            value: The result to share.
+        """
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all results and reset the counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_shared_cache: GeometryCache | None = None
+
+
+def set_geometry_cache(cache: GeometryCache | None) -> None:
+    """Set the process-wide geometry cache.
+
+    Args:
+        cache: Cache to share geometries between sub-areas with the same
+            shape, or None to only memoize on each object.
+    """
+    global _shared_cache  # pylint: disable=global-statement
+    _shared_cache = cache
+
+
+def get_geometry_cache() -> GeometryCache | None:
+    """Return the process-wide geometry cache, if there is one."""
+    return _shared_cache
+
+
+def _memo(obj: _Shape) -> tuple[Hashable, dict[str, Any]]:
+    """Return the geometry key and the memoized results for it."""
+    key = obj.geometry_key()
+    memo = obj.__dict__.get("_geometry_memo")
+    if memo is None or memo[0] != key:
+        memo = (key, {})
+        obj.__dict__["_geometry_memo"] = memo
+    return memo
+
+
+def memoize_geometry[S: _Shape, R](method: Callable[[S], R]) -> Callable[[S], R]:
+    """Memoize a method whose result only depends on geometry_key().
+
+    Args:
+        method: Method without arguments that builds a geometry or something
+            derived from it.
+
+    Returns:
+        The memoizing method.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: S) -> R:
+        key, results = _memo(self)
+        if name in results:
+            return results[name]
+
+        cache = _shared_cache
+        result = None if cache is None else cache.get((name, key))
+        if result is None:
+            result = method(self)
+            if cache is not None:
+                cache.put((name, key), result)
+        results[name] = result
+        return result
+
+    return wrapper
+
+
+def seed_geometry(obj: _Shape, name: str, result: Any) -> None:
+    """Store the result of a memoized method that was computed elsewhere.
+
+    For example, geometry read back from a file, so that the method does
+    not build it again.  The result is dropped like any other once the
+    geometry key of the object changes.
+
+    Args:
+        obj: Object with the memoized method.
+        name: Name of the method.
+        result: What the method would return.
+    """
+    _memo(obj)[1][name] = result
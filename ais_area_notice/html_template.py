@@ -0,0 +1,91 @@
+"""HTML from precompiled string templates.
+
+The html() descriptions of messages are embedded in every KML placemark.
+Building an lxml tree for each one and serializing it costs far more than
+the text.  An HtmlTemplate splits its template into literal text and
+fields once, and render only escapes the values and joins the parts.
+
+Fields use str.format syntax.  Values are escaped, except for fields
+with the html format spec, such as {items:html}, which take markup that
+was already rendered.
+"""
+
+import html
+import string
+
+
+def escape(value: object) -> str:
+    """Return str(value) with the characters special to HTML escaped."""
+    return html.escape(str(value))
+
+
+class HtmlTemplate:
+    """Template with escaped {name} fields.
+
+    Attributes:
+        template: The template text.
+        fields: Names of the fields in the order that they appear.
+    """
+
+    template: str
+    fields: tuple[str, ...]
+
+    def __init__(self, template: str) -> None:
+        """Compile a template.
+
+        Args:
+            template: Text with {name} and {name:html} fields.  Double the
+                braces to include them literally.
+
+        Raises:
+            ValueError: If a field has no name or another format spec or
+                conversion.
+        """
+        self.template = template
+        parts: list[tuple[str, str | None, bool]] = []
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            if name is not None:
+                if not name or conversion or spec not in ("", "html"):
+                    raise ValueError(f"Unsupported field in template: {template!r}")
+                parts.append((literal, name, spec == "html"))
+            else:
+                parts.append((literal, None, False))
+        self._parts = tuple(parts)
+        self.fields = tuple(name for _, name, _ in parts if name is not None)
+
+    def render(self, **values: object) -> str:
+        """Fill in the fields.
+
+        Args:
+            **values: A value for each field.
+
+        Returns:
+            The HTML text.
+        """
+        result = []
+        for literal, name, markup in self._parts:
+            result.append(literal)
+            if name is not None:
+                value = values[name]
+                result.append(str(value) if markup else escape(value))
+        return "".join(result)
+
+
+# An ordered list with one item per element.
+LIST_ITEM = HtmlTemplate("<li>{text}</li>")
+SUMMARY_LIST = HtmlTemplate("<div><p>{summary}</p><ol>{items:html}</ol></div>")
+
+
+def summary_list(summary: object, items: list[object]) -> str:
+    """Render a summary paragraph and a numbered list of items.
+
+    Args:
+        summary: Text of the paragraph.
+        items: Text of each list item.
+
+    Returns:
+        The HTML text.
+    """
+    return SUMMARY_LIST.render(
+        summary=summary, items="".join(LIST_ITEM.render(text=item) for item in items)
+    )
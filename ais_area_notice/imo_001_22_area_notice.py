@@ -10,32 +10,48 @@ It is unclear if that is after the bit stuffing and if those extra
 bits should be returned back into into the NMEA message. The code here
 has the option to byte align the resulting bits in get_aivdm.
 
-TODO(schwehr): Handle polyline and polygons that span multiple subareas.
 TODO(schwehr): Handle text that spans adjacent subareas.
 """
 
 import calendar
 import datetime
+import importlib.resources
+import io
 import logging
 import math
 import operator
 import optparse
+import os
 import queue as Queue
 import re
 import sys
 import time
-from collections.abc import Iterator, Sequence
-from functools import reduce
-from typing import Any, Literal, overload
+import zipfile
+from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
+from functools import cache, reduce
+from typing import Any, BinaryIO, ClassVar, Literal, Self, TextIO, cast, overload
 
-import lxml
-import lxml.html
+import numpy as np
+import numpy.typing as npt
 import shapely.geometry
 from BitVector import BitVector
-from lxml.html import builder as E
-from pyproj import Proj
 
-from . import ais_string, binary
+from . import ais_string, binary, tangent_plane, wire
+from .an_util import BitBuffer
+from .decode_context import DecodeContext, default_context, nmea_context
+from .geometry_cache import memoize_geometry
+from .html_template import escape, summary_list
+from .utm import utm_projection
+
+# How sub-area vertices are converted to longitude and latitude.
+GEOMETRY_ENGINES: tuple[str, ...] = ("utm", "tangent_plane")
+_geometry_engine: str = "utm"
+
+# Level of detail of curved outlines.  See set_max_chord_error.
+_max_chord_error: float | None = None
+MIN_CIRCLE_SEGMENTS: int = 8
+MAX_CIRCLE_SEGMENTS: int = 720
+EARTH_RADIUS_M: float = 6371000.0
 
 # Track the next value to use for multiline nmea messages.
 NEXT_SEQUENCE: int = 1
@@ -84,6 +100,12 @@ kml_head: str = KML_HEAD  # pylint: disable=invalid-name
 KML_TAIL: str = "</Document></kml>"
 kml_tail: str = KML_TAIL  # pylint: disable=invalid-name
 
+# KML styles for each area_type, shipped with the package.
+KML_STYLES_FILE: str = "areanotice_styles.kml"
+
+# Name of the main document inside a KMZ archive.
+KMZ_DOC_FILE: str = "doc.kml"
+
 # ISO time format for NetworkLinkControl strftime.
 ISO8601_TIMEFORMAT: str = "%Y-%m-%dT%H:%M:%SZ"
 iso8601_timeformat: str = ISO8601_TIMEFORMAT  # pylint: disable=invalid-name
@@ -350,21 +372,92 @@ def lon_to_utm_zone(lon: float) -> int:
     """Determine the UTM longitude zone number for a given longitude.
 
     Args:
-        lon: Longitude in degrees.
+        lon: Longitude in degrees.  Wrapped into -180 to 180.
 
     Returns:
         The UTM zone number (1 to 60).
     """
-    return int((lon + 180) / 6) + 1
+    return int((lon + 180) % 360 / 6) % 60 + 1
+
+
+def set_geometry_engine(engine: str) -> None:
+    """Choose how sub-area vertices are converted to longitude and latitude.
+
+    Args:
+        engine: "utm" projects the offsets through the UTM zone of the start
+            point.  "tangent_plane" follows geodesics from the start point
+            without pyproj, which is faster and also works across the
+            antimeridian and near the poles.
+
+    Raises:
+        ValueError: If engine is not in GEOMETRY_ENGINES.
+    """
+    global _geometry_engine  # pylint: disable=global-statement
+    if engine not in GEOMETRY_ENGINES:
+        raise ValueError(f"Unknown geometry engine: {engine}")
+    _geometry_engine = engine
+
+
+def get_geometry_engine() -> str:
+    """Return the engine set with set_geometry_engine."""
+    return _geometry_engine
+
+
+def set_max_chord_error(meters: float | None) -> None:
+    """Set the level of detail of circles, sectors and rectangle outlines.
+
+    Args:
+        meters: Largest distance between an outline and the straight
+            segments that approximate it.  Circles get between
+            MIN_CIRCLE_SEGMENTS and MAX_CIRCLE_SEGMENTS segments, sectors
+            the same share of them as their arc and rectangle edges are
+            split where the curvature of the Earth would exceed it.  None
+            keeps the fixed resolution of 64 segments per circle, a
+            vertex every 0.5 degrees of a sector and rectangles as 4
+            corners.
+
+    Raises:
+        ValueError: If meters is not positive.
+    """
+    global _max_chord_error  # pylint: disable=global-statement
+    if meters is not None and not meters > 0:
+        raise ValueError(f"Chord error must be positive: {meters}")
+    _max_chord_error = meters
+
+
+def get_max_chord_error() -> float | None:
+    """Return the level of detail set with set_max_chord_error."""
+    return _max_chord_error
+
+
+def arc_segments(radius: float, sweep_deg: float, max_error: float) -> int:
+    """Number of segments that keep an arc within a chord error.
+
+    Args:
+        radius: Radius of the arc in meters.
+        sweep_deg: Angle covered by the arc in degrees.
+        max_error: Largest distance between the arc and a segment in meters.
+
+    Returns:
+        The segment count, at least 1.
+    """
+    if max_error < radius:
+        step = 2 * math.acos(1 - max_error / radius)
+        full = min(
+            max(math.ceil(2 * math.pi / step), MIN_CIRCLE_SEGMENTS), MAX_CIRCLE_SEGMENTS
+        )
+    else:
+        full = MIN_CIRCLE_SEGMENTS
+    return max(1, math.ceil(full * sweep_deg / 360 - 1e-9))
 
 
 def ll_to_delta_m(
     lon1: float, lat1: float, lon2: float, lat2: float
 ) -> tuple[float, float]:
     """Calculate dx and dy in meters between two points."""
-    zone = lon_to_utm_zone((lon1 + lon2) / 2.0)  # Just don't cross the dateline!
-    params = {"proj": "utm", "zone": zone}
-    proj = Proj(params)
+    # Take the midpoint the short way around across the antimeridian.
+    zone = lon_to_utm_zone(lon1 + ((lon2 - lon1 + 180) % 360 - 180) / 2.0)
+    proj = utm_projection(zone)
 
     utm1 = proj(lon1, lat1)
     utm2 = proj(lon2, lat2)
@@ -448,8 +541,7 @@ def polyline_to_ll(
 
     lon, lat = start
     zone = lon_to_utm_zone(lon)
-    params = {"proj": "utm", "zone": zone}
-    proj = Proj(params)
+    proj = utm_projection(zone)
 
     p1 = proj(lon, lat)
 
@@ -463,10 +555,49 @@ def polyline_to_ll(
         pts.append(cur)
 
     pts = [vec_add(p1, pt) for pt in pts]
-    proj_pts: list[tuple[float, float]] = [
-        proj(pt[0], pt[1], inverse=True) for pt in pts
-    ]
-    return proj_pts
+    lons, lats = proj([pt[0] for pt in pts], [pt[1] for pt in pts], inverse=True)
+    return list(zip(lons, lats, strict=True))
+
+
+def local_to_ll(
+    lon: float, lat: float, offsets: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Convert offsets from a start point to longitude and latitude.
+
+    Uses the engine chosen with set_geometry_engine.
+
+    Args:
+        lon: Longitude of the start point.
+        lat: Latitude of the start point.
+        offsets: (N, 2) array of meters east and north of the start point.
+
+    Returns:
+        An (N, 2) array of (lon, lat).
+    """
+    if _geometry_engine == "tangent_plane":
+        return tangent_plane.local_to_ll(lon, lat, offsets)
+    proj = utm_projection(lon_to_utm_zone(lon))
+    x, y = proj(lon, lat)
+    lons, lats = proj(offsets[:, 0] + x, offsets[:, 1] + y, inverse=True)
+    return np.column_stack((lons, lats))
+
+
+def polyline_offsets(
+    points: Sequence[tuple[float, float]],
+) -> npt.NDArray[np.float64]:
+    """Add up polyline steps into offsets from the start point.
+
+    Args:
+        points: (angle in degrees, distance in meters) of each step.
+
+    Returns:
+        An (N + 1, 2) array of meters east and north of the start point,
+        starting with the start point itself.
+    """
+    angles = np.radians([point[0] for point in points])
+    dists = np.array([point[1] for point in points], dtype=np.float64)
+    steps = np.column_stack((dists * np.sin(angles), dists * np.cos(angles)))
+    return np.concatenate((np.zeros((1, 2)), np.cumsum(steps, axis=0)))
 
 
 def frange(
@@ -505,39 +636,250 @@ def vec_rot(a: Sequence[float], theta: float) -> tuple[float, float]:
     return x1, y1
 
 
-def geom2kml(geom_dict: dict[str, Any]) -> str:
+@cache
+def kml_styles() -> str:
+    """Return the KML styles for each area_type.
+
+    The styles are read from the package once, not from the current
+    directory.
+    """
+    styles = importlib.resources.files("ais_area_notice") / KML_STYLES_FILE
+    return styles.read_text(encoding="utf-8")
+
+
+# Precision that writes each sub-area with the precision it was sent with.
+TRANSMITTED_PRECISION: str = "transmitted"
+
+# Decimal places of minutes in the positions of 8:1:22 (1/1000 minute).
+POSITION_MINUTE_DECIMALS: int = 3
+
+
+def coordinate_decimals(
+    precision: int, resolution: int = POSITION_MINUTE_DECIMALS
+) -> int:
+    """Decimals of degrees that keep a position sent with a precision.
+
+    The precision field of a sub-area is the number of decimal places of
+    minutes that its position was truncated to.  A step of 10**-precision
+    minutes is 1/60 of that in degrees, so two more decimals keep positions
+    one step apart distinct.  Precisions beyond the resolution of the
+    message, including the reserved 5-7, mean no truncation.
+
+    Args:
+        precision: Precision field of the sub-area.
+        resolution: Decimal places of minutes that the message encodes.
+
+    Returns:
+        Number of decimals of degrees.
+    """
+    return min(precision, resolution) + 2
+
+
+def check_precision(precision: int | str | None) -> None:
+    """Check the precision argument of the output encoders.
+
+    Args:
+        precision: Decimals in each coordinate, None, or TRANSMITTED_PRECISION.
+
+    Raises:
+        ValueError: If precision is negative or an unknown string.
+    """
+    if precision is None or precision == TRANSMITTED_PRECISION:
+        return
+    if isinstance(precision, str) or precision < 0:
+        raise ValueError(f"Invalid precision: {precision}")
+
+
+# Decimals that round_vertices goes up to for shapes that are too small for
+# the requested precision.  Nine decimals of a degree are under a millimeter.
+MAX_ROUND_DECIMALS: int = 9
+
+
+def round_vertices(
+    coords: npt.ArrayLike, decimals: int, closed: bool = False
+) -> npt.NDArray[np.float64]:
+    """Round the vertices of a line or ring and drop those that collapse.
+
+    A vertex that rounds to the same position as the previous one adds
+    nothing at that precision.  A shape that is too small for the
+    precision, such as a small circle at 0 or 1 decimals, would collapse to
+    fewer than 2 vertices or an invalid ring.  It is rounded to more
+    decimals until it is valid, and is kept as is if it never is.
+
+    Args:
+        coords: (N, 2) array of longitudes and latitudes.
+        decimals: Decimals to round to.
+        closed: The vertices are a ring whose last one repeats the first.
+
+    Returns:
+        The rounded vertices.
+    """
+    return _round_vertices(coords, decimals, closed)[0]
+
+
+def _round_vertices(
+    coords: npt.ArrayLike, decimals: int, closed: bool
+) -> tuple[npt.NDArray[np.float64], int]:
+    """round_vertices, with the decimals that the vertices were rounded to."""
+    vertices = np.asarray(coords, dtype=np.float64)
+    places = decimals
+    for places in range(decimals, max(decimals, MAX_ROUND_DECIMALS) + 1):
+        rounded: npt.NDArray[np.float64] = vertices.round(places)
+        keep = np.ones(len(rounded), dtype=bool)
+        keep[1:] = np.any(rounded[1:] != rounded[:-1], axis=1)
+        rounded = rounded[keep]
+        if not closed:
+            if len(rounded) >= 2:
+                return rounded, places
+        elif len(rounded) >= 4 and shapely.is_valid(shapely.polygons(rounded)):
+            return rounded, places
+    return vertices, places
+
+
+def geom2kml(geom_dict: dict[str, Any], precision: int | None = None) -> str:
     """Convert a geointerface geometry to KML.
 
     Args:
         geom_dict: dict, 'geometry' as defined by the geo interface in
           geojson and shapely.
+        precision: Number of decimals in each coordinate.  None writes
+          points as is and the vertices of lines and polygons with six.
+          Five decimals are about a meter.  Vertices that round to the
+          previous one are dropped, and lines and polygons that are too
+          small for the precision are written with more decimals.
 
     Returns:
         KML XML string representation of geometry.
 
     Raises:
-        ValueError: If geometry type is unrecognised.
+        ValueError: If geometry type is unrecognised or precision is negative.
     """
     geom_type = geom_dict["geometry"]["type"]
     geom_coords = geom_dict["geometry"]["coordinates"]
+    if precision is None:
+        fmt = "f"
+    elif precision < 0:
+        raise ValueError(f"Invalid precision: {precision}")
+    else:
+        fmt = f".{precision}f"
 
     if geom_type == "Point":
-        return f"<Point><coordinates>{geom_coords[0]},{geom_coords[1]},0</coordinates></Point>"
+        if precision is None:
+            return f"<Point><coordinates>{geom_coords[0]},{geom_coords[1]},0</coordinates></Point>"
+        return (
+            f"<Point><coordinates>{geom_coords[0]:{fmt}},{geom_coords[1]:{fmt}},0"
+            "</coordinates></Point>"
+        )
+    if geom_type not in ("Polygon", "LineString"):
+        raise ValueError(f"Not a recognized __geo_interface__ type: {geom_type}")
+
+    if precision is not None:
+        # Shapes that are small for the precision keep more decimals.
+        rounded, places = _round_vertices(
+            geom_coords, precision, closed=geom_type == "Polygon"
+        )
+        geom_coords = rounded.tolist()
+        fmt = f".{places}f"
     if geom_type == "Polygon":
         o = ["<Polygon><outerBoundaryIs><LinearRing><coordinates>"]
         for pt in geom_coords:
-            o.append(f"\t{pt[0]:f},{pt[1]:f},0")
+            o.append(f"\t{pt[0]:{fmt}},{pt[1]:{fmt}},0")
         o.append("</coordinates></LinearRing></outerBoundaryIs></Polygon>")
         return "\n".join(o)
 
-    if geom_type == "LineString":
-        o = ["<LineString><coordinates>"]
-        for pt in geom_coords:
-            o.append(f"\t{pt[0]:f},{pt[1]:f},0")
-        o.append("</coordinates></LineString>")
-        return "\n".join(o)
+    o = ["<LineString><coordinates>"]
+    for pt in geom_coords:
+        o.append(f"\t{pt[0]:{fmt}},{pt[1]:{fmt}},0")
+    o.append("</coordinates></LineString>")
+    return "\n".join(o)
+
+
+@cache
+def _kml_description_head(area_type: int) -> str:
+    return f"<description>\n<i>AreaNotice - {escape(notice_type[area_type])}</i>\n"
+
+
+def kml_placemarks(
+    msg: Any,
+    with_style: bool | str = True,
+    with_time: bool = False,
+    with_extended_data: bool = False,
+    precision: int | str | None = None,
+    style_file: str = "",
+) -> list[tuple[int, str]]:
+    """Render the KML placemarks of a message.
+
+    Args:
+        msg: Area Notice or other message with areas.
+        with_style: If True, uses standard style. Set to str for custom style.
+        with_time: Enable timestamps in Google Earth.
+        with_extended_data: Include extended data tags.
+        precision: Decimals in each coordinate.  See geom2kml.
+            TRANSMITTED_PRECISION uses the precision that each sub-area was
+            sent with, and None for sub-areas without a precision field.
+        style_file: File with the styles, or "" for the same document.
 
-    raise ValueError(f"Not a recognized __geo_interface__ type: {geom_type}")
+    Returns:
+        The index of the sub-area and the content between <Placemark> and
+        </Placemark> for each sub-area with a geometry.
+
+    Raises:
+        ValueError: If precision is negative or an unknown string.
+    """
+    check_precision(precision)
+    shapes = []
+    for index, area in enumerate(getattr(msg, "areas", [])):
+        geo_i = area.__geo_interface__
+        if "geometry" in geo_i:
+            if isinstance(precision, str):
+                decimals = area.coordinate_decimals()
+            else:
+                decimals = precision
+            shapes.append((index, geom2kml(geo_i, decimals)))
+    if not shapes:
+        return []
+
+    area_type = getattr(msg, "area_type", 0)
+    name = getattr(msg, "name", None)
+    if not name:
+        name = short_notice[area_type].replace("_", " ")
+    style = ""
+    if with_style:
+        if isinstance(with_style, str):
+            style = f"<styleUrl>{with_style}</styleUrl>\n"
+        style += f"<styleUrl>{style_file}#AreaNotice_{area_type}</styleUrl>\n"
+    extended_data = ""
+    if with_extended_data:
+        values = "\n".join(
+            f'\t<Data name="{key}"><value>{getattr(msg, key, "")}</value></Data>'
+            for key in (
+                "message_id",
+                "source_mmsi",
+                "dac",
+                "fi",
+                "link_id",
+                "when",
+                "duration",
+                "area_type",
+            )
+        )
+        extended_data = f"<ExtendedData>\n{values}\n</ExtendedData>\n\n"
+    html = getattr(msg, "html", lambda: "")()
+    head = (
+        f"\n<name>{name}</name>\n{style}{extended_data}"
+        f"{_kml_description_head(area_type)}{html}\n</description>\n"
+    )
+    tail = ""
+    if with_time:
+        when = getattr(msg, "when", datetime.datetime.now(datetime.UTC))
+        duration = getattr(msg, "duration", 0)
+        start = datetime.datetime.strftime(when, iso8601_timeformat)
+        end = datetime.datetime.strftime(
+            when + datetime.timedelta(minutes=duration),
+            iso8601_timeformat,
+        )
+        tail = f"<TimeSpan><begin>{start}</begin><end>{end}</end></TimeSpan>\n"
+    return [(index, f"{head}{shape}\n{tail}") for index, shape in shapes]
 
 
 class AisException(Exception):
@@ -772,6 +1114,7 @@ class AIVDM:
         full: bool = False,
         with_time: bool = False,
         with_extended_data: bool = False,
+        precision: int | str | None = None,
     ) -> str:
         """Return a KML str for Google Earth.
 
@@ -780,77 +1123,195 @@ class AIVDM:
             full: Include KML header and footer.
             with_time: Enable timestamps in Google Earth.
             with_extended_data: Include extended data tags.
+            precision: Decimals in each coordinate.  See kml_placemarks.
 
         Returns:
             KML XML string.
         """
-        o = []
-        if full:
-            o.append(kml_head)
-            with open("areanotice_styles.kml", encoding="utf-8") as f:
-                o.append(f.read())
-        html = getattr(self, "html", lambda: "")()
-        areas = getattr(self, "areas", [])
-        for area in areas:
-            geo_i = area.__geo_interface__
-            if "geometry" not in geo_i:
-                continue
-            kml_shape = geom2kml(geo_i)
+        out = io.StringIO()
+        with KmlWriter(
+            out,
+            document=full,
+            with_style=with_style,
+            with_time=with_time,
+            with_extended_data=with_extended_data,
+            precision=precision,
+        ) as writer:
+            writer.write(self)
+        return out.getvalue()
+
+
+class KmlWriter:
+    """Stream the placemarks of Area Notices to a KML document.
+
+    Each message is written as soon as it is passed to write, so memory
+    use does not grow with the number of placemarks.  Placemarks can be
+    grouped into folders by area_type, by MMSI, or by any key function.
+    A folder is started whenever the key changes, so sort the messages by
+    the key to get a single folder per key.
+
+    A KMZ archive is written when the path ends in .kmz or kmz is True.
+    The placemarks are compressed into doc.kml as they are written, and
+    the styles are bundled as a separate entry that the placemarks refer
+    to.
 
-            o.append("<Placemark>")
-            name = getattr(self, "name", None)
-            area_type = getattr(self, "area_type", 0)
-            if name:
-                o.append(f"<name>{name}</name>")
-            else:
-                o.append(f"<name>{short_notice[area_type].replace('_', ' ')}</name>")
-            if with_style:
-                if isinstance(with_style, str):
-                    o.append(f"<styleUrl>{with_style}</styleUrl>")
-                o.append(f"<styleUrl>#AreaNotice_{area_type}</styleUrl>")
-
-            if with_extended_data:
-                o.append("<ExtendedData>")
-
-                for key in (
-                    "message_id",
-                    "source_mmsi",
-                    "dac",
-                    "fi",
-                    "link_id",
-                    "when",
-                    "duration",
-                    "area_type",
-                ):
-                    val = getattr(self, key, "")
-                    o.append(f'\t<Data name="{key}"><value>{val}</value></Data>')
-
-                o.append("</ExtendedData>\n")
-
-            o.append("<description>")
-            o.append(f"<i>AreaNotice - {notice_type[area_type]}</i>")
-            o.append(html)
-            o.append("</description>")
-
-            o.append(kml_shape)
-            if with_time:
-                when = getattr(self, "when", datetime.datetime.now(datetime.UTC))
-                duration = getattr(self, "duration", 0)
-                start = datetime.datetime.strftime(when, iso8601_timeformat)
-                end = datetime.datetime.strftime(
-                    when + datetime.timedelta(minutes=duration),
-                    iso8601_timeformat,
-                )
-                o.append(
-                    f"""<TimeSpan><begin>{start}</begin><end>{end}</end></TimeSpan>"""
-                )
+    Attributes:
+        placemarks: Number of placemarks written so far.
+    """
 
-            o.append("</Placemark>\n")
+    placemarks: int
 
-        if full:
-            o.append(kml_tail)
+    def __init__(
+        self,
+        out: TextIO | BinaryIO | str | os.PathLike[str],
+        document: bool = True,
+        folders: Literal["area_type", "mmsi"] | Callable[[Any], Any] | None = None,
+        with_style: bool | str = True,
+        with_time: bool = False,
+        with_extended_data: bool = False,
+        precision: int | str | None = None,
+        kmz: bool | None = None,
+    ) -> None:
+        """Start writing.
 
-        return "\n".join(o)
+        Args:
+            out: File object or the path of a file to create.  A KMZ needs
+                a binary file object or a path.
+            document: Write the KML header, styles and footer around the
+                placemarks.
+            folders: "area_type", "mmsi", or a function that returns the
+                folder name of a message.  None writes no folders.
+            with_style: If True, uses standard style. Set to str for custom style.
+            with_time: Enable timestamps in Google Earth.
+            with_extended_data: Include extended data tags.
+            precision: Decimals in each coordinate.  See kml_placemarks.
+            kmz: Write a KMZ archive.  None writes one if out is a path
+                that ends in .kmz.
+
+        Raises:
+            ValueError: If precision is negative or an unknown string.
+            TypeError: If a KMZ is asked for with a text file object.
+        """
+        check_precision(precision)
+        if kmz is None:
+            kmz = isinstance(out, (str, os.PathLike)) and os.fspath(
+                out
+            ).lower().endswith(".kmz")
+        self._zip: zipfile.ZipFile | None = None
+        self._style_file = ""
+        if kmz:
+            if isinstance(out, io.TextIOBase):
+                raise TypeError("A KMZ needs a binary file object or a path")
+            self._zip = zipfile.ZipFile(
+                cast(BinaryIO | str | os.PathLike[str], out),
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+            )
+            self._zip.writestr(
+                KML_STYLES_FILE, kml_head + "\n" + kml_styles() + "\n" + kml_tail
+            )
+            self._style_file = KML_STYLES_FILE
+            self._out: TextIO = io.TextIOWrapper(
+                self._zip.open(KMZ_DOC_FILE, "w"), encoding="utf-8"
+            )
+            self._close_out = True
+        elif isinstance(out, (str, os.PathLike)):
+            self._out = open(out, "w", encoding="utf-8")  # noqa: SIM115
+            self._close_out = True
+        else:
+            self._out = cast(TextIO, out)
+            self._close_out = False
+        if folders == "area_type":
+            self._folder_key: Callable[[Any], Any] | None = _area_type_folder
+        elif folders == "mmsi":
+            self._folder_key = operator.attrgetter("source_mmsi")
+        else:
+            self._folder_key = folders
+        self._document = document
+        self._with_style = with_style
+        self._with_time = with_time
+        self._with_extended_data = with_extended_data
+        self._precision = precision
+        self._folder: Any = _NO_FOLDER
+        self._closed = False
+        self.placemarks = 0
+        if document:
+            self._out.write(kml_head + "\n")
+            if not kmz:
+                self._out.write(kml_styles() + "\n")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, msg: AIVDM) -> int:
+        """Write a placemark for each sub-area with a geometry.
+
+        Args:
+            msg: Area Notice or other message with areas.
+
+        Returns:
+            The number of placemarks written.
+        """
+        bodies = kml_placemarks(
+            msg,
+            with_style=self._with_style,
+            with_time=self._with_time,
+            with_extended_data=self._with_extended_data,
+            precision=self._precision,
+            style_file=self._style_file,
+        )
+        if not bodies:
+            return 0
+
+        if self._folder_key is not None:
+            folder = self._folder_key(msg)
+            if folder != self._folder:
+                if self._folder is not _NO_FOLDER:
+                    self._out.write("</Folder>\n")
+                self._out.write(f"<Folder><name>{escape(folder)}</name>\n")
+                self._folder = folder
+
+        for _, body in bodies:
+            self._out.write(f"<Placemark>{body}</Placemark>\n\n")
+        self.placemarks += len(bodies)
+        return len(bodies)
+
+    def write_all(self, msgs: Iterable[AIVDM]) -> int:
+        """Write the placemarks of many messages.
+
+        Args:
+            msgs: Area Notices or other messages with areas, in folder order.
+
+        Returns:
+            The number of placemarks written.
+        """
+        return sum(self.write(msg) for msg in msgs)
+
+    def close(self) -> None:
+        """Finish the document and close the file if the writer opened it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._folder is not _NO_FOLDER:
+            self._out.write("</Folder>\n")
+        if self._document:
+            self._out.write(kml_tail)
+        if self._close_out:
+            self._out.close()
+        if self._zip is not None:
+            self._zip.close()
+
+
+# Folder key before the first placemark.
+_NO_FOLDER = object()
+
+
+def _area_type_folder(msg: Any) -> str:
+    area_type = getattr(msg, "area_type", 0)
+    return f"{area_type}: {short_notice[area_type].replace('_', ' ')}"
 
 
 class BBM(AIVDM):
@@ -935,6 +1396,232 @@ class BBM(AIVDM):
         return sentences
 
 
+def nmea_payload(
+    strings: Sequence[str],
+) -> tuple[BitVector, list[dict[str, str | None]]]:
+    """Check NMEA sentences and join their payloads into one message.
+
+    Args:
+        strings: Sequence of NMEA sentence strings of one message.
+
+    Returns:
+        The bits of the message without fill bits and the parsed fields of
+        each sentence.
+
+    Raises:
+        AisUnpackingException: If parsing or checksum fails.
+    """
+    try:
+        msgs = []
+        for msg in strings:
+            match = ais_nmea_regex.search(msg)
+            if match is None:
+                raise AisUnpackingException(
+                    "one or more NMEA lines did were malformed (1)"
+                )
+            msg_dict = match.groupdict()
+            if msg_dict is None or "body" not in msg_dict:
+                raise AisUnpackingException("Failed to parse message.")
+            if msg_dict["checksum"] != nmea_checksum_hex(msg):
+                raise AisUnpackingException("Checksum failed")
+            msgs.append(msg_dict)
+    except AttributeError, TypeError:
+        raise AisUnpackingException("one or more NMEA lines did were malformed (1)")
+
+    bits_list = []
+    for parsed_msg in msgs:
+        assert parsed_msg["fill_bits"] is not None
+        assert parsed_msg["body"] is not None
+        fill_bits = int(parsed_msg["fill_bits"])
+        bv = binary.ais6tobitvec(parsed_msg["body"])
+        if fill_bits > 0:
+            bv = bv[:-fill_bits]
+        bits_list.append(bv)
+    return binary.joinBV(bits_list), msgs
+
+
+def decode_polyline_points(
+    buf: BitBuffer, bit_offset: int, scale_factor: int
+) -> list[tuple[float, float]]:
+    """Read the points of a polyline or polygon sub-area.
+
+    Args:
+        buf: The message bits.
+        bit_offset: Start of the sub-area.
+        scale_factor: Multiplier for the distances.
+
+    Returns:
+        (angle in degrees, distance in meters) of each point until the first
+        unused one.
+    """
+    points = []
+    done = False
+    for i in range(4):
+        base = 5 + i * 20
+        angle = buf.get_uint(bit_offset + base, 10)
+        if angle == 720:
+            done = True
+            continue
+
+        if done and angle != 720:
+            sys.stderr.write(
+                "ERROR: bad polyline.  Must have all point with angle 720 (raw) "
+                "after the first\n"
+            )
+            continue
+
+        angle_deg = angle * 0.5
+        dist_scaled = buf.get_uint(bit_offset + base + 10, 10)
+        dist_m = float(dist_scaled * scale_factor)
+        points.append((angle_deg, dist_m))
+        if 720 == dist_scaled:
+            break
+    return points
+
+
+def _sub_area_buffer(
+    bits: BitVector | str | Sequence[int] | BitBuffer, bit_offset: int
+) -> BitBuffer:
+    """Check the size of a sub-area and convert it to a BitBuffer if needed.
+
+    Args:
+        bits: Bits of one sub-area, or a BitBuffer of the whole message.
+        bit_offset: Start of the sub-area in a BitBuffer.
+
+    Returns:
+        A BitBuffer with the sub-area at bit_offset.
+
+    Raises:
+        AisUnpackingException: If there are not SUB_AREA_SIZE bits.
+    """
+    if isinstance(bits, BitBuffer):
+        if len(bits) - bit_offset < SUB_AREA_SIZE:
+            raise AisUnpackingException(f"bit length {len(bits) - bit_offset}")
+        return bits
+    if len(bits) != SUB_AREA_SIZE:
+        raise AisUnpackingException(f"bit length {len(bits)}")
+    return BitBuffer(bits)
+
+
+@cache
+def _unit_circle(segments: int | None = None) -> npt.NDArray[np.float64]:
+    """Boundary of a circle of radius 1.
+
+    Args:
+        segments: Number of segments, or None for the 64 that shapely buffers
+            a point with.  Both start at (1, 0) and go clockwise.
+    """
+    if segments is None:
+        coords = np.array(shapely.geometry.Point(0.0, 0.0).buffer(1.0).exterior.coords)
+    else:
+        angles = np.linspace(0, -2 * math.pi, segments + 1)
+        coords = np.column_stack((np.cos(angles), np.sin(angles)))
+        coords[-1] = coords[0]
+    coords.setflags(write=False)
+    return coords
+
+
+def _densify_ring(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], counts: Sequence[int]
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Split each edge of a ring into evenly spaced segments.
+
+    Args:
+        x: Vertices of the ring, without repeating the first.
+        y: Vertices of the ring, without repeating the first.
+        counts: Number of segments for the edge that starts at each vertex.
+
+    Returns:
+        x and y of the split ring, without repeating the first vertex.
+    """
+    steps = np.concatenate([np.arange(count) / count for count in counts])
+    start = np.repeat(np.arange(len(x)), counts)
+    end = (start + 1) % len(x)
+    return x[start] + (x[end] - x[start]) * steps, y[start] + (
+        y[end] - y[start]
+    ) * steps
+
+
+class ValueRange:
+    """Closed interval of valid decoded values and their sentinels.
+
+    The ranges in the decoded value tables only hold ints.  Scaled fields
+    decode to floats, so this compares them with a small tolerance.
+
+    Attributes:
+        low: Smallest valid value.
+        high: Largest valid value.
+        sentinels: Valid values outside of the interval, such as not
+            available.
+    """
+
+    __slots__ = ("high", "low", "sentinels")
+
+    low: float
+    high: float
+    sentinels: tuple[float, ...]
+
+    # Scaled ints are only off from the decimal bounds by rounding.
+    _TOLERANCE: ClassVar[float] = 1e-6
+
+    def __init__(self, low: float, high: float, *sentinels: float) -> None:
+        """Set the bounds.
+
+        Args:
+            low: Smallest valid value.
+            high: Largest valid value.
+            *sentinels: Valid values outside of the interval.
+        """
+        self.low = low
+        self.high = high
+        self.sentinels = sentinels
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int | float):
+            return False
+        tolerance = self._TOLERANCE
+        if self.low - tolerance <= value <= self.high + tolerance:
+            return True
+        return any(abs(value - sentinel) <= tolerance for sentinel in self.sentinels)
+
+    def __repr__(self) -> str:
+        return f"ValueRange({self.low}, {self.high}, *{self.sentinels})"
+
+
+# Longitude and latitude with 181 and 91 for not available.
+LON_VALUES: ValueRange = ValueRange(-180.0, 180.0, 181.0)
+LAT_VALUES: ValueRange = ValueRange(-90.0, 90.0, 91.0)
+
+
+def check_decoded_values(
+    message: object, allowed: Mapping[str, Container[float]]
+) -> None:
+    """Check decoded codes and sentinels that the field widths do not rule out.
+
+    Decoders use this instead of the range checks in the constructors.  All
+    of the attributes are checked in one pass.
+
+    Args:
+        message: Decoded message or sensor report, or a mapping such as one
+            of the current entries of a sensor report.
+        allowed: The valid values of each attribute or key to check.
+
+    Raises:
+        AisUnpackingException: Naming every attribute with a reserved value.
+    """
+    if isinstance(message, Mapping):
+        values = {name: message[name] for name in allowed}
+    else:
+        values = {name: getattr(message, name) for name in allowed}
+    invalid = [
+        f"{name}={values[name]}"
+        for name, valid in allowed.items()
+        if values[name] not in valid
+    ]
+    if invalid:
+        raise AisUnpackingException("Reserved values: " + ", ".join(invalid))
+
+
 class AreaNoticeSubArea:
     """Base class for subarea shapes in IMO Area Notices (8:1:22).
 
@@ -948,12 +1635,48 @@ class AreaNoticeSubArea:
     lon: float
     lat: float
 
+    # Attributes that define the geometry.
+    _geometry_fields: ClassVar[tuple[str, ...]] = ()
+
+    # Values that fit in the fields, but are not valid.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {}
+
     def __str__(self) -> str:
         return self.__unicode__()
 
     def __unicode__(self) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def from_bits(
+        cls,
+        bits: BitVector | str | Sequence[int] | BitBuffer,
+        bit_offset: int = 0,
+        **fields: Any,
+    ) -> Self:
+        """Decode a sub-area without the argument checks of the constructor.
+
+        Decoders use this instead of the constructor.  Only the reserved
+        codes and sentinels in _decoded_values are checked, in one pass.
+
+        Args:
+            bits: Bits of one sub-area, or a BitBuffer of the whole message.
+            bit_offset: Start of the sub-area in a BitBuffer.
+            **fields: Attributes that are not in the bits, such as the start
+                of a polyline.  They are set as is.
+
+        Returns:
+            The decoded sub-area.
+
+        Raises:
+            AisUnpackingException: If a field holds a reserved value.
+        """
+        area = cls.__new__(cls)
+        area.__dict__.update(fields)
+        area.decode_bits(bits, bit_offset=bit_offset)  # type: ignore[attr-defined]
+        check_decoded_values(area, cls._decoded_values)
+        return area
+
     def get_bits(self) -> BitVector:
         """Build a BitVector for this area.
 
@@ -966,6 +1689,56 @@ class AreaNoticeSubArea:
         """Return shapely geometry representation."""
         raise NotImplementedError
 
+    def geometry_key(self) -> tuple[Any, ...]:
+        """Return the class and the attributes that define the geometry.
+
+        Memoized geometry is rebuilt when this, the geometry engine or the
+        level of detail changes.
+
+        Returns:
+            A hashable tuple.
+        """
+        values: list[Any] = [type(self), _geometry_engine, _max_chord_error]
+        for name in self._geometry_fields:
+            value = getattr(self, name)
+            values.append(tuple(value) if isinstance(value, list) else value)
+        return tuple(values)
+
+    def coordinate_decimals(self) -> int | None:
+        """Return the decimals of degrees of the transmitted precision.
+
+        Returns:
+            See coordinate_decimals, or None for shapes without a precision
+            field.
+        """
+        precision = getattr(self, "precision", None)
+        if precision is None:
+            return None
+        return coordinate_decimals(precision)
+
+    @memoize_geometry
+    def _geometry_coords(self) -> tuple[tuple[float, ...], ...]:
+        """Coordinates of the line or of the outline of the polygon."""
+        geom = self.geom()
+        assert geom is not None
+        if isinstance(geom, shapely.geometry.Polygon):
+            return tuple(geom.boundary.coords)
+        return tuple(geom.coords)
+
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return the vertices of the shape relative to its start point.
+
+        Returns:
+            An (N, 2) array of meters east and north of (lon, lat).  The
+            "utm" geometry engine adds them to the UTM coordinates of (lon,
+            lat) in the zone of lon.
+        """
+        raise NotImplementedError
+
+    def _local_to_ll(self, offsets: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Convert local vertices to an (N, 2) array of (lon, lat)."""
+        return local_to_ll(self.lon, self.lat, offsets)
+
     @property
     def __geo_interface__(self) -> dict[str, Any]:
         """Provide a Geo Interface for GeoJSON serialization."""
@@ -995,13 +1768,23 @@ class AreaNoticeCirclePt(AreaNoticeSubArea):
     scale_factor: int
     radius_scaled: float
 
+    _geometry_fields: ClassVar[tuple[str, ...]] = ("lon", "lat", "radius")
+
+    # Precision is the number of decimal places, 0 to 4.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        "lon": LON_VALUES,
+        "lat": LAT_VALUES,
+        "precision": range(5),
+    }
+
     def __init__(
         self,
         lon: float | None = None,
         lat: float | None = None,
         radius: float = 0,
         precision: int = 4,
-        bits: BitVector | str | Sequence[int] | None = None,
+        bits: BitVector | str | Sequence[int] | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             assert -180.0 <= lon <= 180.0
@@ -1030,35 +1813,32 @@ class AreaNoticeCirclePt(AreaNoticeSubArea):
             return
 
         if bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
             return
 
-    def decode_bits(self, bits: BitVector | str | Sequence[int]) -> None:
+    def decode_bits(
+        self, bits: BitVector | str | Sequence[int] | BitBuffer, bit_offset: int = 0
+    ) -> None:
         """Unpack circle/point subarea fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea payload.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
 
         Raises:
             AisUnpackingException: If payload bit length is invalid.
         """
-        if len(bits) != SUB_AREA_SIZE:
-            raise AisUnpackingException(f"bit length {len(bits)}")
-        if isinstance(bits, BitVector):
-            bv_bits = bits
-        elif isinstance(bits, str):
-            bv_bits = BitVector.from_bitstring(bits)
-        else:
-            bv_bits = BitVector(bitlist=list(bits))
+        buf = _sub_area_buffer(bits, bit_offset)
 
-        self.area_shape = int(bv_bits[:3])
-        self.scale_factor_raw = int(bv_bits[3:5])
+        self.area_shape = buf.get_uint(bit_offset, 3)
+        self.scale_factor_raw = buf.get_uint(bit_offset + 3, 2)
         self.scale_factor = (1, 10, 100, 1000)[self.scale_factor_raw]
-        self.lon = binary.signedIntFromBV(bv_bits[5:30]) / 60000.0
-        self.lat = binary.signedIntFromBV(bv_bits[30:54]) / 60000.0
-        self.precision = int(bv_bits[54:57])
+        self.lon = buf.get_int(bit_offset + 5, 25) / 60000.0
+        self.lat = buf.get_int(bit_offset + 30, 24) / 60000.0
+        self.precision = buf.get_uint(bit_offset + 54, 3)
 
-        self.radius_scaled = int(bv_bits[57:69])
+        self.radius_scaled = buf.get_uint(bit_offset + 57, 12)
 
         self.radius = self.radius_scaled * self.scale_factor
         assert 18 == SUB_AREA_SIZE - 69
@@ -1090,6 +1870,7 @@ class AreaNoticeCirclePt(AreaNoticeSubArea):
             f"{self.lat:.4f}) - radius {self.radius}m"
         )
 
+    @memoize_geometry
     def geom(self) -> shapely.geometry.Point | shapely.geometry.Polygon:
         """Construct Shapely geometry representation of this circle or point.
 
@@ -1098,22 +1879,14 @@ class AreaNoticeCirclePt(AreaNoticeSubArea):
         """
         if self.radius <= 0.01:
             return shapely.geometry.Point(self.lon, self.lat)
+        return shapely.geometry.Polygon(self._local_to_ll(self.local_vertices()))
 
-        zone = lon_to_utm_zone(self.lon)
-        params = {"proj": "utm", "zone": zone}
-        proj = Proj(params)
-
-        utm_center = proj(self.lon, self.lat)
-        pt = shapely.geometry.Point(utm_center)
-        circle_utm = pt.buffer(self.radius)
-
-        raw_coords: Sequence[tuple[float, float]] = list(circle_utm.boundary.coords)
-        coords: list[tuple[float, float]] = [
-            proj(c[0], c[1], inverse=True) for c in raw_coords
-        ]
-        circle = shapely.geometry.Polygon(coords)
-
-        return circle
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return the boundary of the circle relative to its center."""
+        if _max_chord_error is None:
+            return self.radius * _unit_circle()
+        segments = arc_segments(self.radius, 360, _max_chord_error)
+        return self.radius * _unit_circle(segments)
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
@@ -1132,7 +1905,7 @@ class AreaNoticeCirclePt(AreaNoticeSubArea):
             "radius_m": self.radius,
             "geometry": {
                 "type": "Polygon",
-                "coordinates": tuple(self.geom().boundary.coords),
+                "coordinates": self._geometry_coords(),
             },
         }
         return r
@@ -1169,6 +1942,21 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
     orientation_deg: int
     spare: int
 
+    _geometry_fields: ClassVar[tuple[str, ...]] = (
+        "lon",
+        "lat",
+        "e_dim",
+        "n_dim",
+        "orientation_deg",
+    )
+
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        "lon": LON_VALUES,
+        "lat": LAT_VALUES,
+        "precision": range(5),
+        "orientation_deg": range(360),
+    }
+
     def __init__(
         self,
         lon: float | None = None,
@@ -1177,7 +1965,8 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
         north_dim: float = 0,
         orientation_deg: int = 0,
         precision: int = 4,
-        bits: BitVector | str | Sequence[int] | None = None,
+        bits: BitVector | str | Sequence[int] | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             assert -180.0 <= lon <= 180.0
@@ -1209,42 +1998,39 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
             self.orientation_deg = orientation_deg
 
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector | str | Sequence[int]) -> None:
+    def decode_bits(
+        self, bits: BitVector | str | Sequence[int] | BitBuffer, bit_offset: int = 0
+    ) -> None:
         """Unpack rectangle subarea fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea payload.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
 
         Raises:
             AisUnpackingException: If payload bit length is invalid.
         """
-        if len(bits) != SUB_AREA_SIZE:
-            raise AisUnpackingException(f"bit length {len(bits)}")
-        if isinstance(bits, BitVector):
-            bv_bits = bits
-        elif isinstance(bits, str):
-            bv_bits = BitVector.from_bitstring(bits)
-        else:
-            bv_bits = BitVector(bitlist=list(bits))
+        buf = _sub_area_buffer(bits, bit_offset)
 
-        self.area_shape = int(bv_bits[:3])
-        self.scale_factor_raw = int(bv_bits[3:5])
+        self.area_shape = buf.get_uint(bit_offset, 3)
+        self.scale_factor_raw = buf.get_uint(bit_offset + 3, 2)
         self.scale_factor = (1, 10, 100, 1000)[self.scale_factor_raw]
-        self.lon = binary.signedIntFromBV(bv_bits[5:30]) / 60000.0
-        self.lat = binary.signedIntFromBV(bv_bits[30:54]) / 60000.0
-        self.precision = int(bv_bits[54:57])
+        self.lon = buf.get_int(bit_offset + 5, 25) / 60000.0
+        self.lat = buf.get_int(bit_offset + 30, 24) / 60000.0
+        self.precision = buf.get_uint(bit_offset + 54, 3)
 
-        self.e_dim_scaled = int(bv_bits[57:65])
-        self.n_dim_scaled = int(bv_bits[65:73])
+        self.e_dim_scaled = buf.get_uint(bit_offset + 57, 8)
+        self.n_dim_scaled = buf.get_uint(bit_offset + 65, 8)
 
         self.e_dim = float(self.e_dim_scaled * self.scale_factor)
         self.n_dim = float(self.n_dim_scaled * self.scale_factor)
 
-        self.orientation_deg = int(bv_bits[73:82])
+        self.orientation_deg = buf.get_uint(bit_offset + 73, 9)
 
-        self.spare = int(bv_bits[82:])
+        self.spare = buf.get_uint(bit_offset + 82, 5)
 
     def get_bits(self) -> BitVector:
         """Pack rectangle subarea fields into a BitVector payload.
@@ -1280,30 +2066,28 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
             f"[{self.e_dim},{self.n_dim}]m rot: {self.orientation_deg} deg"
         )
 
+    @memoize_geometry
     def geom(self) -> shapely.geometry.Polygon:
         """Return shapely geometry object."""
-        zone = lon_to_utm_zone(self.lon)
-        params = {"proj": "utm", "zone": zone}
-        proj = Proj(params)
-
-        p1 = proj(self.lon, self.lat)
+        return shapely.geometry.Polygon(self._local_to_ll(self.local_vertices()))
 
-        pts = [
-            (0.0, 0.0),
-            (self.e_dim, 0.0),
-            (self.e_dim, self.n_dim),
-            (0.0, self.n_dim),
-        ]
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return the rotated corners relative to the start point.
 
+        With a level of detail, the edges also have evenly spaced vertices
+        so that they follow the curvature of the Earth.
+        """
+        x = np.array((0.0, self.e_dim, self.e_dim, 0.0))
+        y = np.array((0.0, 0.0, self.n_dim, self.n_dim))
+        if _max_chord_error is not None:
+            # Sagitta of an arc on the Earth with a chord of this length.
+            length = math.sqrt(8 * EARTH_RADIUS_M * _max_chord_error)
+            east = max(1, math.ceil(self.e_dim / length))
+            north = max(1, math.ceil(self.n_dim / length))
+            x, y = _densify_ring(x, y, (east, north, east, north))
         rot = math.radians(-self.orientation_deg)
-        pts = [vec_rot(pt, rot) for pt in pts]
-
-        pts = [vec_add(p1, pt) for pt in pts]
-        proj_pts: list[tuple[float, float]] = [
-            proj(pt[0], pt[1], inverse=True) for pt in pts
-        ]
-
-        return shapely.geometry.Polygon(proj_pts)
+        cos, sin = math.cos(rot), math.sin(rot)
+        return np.column_stack((x * cos - y * sin, x * sin + y * cos))
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
@@ -1316,7 +2100,7 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
             "n_dim": self.n_dim,
             "geometry": {
                 "type": "Polygon",
-                "coordinates": tuple(self.geom().boundary.coords),
+                "coordinates": self._geometry_coords(),
             },
         }
 
@@ -1336,7 +2120,8 @@ class AreaNoticeSector(AreaNoticeSubArea):
         radius: Radius in meters.
         radius_scaled: Scaled radius value.
         left_bound_deg: Left boundary in degrees.
-        right_bound_deg: Right boundary in degrees.
+        right_bound_deg: Right boundary in degrees, clockwise from the left
+            boundary, so it may be smaller when the sector crosses north.
     """
 
     area_shape: int = 2
@@ -1350,6 +2135,22 @@ class AreaNoticeSector(AreaNoticeSubArea):
     left_bound_deg: int
     right_bound_deg: int
 
+    _geometry_fields: ClassVar[tuple[str, ...]] = (
+        "lon",
+        "lat",
+        "radius",
+        "left_bound_deg",
+        "right_bound_deg",
+    )
+
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        "lon": LON_VALUES,
+        "lat": LAT_VALUES,
+        "precision": range(5),
+        "left_bound_deg": range(360),
+        "right_bound_deg": range(360),
+    }
+
     def __init__(
         self,
         lon: float | None = None,
@@ -1358,7 +2159,8 @@ class AreaNoticeSector(AreaNoticeSubArea):
         left_bound_deg: int = 0,
         right_bound_deg: int = 0,
         precision: int = 4,
-        bits: BitVector | str | Sequence[int] | None = None,
+        bits: BitVector | str | Sequence[int] | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             assert -180.0 <= lon <= 180.0
@@ -1375,8 +2177,6 @@ class AreaNoticeSector(AreaNoticeSubArea):
             assert 0 <= left_bound_deg < 360
             assert 0 <= right_bound_deg < 360
 
-            assert left_bound_deg <= right_bound_deg
-
             if radius / 100.0 >= 4095:
                 self.scale_factor_raw = 3
             elif radius / 10.0 > 4095:
@@ -1393,39 +2193,36 @@ class AreaNoticeSector(AreaNoticeSubArea):
             self.right_bound_deg = right_bound_deg
 
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector | str | Sequence[int]) -> None:
+    def decode_bits(
+        self, bits: BitVector | str | Sequence[int] | BitBuffer, bit_offset: int = 0
+    ) -> None:
         """Unpack sector subarea fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea payload.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
 
         Raises:
             AisUnpackingException: If payload bit length is invalid.
         """
-        if len(bits) != SUB_AREA_SIZE:
-            raise AisUnpackingException(f"bit length {len(bits)}")
-        if isinstance(bits, BitVector):
-            bv_bits = bits
-        elif isinstance(bits, str):
-            bv_bits = BitVector.from_bitstring(bits)
-        else:
-            bv_bits = BitVector(bitlist=list(bits))
+        buf = _sub_area_buffer(bits, bit_offset)
 
-        self.area_shape = int(bv_bits[:3])
-        self.scale_factor_raw = int(bv_bits[3:5])
+        self.area_shape = buf.get_uint(bit_offset, 3)
+        self.scale_factor_raw = buf.get_uint(bit_offset + 3, 2)
         self.scale_factor = (1, 10, 100, 1000)[self.scale_factor_raw]
-        self.lon = binary.signedIntFromBV(bv_bits[5:30]) / 60000.0
-        self.lat = binary.signedIntFromBV(bv_bits[30:54]) / 60000.0
-        self.precision = int(bv_bits[54:57])
+        self.lon = buf.get_int(bit_offset + 5, 25) / 60000.0
+        self.lat = buf.get_int(bit_offset + 30, 24) / 60000.0
+        self.precision = buf.get_uint(bit_offset + 54, 3)
 
-        self.radius_scaled = int(bv_bits[57:69])
+        self.radius_scaled = buf.get_uint(bit_offset + 57, 12)
 
         self.radius = float(self.radius_scaled * self.scale_factor)
 
-        self.left_bound_deg = int(bv_bits[69:78])
-        self.right_bound_deg = int(bv_bits[78:87])
+        self.left_bound_deg = buf.get_uint(bit_offset + 69, 9)
+        self.right_bound_deg = buf.get_uint(bit_offset + 78, 9)
 
     def get_bits(self) -> BitVector:
         """Build a BitVector for this area."""
@@ -1458,26 +2255,28 @@ class AreaNoticeSector(AreaNoticeSubArea):
             f"rot: {self.left_bound_deg} to {self.right_bound_deg} deg"
         )
 
+    @memoize_geometry
     def geom(self) -> shapely.geometry.Polygon:
         """Return shapely geometry object."""
-        zone = lon_to_utm_zone(self.lon)
-        params = {"proj": "utm", "zone": zone}
-        proj = Proj(params)
+        return shapely.geometry.Polygon(self._local_to_ll(self.local_vertices()))
 
-        p1 = proj(self.lon, self.lat)
-
-        pts = [
-            vec_rot((0.0, self.radius), math.radians(-angle))
-            for angle in frange(self.left_bound_deg, self.right_bound_deg + 0.01, 0.5)
-        ]
-        pts = [(0.0, 0.0)] + pts + [(0.0, 0.0)]
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return the center and the arc relative to the center.
 
-        pts = [vec_add(p1, pt) for pt in pts]
-        proj_pts: list[tuple[float, float]] = [
-            proj(pt[0], pt[1], inverse=True) for pt in pts
-        ]
-
-        return shapely.geometry.Polygon(proj_pts)
+        The arc has a vertex every 0.5 degrees, or as many as the level of
+        detail needs. The arc runs clockwise from the left bound to the right
+        bound, so a sector may cross north.
+        """
+        left = self.left_bound_deg
+        sweep = (self.right_bound_deg - left) % 360
+        if _max_chord_error is None:
+            angles = np.radians(list(frange(left, left + sweep + 0.01, 0.5)))
+        else:
+            segments = arc_segments(self.radius, sweep, _max_chord_error)
+            angles = np.radians(np.linspace(left, left + sweep, segments + 1))
+        origin = np.zeros((1, 2))
+        arc = self.radius * np.column_stack((np.sin(angles), np.cos(angles)))
+        return np.concatenate((origin, arc, origin))
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
@@ -1490,7 +2289,7 @@ class AreaNoticeSector(AreaNoticeSubArea):
             "radius": self.radius,
             "geometry": {
                 "type": "Polygon",
-                "coordinates": tuple(self.geom().boundary.coords),
+                "coordinates": self._geometry_coords(),
             },
         }
 
@@ -1516,12 +2315,20 @@ class AreaNoticePolyline(AreaNoticeSubArea):
     scale_factor_raw: int
     scale_factor: int
 
+    _geometry_fields: ClassVar[tuple[str, ...]] = ("lon", "lat", "points")
+
+    # Angles are sent in half degrees, with 720 ending the points.
+    _decoded_point_values: ClassVar[dict[str, Container[float]]] = {
+        "angle": ValueRange(0.0, 359.5),
+    }
+
     def __init__(
         self,
         points: Sequence[tuple[float, float]] | None = None,
         lon: float | None = None,
         lat: float | None = None,
-        bits: BitVector | str | Sequence[int] | None = None,
+        bits: BitVector | str | Sequence[int] | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             assert -180.0 <= lon <= 180.0
@@ -1548,50 +2355,49 @@ class AreaNoticePolyline(AreaNoticeSubArea):
         elif bits is not None:
             assert lon is not None
             assert lat is not None
-            self.decode_bits(bits, lon, lat)
+            self.decode_bits(bits, lon, lat, bit_offset=bit_offset)
+
+    @classmethod
+    def from_bits(
+        cls,
+        bits: BitVector | str | Sequence[int] | BitBuffer,
+        bit_offset: int = 0,
+        **fields: Any,
+    ) -> Self:
+        """Decode a polyline and check the angle of each of its points.
+
+        Args:
+            bits: Bits of one sub-area, or a BitBuffer of the whole message.
+            bit_offset: Start of the sub-area in a BitBuffer.
+            **fields: Attributes that are not in the bits, such as the start
+                of the polyline.  They are set as is.
+
+        Returns:
+            The decoded polyline.
+
+        Raises:
+            AisUnpackingException: If a field holds a reserved value.
+        """
+        area = super().from_bits(bits, bit_offset, **fields)
+        for angle, _ in area.points:
+            check_decoded_values({"angle": angle}, cls._decoded_point_values)
+        return area
 
     def decode_bits(
         self,
-        bits: BitVector | str | Sequence[int],
+        bits: BitVector | str | Sequence[int] | BitBuffer,
         _lon: float | None = None,
         _lat: float | None = None,
+        bit_offset: int = 0,
     ) -> None:
         """Decode bits into polyline shape parameters."""
-        if len(bits) != SUB_AREA_SIZE:
-            raise AisUnpackingException(f"bit length {len(bits)}")
-        if isinstance(bits, BitVector):
-            bv_bits = bits
-        elif isinstance(bits, str):
-            bv_bits = BitVector.from_bitstring(bits)
-        else:
-            bv_bits = BitVector(bitlist=list(bits))
+        buf = _sub_area_buffer(bits, bit_offset)
 
-        self.area_shape = int(bv_bits[:3])
-        self.scale_factor_raw = int(bv_bits[3:5])
+        self.area_shape = buf.get_uint(bit_offset, 3)
+        self.scale_factor_raw = buf.get_uint(bit_offset + 3, 2)
         self.scale_factor = (1, 10, 100, 1000)[self.scale_factor_raw]
 
-        self.points = []
-        done = False
-        for i in range(4):
-            base = 5 + i * 20
-            angle = int(bv_bits[base : base + 10])
-            if angle == 720:
-                done = True
-                continue
-
-            if done and angle != 720:
-                sys.stderr.write(
-                    "ERROR: bad polyline.  Must have all point with angle 720 (raw) "
-                    "after the first\n"
-                )
-                continue
-
-            angle_deg = angle * 0.5
-            dist_scaled = int(bv_bits[base + 10 : base + 10 + 10])
-            dist_m = float(dist_scaled * self.scale_factor)
-            self.points.append((angle_deg, dist_m))
-            if 720 == dist_scaled:
-                break
+        self.points = decode_polyline_points(buf, bit_offset, self.scale_factor)
 
     def get_bits(self) -> BitVector:
         """Build a BitVector for this area."""
@@ -1644,8 +2450,14 @@ class AreaNoticePolyline(AreaNoticeSubArea):
 
     def get_points(self) -> list[tuple[float, float]]:
         """Convert to list of (lon, lat) tuples."""
-        return polyline_to_ll((self.lon, self.lat), self.points)
+        ll = self._local_to_ll(self.local_vertices())
+        return [(lon, lat) for lon, lat in ll.tolist()]
+
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return the start and each point after it relative to the start."""
+        return polyline_offsets(self.points)
 
+    @memoize_geometry
     def geom(self) -> shapely.geometry.LineString | shapely.geometry.Polygon:
         """Construct Shapely LineString geometry representation of this polyline.
 
@@ -1662,7 +2474,7 @@ class AreaNoticePolyline(AreaNoticeSubArea):
             "area_shape_name": "waypoints/polyline",
             "geometry": {
                 "type": "LineString",
-                "coordinates": tuple(self.geom().coords),
+                "coordinates": self._geometry_coords(),
             },
         }
 
@@ -1683,27 +2495,9 @@ class AreaNoticePolygon(AreaNoticePolyline):
     def __unicode__(self) -> str:
         return f"AreaNoticePolygon: ({self.lon:.4f},{self.lat:.4f}) {len(self.points)} points"
 
+    @memoize_geometry
     def geom(self) -> shapely.geometry.Polygon:
-        zone = lon_to_utm_zone(self.lon)
-        params = {"proj": "utm", "zone": zone}
-        proj = Proj(params)
-
-        p1 = proj(self.lon, self.lat)
-
-        pts: list[tuple[float, float]] = [(0.0, 0.0)]
-        cur = (0.0, 0.0)
-        for pt in self.points:
-            alpha = math.radians(pt[0])
-            d = pt[1]
-            x, y = d * math.sin(alpha), d * math.cos(alpha)
-            cur = vec_add(cur, (x, y))
-            pts.append(cur)
-
-        pts = [vec_add(p1, pt) for pt in pts]
-        proj_pts: list[tuple[float, float]] = [
-            proj(pt[0], pt[1], inverse=True) for pt in pts
-        ]
-        return shapely.geometry.Polygon(proj_pts)
+        return shapely.geometry.Polygon(self._local_to_ll(self.local_vertices()))
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
@@ -1713,13 +2507,111 @@ class AreaNoticePolygon(AreaNoticePolyline):
             "area_shape_name": self.area_name,
             "geometry": {
                 "type": "Polygon",
-                "coordinates": tuple(self.geom().boundary.coords),
+                "coordinates": self._geometry_coords(),
             },
         }
 
         return r
 
 
+class PolylineChain:
+    """Polyline or polygon that continues across adjacent sub-areas.
+
+    A sub-area only has room for 4 points, so a longer line continues in
+    the next sub-area, which starts where the previous one ended.  The
+    vertices of the chain are offsets from its first point, converted with
+    the geometry engine like those of a single sub-area.  The geometry is
+    memoized until a sub-area is appended or the engine changes.
+
+    Works with the polylines from both 8:1:22 and 8:367:22, which share the
+    lon, lat, area_shape and points attributes.
+
+    Attributes:
+        area_shape: Shape of the first sub-area (3 polyline or 4 polygon).
+        areas: The sub-areas in order.
+    """
+
+    area_shape: int
+    areas: list[Any]
+
+    def __init__(self, area: Any) -> None:
+        """Start a chain.
+
+        Args:
+            area: First polyline or polygon sub-area.
+        """
+        self.area_shape = area.area_shape
+        self.areas = [area]
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def append(self, area: Any) -> None:
+        """Add a continuation sub-area.
+
+        Args:
+            area: Polyline or polygon that starts at the end of the chain.
+        """
+        self.areas.append(area)
+
+    def geometry_key(self) -> tuple[Any, ...]:
+        """Return the start, the points of every sub-area and the engine."""
+        first = self.areas[0]
+        return (
+            type(self),
+            _geometry_engine,
+            self.area_shape,
+            first.lon,
+            first.lat,
+            tuple(tuple(area.points) for area in self.areas),
+        )
+
+    def local_vertices(self) -> npt.NDArray[np.float64]:
+        """Return every vertex of the chain relative to its first point.
+
+        Returns:
+            An (N, 2) array of meters east and north of the first point.
+        """
+        return polyline_offsets([point for area in self.areas for point in area.points])
+
+    @memoize_geometry
+    def _vertices(self) -> npt.NDArray[np.float64]:
+        """(N, 2) array of the (lon, lat) of every vertex."""
+        first = self.areas[0]
+        return local_to_ll(first.lon, first.lat, self.local_vertices())
+
+    @property
+    def end(self) -> tuple[float, float]:
+        """(lon, lat) of the last vertex, where a continuation starts."""
+        lon, lat = self._vertices()[-1].tolist()
+        return lon, lat
+
+    def get_points(self) -> list[tuple[float, float]]:
+        """Convert the whole chain to a list of (lon, lat) tuples."""
+        return [(lon, lat) for lon, lat in self._vertices().tolist()]
+
+    @memoize_geometry
+    def geom(self) -> shapely.geometry.LineString | shapely.geometry.Polygon:
+        """Construct a single Shapely geometry for the whole chain.
+
+        Returns:
+            A Polygon if the chain starts with a polygon, otherwise a
+            LineString.
+        """
+        if self.area_shape == AreaNoticePolygon.area_shape:
+            return shapely.geometry.Polygon(self._vertices())
+        return shapely.geometry.LineString(self._vertices())
+
+    @property
+    def __geo_interface__(self) -> dict[str, Any]:
+        """Provide a Geo Interface for GeoJSON serialization."""
+        return {
+            "area_shape": self.area_shape,
+            "num_sub_areas": len(self.areas),
+            "geometry": self.geom().__geo_interface__,
+        }
+
+
 class AreaNoticeFreeText(AreaNoticeSubArea):
     """Free text subarea shape for IMO Area Notices (8:1:22).
 
@@ -1736,7 +2628,8 @@ class AreaNoticeFreeText(AreaNoticeSubArea):
     def __init__(
         self,
         text: str | None = None,
-        bits: BitVector | str | Sequence[int] | None = None,
+        bits: BitVector | str | Sequence[int] | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if text is not None:
             text = text.upper()
@@ -1745,22 +2638,17 @@ class AreaNoticeFreeText(AreaNoticeSubArea):
                 assert c in ais_string.character_dict
             self.text = text
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector | str | Sequence[int]) -> None:
+    def decode_bits(
+        self, bits: BitVector | str | Sequence[int] | BitBuffer, bit_offset: int = 0
+    ) -> None:
         """Removes the "@" padding."""
-        if len(bits) != SUB_AREA_SIZE:
-            raise AisUnpackingException(f"bit length {len(bits)}")
-        if isinstance(bits, BitVector):
-            bv_bits = bits
-        elif isinstance(bits, str):
-            bv_bits = BitVector.from_bitstring(bits)
-        else:
-            bv_bits = BitVector(bitlist=list(bits))
+        buf = _sub_area_buffer(bits, bit_offset)
 
-        area_shape = int(bv_bits[:3])
+        area_shape = buf.get_uint(bit_offset, 3)
         assert self.area_shape == area_shape
-        self.text = ais_string.Decode(bv_bits[3:]).rstrip("@")
+        self.text = buf.get_text(bit_offset + 3, 84).rstrip("@")
 
     def get_bits(self) -> BitVector:
         """Build a BitVector for this area."""
@@ -1811,9 +2699,12 @@ class AreaNotice(BBM):
         fi: Function Identifier (22).
         source_mmsi: Source MMSI integer.
         name: Optional notice name string.
+        polyline_chains: Polylines and polygons in areas, with the ones that
+            continue across sub-areas merged.
     """
 
     areas: list[AreaNoticeSubArea]
+    polyline_chains: list[PolylineChain]
     area_type: int
     when: datetime.datetime
     duration: int
@@ -1831,11 +2722,13 @@ class AreaNotice(BBM):
         link_id: int = 0,
         nmea_strings: Sequence[str] | None = None,
         source_mmsi: int | None = None,
+        context: DecodeContext | None = None,
     ) -> None:
         self.areas = []
+        self.polyline_chains = []
 
         if nmea_strings is not None:
-            self.decode_nmea(nmea_strings)
+            self.decode_nmea(nmea_strings, context=context)
             return
 
         if area_type is not None and when is not None and duration is not None:
@@ -1887,20 +2780,20 @@ class AreaNotice(BBM):
         """Return an embeddable html representation.
 
         Args:
-            efactory: return lxml E-factory
+            efactory: Return None.  Kept for compatibility with callers of
+                the lxml E-factory version.
 
         Returns:
             HTML string or None.
         """
-        l = E.OL()
-        text = self.get_merged_text()
-        if text is not None:
-            l.append(E.LI("FreeText: " + text))
-        for area in self.areas:
-            l.append(E.LI(str(area)))
         if efactory:
             return None
-        return lxml.html.tostring(E.DIV(E.P(str(self)), l), encoding="unicode")
+        items: list[object] = []
+        text = self.get_merged_text()
+        if text is not None:
+            items.append("FreeText: " + text)
+        items.extend(self.areas)
+        return summary_list(self, items)
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
@@ -1944,6 +2837,28 @@ class AreaNotice(BBM):
 
         return r
 
+    def valid_interval(self) -> tuple[float, float]:
+        """Return when the notice starts and stops as UNIX times in seconds."""
+        start = self.when.timestamp()
+        return start, start + 60 * self.duration
+
+    def geoms(self) -> list[shapely.geometry.base.BaseGeometry]:
+        """Return the geometries of the sub-areas.
+
+        Polylines and polygons that continue across sub-areas are merged
+        into one geometry, and free text is skipped.  The geometries of the
+        sub-areas and of the chains are memoized.
+        """
+        result: list[shapely.geometry.base.BaseGeometry] = []
+        for area in self.areas:
+            if isinstance(area, AreaNoticePolyline):
+                continue
+            geom = area.geom()
+            if geom is not None:
+                result.append(geom)
+        result.extend(chain.geom() for chain in self.polyline_chains)
+        return result
+
     def get_merged_text(self) -> str | None:
         """Return the complete text for any free text sub areas."""
         strings = []
@@ -1970,6 +2885,11 @@ class AreaNotice(BBM):
             raise AisPackingException("Can only have 9 sub areas in an Area Notice")
 
         self.areas.append(area)
+        if isinstance(area, AreaNoticePolyline) and not (
+            self.polyline_chains and self.polyline_chains[-1].areas[-1] is area
+        ):
+            # Not already added as a continuation by subarea_factory.
+            self.polyline_chains.append(PolylineChain(area))
 
     def get_bits(
         self,
@@ -2031,74 +2951,102 @@ class AreaNotice(BBM):
             )
         return bv
 
-    def decode_nmea(self, strings: Sequence[str]) -> None:
+    @classmethod
+    def from_bits(
+        cls, bits: BitVector | BitBuffer, context: DecodeContext | None = None
+    ) -> Self:
+        """Decode a message without the argument checks of the constructor.
+
+        Args:
+            bits: The whole message, starting with the message id.
+            context: Shared decode state that supplies the missing year.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        notice = cls.__new__(cls)
+        notice.areas = []
+        notice.polyline_chains = []
+        notice.decode_bits(bits, context=context)
+        return notice
+
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the compact wire form of the Area Notice.
+
+        Only what the message bits encode is kept.  See the wire module.
+
+        Args:
+            station: Receiving station.
+        """
+        return wire.encode(self.get_bits(include_bin_hdr=True), self.when, station)
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the form from to_wire.
+
+        Args:
+            data: Wire form of the Area Notice.
+            context: Shared decode state.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        bits, context = wire.decode(data, context)
+        return cls.from_bits(bits, context)
+
+    def decode_nmea(
+        self, strings: Sequence[str], context: DecodeContext | None = None
+    ) -> None:
         """Unpack nmea instrings into objects.
 
         The strings will be aggregated into one message.
 
         Args:
             strings: Sequence of NMEA sentence strings.
+            context: Shared decode state.  The NMEA time_stamp, if present,
+                becomes its reference time.
 
         Raises:
             AisUnpackingException: If parsing or checksum fails.
         """
-        try:
-            msgs = []
-            for msg in strings:
-                match = ais_nmea_regex.search(msg)
-                if match is None:
-                    raise AisUnpackingException(
-                        "one or more NMEA lines did were malformed (1)"
-                    )
-                msg_dict = match.groupdict()
-                if msg_dict is None or "body" not in msg_dict:
-                    raise AisUnpackingException("Failed to parse message.")
-                if msg_dict["checksum"] != nmea_checksum_hex(msg):
-                    raise AisUnpackingException("Checksum failed")
-                msgs.append(msg_dict)
-        except AttributeError, TypeError:
-            raise AisUnpackingException("one or more NMEA lines did were malformed (1)")
-
-        bits_list = []
-        for parsed_msg in msgs:
-            assert parsed_msg["fill_bits"] is not None
-            assert parsed_msg["body"] is not None
-            fill_bits = int(parsed_msg["fill_bits"])
-            bv = binary.ais6tobitvec(parsed_msg["body"])
-            if fill_bits > 0:
-                bv = bv[:-fill_bits]
-            bits_list.append(bv)
-        bits = binary.joinBV(bits_list)
-        self.decode_bits(bits)
-
-    def decode_bits(self, bits: BitVector) -> None:
-        """Decode the bits for a message."""
+        bits, msgs = nmea_payload(strings)
+        context = nmea_context(msgs, context)
+        self.decode_bits(bits, context=context)
+
+    def decode_bits(
+        self, bits: BitVector | BitBuffer, context: DecodeContext | None = None
+    ) -> None:
+        """Decode the bits for a message.
+
+        Args:
+            bits: The whole message, starting with the message id.
+            context: Shared decode state that supplies the missing year.
+        """
+        if context is None:
+            context = default_context()
+        # Convert once and decode the sub-areas by offset.
+        buf = bits if isinstance(bits, BitBuffer) else BitBuffer(bits)
+        del bits
         r: dict[str, Any] = {}
-        r["message_id"] = int(bits[:6])
-        r["repeat_indicator"] = int(bits[6:8])
-        r["mmsi"] = int(bits[8:38])
-        r["spare"] = int(bits[38:40])
-        r["dac"] = int(bits[40:50])
-        r["fi"] = int(bits[50:56])
-        r["link_id"] = int(bits[56:66])
-        r["area_type"] = int(bits[66:73])
-        r["utc_month"] = int(bits[73:77])
-        r["utc_day"] = int(bits[77:82])
-        r["utc_hour"] = int(bits[82:87])
-        r["utc_min"] = int(bits[87:93])
-        r["duration_min"] = int(bits[93:111])
+        r["message_id"] = buf.get_uint(0, 6)
+        r["repeat_indicator"] = buf.get_uint(6, 2)
+        r["mmsi"] = buf.get_uint(8, 30)
+        r["spare"] = buf.get_uint(38, 2)
+        r["dac"] = buf.get_uint(40, 10)
+        r["fi"] = buf.get_uint(50, 6)
+        r["link_id"] = buf.get_uint(56, 10)
+        r["area_type"] = buf.get_uint(66, 7)
+        r["utc_month"] = buf.get_uint(73, 4)
+        r["utc_day"] = buf.get_uint(77, 5)
+        r["utc_hour"] = buf.get_uint(82, 5)
+        r["utc_min"] = buf.get_uint(87, 6)
+        r["duration_min"] = buf.get_uint(93, 18)
         r["sub_areas"] = []
 
         self.area_type = r["area_type"]
 
-        now = datetime.datetime.now(datetime.UTC)
-        self.when = datetime.datetime(
-            year=now.year,
-            month=r["utc_month"],
-            day=r["utc_day"],
-            hour=r["utc_hour"],
-            minute=r["utc_min"],
-            tzinfo=datetime.UTC,
+        self.when = context.infer_datetime(
+            r["utc_month"], r["utc_day"], r["utc_hour"], r["utc_min"]
         )
         self.duration = r["duration_min"]
         self.link_id = r["link_id"]
@@ -2110,16 +3058,18 @@ class AreaNotice(BBM):
         self.repeat_indicator = r["repeat_indicator"]
         self.source_mmsi = r["mmsi"]
 
-        sub_areas_bits = bits[111:]
-        del bits
+        sub_areas_size = len(buf) - 111
 
-        assert 8 > len(sub_areas_bits) % SUB_AREA_SIZE
+        assert 8 > sub_areas_size % SUB_AREA_SIZE
 
-        for i in range(len(sub_areas_bits) // SUB_AREA_SIZE):
-            area_bits = sub_areas_bits[i * SUB_AREA_SIZE : (i + 1) * SUB_AREA_SIZE]
-            sa_obj = self.subarea_factory(bits=area_bits)
+        for i in range(sub_areas_size // SUB_AREA_SIZE):
+            sa_obj = self.subarea_factory(
+                bits=buf, context=context, bit_offset=111 + i * SUB_AREA_SIZE
+            )
             if sa_obj is not None:
                 self.add_subarea(sa_obj)
+        context.count("area_notices")
+        context.count("sub_areas", len(self.areas))
 
     def get_shapes(self, sub_areas_bits: BitVector) -> list[tuple[int, str | int]]:
         """Return a list of the sub area types."""
@@ -2131,55 +3081,73 @@ class AreaNotice(BBM):
             )
         ]
 
-    def subarea_factory(self, bits: BitVector) -> AreaNoticeSubArea | None:
-        """Scary side effects going on in this with Polyline and Polygon."""
-        shape = int(bits[:3])
+    def subarea_factory(
+        self,
+        bits: BitVector | BitBuffer,
+        context: DecodeContext | None = None,
+        bit_offset: int = 0,
+    ) -> AreaNoticeSubArea | None:
+        """Scary side effects going on in this with Polyline and Polygon.
+
+        Args:
+            bits: Bits of one sub-area, or a BitBuffer of the whole message.
+            context: Shared decode state.
+            bit_offset: Start of the sub-area when bits is a BitBuffer.
+
+        Returns:
+            The decoded sub-area or None for unknown shapes.
+        """
+        if context is None:
+            context = default_context()
+        if isinstance(bits, BitBuffer):
+            shape = bits.get_uint(bit_offset, 3)
+        else:
+            shape = int(bits[:3])
         if 0 == shape:
-            return AreaNoticeCirclePt(bits=bits)
+            return AreaNoticeCirclePt.from_bits(bits, bit_offset)
         if 1 == shape:
-            return AreaNoticeRectangle(bits=bits)
+            return AreaNoticeRectangle.from_bits(bits, bit_offset)
         if 2 == shape:
-            return AreaNoticeSector(bits=bits)
+            return AreaNoticeSector.from_bits(bits, bit_offset)
 
-        if 3 == shape:  # Polyline
-            assert len(self.areas) > 0
-            lon: float | None = None
-            lat: float | None = None
-
-            if isinstance(self.areas[-1], AreaNoticeCirclePt):
-                lon = self.areas[-1].lon
-                lat = self.areas[-1].lat
+        if shape in (3, 4):  # Polyline or polygon
+            prev = self.areas[-1] if self.areas else None
+            poly_class = AreaNoticePolyline if shape == 3 else AreaNoticePolygon
+            if isinstance(prev, AreaNoticeCirclePt):
                 self.areas.pop()
-            elif isinstance(self.areas[-1], AreaNoticePolyline):
-                last_pt = self.areas[-1].get_points()[-1]
-                lon = last_pt[0]
-                lat = last_pt[1]
-            else:
+                poly = poly_class.from_bits(
+                    bits, bit_offset, lon=prev.lon, lat=prev.lat
+                )
+                self.polyline_chains.append(PolylineChain(poly))
+                return poly
+            if not isinstance(prev, AreaNoticePolyline):
+                assert shape != 4, "Point or polyline must precede a polygon"
                 raise AisPackingException(
                     "Point or another polyline must precede a polyline"
                 )
-            return AreaNoticePolyline(bits=bits, lon=lon, lat=lat)
-
-        if 4 == shape:
-            assert len(self.areas) > 0
-            lon = lat = None
-            if isinstance(self.areas[-1], AreaNoticeCirclePt):
-                lon = self.areas[-1].lon
-                lat = self.areas[-1].lat
-                self.areas.pop()
-            elif isinstance(self.areas[-1], AreaNoticePolyline):
-                last_pt = self.areas[-1].get_points()[-1]
-                lon = last_pt[0]
-                lat = last_pt[1]
-            return AreaNoticePolygon(bits=bits, lon=lon, lat=lat)
+            chain = self._polyline_chain_ending_at(prev)
+            lon, lat = chain.end
+            poly = poly_class.from_bits(bits, bit_offset, lon=lon, lat=lat)
+            chain.append(poly)
+            return poly
         if 5 == shape:
             assert len(self.areas) > 0
             assert not isinstance(self.areas[0], AreaNoticeFreeText)
-            return AreaNoticeFreeText(bits=bits)
+            free_text = AreaNoticeFreeText.from_bits(bits, bit_offset)
+            free_text.text = context.intern(free_text.text)
+            return free_text
 
         sys.stderr.write(f"Warning: unknown shape type {shape}")
         return None
 
+    def _polyline_chain_ending_at(self, prev: AreaNoticePolyline) -> PolylineChain:
+        """Return the chain that a continuation of prev belongs to."""
+        if self.polyline_chains and self.polyline_chains[-1].areas[-1] is prev:
+            return self.polyline_chains[-1]
+        chain = PolylineChain(prev)
+        self.polyline_chains.append(chain)
+        return chain
+
 
 sbnms_bbox: dict[str, tuple[float, float]] = {
     "ur": (-68.3, 43.0),
@@ -2187,6 +3155,53 @@ sbnms_bbox: dict[str, tuple[float, float]] = {
 }
 
 
+def _fetcher_formatter_timestamp(timestamp: int | datetime.datetime | None) -> int:
+    """UNIX time of a row, moved up a day for the Windows time coding."""
+    if timestamp is None:
+        timestamp_int = int(time.time())
+    elif isinstance(timestamp, datetime.datetime):
+        timestamp_int = calendar.timegm(datetime.datetime.utctimetuple(timestamp))
+    else:
+        timestamp_int = timestamp
+    return timestamp_int + 24 * 3600
+
+
+def _fetcher_formatter_message_type(msg: BBM, message_type: int | None) -> int:
+    if message_type is None:
+        if isinstance(msg, AreaNotice):
+            message_type = msg.area_type
+        else:
+            raise NotImplementedError
+
+    if isinstance(msg, AreaNotice) and message_type < 1000:
+        message_type += 1000
+    return message_type
+
+
+@cache
+def _fetcher_formatter_site(
+    magic_number: str,
+    site_name: str,
+    xmin: float,
+    ymax: float,
+    xmax: float,
+    ymin: float,
+) -> str:
+    """Leading fields of every row of a site."""
+    return f"{magic_number},{site_name},{xmin},{ymax},{xmax},{ymin},"
+
+
+@cache
+def _dac_fi_bit_string(dac: int, fi: int) -> str:
+    return f"{dac:010b}{fi:06b}"
+
+
+def _bit_string(bits: BitVector) -> str:
+    """Same as str(bits), formatted from an int rather than bit by bit."""
+    size = len(bits)
+    return f"{int(bits):0{size}b}" if size else ""
+
+
 def message_2_fetcherformatter(
     msg: BBM,
     magic_number: str = "BMS",
@@ -2201,60 +3216,162 @@ def message_2_fetcherformatter(
     timestamp: int | datetime.datetime | None = None,
     verbose: bool = False,
 ) -> str:
-    """Take an AreaNotice and produce a Fetcher Formatter CSV."""
+    """Take an AreaNotice and produce a Fetcher Formatter CSV.
+
+    Use FetcherFormatterWriter for many messages.
+    """
     if verbose:
         logger.info("message_2_fetcherformatter: %s", msg)
 
-    if timestamp is None:
-        timestamp_int = int(time.time())
-    elif isinstance(timestamp, datetime.datetime):
-        timestamp_int = calendar.timegm(datetime.datetime.utctimetuple(timestamp))
-    else:
-        timestamp_int = timestamp
-
-    timestamp_int += 24 * 3600
+    timestamp_int = _fetcher_formatter_timestamp(timestamp)
     if verbose:
         logger.info(
             "Moving time up by 4 hours to deal with Windows time coding issues."
         )
 
-    if message_type is None:
-        if isinstance(msg, AreaNotice):
-            message_type = msg.area_type
-        else:
-            raise NotImplementedError
-
-    if isinstance(msg, AreaNotice) and message_type < 1000:
-        message_type += 1000
-
+    message_type = _fetcher_formatter_message_type(msg, message_type)
     if link_id is None:
         link_id = msg.link_id
 
-    dac = BitVector.from_int(msg.dac, size=10)
-    fi = BitVector.from_int(msg.fi, size=6)
-
-    dacfi = dac + fi
-    bits = msg.get_bits(include_dac_fi=False)
+    dacfi = _dac_fi_bit_string(msg.dac, msg.fi)
+    bits = _bit_string(msg.get_bits(include_dac_fi=False))
     if verbose:
         logger.info("dacfi: %s", dacfi)
         logger.info("bits: len=%d %s", len(bits), bits)
 
-    line = [
-        magic_number,
-        site_name,
-        xmin,
-        ymax,
-        xmax,
-        ymin,
-        link_id,
-        message_type,
-        priority,
-        timestamp_int,
-        dacfi,
-        bits,
-    ]
+    site = _fetcher_formatter_site(magic_number, site_name, xmin, ymax, xmax, ymin)
+    return f"{site}{link_id},{message_type},{priority},{timestamp_int},{dacfi},{bits}"
+
+
+class FetcherFormatterWriter:
+    """Write Fetcher Formatter CSV rows for many messages to a file.
+
+    The fields of the site are formatted once, the DAC and FI bits once
+    for each (dac, fi), and the payload bits from an int rather than bit
+    by bit.  Rows are buffered and written chunk_size at a time.
+
+    Attributes:
+        chunk_size: Number of rows to buffer before writing.
+        rows: Number of rows written so far.
+    """
+
+    chunk_size: int
+    rows: int
+
+    def __init__(
+        self,
+        out: TextIO | str | os.PathLike[str],
+        magic_number: str = "BMS",
+        site_name: str = "SBNMS",
+        xmin: float = -71.3,
+        xmax: float = -68.3,
+        ymin: float = 41.0,
+        ymax: float = 43.0,
+        priority: int = 0,
+        chunk_size: int = 1000,
+    ) -> None:
+        """Start writing.
 
-    return ",".join(str(item) for item in line)
+        Args:
+            out: File object or the path of a file to create.
+            magic_number: First field of each row.
+            site_name: Name of the site.
+            xmin: West edge of the site.
+            xmax: East edge of the site.
+            ymin: South edge of the site.
+            ymax: North edge of the site.
+            priority: Priority of every row.
+            chunk_size: Number of rows to buffer before writing.
+        """
+        if isinstance(out, (str, os.PathLike)):
+            self._out: TextIO = open(out, "w", encoding="utf-8")  # noqa: SIM115
+            self._close_out = True
+        else:
+            self._out = out
+            self._close_out = False
+        self._site = _fetcher_formatter_site(
+            magic_number, site_name, xmin, ymax, xmax, ymin
+        )
+        self._priority = priority
+        self._pending: list[str] = []
+        self._closed = False
+        self.chunk_size = chunk_size
+        self.rows = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _add(
+        self,
+        msg: BBM,
+        timestamp: int,
+        link_id: int | None,
+        message_type: int | None,
+    ) -> None:
+        message_type = _fetcher_formatter_message_type(msg, message_type)
+        if link_id is None:
+            link_id = msg.link_id
+        self._pending.append(
+            f"{self._site}{link_id},{message_type},{self._priority},{timestamp},"
+            f"{_dac_fi_bit_string(msg.dac, msg.fi)},"
+            f"{_bit_string(msg.get_bits(include_dac_fi=False))}\n"
+        )
+        self.rows += 1
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def write(
+        self,
+        msg: BBM,
+        timestamp: int | datetime.datetime | None = None,
+        link_id: int | None = None,
+        message_type: int | None = None,
+    ) -> None:
+        """Add the row of one message.
+
+        Args:
+            msg: Area Notice or other message.
+            timestamp: Time of the row.  Defaults to now.
+            link_id: Defaults to the link_id of the message.
+            message_type: Defaults to 1000 plus the area_type.
+        """
+        self._add(msg, _fetcher_formatter_timestamp(timestamp), link_id, message_type)
+
+    def write_all(
+        self, msgs: Iterable[BBM], timestamp: int | datetime.datetime | None = None
+    ) -> int:
+        """Add the rows of many messages with the same timestamp.
+
+        Args:
+            msgs: Area Notices or other messages.
+            timestamp: Time of the rows.  Defaults to now.
+
+        Returns:
+            The number of rows added.
+        """
+        timestamp_int = _fetcher_formatter_timestamp(timestamp)
+        before = self.rows
+        for msg in msgs:
+            self._add(msg, timestamp_int, None, None)
+        return self.rows - before
+
+    def flush(self) -> None:
+        """Write the buffered rows."""
+        if self._pending:
+            self._out.write("".join(self._pending))
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Write the buffered rows and close the file if the writer opened it."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self._close_out:
+            self._out.close()
 
 
 class NormQueue(Queue.Queue[dict[str, Any]]):
@@ -2340,19 +3457,34 @@ class NormQueue(Queue.Queue[dict[str, Any]]):
 def main() -> None:
     """Command-line entry point for processing sample NMEA Area Notice messages."""
     parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option(
+        "-o",
+        "--output",
+        default="out.kml",
+        help="KML file to write. A name ending in .kmz writes a KMZ archive.",
+    )
+    parser.add_option(
+        "-p",
+        "--precision",
+        type="int",
+        default=None,
+        help="Decimals in each coordinate. Five are about a meter.",
+    )
 
-    _unused_options, args = parser.parse_args()
+    options, args = parser.parse_args()
     norm_queue = NormQueue()
-
-    with open("out.kml", "w", encoding="utf-8") as kmlfile:
-        kmlfile.write(kml_head)
-        with open("areanotice_styles.kml", encoding="utf-8") as f:
-            kmlfile.write(f.read())
-
+    context = DecodeContext()
+
+    with KmlWriter(
+        options.output,
+        with_time=True,
+        with_extended_data=True,
+        precision=options.precision,
+    ) as writer:
         if 0 == len(args):
             assert False
         if "!AIVDM" in args[0]:
-            an = AreaNotice(nmea_strings=args)
+            an = AreaNotice(nmea_strings=args, context=context)
             print("Area Notice:", str(an))
         else:
             for filename in args:
@@ -2380,17 +3512,11 @@ def main() -> None:
                             )
                             checksum = nmea_checksum_hex(nmea)
                             nmea = nmea.format(checksum=checksum)
-                            area_notice = AreaNotice(nmea_strings=(nmea,))
-                            print("AreaNotice:", area_notice)
-                            kmlfile.write(
-                                area_notice.kml(
-                                    with_style=True,
-                                    with_time=True,
-                                    with_extended_data=True,
-                                )
+                            area_notice = AreaNotice(
+                                nmea_strings=(nmea,), context=context
                             )
-
-        kmlfile.write(kml_tail)
+                            print("AreaNotice:", area_notice)
+                            writer.write(area_notice)
 
 
 if __name__ == "__main__":
@@ -14,17 +14,23 @@ through the binary AIS messages.
 """
 
 import datetime
-from collections.abc import Sequence
-from typing import NoReturn, TypedDict
+from collections.abc import Container, Sequence
+from typing import ClassVar, Self, TypedDict
 
 from BitVector import BitVector
 
-from . import ais_string, binary
+from . import ais_string, binary, wire
+from .decode_context import DecodeContext, default_context, nmea_context
+from .html_template import summary_list
 from .imo_001_22_area_notice import (
     BBM,
+    LAT_VALUES,
+    LON_VALUES,
     AisPackingException,
     AisUnpackingException,
+    ValueRange,
     ais_nmea_regex,
+    check_decoded_values,
     nmea_checksum_hex,
 )
 
@@ -187,6 +193,16 @@ class SensorReport:
     minute: int
     site_id: int
 
+    # Values that fit in the fields, but are not valid.  24 and 60 mean not
+    # available.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        "hour": range(25),
+        "minute": range(61),
+    }
+
+    # Checked for each entry of cur in the current reports.
+    _decoded_current_values: ClassVar[dict[str, Container[float]]] = {}
+
     def __init__(
         self,
         report_type: int | None = None,
@@ -310,19 +326,47 @@ class SensorReport:
     def __str__(self) -> str:
         return self.__unicode__()
 
+    @classmethod
+    def from_bits(cls, bits: BitVector, context: DecodeContext | None = None) -> Self:
+        """Create a sensor report from its bits.
+
+        This skips the range checks of the constructor.  Reserved values are
+        still rejected.
+
+        Args:
+            bits: BitVector containing encoded sensor report bits.
+            context: Shared decode state that supplies the year and month.
+
+        Returns:
+            The decoded sensor report.
+
+        Raises:
+            AisUnpackingException: If a field holds a reserved value.
+        """
+        report = cls.__new__(cls)
+        report.decode_bits(bits, context=context)
+        check_decoded_values(report, cls._decoded_values)
+        for entry in getattr(report, "cur", ()):
+            check_decoded_values(entry, cls._decoded_current_values)
+        return report
+
     def decode_bits(
         self,
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
+        context: DecodeContext | None = None,
         **_kwargs: object,
     ) -> None:
         """Unpack common sensor report header fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded sensor report bits.
-            year: Optional year override. Defaults to current year.
-            month: Optional month override. Defaults to current month.
+            year: Optional year override. Defaults to the year closest to the
+                reference time of the context.
+            month: Optional month override. Defaults to the month closest to
+                the reference time of the context.
+            context: Shared decode state.
             **_kwargs: Additional unused keyword arguments.
         """
         if not (len(bits) >= SENSOR_REPORT_HDR_SIZE):
@@ -337,14 +381,14 @@ class SensorReport:
         self.site_id = int(bits[20:27])
 
         if year is None:
-            now = datetime.datetime.now(datetime.UTC)
-            year = now.year
-            month = now.month
-
-        if not (year is not None and 2010 <= year <= 2100):
-            raise ValueError()
-        if not (month is not None and 1 <= month <= 12):
-            raise ValueError()
+            if context is None:
+                context = default_context()
+            year, month = context.infer_year_month(self.day, self.hour, self.minute)
+        else:
+            if not (2010 <= year <= 2100):
+                raise ValueError()
+            if not (month is not None and 1 <= month <= 12):
+                raise ValueError()
         self.year = year
         self.month = month
 
@@ -378,6 +422,16 @@ class SensorReportLocation(SensorReport):
     owner: int
     timeout: int
 
+    # Altitude 200.2 m is not available.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "lon": LON_VALUES,
+        "lat": LAT_VALUES,
+        "alt": ValueRange(0.0, 200.2),
+        "owner": (*range(7), 14),
+        "timeout": range(6),
+    }
+
     def __init__(
         self,
         day: int | None = None,
@@ -447,7 +501,8 @@ class SensorReportLocation(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack site location fields from a BitVector.
 
@@ -455,7 +510,8 @@ class SensorReportLocation(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -464,7 +520,7 @@ class SensorReportLocation(SensorReport):
             raise AisUnpackingException("bit length " + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.lon = binary.signedIntFromBV(bits[27:55]) / 600000.0
         self.lat = binary.signedIntFromBV(bits[55:82]) / 600000.0
         self.alt = int(bits[82:93]) / 10.0
@@ -559,7 +615,8 @@ class SensorReportId(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack station ID fields from a BitVector.
 
@@ -567,7 +624,8 @@ class SensorReportId(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -576,7 +634,7 @@ class SensorReportId(SensorReport):
             raise AisUnpackingException("bit length " + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.id_str = ais_string.Decode(bits[27:-1])
         # 1 spare bit
 
@@ -625,6 +683,20 @@ class SensorReportWind(SensorReport):
     forecast_minute: int
     duration_min: int
 
+    # 122 knots and 360 degrees mean not available.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "speed": range(123),
+        "gust": range(123),
+        "dir": range(361),
+        "gust_dir": range(361),
+        "forecast_speed": range(123),
+        "forecast_gust": range(123),
+        "forecast_dir": range(361),
+        "forecast_hour": range(25),
+        "forecast_minute": range(61),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -728,7 +800,8 @@ class SensorReportWind(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack wind report fields from a BitVector.
 
@@ -736,7 +809,8 @@ class SensorReportWind(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -745,7 +819,7 @@ class SensorReportWind(SensorReport):
             raise AisUnpackingException("bit length " + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.speed = int(bits[27:34])
         self.gust = int(bits[34:41])
         self.dir = int(bits[41:50])
@@ -839,6 +913,13 @@ class SensorReportWaterLevel(SensorReport):
     forecast_minute: int
     duration_min: int
 
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "vdatum": vdatum_lut,
+        "forecast_hour": range(25),
+        "forecast_minute": range(61),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -940,7 +1021,8 @@ class SensorReportWaterLevel(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack water level fields from a BitVector.
 
@@ -948,7 +1030,8 @@ class SensorReportWaterLevel(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -959,7 +1042,7 @@ class SensorReportWaterLevel(SensorReport):
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
 
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
 
         self.wl_type = int(bits[27:28])
         self.wl = binary.signedIntFromBV(bits[28:44]) / 100.0
@@ -1043,6 +1126,13 @@ class SensorReportCurrent2d(SensorReport):
     cur: list[Current2dEntry]
     data_descr: int
 
+    # 24.7 knots, 360 degrees and 362 m mean not available.
+    _decoded_current_values: ClassVar[dict[str, Container[float]]] = {
+        "speed": ValueRange(0.0, 24.7),
+        "dir": range(361),
+        "level": range(363),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -1121,7 +1211,8 @@ class SensorReportCurrent2d(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack 2D current flow fields from a BitVector.
 
@@ -1129,7 +1220,8 @@ class SensorReportCurrent2d(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -1138,7 +1230,7 @@ class SensorReportCurrent2d(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.cur = []
         for i in range(3):
             base = SENSOR_REPORT_HDR_SIZE + i * 26
@@ -1196,6 +1288,13 @@ class SensorReportCurrent3d(SensorReport):
     cur: list[Current3dEntry]
     data_descr: int
 
+    _decoded_current_values: ClassVar[dict[str, Container[float]]] = {
+        "n": ValueRange(0.0, 24.7),
+        "e": ValueRange(0.0, 24.7),
+        "z": ValueRange(0.0, 24.7),
+        "level": range(363),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -1270,7 +1369,8 @@ class SensorReportCurrent3d(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack 3D current flow fields from a BitVector.
 
@@ -1278,7 +1378,8 @@ class SensorReportCurrent3d(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -1287,7 +1388,7 @@ class SensorReportCurrent3d(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.cur = []
         for i in range(2):
             base = SENSOR_REPORT_HDR_SIZE + i * 33
@@ -1345,6 +1446,13 @@ class SensorReportCurrentHorz(SensorReport):
     report_type: int = 6
     cur: list[CurrentHorzEntry]
 
+    _decoded_current_values: ClassVar[dict[str, Container[float]]] = {
+        "bearing": range(361),
+        "dist": range(123),
+        "dir": range(361),
+        "level": range(362),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -1431,7 +1539,8 @@ class SensorReportCurrentHorz(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack horizontal current flow fields from a BitVector.
 
@@ -1439,7 +1548,8 @@ class SensorReportCurrentHorz(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -1448,7 +1558,7 @@ class SensorReportCurrentHorz(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
         self.cur = []
         for i in range(2):
             base = SENSOR_REPORT_HDR_SIZE + i * 42
@@ -1522,6 +1632,20 @@ class SensorReportSeaState(SensorReport):
     wave_data_descr: int
     salinity: float
 
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "swell_height": ValueRange(0.0, 24.7),
+        "swell_period": range(62),
+        "swell_dir": range(362),
+        "sea_state": beaufort_scale,
+        "temp": ValueRange(-10.0, 50.1),
+        "temp_depth": ValueRange(0.0, 12.2),
+        "wave_height": ValueRange(0.0, 24.7),
+        "wave_period": range(62),
+        "wave_dir": range(362),
+        "salinity": ValueRange(0.0, 50.2),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -1631,7 +1755,8 @@ class SensorReportSeaState(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack sea state fields from a BitVector.
 
@@ -1639,7 +1764,8 @@ class SensorReportSeaState(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -1648,7 +1774,7 @@ class SensorReportSeaState(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
 
         self.swell_height = int(bits[27:35]) / 10.0
         self.swell_period = int(bits[35:41])
@@ -1743,6 +1869,16 @@ class SensorReportSalinity(SensorReport):
     salinity_type: int
     data_descr: int
 
+    # Temperatures of 60.1 and 60.2 C are not available and sensor failure.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "temp": ValueRange(-10.0, 50.0, 60.1, 60.2),
+        "cond": ValueRange(0.0, 7.03),
+        "pres": ValueRange(0.0, 6000.3),
+        "salinity": ValueRange(0.0, 50.3),
+        "salinity_type": range(3),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -1819,7 +1955,8 @@ class SensorReportSalinity(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack salinity report fields from a BitVector.
 
@@ -1827,7 +1964,8 @@ class SensorReportSalinity(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -1836,7 +1974,7 @@ class SensorReportSalinity(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
 
         self.temp = int(bits[27:37]) / 10.0 - 10
         self.cond = int(bits[37:47]) / 100.0
@@ -1910,6 +2048,16 @@ class SensorReportWeather(SensorReport):
     air_pres_data_descr: int
     salinity: float
 
+    # -102.4 C is not available.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "air_temp": ValueRange(-60.0, 60.0, -102.4),
+        "vis": ValueRange(0.0, 24.3),
+        "dew": ValueRange(-20.0, 50.1),
+        "air_pres": range(800, 1203),
+        "salinity": ValueRange(0.0, 50.2),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -2003,7 +2151,8 @@ class SensorReportWeather(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack weather report fields from a BitVector.
 
@@ -2011,7 +2160,8 @@ class SensorReportWeather(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -2020,7 +2170,7 @@ class SensorReportWeather(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
 
         self.air_temp = binary.signedIntFromBV(bits[27:38]) / 10.0
         self.air_temp_data_descr = int(bits[38:41])
@@ -2112,6 +2262,16 @@ class SensorReportAirGap(SensorReport):
     forecast_hour: int
     forecast_minute: int
 
+    # 0 m is not available.
+    _decoded_values: ClassVar[dict[str, Container[float]]] = {
+        **SensorReport._decoded_values,
+        "draft": ValueRange(1.0, 81.91, 0.0),
+        "gap": ValueRange(1.0, 81.91, 0.0),
+        "forecast_gap": ValueRange(1.0, 81.91, 0.0),
+        "forecast_hour": range(25),
+        "forecast_minute": range(61),
+    }
+
     def __init__(
         self,
         year: int | None = None,
@@ -2191,7 +2351,8 @@ class SensorReportAirGap(SensorReport):
         bits: BitVector,
         year: int | None = None,
         month: int | None = None,
-        **kwargs: object,
+        context: DecodeContext | None = None,
+        **_kwargs: object,
     ) -> None:
         """Unpack air gap fields from a BitVector.
 
@@ -2199,7 +2360,8 @@ class SensorReportAirGap(SensorReport):
             bits: BitVector containing encoded sensor report bits.
             year: Optional year override.
             month: Optional month override.
-            **kwargs: Additional keyword arguments.
+            context: Shared decode state that supplies the year and month.
+            **_kwargs: Additional unused keyword arguments.
 
         Raises:
             AisUnpackingException: If bit length does not match SENSOR_REPORT_SIZE.
@@ -2208,7 +2370,7 @@ class SensorReportAirGap(SensorReport):
             raise AisUnpackingException("bit length" + str(len(bits)))
         if not (self.report_type == int(bits[:4])):
             raise ValueError()
-        SensorReport.decode_bits(self, bits, year=year, month=month, **kwargs)
+        SensorReport.decode_bits(self, bits, year=year, month=month, context=context)
 
         # TODO(schwehr): Spec of 0.1m steps for draft and gap?
         self.draft = int(bits[27:40]) / 100.0
@@ -2280,6 +2442,7 @@ class Environment(BBM):
         _name: str | None = None,
         nmea_strings: Sequence[str] | None = None,
         bits: BitVector | None = None,
+        context: DecodeContext | None = None,
     ) -> None:
         """Initialize an Environmental AIS binary broadcast message (8:1:26).
 
@@ -2288,17 +2451,18 @@ class Environment(BBM):
             _name: Optional name for message (unused).
             nmea_strings: Sequence of NMEA 0183 VDM/VDO strings to decode.
             bits: BitVector payload to decode.
+            context: Shared decode state for nmea_strings or bits.
         """
         BBM.__init__(self, message_id=8)
 
         self.sensor_reports = []
 
         if nmea_strings is not None:
-            self.decode_nmea(nmea_strings)
+            self.decode_nmea(nmea_strings, context=context)
             return
 
         if bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, context=context)
             return
 
         if not (source_mmsi is not None and 0 < source_mmsi <= 999999999):
@@ -2342,9 +2506,16 @@ class Environment(BBM):
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
-    def html(self, efactory: bool = False) -> NoReturn:
-        """Return an embeddable html representation."""
-        raise NotImplementedError
+    def html(self, efactory: bool = False) -> str:
+        """Return an embeddable html representation.
+
+        Args:
+            efactory: Unused.  Kept to match AreaNotice.html.
+
+        Returns:
+            HTML with the message summary and a list of the sensor reports.
+        """
+        return summary_list(self, list(self.sensor_reports))
 
     def append(self, report: SensorReport) -> None:
         """Append a sensor report to the environment message.
@@ -2381,6 +2552,34 @@ class Environment(BBM):
             s.append(sr.report_type)
         return s
 
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the compact wire form of the message.
+
+        Only what the message bits encode is kept.  See the wire module.
+
+        Args:
+            station: Receiving station.
+        """
+        reference = None
+        if self.sensor_reports:
+            # Decoding takes the year and month of the reports from here.
+            reference = self.sensor_reports[0].get_date()
+        return wire.encode(self.get_bits(include_bin_hdr=True), reference, station)
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the form from to_wire.
+
+        Args:
+            data: Wire form of the message.
+            context: Shared decode state.
+
+        Returns:
+            The decoded message.
+        """
+        bits, context = wire.decode(data, context)
+        return cls(bits=bits, context=context)
+
     def get_bits(
         self,
         include_bin_hdr: bool = False,
@@ -2426,14 +2625,21 @@ class Environment(BBM):
             raise AisPackingException(f"Too large ({len(bv)} bits > 953).")
         return bv
 
-    def decode_nmea(self, strings: Sequence[str]) -> None:
+    def decode_nmea(
+        self, strings: Sequence[str], context: DecodeContext | None = None
+    ) -> None:
         """Unpack nmea instrings into objects.
 
+        The strings will be aggregated into one message.
+
         Args:
             strings: Sequence of NMEA sentence strings to decode.
+            context: Shared decode state.  The NMEA time_stamp, if present,
+                becomes its reference time.
 
         Raises:
-            AisUnpackingException: If NMEA lines are malformed or checksum fails.
+            AisUnpackingException: If NMEA lines are malformed, checksum fails
+                or the payload is not a valid message.
         """
         try:
             msgs = []
@@ -2449,13 +2655,32 @@ class Environment(BBM):
                 msgs.append(msg_dict)
         except AttributeError, TypeError:
             raise AisUnpackingException(f"NMEA line malformed: {strings} ")
+        if not msgs:
+            raise AisUnpackingException("No NMEA lines to decode")
+
+        context = nmea_context(msgs, context)
+        bits_list = []
+        for msg_dict in msgs:
+            bv = binary.ais6tobitvec(str(msg_dict["body"]))
+            fill_bits = int(msg_dict["fill_bits"] or 0)
+            if fill_bits > 0:
+                bv = bv[:-fill_bits]
+            bits_list.append(bv)
+        self.decode_bits(binary.joinBV(bits_list), context=context)
 
-    def decode_bits(self, bits: BitVector, _year: int | None = None) -> None:
+    def decode_bits(
+        self,
+        bits: BitVector,
+        _year: int | None = None,
+        context: DecodeContext | None = None,
+    ) -> None:
         """Decode the bits for a message.
 
         Args:
             bits: BitVector payload to decode.
             _year: Optional unused year argument.
+            context: Shared decode state that supplies the year and month of
+                the sensor reports.
 
         Raises:
             AisUnpackingException: If bits length or contents are invalid.
@@ -2475,6 +2700,10 @@ class Environment(BBM):
         self.dac = r["dac"]
         self.fi = r["fi"]
 
+        if context is None:
+            context = default_context()
+        context.count("environment")
+
         if len(bits) == 56:
             # TODO(schwehr): Should this raise an exception?
             self.sensor_reports = []
@@ -2494,14 +2723,18 @@ class Environment(BBM):
             rpt_bits = sensor_reports_bits[
                 i * SENSOR_REPORT_SIZE : (i + 1) * SENSOR_REPORT_SIZE
             ]
-            sa_obj = self.sensor_report_factory(bits=rpt_bits)
+            sa_obj = self.sensor_report_factory(bits=rpt_bits, context=context)
             self.add_sensor_report(sa_obj)
+        context.count("sensor_reports", len(self.sensor_reports))
 
-    def sensor_report_factory(self, bits: BitVector) -> SensorReport:
+    def sensor_report_factory(
+        self, bits: BitVector, context: DecodeContext | None = None
+    ) -> SensorReport:
         """Based on sensor bit reports, return a proper SensorReport instance.
 
         Args:
             bits: BitVector of length SENSOR_REPORT_SIZE containing report bits.
+            context: Shared decode state that supplies the year and month.
 
         Returns:
             A SensorReport subclass instance.
@@ -2513,27 +2746,27 @@ class Environment(BBM):
             raise ValueError()
         report_type = int(bits[:4])
         if 0 == report_type:
-            return SensorReportLocation(bits=bits)
+            return SensorReportLocation.from_bits(bits, context=context)
         if 1 == report_type:
-            return SensorReportId(bits=bits)
+            return SensorReportId.from_bits(bits, context=context)
         if 2 == report_type:
-            return SensorReportWind(bits=bits)
+            return SensorReportWind.from_bits(bits, context=context)
         if 3 == report_type:
-            return SensorReportWaterLevel(bits=bits)
+            return SensorReportWaterLevel.from_bits(bits, context=context)
         if 4 == report_type:
-            return SensorReportCurrent2d(bits=bits)
+            return SensorReportCurrent2d.from_bits(bits, context=context)
         if 5 == report_type:
-            return SensorReportCurrent3d(bits=bits)
+            return SensorReportCurrent3d.from_bits(bits, context=context)
         if 6 == report_type:
-            return SensorReportCurrentHorz(bits=bits)
+            return SensorReportCurrentHorz.from_bits(bits, context=context)
         if 7 == report_type:
-            return SensorReportSeaState(bits=bits)
+            return SensorReportSeaState.from_bits(bits, context=context)
         if 8 == report_type:
-            return SensorReportSalinity(bits=bits)
+            return SensorReportSalinity.from_bits(bits, context=context)
         if 9 == report_type:
-            return SensorReportWeather(bits=bits)
+            return SensorReportWeather.from_bits(bits, context=context)
         if 10 == report_type:
-            return SensorReportAirGap(bits=bits)
+            return SensorReportAirGap.from_bits(bits, context=context)
 
         msg = f"Reports 11-15 reserved for future use.  Found: {report_type}"
         raise AisUnpackingException(msg)
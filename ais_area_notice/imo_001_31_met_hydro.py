@@ -10,17 +10,20 @@ Be aware of:
 
 import datetime
 import sys
-from collections.abc import Sequence
-from typing import Any
+from collections.abc import Container, Sequence
+from typing import Any, Self
 
 from BitVector import BitVector
 
-from . import binary
+from . import binary, wire
+from .decode_context import DecodeContext
+from .html_template import HtmlTemplate
 from .imo_001_22_area_notice import (
     BBM,
     AisPackingException,
     AisUnpackingException,
     ais_nmea_regex,
+    check_decoded_values,
     nmea_checksum_hex,
 )
 from .imo_001_26_environment import almost_equal, beaufort_scale
@@ -45,6 +48,69 @@ ice_types: dict[int, str] = {
     3: "not available",  # default
 }
 
+# Values that fit in the fields of a decoded message, but are reserved or
+# out of range.  The largest valid value is often the not available value.
+decoded_values: dict[str, Container[float]] = {
+    "hour": range(25),
+    "minute": range(61),
+    "wind_dir": range(361),
+    "gust_dir": range(361),
+    "humid": range(102),
+    "wave_period": (*range(61), 63),
+    "wave_dir": range(361),
+    "swell_period": (*range(61), 63),
+    "swell_dir": range(361),
+    "sea_state": beaufort_scale,
+    "precip": precip_types,
+    "ice": ice_types,
+}
+
+# Fields other than the position and currents, in the order of the bits.
+SCALAR_FIELDS: tuple[str, ...] = (
+    "pos_acc",
+    "day",
+    "hour",
+    "minute",
+    "wind",
+    "gust",
+    "wind_dir",
+    "gust_dir",
+    "air_temp",
+    "humid",
+    "dew",
+    "air_pres",
+    "air_pres_trend",
+    "vis",
+    "wl",
+    "wl_trend",
+    "wave_height",
+    "wave_period",
+    "wave_dir",
+    "swell_height",
+    "swell_period",
+    "swell_dir",
+    "sea_state",
+    "water_temp",
+    "precip",
+    "salinity",
+    "ice",
+)
+
+CURRENT_FIELDS: tuple[str, ...] = tuple(
+    f"{field}_{i}" for i in range(1, 4) for field in ("cur", "cur_dir", "cur_level")
+)
+
+_HTML_VALUE_FIELDS = ("source_mmsi", "lon", "lat", *SCALAR_FIELDS)
+# The field names are compiled into the template once.
+_HTML_TEMPLATE = HtmlTemplate(
+    "<div><p>MetHydro31: mmsi={source_mmsi} lon={lon} lat={lat}</p><table>"
+    + "".join(
+        f"<tr><td>{name}</td><td>{{{name}}}</td></tr>"
+        for name in (*SCALAR_FIELDS, *CURRENT_FIELDS)
+    )
+    + "</table></div>"
+)
+
 
 class MetHydro31(BBM):
     """IMO SN.1/Circ.289 Meteorological and Hydrographic Data (BBM 8:1:31)."""
@@ -98,6 +164,7 @@ class MetHydro31(BBM):
         nmea_strings: Sequence[str] | None = None,
         # OR
         bits: BitVector | None = None,
+        context: DecodeContext | None = None,
     ) -> None:
         """Initialize a Met/Hydro ver 2 AIS binary broadcast message (1:8:31)."""
 
@@ -108,7 +175,7 @@ class MetHydro31(BBM):
             return
 
         if bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, context=context)
             return
 
         if day is None or hour is None or minute is None:
@@ -198,6 +265,52 @@ class MetHydro31(BBM):
         self.salinity = salinity
         self.ice = ice
 
+    @classmethod
+    def from_bits(cls, bits: BitVector, context: DecodeContext | None = None) -> Self:
+        """Decode a message without the range checks of the constructor.
+
+        Reserved values are still rejected.
+
+        Args:
+            bits: BitVector of the whole message, starting with the message id.
+            context: Shared decode state.
+
+        Returns:
+            The decoded message.
+
+        Raises:
+            AisUnpackingException: If a field holds a reserved value.
+        """
+        msg = cls.__new__(cls)
+        msg.decode_bits(bits, context=context)
+        check_decoded_values(msg, decoded_values)
+        return msg
+
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the compact wire form of the message.
+
+        Only what the message bits encode is kept.  The message has no
+        month or year, so there is no reference time.  See the wire module.
+
+        Args:
+            station: Receiving station.
+        """
+        return wire.encode(self.get_bits(include_bin_hdr=True), None, station)
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the form from to_wire.
+
+        Args:
+            data: Wire form of the message.
+            context: Shared decode state.
+
+        Returns:
+            The decoded message.
+        """
+        bits, context = wire.decode(data, context)
+        return cls.from_bits(bits, context)
+
     def __unicode__(self, verbose: bool = False) -> str:
         r = []
         r.append("MetHydro31: ")
@@ -234,8 +347,20 @@ class MetHydro31(BBM):
         return not self.__eq__(other)
 
     def html(self, efactory: bool = False) -> str:
-        """Return an embeddable html representation."""
-        raise NotImplementedError
+        """Return an embeddable html representation.
+
+        Args:
+            efactory: Unused.  Kept to match AreaNotice.html.
+
+        Returns:
+            HTML with the position and a table of the fields.
+        """
+        values = {name: getattr(self, name) for name in _HTML_VALUE_FIELDS}
+        for i, current in enumerate(self.cur, 1):
+            values[f"cur_{i}"] = current["speed"]
+            values[f"cur_dir_{i}"] = current["dir"]
+            values[f"cur_level_{i}"] = current["level"]
+        return _HTML_TEMPLATE.render(**values)
 
     def get_bits(
         self,
@@ -351,8 +476,17 @@ class MetHydro31(BBM):
         # TODO(schwehr): Decode the NMEA.
         raise NotImplementedError
 
-    def decode_bits(self, bits: BitVector, _year: int | None = None) -> None:
-        """Decode the bits for a message."""
+    def decode_bits(
+        self,
+        bits: BitVector,
+        _year: int | None = None,
+        context: DecodeContext | None = None,
+    ) -> None:
+        """Decode the bits for a message.
+
+        The message has a day, hour and minute, but no month or year, so the
+        context is only used for statistics.
+        """
 
         message_id = int(bits[:6])
         if message_id != 8:
@@ -421,6 +555,8 @@ class MetHydro31(BBM):
         self.salinity = int(bits[339:348]) / 10.0
         self.ice = int(bits[348:350])
         # + 10 spare bits
+        if context is not None:
+            context.count("met_hydro")
 
     @property
     def __geo_interface__(self) -> dict[str, Any]:
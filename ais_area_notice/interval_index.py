@@ -0,0 +1,291 @@
+"""Index of items that are valid from a start time until an end time.
+
+Area Notices are valid from when for duration minutes.  IntervalIndex
+answers "what is valid at t?" and "what stops in the next N seconds?"
+without scanning every item, so that a million historical notices can be
+filtered down to the few hundred that are active.
+
+- Expiry uses a min-heap of end times.  Evicting an item is O(log n).
+- Stabbing queries use the items sorted by start time in blocks that
+  each know their latest end.  Only blocks that started before t and end
+  after it are searched.  Blocks that end after t are found with a
+  binary search over the blocks sorted by their latest end.
+- Items added since the sorted arrays were built are searched directly
+  until there are enough of them to rebuild.
+
+Times are UNIX times in seconds.  An item is valid for start <= t < end.
+"""
+
+import datetime
+import heapq
+import math
+from collections.abc import Hashable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+# Items per block of the sorted arrays.
+BLOCK_SIZE: int = 64
+
+
+def _timestamp(when: datetime.datetime | float) -> float:
+    if isinstance(when, datetime.datetime):
+        return when.timestamp()
+    return float(when)
+
+
+class IntervalIndex[T]:
+    """Items keyed by a hashable key and valid over a time interval.
+
+    Attributes:
+        rebuilds: Number of times the sorted arrays were built.
+    """
+
+    rebuilds: int
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.rebuilds = 0
+        self._slots: dict[Hashable, int] = {}
+        self._keys: list[Hashable] = []
+        self._values: list[T | None] = []
+        self._starts = np.empty(16)
+        self._ends = np.empty(16)
+        self._alive = np.zeros(16, dtype=bool)
+        self._heap: list[tuple[float, int]] = []
+        # Sorted arrays of the slots below _sorted_count.
+        self._sorted_count = 0
+        self._order = np.empty(0, dtype=np.intp)
+        self._block_starts = np.empty(0)
+        self._block_ends = np.empty(0)
+        self._blocks_by_end = np.empty(0, dtype=np.intp)
+        self._block_ends_sorted = np.empty(0)
+        self._end_order = np.empty(0, dtype=np.intp)
+        self._ends_sorted = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __iter__(self) -> Iterator[T]:
+        for slot in self._slots.values():
+            yield self._value(slot)
+
+    def _value(self, slot: int) -> T:
+        value = self._values[slot]
+        assert value is not None
+        return value
+
+    def get(self, key: Hashable) -> T | None:
+        """Return the item with a key, if there is one."""
+        slot = self._slots.get(key)
+        return None if slot is None else self._values[slot]
+
+    def interval(self, key: Hashable) -> tuple[float, float]:
+        """Return the start and end of an item.
+
+        Raises:
+            KeyError: If there is no item with the key.
+        """
+        slot = self._slots[key]
+        return float(self._starts[slot]), float(self._ends[slot])
+
+    def add(
+        self,
+        key: Hashable,
+        start: datetime.datetime | float,
+        end: datetime.datetime | float,
+        value: T,
+    ) -> None:
+        """Add an item, replacing any item with the same key.
+
+        Args:
+            key: Identifies the item.
+            start: Datetime or UNIX time in seconds when it becomes valid.
+            end: Datetime or UNIX time in seconds when it stops being valid.
+            value: The item.
+        """
+        self.remove(key)
+        slot = len(self._values)
+        if slot == len(self._starts):
+            self._starts = np.resize(self._starts, 2 * slot)
+            self._ends = np.resize(self._ends, 2 * slot)
+            alive = np.zeros(2 * slot, dtype=bool)
+            alive[:slot] = self._alive
+            self._alive = alive
+        end = _timestamp(end)
+        self._starts[slot] = _timestamp(start)
+        self._ends[slot] = end
+        self._alive[slot] = True
+        self._slots[key] = slot
+        self._keys.append(key)
+        self._values.append(value)
+        heapq.heappush(self._heap, (end, slot))
+
+    def remove(self, key: Hashable) -> T | None:
+        """Remove an item.
+
+        Returns:
+            The removed item, or None if there was none.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return None
+        value = self._values[slot]
+        self._values[slot] = None
+        self._alive[slot] = False
+        # The heap entry is dropped when it reaches the top.
+        return value
+
+    def expire(self, now: datetime.datetime | float) -> list[T]:
+        """Remove the items that end at or before now.
+
+        Each removal is O(log n).
+
+        Args:
+            now: Datetime or UNIX time in seconds.
+
+        Returns:
+            The removed items in the order that they ended.
+        """
+        now = _timestamp(now)
+        heap = self._heap
+        expired = []
+        while heap and heap[0][0] <= now:
+            _, slot = heapq.heappop(heap)
+            if self._alive[slot]:
+                expired.append(self._value(slot))
+                self._alive[slot] = False
+                self._values[slot] = None
+                del self._slots[self._keys[slot]]
+        return expired
+
+    def next_expiry(self) -> float | None:
+        """Return the earliest end time of the items, if there are any."""
+        heap = self._heap
+        while heap and not self._alive[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _refresh(self) -> None:
+        """Rebuild the sorted arrays when enough has changed."""
+        live = len(self._slots)
+        total = len(self._values)
+        unsorted = total - self._sorted_count
+        if unsorted <= max(4 * BLOCK_SIZE, math.isqrt(live)) and (total - live <= live):
+            return
+
+        # Drop the removed items, which renumbers the slots.
+        slots = np.flatnonzero(self._alive[:total])
+        self._keys = [self._keys[slot] for slot in slots.tolist()]
+        self._values = [self._values[slot] for slot in slots.tolist()]
+        self._slots = {key: slot for slot, key in enumerate(self._keys)}
+        starts = self._starts[slots]
+        ends = self._ends[slots]
+        size = max(16, 2 * live)
+        self._starts = np.resize(starts, size)
+        self._ends = np.resize(ends, size)
+        self._alive = np.zeros(size, dtype=bool)
+        self._alive[:live] = True
+        self._heap = list(zip(ends.tolist(), range(live), strict=True))
+        heapq.heapify(self._heap)
+
+        order = np.argsort(starts, kind="stable")
+        self._order = order
+        self._sorted_count = live
+        blocks = np.arange(0, live, BLOCK_SIZE)
+        self._block_starts = starts[order][blocks]
+        self._block_ends = (
+            np.maximum.reduceat(ends[order], blocks) if live else np.empty(0)
+        )
+        self._blocks_by_end = np.argsort(self._block_ends, kind="stable")
+        self._block_ends_sorted = self._block_ends[self._blocks_by_end]
+        self._end_order = np.argsort(ends, kind="stable")
+        self._ends_sorted = ends[self._end_order]
+        self.rebuilds += 1
+
+    def _active_slots(self, when: float) -> npt.NDArray[np.intp]:
+        """Slots of the items valid at one time."""
+        # Blocks that end after when and start at or before it.
+        first = int(np.searchsorted(self._block_ends_sorted, when, side="right"))
+        blocks = self._blocks_by_end[first:]
+        last = int(np.searchsorted(self._block_starts, when, side="right"))
+        blocks = blocks[blocks < last]
+        candidates = (
+            blocks[:, np.newaxis] * BLOCK_SIZE + np.arange(BLOCK_SIZE)
+        ).ravel()
+        candidates = candidates[candidates < self._sorted_count]
+        slots = self._order[candidates]
+        unsorted = np.arange(self._sorted_count, len(self._values))
+        slots = np.concatenate((slots, unsorted))
+        keep = (
+            self._alive[slots]
+            & (self._starts[slots] <= when)
+            & (when < self._ends[slots])
+        )
+        return np.sort(slots[keep])
+
+    def active_at(self, when: datetime.datetime | float) -> list[T]:
+        """Return the items valid at a time.
+
+        Args:
+            when: Datetime or UNIX time in seconds.
+
+        Returns:
+            The items in the order that they were added.
+        """
+        self._refresh()
+        return [
+            self._value(slot) for slot in self._active_slots(_timestamp(when)).tolist()
+        ]
+
+    def active_at_many(
+        self, times: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.intp], list[T]]:
+        """Find the items valid at many times.
+
+        Args:
+            times: UNIX times in seconds.
+
+        Returns:
+            The index into times and the item of each match, sorted by the
+            index into times.
+        """
+        self._refresh()
+        times = np.asarray(times, dtype=np.float64)
+        unique, inverse = np.unique(times, return_inverse=True)
+        per_time = [self._active_slots(float(when)) for when in unique.tolist()]
+        counts = np.array([len(slots) for slots in per_time], dtype=np.intp)
+        inverse = inverse.ravel()
+        time_indices = np.repeat(np.arange(len(times)), counts[inverse])
+        values = [
+            self._value(slot)
+            for unique_index in inverse.tolist()
+            for slot in per_time[unique_index].tolist()
+        ]
+        return time_indices, values
+
+    def expiring(self, now: datetime.datetime | float, within: float) -> list[T]:
+        """Return the items that end after now and no later than within.
+
+        Args:
+            now: Datetime or UNIX time in seconds.
+            within: Seconds after now.
+
+        Returns:
+            The items in the order that they end.
+        """
+        self._refresh()
+        now = _timestamp(now)
+        lo = int(np.searchsorted(self._ends_sorted, now, side="right"))
+        hi = int(np.searchsorted(self._ends_sorted, now + within, side="right"))
+        slots = np.concatenate(
+            (self._end_order[lo:hi], np.arange(self._sorted_count, len(self._values)))
+        )
+        ends = self._ends[slots]
+        keep = self._alive[slots] & (now < ends) & (ends <= now + within)
+        slots = slots[keep]
+        slots = slots[np.argsort(self._ends[slots], kind="stable")]
+        return [self._value(slot) for slot in slots.tolist()]
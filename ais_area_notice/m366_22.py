@@ -8,14 +8,17 @@ https://en.wikipedia.org/wiki/Rhumb_line
 import datetime
 import logging
 from collections.abc import Sequence
+from typing import Self
 
 from BitVector import BitVector
 
-from . import an_util, binary
+from . import an_util, binary, wire
+from .decode_context import DecodeContext, default_context, nmea_context
 from .imo_001_22_area_notice import (
     AisPackingException,
     AisUnpackingException,
     ais_nmea_regex,
+    coordinate_decimals,
     nmea_checksum_hex,
 )
 
@@ -24,6 +27,9 @@ FI: int = 22
 MAX_SUB_AREAS: int = 10
 SUB_AREA_BIT_SIZE: int = 90 + 3
 
+# Decimal places of minutes in the positions (1/10,000 minute).
+POSITION_MINUTE_DECIMALS: int = 4
+
 logger = logging.getLogger(__name__)
 
 SHAPES: dict[str, int] = {
@@ -83,6 +89,22 @@ class AreaNoticeSubArea:
         scale_factor_raw = db.get_int(2)
         return {0: 1, 1: 10, 2: 100, 3: 1000}[scale_factor_raw]
 
+    def get_bits(self) -> BitVector:
+        """Build a BitVector for this area."""
+        raise NotImplementedError
+
+    def coordinate_decimals(self) -> int | None:
+        """Return the decimals of degrees of the transmitted precision.
+
+        Returns:
+            See imo_001_22_area_notice.coordinate_decimals, or None for
+            shapes without a precision field.
+        """
+        precision = getattr(self, "precision", None)
+        if precision is None:
+            return None
+        return coordinate_decimals(precision, POSITION_MINUTE_DECIMALS)
+
 
 class AreaNoticeCircle(AreaNoticeSubArea):
     """Circle subarea shape for USCG 8:366:22 Area Notices."""
@@ -103,7 +125,8 @@ class AreaNoticeCircle(AreaNoticeSubArea):
         radius: float = 0,
         precision: int = 4,
         scale_factor: int | None = None,
-        bits: BitVector | None = None,
+        bits: BitVector | an_util.BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             self.area_shape = SHAPES["CIRCLE"]
@@ -117,18 +140,22 @@ class AreaNoticeCircle(AreaNoticeSubArea):
             self.radius = radius
             self.radius_scaled = int(radius / self.scale_factor)
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
         else:
             raise Error("Must specify bits or parameters.")
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(
+        self, bits: BitVector | an_util.BitBuffer, bit_offset: int = 0
+    ) -> None:
         """Unpack circle subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        logger.info("areanotice CIRCLE - decode bits %d %s", len(bits), bits)
-        db = an_util.DecodeBits(bits)
+        logger.info("areanotice CIRCLE - decode bits %d %d", len(bits), bit_offset)
+        db = an_util.DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.scale_factor = self.decode_scale_factor(db)
         self.lon = db.get_signed_int(28) / 600000.0
@@ -190,10 +217,11 @@ class AreaNotice:
         link_id: int | None = None,
         mmsi: int | None = None,
         nmea_strings: Sequence[str] | None = None,
+        context: DecodeContext | None = None,
     ) -> None:
         self.areas = []
         if nmea_strings:
-            self.decode_nmea(nmea_strings)
+            self.decode_nmea(nmea_strings, context=context)
         elif area_type is not None:
             self.area_type = area_type
             assert when is not None
@@ -230,11 +258,89 @@ class AreaNotice:
             )
         self.areas.append(area)
 
-    def decode_nmea(self, strings: Sequence[str]) -> None:
+    def get_bits(self, include_bin_hdr: bool = True) -> BitVector:
+        """Pack the message into a BitVector.
+
+        Args:
+            include_bin_hdr: Start with the message id, repeat indicator,
+                MMSI, DAC and FI.
+
+        Returns:
+            A BitVector laid out as decode_bits reads it.
+        """
+        bb = an_util.BuildBits()
+        if include_bin_hdr:
+            bb.add_uint(self.message_id, 6)
+            bb.add_uint(self.__dict__.get("repeat_indicator", 0), 2)
+            bb.add_uint(self.mmsi or 0, 30)
+            bb.add_uint(0, 2)
+            bb.add_uint(self.dac, 10)
+            bb.add_uint(self.fi, 6)
+        bb.add_uint(self.link_id or 0, 10)
+        bb.add_uint(self.area_type, 7)
+        bb.add_uint(self.when.month, 4)
+        bb.add_uint(self.when.day, 5)
+        bb.add_uint(self.when.hour, 5)
+        bb.add_uint(self.when.minute, 6)
+        bb.add_uint(self.duration_min or 0, 18)
+        bits = binary.join_bv(
+            [bb.get_bits()] + [area.get_bits() for area in self.areas]
+        )
+        if len(bits) > self.max_bits:
+            raise AisPackingException(
+                f"Message to large: {len(bits)} > {self.max_bits}"
+            )
+        return bits
+
+    @classmethod
+    def from_bits(cls, bits: BitVector, context: DecodeContext | None = None) -> Self:
+        """Decode a message.
+
+        Args:
+            bits: BitVector of the whole message, starting with the message id.
+            context: Shared decode state that supplies the missing year.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        notice = cls.__new__(cls)
+        notice.areas = []
+        notice.decode_bits(bits, context=context)
+        return notice
+
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the compact wire form of the Area Notice.
+
+        Only what the message bits encode is kept.  See the wire module.
+
+        Args:
+            station: Receiving station.
+        """
+        return wire.encode(self.get_bits(include_bin_hdr=True), self.when, station)
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the form from to_wire.
+
+        Args:
+            data: Wire form of the Area Notice.
+            context: Shared decode state.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        bits, context = wire.decode(data, context)
+        return cls.from_bits(bits, context)
+
+    def decode_nmea(
+        self, strings: Sequence[str], context: DecodeContext | None = None
+    ) -> None:
         """Decode NMEA 0183 AIVDM sentence strings into this Area Notice message.
 
         Args:
             strings: List of NMEA sentence strings.
+            context: Shared decode state.  The NMEA time_stamp, if present,
+                becomes its reference time.
 
         Raises:
             AisUnpackingException: If sentence parsing or checksum verification fails.
@@ -256,6 +362,7 @@ class AreaNotice:
         except AttributeError, TypeError:
             raise AisUnpackingException("One or more NMEA lines were malformed (1)")
 
+        context = nmea_context(msgs, context)
         bits_list: list[BitVector] = []
         for m_dict in msgs:
             fill_bits = int(m_dict["fill_bits"])  # type: ignore[arg-type]
@@ -265,18 +372,25 @@ class AreaNotice:
                 bv = bv[:-fill_bits]
             bits_list.append(bv)
         bits = binary.join_bv(bits_list)
-        self.decode_bits(bits)
+        self.decode_bits(bits, context=context)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(
+        self, bits: BitVector, context: DecodeContext | None = None
+    ) -> None:
         """Unpack Area Notice fields from a BitVector payload.
 
         Args:
             bits: BitVector containing the encoded binary payload.
+            context: Shared decode state that supplies the missing year.
 
         Raises:
             Error: If message headers or subarea counts are invalid.
         """
-        db = an_util.DecodeBits(bits)
+        if context is None:
+            context = default_context()
+        # Convert once and decode the sub-areas by offset.
+        buf = an_util.BitBuffer(bits)
+        db = an_util.DecodeBits(buf)
         self.message_id = db.get_int(6)
         self.repeat_indicator = db.get_int(2)
         self.mmsi = db.get_int(30)
@@ -290,38 +404,39 @@ class AreaNotice:
         day = db.get_int(5)
         hour = db.get_int(5)
         minute = db.get_int(6)
-        # TODO(schwehr): Handle year boundary.
-        now = datetime.datetime.now(datetime.UTC)
-        self.when = datetime.datetime(
-            now.year, month, day, hour, minute, tzinfo=datetime.UTC
-        )
+        self.when = context.infer_datetime(month, day, hour, minute)
         self.duration_min = db.get_int(18)
         # self.spare2 = db.GetInt(3)
         start_sub_areas = 111
         db.verify(start_sub_areas)
 
-        sub_areas_bits = bits[start_sub_areas:]
-        num_sub_areas = len(sub_areas_bits) // SUB_AREA_BIT_SIZE
-        # if len(sub_areas_bits) % SUB_AREA_BIT_SIZE:
+        sub_areas_size = len(buf) - start_sub_areas
+        num_sub_areas = sub_areas_size // SUB_AREA_BIT_SIZE
+        # if sub_areas_size % SUB_AREA_BIT_SIZE:
         #   raise Error('Partial sub area: %d %% %d -> %d',
-        #               len(sub_areas_bits), SUB_AREA_BIT_SIZE,
-        #               len(sub_areas_bits) / SUB_AREA_BIT_SIZE)
+        #               sub_areas_size, SUB_AREA_BIT_SIZE,
+        #               sub_areas_size / SUB_AREA_BIT_SIZE)
         if num_sub_areas > MAX_SUB_AREAS:
             raise Error(f"Sub area overflow: {MAX_SUB_AREAS} {num_sub_areas}")
 
         for area_num in range(num_sub_areas):
-            start = area_num * SUB_AREA_BIT_SIZE
+            start = start_sub_areas + area_num * SUB_AREA_BIT_SIZE
             end = start + SUB_AREA_BIT_SIZE
-            sub_bits = sub_areas_bits[start:end]
-            logger.info("bits for sub area: %d %d %d", len(sub_bits), start, end)
-            subarea = self.subarea_factory(sub_bits)
+            logger.info("bits for sub area: %d %d", start, end)
+            subarea = self.subarea_factory(buf, bit_offset=start)
             self.add_subarea(subarea)
+        context.count("area_notices")
+        context.count("sub_areas", len(self.areas))
 
-    def subarea_factory(self, bits: BitVector) -> AreaNoticeSubArea:
+    def subarea_factory(
+        self, bits: BitVector | an_util.BitBuffer, bit_offset: int = 0
+    ) -> AreaNoticeSubArea:
         """Instantiate appropriate subarea shape object from raw bit slice.
 
         Args:
-            bits: BitVector containing encoded subarea bits.
+            bits: BitVector containing encoded subarea bits, or a BitBuffer of
+                the whole message.
+            bit_offset: Start of the sub-area when bits is a BitBuffer.
 
         Returns:
             An AreaNoticeSubArea subclass instance.
@@ -330,9 +445,12 @@ class AreaNotice:
             AisPackingException: If polyline/polygon sequencing requirements fail.
             Error: If shape type is unsupported.
         """
-        shape = int(bits[:3])
+        if isinstance(bits, an_util.BitBuffer):
+            shape = bits.get_uint(bit_offset, 3)
+        else:
+            shape = int(bits[:3])
         if shape == 0:
-            return AreaNoticeCircle(bits=bits)
+            return AreaNoticeCircle(bits=bits, bit_offset=bit_offset)
         if shape == 1:
             return AreaNoticeRectangle(bits=bits)  # type: ignore[name-defined]  # noqa: F821
         if shape == 2:
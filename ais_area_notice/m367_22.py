@@ -8,19 +8,26 @@ https://en.wikipedia.org/wiki/Rhumb_line
 import datetime
 import logging
 from collections.abc import Sequence
-from typing import Any
+from typing import Any, Self
 
 from BitVector import BitVector
 
-from . import ais_string, binary
+from . import ais_string, binary, wire
+from .an_util import BitBuffer
+from .decode_context import DecodeContext, default_context, nmea_context
 from .imo_001_22_area_notice import (
     BBM,
     AisPackingException,
     AisUnpackingException,
+    PolylineChain,
     ais_nmea_regex,
+    coordinate_decimals,
     nmea_checksum_hex,
 )
 
+# Decimal places of minutes in the positions (1/10,000 minute).
+POSITION_MINUTE_DECIMALS: int = 4
+
 SUB_AREA_SIZE: int = 96
 
 logger = logging.getLogger(__name__)
@@ -39,16 +46,18 @@ class DecodeBits:
     """Sequential bitstream reader for unpacking integer and text fields.
 
     Attributes:
-        bits: BitVector containing encoded bits.
-        pos: Current bit position in the bitstream.
+        bits: BitVector or BitBuffer containing encoded bits.
+        pos: Current bit position, relative to the starting offset.
     """
 
-    bits: BitVector
+    bits: BitVector | BitBuffer
     pos: int
 
-    def __init__(self, bits: BitVector) -> None:
+    def __init__(self, bits: BitVector | BitBuffer, offset: int = 0) -> None:
         self.bits = bits
         self.pos = 0
+        self._buffer = bits if isinstance(bits, BitBuffer) else BitBuffer(bits)
+        self._offset = offset
 
     # TODO(schwehr): This should be get_uint.
     def get_int(self, length: int) -> int:
@@ -60,8 +69,7 @@ class DecodeBits:
         Returns:
             The unsigned integer value decoded from the bit slice.
         """
-        end = self.pos + length
-        value = int(self.bits[self.pos : end])
+        value = self._buffer.get_uint(self._offset + self.pos, length)
         self.pos += length
         return value
 
@@ -75,8 +83,7 @@ class DecodeBits:
         Returns:
             The signed integer value decoded from the bit slice.
         """
-        end = self.pos + length
-        value = binary.signed_int_from_bv(self.bits[self.pos : end])
+        value = self._buffer.get_int(self._offset + self.pos, length)
         self.pos += length
         return value
 
@@ -91,8 +98,7 @@ class DecodeBits:
             The decoded string.
         """
         assert length % 6 == 0
-        end = self.pos + length
-        text = ais_string.decode(self.bits[self.pos : end])
+        text = self._buffer.get_text(self._offset + self.pos, length)
         at = text.find("@")
         if strip and at != -1:
             text = text[:at]
@@ -218,6 +224,18 @@ class AreaNoticeSubArea:
         """
         raise NotImplementedError
 
+    def coordinate_decimals(self) -> int | None:
+        """Return the decimals of degrees of the transmitted precision.
+
+        Returns:
+            See imo_001_22_area_notice.coordinate_decimals, or None for
+            shapes without a precision field.
+        """
+        precision = getattr(self, "precision", None)
+        if precision is None:
+            return None
+        return coordinate_decimals(precision, POSITION_MINUTE_DECIMALS)
+
 
 class AreaNoticeCircle(AreaNoticeSubArea):
     """Circle subarea shape for USCG 8:367:22 Area Notices.
@@ -249,7 +267,8 @@ class AreaNoticeCircle(AreaNoticeSubArea):
         radius: float = 0,
         precision: int = 4,
         scale_factor: int | None = None,
-        bits: BitVector | None = None,
+        bits: BitVector | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             self.area_shape = SHAPES["CIRCLE"]
@@ -263,17 +282,19 @@ class AreaNoticeCircle(AreaNoticeSubArea):
             self.radius = radius
             self.radius_scaled = radius / self.scale_factor
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
         # TODO(schwehr): Warn for else.
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(self, bits: BitVector | BitBuffer, bit_offset: int = 0) -> None:
         """Unpack circle subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        assert len(bits) == SUB_AREA_SIZE
-        db = DecodeBits(bits)
+        assert isinstance(bits, BitBuffer) or len(bits) == SUB_AREA_SIZE
+        db = DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.scale_factor = self.decode_scale_factor(db)
         self.lon = db.get_signed_int(28) / 600000.0
@@ -345,7 +366,8 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
         orientation_deg: int = 0,
         precision: int = 4,
         scale_factor: int | None = None,
-        bits: BitVector | None = None,
+        bits: BitVector | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             self.area_shape = SHAPES["RECTANGLE"]
@@ -364,15 +386,17 @@ class AreaNoticeRectangle(AreaNoticeSubArea):
             self.n_dim_scaled = int(north_dim / self.scale_factor)
             self.orientation_deg = orientation_deg
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(self, bits: BitVector | BitBuffer, bit_offset: int = 0) -> None:
         """Unpack rectangle subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        db = DecodeBits(bits)
+        db = DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.scale_factor = self.decode_scale_factor(db)
         self.lon = db.get_signed_int(28) / 600000.0
@@ -445,7 +469,8 @@ class AreaNoticeSector(AreaNoticeSubArea):
         right_bound_deg: int = 0,
         precision: int = 4,
         scale_factor: int | None = None,
-        bits: BitVector | None = None,
+        bits: BitVector | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if lon is not None:
             self.area_shape = SHAPES["SECTOR"]
@@ -461,15 +486,17 @@ class AreaNoticeSector(AreaNoticeSubArea):
             self.left_bound_deg = left_bound_deg
             self.right_bound_deg = right_bound_deg
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(self, bits: BitVector | BitBuffer, bit_offset: int = 0) -> None:
         """Unpack sector subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        db = DecodeBits(bits)
+        db = DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.scale_factor = self.decode_scale_factor(db)
         self.lon = db.get_signed_int(28) / 600000.0
@@ -533,7 +560,8 @@ class AreaNoticePoly(AreaNoticeSubArea):
         scale_factor: int | None = None,
         lon: float | None = None,
         lat: float | None = None,
-        bits: BitVector | None = None,
+        bits: BitVector | BitBuffer | None = None,
+        bit_offset: int = 0,
     ) -> None:
         if area_shape:
             self.area_shape = area_shape
@@ -548,16 +576,18 @@ class AreaNoticePoly(AreaNoticeSubArea):
         if scale_factor:
             self.scale_factor = scale_factor
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(self, bits: BitVector | BitBuffer, bit_offset: int = 0) -> None:
         """Unpack polyline/polygon subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        assert len(bits) == SUB_AREA_SIZE
-        db = DecodeBits(bits)
+        assert isinstance(bits, BitBuffer) or len(bits) == SUB_AREA_SIZE
+        db = DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.scale_factor = self.decode_scale_factor(db)
 
@@ -617,19 +647,26 @@ class AreaNoticeText(AreaNoticeSubArea):
     text: str
     spare: int
 
-    def __init__(self, text: str | None = None, bits: BitVector | None = None) -> None:
+    def __init__(
+        self,
+        text: str | None = None,
+        bits: BitVector | BitBuffer | None = None,
+        bit_offset: int = 0,
+    ) -> None:
         if text is not None:
             self.text = text
         elif bits is not None:
-            self.decode_bits(bits)
+            self.decode_bits(bits, bit_offset)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(self, bits: BitVector | BitBuffer, bit_offset: int = 0) -> None:
         """Unpack free text subarea shape fields from a BitVector.
 
         Args:
             bits: BitVector containing encoded subarea bits.
+            bit_offset: Start of the sub-area when bits is a BitBuffer of the
+                whole message.
         """
-        db = DecodeBits(bits)
+        db = DecodeBits(bits, bit_offset)
         self.area_shape = db.get_int(3)
         self.text = db.get_text(90, strip=True)
         self.spare = db.get_int(3)
@@ -669,6 +706,8 @@ class AreaNotice(BBM):
         repeat_indicator: Repeat indicator value.
         spare: Spare bits.
         spare2: Spare bits 2.
+        polyline_chains: Polylines and polygons in areas, with the ones that
+            continue across sub-areas merged.
     """
 
     version: int = 1
@@ -679,6 +718,7 @@ class AreaNotice(BBM):
     fi: int = 22
 
     areas: list[AreaNoticeSubArea]
+    polyline_chains: list[PolylineChain]
     area_type: int
     when: datetime.datetime
     duration_min: int
@@ -697,11 +737,13 @@ class AreaNotice(BBM):
         link_id: int | None = None,
         mmsi: int | None = None,
         nmea_strings: Sequence[str] | None = None,
+        context: DecodeContext | None = None,
     ) -> None:
         super().__init__()
         self.areas = []
+        self.polyline_chains = []
         if nmea_strings:
-            self.decode_nmea(nmea_strings)
+            self.decode_nmea(nmea_strings, context=context)
         elif area_type is not None:
             self.area_type = area_type
             assert when is not None
@@ -738,6 +780,11 @@ class AreaNotice(BBM):
                 f"Can only have {self.max_areas} sub areas in an Area Notice"
             )
         self.areas.append(area)
+        if isinstance(area, AreaNoticePoly) and not (
+            self.polyline_chains and self.polyline_chains[-1].areas[-1] is area
+        ):
+            # Not already added as a continuation by subarea_factory.
+            self.polyline_chains.append(PolylineChain(area))
 
     def get_bits(
         self,
@@ -792,11 +839,54 @@ class AreaNotice(BBM):
             raise AisPackingException(f"Message to large:  {len(bv)} > {self.max_bits}")
         return bv
 
-    def decode_nmea(self, strings: Sequence[str]) -> None:
+    @classmethod
+    def from_bits(cls, bits: BitVector, context: DecodeContext | None = None) -> Self:
+        """Decode a message.
+
+        Args:
+            bits: BitVector of the whole message, starting with the message id.
+            context: Shared decode state that supplies the missing year.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        notice = cls()
+        notice.decode_bits(bits, context=context)
+        return notice
+
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the compact wire form of the Area Notice.
+
+        Only what the message bits encode is kept.  See the wire module.
+
+        Args:
+            station: Receiving station.
+        """
+        return wire.encode(self.get_bits(include_bin_hdr=True), self.when, station)
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the form from to_wire.
+
+        Args:
+            data: Wire form of the Area Notice.
+            context: Shared decode state.
+
+        Returns:
+            The decoded Area Notice.
+        """
+        bits, context = wire.decode(data, context)
+        return cls.from_bits(bits, context)
+
+    def decode_nmea(
+        self, strings: Sequence[str], context: DecodeContext | None = None
+    ) -> None:
         """Decode NMEA 0183 AIVDM sentence strings into this Area Notice message.
 
         Args:
             strings: List of NMEA sentence strings.
+            context: Shared decode state.  The NMEA time_stamp, if present,
+                becomes its reference time.
 
         Raises:
             AisUnpackingException: If sentence parsing or checksum verification fails.
@@ -818,6 +908,7 @@ class AreaNotice(BBM):
         except AttributeError, TypeError:
             raise AisUnpackingException("One or more NMEA lines were malformed (1)")
 
+        context = nmea_context(msgs, context)
         bits_list = []
         for parsed_msg in msgs:
             assert parsed_msg["fill_bits"] is not None
@@ -828,15 +919,22 @@ class AreaNotice(BBM):
                 bv = bv[:-fill_bits]
             bits_list.append(bv)
         bits = binary.join_bv(bits_list)
-        self.decode_bits(bits)
+        self.decode_bits(bits, context=context)
 
-    def decode_bits(self, bits: BitVector) -> None:
+    def decode_bits(
+        self, bits: BitVector, context: DecodeContext | None = None
+    ) -> None:
         """Unpack Area Notice fields from a BitVector payload.
 
         Args:
             bits: BitVector containing the encoded binary payload.
+            context: Shared decode state that supplies the missing year.
         """
-        db = DecodeBits(bits)
+        if context is None:
+            context = default_context()
+        # Convert once and decode the sub-areas by offset.
+        buf = BitBuffer(bits)
+        db = DecodeBits(buf)
         self.message_id = db.get_int(6)
         self.repeat_indicator = db.get_int(2)
         self.mmsi = db.get_int(30)
@@ -852,32 +950,32 @@ class AreaNotice(BBM):
         day = db.get_int(5)
         hour = db.get_int(5)
         minute = db.get_int(6)
-        # TODO(schwehr): Handle year boundary.
-        now = datetime.datetime.now(datetime.UTC)
-        self.when = datetime.datetime(
-            now.year, month, day, hour, minute, tzinfo=datetime.UTC
-        )
+        self.when = context.infer_datetime(month, day, hour, minute)
         self.duration_min = db.get_int(18)
         self.spare2 = db.get_int(3)
         db.verify(120)
 
-        sub_areas_bits = bits[120:]
-        num_sub_areas = len(sub_areas_bits) // SUB_AREA_SIZE
+        sub_areas_size = len(buf) - 120
+        num_sub_areas = sub_areas_size // SUB_AREA_SIZE
         # TODO(schwehr): change this to raising an error.
-        assert len(sub_areas_bits) % SUB_AREA_SIZE == 0
+        assert sub_areas_size % SUB_AREA_SIZE == 0
         assert num_sub_areas <= self.max_areas
         for area_num in range(num_sub_areas):
-            start = area_num * SUB_AREA_SIZE
-            end = start + SUB_AREA_SIZE
-            area_bits = sub_areas_bits[start:end]
-            subarea = self.subarea_factory(area_bits)
+            start = 120 + area_num * SUB_AREA_SIZE
+            subarea = self.subarea_factory(buf, bit_offset=start)
             self.add_subarea(subarea)
+        context.count("area_notices")
+        context.count("sub_areas", len(self.areas))
 
-    def subarea_factory(self, bits: BitVector) -> AreaNoticeSubArea:
+    def subarea_factory(
+        self, bits: BitVector | BitBuffer, bit_offset: int = 0
+    ) -> AreaNoticeSubArea:
         """Instantiate appropriate subarea shape object from raw bit slice.
 
         Args:
-            bits: BitVector containing encoded subarea bits.
+            bits: BitVector containing encoded subarea bits, or a BitBuffer of
+                the whole message.
+            bit_offset: Start of the sub-area when bits is a BitBuffer.
 
         Returns:
             An AreaNoticeSubArea subclass instance.
@@ -885,34 +983,43 @@ class AreaNotice(BBM):
         Raises:
             AisPackingException: If polyline/polygon sequencing requirements fail.
         """
-        shape = int(bits[:3])
+        if isinstance(bits, BitBuffer):
+            shape = bits.get_uint(bit_offset, 3)
+        else:
+            shape = int(bits[:3])
         if shape == 0:
-            return AreaNoticeCircle(bits=bits)
+            return AreaNoticeCircle(bits=bits, bit_offset=bit_offset)
         if shape == 1:
-            return AreaNoticeRectangle(bits=bits)
+            return AreaNoticeRectangle(bits=bits, bit_offset=bit_offset)
         if shape == 2:
-            return AreaNoticeSector(bits=bits)
+            return AreaNoticeSector(bits=bits, bit_offset=bit_offset)
         if shape in (3, 4):
             if not self.areas:
                 raise AisPackingException(
                     "Point or another polyline must precede a polyline"
                 )
-            lon: float | None = None
-            lat: float | None = None
-            if isinstance(self.areas[-1], AreaNoticeCircle):
-                lon = self.areas[-1].lon
-                lat = self.areas[-1].lat
+            prev = self.areas[-1]
+            if isinstance(prev, AreaNoticeCircle):
                 self.areas.pop()
-            elif isinstance(self.areas[-1], AreaNoticePoly):
-                last_pt = self.areas[-1].points[-1]
-                lon = last_pt[0]
-                lat = last_pt[1]
-            else:
+                poly = AreaNoticePoly(
+                    bits=bits, lon=prev.lon, lat=prev.lat, bit_offset=bit_offset
+                )
+                self.polyline_chains.append(PolylineChain(poly))
+                return poly
+            if not isinstance(prev, AreaNoticePoly):
                 raise AisPackingException(
                     "Point or another polyline must precede a polyline"
                 )
-
-            return AreaNoticePoly(bits=bits, lon=lon, lat=lat)
+            if self.polyline_chains and self.polyline_chains[-1].areas[-1] is prev:
+                chain = self.polyline_chains[-1]
+            else:
+                chain = PolylineChain(prev)
+                self.polyline_chains.append(chain)
+            # Continues from the end of the previous polyline.
+            lon, lat = chain.end
+            poly = AreaNoticePoly(bits=bits, lon=lon, lat=lat, bit_offset=bit_offset)
+            chain.append(poly)
+            return poly
         if shape == 5:
-            return AreaNoticeText(bits=bits)
+            return AreaNoticeText(bits=bits, bit_offset=bit_offset)
         raise AisPackingException(f"Unsupported shape type: {shape}")
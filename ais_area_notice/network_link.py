@@ -0,0 +1,199 @@
+"""Incremental KML updates of Area Notices for live displays.
+
+Google Earth can poll a NetworkLink and apply a NetworkLinkControl
+<Update> to a document that it already loaded instead of downloading
+every placemark again.  KmlUpdater remembers the placemarks that the
+display has, and on each cycle returns only the <Create>, <Change> and
+<Delete> of the placemarks that appeared, changed or went away.
+
+The display first loads document(), which gives the Document and each
+Placemark an id.  A placemark is identified by the source MMSI, link ID
+and sub-area index of its notice.
+"""
+
+from collections.abc import Iterable
+
+from .html_template import escape
+from .imo_001_22_area_notice import (
+    KML_HEAD,
+    KML_TAIL,
+    AreaNotice,
+    kml_placemarks,
+    kml_styles,
+    notice_type,
+)
+from .notice_index import NoticeKey, notice_key
+
+DEFAULT_DOCUMENT_ID: str = "area_notices"
+
+# KML_HEAD without the opening <Document> tag.
+_KML_OPEN = KML_HEAD.removesuffix("<Document>")
+
+_DESCRIPTION_END = "</description>\n"
+
+
+def placemark_id(mmsi: int | None, link_id: int, index: int) -> str:
+    """Return the KML id of the placemark of a sub-area."""
+    return f"an_{mmsi}_{link_id}_{index}"
+
+
+def _geometry_kind(body: str) -> str:
+    """Return the geometry element of a body from kml_placemarks."""
+    geometry = body[body.rindex(_DESCRIPTION_END) + len(_DESCRIPTION_END) :]
+    return geometry[: geometry.index(">") + 1]
+
+
+class KmlUpdater:
+    """Generate NetworkLinkControl updates for a live display.
+
+    Attributes:
+        target_href: URL of the document that the display loaded.
+        document_id: id of the KML Document that placemarks are created in.
+        cycles: Number of updates generated.
+    """
+
+    target_href: str
+    document_id: str
+    cycles: int
+
+    def __init__(
+        self,
+        target_href: str,
+        document_id: str = DEFAULT_DOCUMENT_ID,
+        with_style: bool | str = True,
+        with_time: bool = False,
+        with_extended_data: bool = False,
+        precision: int | str | None = None,
+    ) -> None:
+        """Initialize an updater for a display without placemarks.
+
+        Args:
+            target_href: URL of the document that the display loaded.
+            document_id: id of the KML Document.
+            with_style: If True, uses standard style. Set to str for custom style.
+            with_time: Enable timestamps in Google Earth.
+            with_extended_data: Include extended data tags.
+            precision: Decimals in each coordinate.  See kml_placemarks.
+        """
+        self.target_href = target_href
+        self.document_id = document_id
+        self.cycles = 0
+        self._with_style = with_style
+        self._with_time = with_time
+        self._with_extended_data = with_extended_data
+        self._precision = precision
+        self._placemarks: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._placemarks)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._placemarks
+
+    def _render(self, notices: Iterable[AreaNotice]) -> dict[str, str]:
+        """Placemark bodies by id of the newest notice with each key."""
+        newest: dict[NoticeKey, AreaNotice] = {}
+        for notice in notices:
+            if notice.area_type == notice_type["cancel_area_notice"]:
+                continue
+            key = notice_key(notice)
+            old = newest.get(key)
+            if old is None or old.when <= notice.when:
+                newest[key] = notice
+        placemarks = {}
+        for (mmsi, link_id), notice in newest.items():
+            for index, body in kml_placemarks(
+                notice,
+                with_style=self._with_style,
+                with_time=self._with_time,
+                with_extended_data=self._with_extended_data,
+                precision=self._precision,
+            ):
+                placemarks[placemark_id(mmsi, link_id, index)] = body
+        return placemarks
+
+    def document(self, notices: Iterable[AreaNotice]) -> str:
+        """Return the whole document for a display to load.
+
+        The updater then assumes that the display has these placemarks.
+
+        Args:
+            notices: The active Area Notices.
+
+        Returns:
+            KML XML string with the styles and a placemark for each sub-area.
+        """
+        self._placemarks = self._render(notices)
+        parts = [
+            f'{_KML_OPEN}<Document id="{escape(self.document_id)}">\n',
+            kml_styles(),
+            "\n",
+        ]
+        parts.extend(
+            f'<Placemark id="{pid}">{body}</Placemark>\n'
+            for pid, body in self._placemarks.items()
+        )
+        parts.append(KML_TAIL)
+        return "".join(parts)
+
+    def update(self, notices: Iterable[AreaNotice]) -> str:
+        """Return the changes since the last document or update.
+
+        A placemark whose geometry changes from one kind to another, such
+        as from a Point to a Polygon, is deleted and created again since
+        <Change> cannot replace an element with a different one.
+
+        Args:
+            notices: The active Area Notices.  Placemarks of notices that
+                are no longer passed are deleted.
+
+        Returns:
+            KML XML string with a NetworkLinkControl.  It has no <Update>
+            if nothing changed.
+        """
+        placemarks = self._render(notices)
+        old = self._placemarks
+        created = []
+        changed = []
+        deleted = [pid for pid in old if pid not in placemarks]
+        for pid, body in placemarks.items():
+            old_body = old.get(pid)
+            if old_body is None:
+                created.append(pid)
+            elif old_body != body:
+                if _geometry_kind(old_body) == _geometry_kind(body):
+                    changed.append(pid)
+                else:
+                    deleted.append(pid)
+                    created.append(pid)
+        self._placemarks = placemarks
+        self.cycles += 1
+
+        parts = [f"{_KML_OPEN}<NetworkLinkControl>\n"]
+        if created or changed or deleted:
+            parts.append(
+                f"<Update><targetHref>{escape(self.target_href)}</targetHref>\n"
+            )
+            if deleted:
+                parts.append("<Delete>\n")
+                parts.extend(f'<Placemark targetId="{pid}"/>\n' for pid in deleted)
+                parts.append("</Delete>\n")
+            if changed:
+                parts.append("<Change>\n")
+                parts.extend(
+                    f'<Placemark targetId="{pid}">{placemarks[pid]}</Placemark>\n'
+                    for pid in changed
+                )
+                parts.append("</Change>\n")
+            if created:
+                parts.append(
+                    f'<Create><Document targetId="{escape(self.document_id)}">\n'
+                )
+                parts.extend(
+                    f'<Placemark id="{pid}">{placemarks[pid]}</Placemark>\n'
+                    for pid in created
+                )
+                parts.append("</Document></Create>\n")
+            parts.append("</Update>\n")
+        parts.append("</NetworkLinkControl></kml>")
+        return "".join(parts)
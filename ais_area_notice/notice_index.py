@@ -0,0 +1,307 @@
+"""Index of active 8:1:22 Area Notices by position and time.
+
+Answers "which notices affect this position at time t?" for many
+positions at once.  The sub-area geometries of every notice are kept in
+a shapely STRtree.  STRtrees cannot change once built, so notices that
+are inserted afterwards go into a small second tree and removed notices
+are skipped until enough of either piles up to rebuild the main tree.
+
+A notice is identified by its source MMSI and link ID.  A newer notice
+with the same key replaces the old one, and a cancellation notice
+(area_type 126) removes it.  Expired notices are found with the heap of
+an IntervalIndex rather than by checking every notice.  ActiveNotices
+keeps this bookkeeping for the index and the other structures of active
+notices, such as CoverageGrid and NoticeUnion.
+"""
+
+import datetime
+from collections.abc import Iterator
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+
+from .imo_001_22_area_notice import AreaNotice, notice_type
+from .interval_index import IntervalIndex, _timestamp
+
+# Rebuild the main tree once this many notices were inserted after it, or
+# this fraction of the indexed notices, whichever is more.
+MIN_PENDING: int = 32
+PENDING_FRACTION: float = 0.125
+
+# (source_mmsi, link_id)
+NoticeKey = tuple[int | None, int]
+
+
+def notice_key(notice: AreaNotice) -> NoticeKey:
+    """Return the (source_mmsi, link_id) that identifies a notice."""
+    return notice.source_mmsi, notice.link_id
+
+
+class ActiveNotices:
+    """Newest Area Notice of each key, until it is cancelled or expires.
+
+    Subclasses keep their own data for each notice.  _add is called for
+    each notice that is inserted, and _discard when it is replaced,
+    cancelled, removed or expires.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no notices."""
+        self._intervals: IntervalIndex[AreaNotice] = IntervalIndex()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._intervals
+
+    def __iter__(self) -> Iterator[AreaNotice]:
+        return iter(self._intervals)
+
+    def get(self, key: NoticeKey) -> AreaNotice | None:
+        """Return the notice with a (source_mmsi, link_id) key, if present."""
+        return self._intervals.get(key)
+
+    def insert(self, notice: AreaNotice) -> bool:
+        """Add a notice, replacing an older one with the same key.
+
+        Args:
+            notice: Area Notice to add.  A cancellation notice removes the
+                notice with its key instead.
+
+        Returns:
+            False if a notice with the same key starts later, in which case
+            nothing changes.
+        """
+        key = notice_key(notice)
+        old = self.get(key)
+        if old is not None and old.when > notice.when:
+            return False
+        if old is not None:
+            self.remove(key)
+        if notice.area_type == notice_type["cancel_area_notice"]:
+            return True
+
+        start, end = notice.valid_interval()
+        self._add(key, notice, start, end)
+        self._intervals.add(key, start, end, notice)
+        return True
+
+    def remove(self, key: NoticeKey) -> AreaNotice | None:
+        """Remove a notice.
+
+        Args:
+            key: (source_mmsi, link_id) of the notice.
+
+        Returns:
+            The removed notice, or None if there was none.
+        """
+        notice = self._intervals.remove(key)
+        if notice is not None:
+            self._discard(key)
+        return notice
+
+    def expire(self, now: datetime.datetime | float) -> list[AreaNotice]:
+        """Remove the notices that stopped at or before now.
+
+        Each removal is O(log n) plus the work of _discard.
+
+        Args:
+            now: Datetime or UNIX time in seconds.
+
+        Returns:
+            The removed notices in the order that they stopped.
+        """
+        expired = self._intervals.expire(now)
+        for notice in expired:
+            self._discard(notice_key(notice))
+        return expired
+
+    def active_at(self, when: datetime.datetime | float) -> list[AreaNotice]:
+        """Return the notices valid at a time, wherever they are.
+
+        Args:
+            when: Datetime or UNIX time in seconds.
+        """
+        return self._intervals.active_at(when)
+
+    def _add(
+        self, key: NoticeKey, notice: AreaNotice, start: float, end: float
+    ) -> None:
+        """Keep the data of a new notice.
+
+        Args:
+            key: (source_mmsi, link_id) of the notice.
+            notice: The notice, which is not a cancellation.
+            start: UNIX time in seconds when it becomes valid.
+            end: UNIX time in seconds when it stops being valid.
+        """
+        raise NotImplementedError
+
+    def _discard(self, key: NoticeKey) -> None:
+        """Drop the data of a notice that was replaced, removed or expired."""
+        raise NotImplementedError
+
+
+class _Tree:
+    """STRtree of geometries and the notice slot of each one."""
+
+    def __init__(self, geoms: list[shapely.Geometry], slots: list[int]) -> None:
+        self.tree = shapely.STRtree(geoms)
+        self.slots = np.array(slots, dtype=np.intp)
+
+    def query(
+        self, points: npt.NDArray[np.object_]
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Return the point index and notice slot of each hit."""
+        point_indices, rows = self.tree.query(points, predicate="intersects")
+        return point_indices, self.slots[rows]
+
+
+class AreaNoticeIndex(ActiveNotices):
+    """Spatial and temporal index of Area Notices.
+
+    Attributes:
+        rebuilds: Number of times the main tree was built.
+    """
+
+    rebuilds: int
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        super().__init__()
+        self.rebuilds = 0
+        self._slots: dict[NoticeKey, int] = {}
+        self._notices: list[AreaNotice | None] = []
+        self._starts: list[float] = []
+        self._ends: list[float] = []
+        self._main: _Tree | None = None
+        # Slots added since the main tree was built.
+        self._pending: list[int] = []
+        self._pending_tree: _Tree | None = None
+        self._arrays: tuple[npt.NDArray[np.float64], ...] | None = None
+
+    def _add(
+        self, key: NoticeKey, notice: AreaNotice, start: float, end: float
+    ) -> None:
+        """Queue a notice for the pending tree."""
+        slot = len(self._notices)
+        self._slots[key] = slot
+        self._notices.append(notice)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._pending.append(slot)
+        self._pending_tree = None
+        self._arrays = None
+
+    def _discard(self, key: NoticeKey) -> None:
+        """Skip a notice until the next rebuild."""
+        slot = self._slots.pop(key)
+        self._notices[slot] = None
+        self._arrays = None
+
+    def _refresh(self) -> None:
+        """Rebuild the trees and arrays that are out of date."""
+        live = len(self._slots)
+        dead = len(self._notices) - live
+        limit = max(MIN_PENDING, PENDING_FRACTION * live)
+        if len(self._pending) > limit or dead > live:
+            self._rebuild()
+        elif self._pending and self._pending_tree is None:
+            self._pending_tree = self._build(self._pending)
+
+        if self._arrays is None:
+            alive = np.array(
+                [notice is not None for notice in self._notices], dtype=bool
+            )
+            self._arrays = (np.array(self._starts), np.array(self._ends), alive)
+
+    def _build(self, slots: list[int]) -> _Tree:
+        geoms: list[shapely.Geometry] = []
+        geom_slots: list[int] = []
+        for slot in slots:
+            notice = self._notices[slot]
+            if notice is None:
+                continue
+            for geom in notice.geoms():
+                geoms.append(geom)
+                geom_slots.append(slot)
+        return _Tree(geoms, geom_slots)
+
+    def _rebuild(self) -> None:
+        """Drop removed notices and build the main tree of all of them."""
+        notices = [self._notices[slot] for slot in self._slots.values()]
+        starts = [self._starts[slot] for slot in self._slots.values()]
+        ends = [self._ends[slot] for slot in self._slots.values()]
+        self._slots = {key: slot for slot, key in enumerate(self._slots)}
+        self._notices = list(notices)
+        self._starts = starts
+        self._ends = ends
+        self._main = self._build(list(range(len(notices))))
+        self._pending = []
+        self._pending_tree = None
+        self._arrays = None
+        self.rebuilds += 1
+
+    def query_many(
+        self,
+        lons: npt.ArrayLike,
+        lats: npt.ArrayLike,
+        times: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.intp], list[AreaNotice]]:
+        """Find the notices that affect many positions.
+
+        Args:
+            lons: Longitude of each position in degrees.
+            lats: Latitude of each position in degrees.
+            times: UNIX time in seconds of each position.
+
+        Returns:
+            The index of the position and the notice of each hit, sorted by
+            position.  A notice is listed once per position even if more
+            than one of its sub-areas contain it.
+        """
+        self._refresh()
+        assert self._arrays is not None
+        starts, ends, alive = self._arrays
+        times = np.asarray(times, dtype=np.float64)
+        points = np.asarray(shapely.points(np.asarray(lons), np.asarray(lats)))
+
+        hits = [
+            tree.query(points)
+            for tree in (self._main, self._pending_tree)
+            if tree is not None
+        ]
+        if not hits:
+            return np.empty(0, dtype=np.intp), []
+        point_indices = np.concatenate([hit[0] for hit in hits])
+        slots = np.concatenate([hit[1] for hit in hits])
+
+        when = times[point_indices]
+        keep = alive[slots] & (starts[slots] <= when) & (when < ends[slots])
+        pairs = np.unique(
+            np.column_stack((point_indices[keep], slots[keep])), axis=0
+        ).reshape(-1, 2)
+        notices: list[AreaNotice] = []
+        for slot in pairs[:, 1].tolist():
+            notice = self._notices[slot]
+            assert notice is not None
+            notices.append(notice)
+        return pairs[:, 0], notices
+
+    def query(
+        self, lon: float, lat: float, when: datetime.datetime | float
+    ) -> list[AreaNotice]:
+        """Find the notices that affect one position.
+
+        Args:
+            lon: Longitude in degrees.
+            lat: Latitude in degrees.
+            when: Datetime or UNIX time in seconds.
+
+        Returns:
+            The active notices with a sub-area that contains the position.
+        """
+        _, notices = self.query_many([lon], [lat], [_timestamp(when)])
+        return notices
@@ -0,0 +1,177 @@
+"""Merged extent of the active Area Notices of each group.
+
+Displays often show the union of every active notice of an area_type,
+such as all of the right whale zones combined.  Recomputing that union
+over all of the geometries after each change gets slow as notices pile
+up.  NoticeUnion splits the plane into square lat/lon tiles and keeps
+the union of each group within each tile.  Inserting or removing a
+notice only recomputes the tiles that it overlaps, and the union of a
+group merges the already merged tiles.
+
+Geometries come from the cached AreaNotice.geoms(), so notices that were
+already drawn or indexed are not projected again.
+"""
+
+import math
+import operator
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import shapely
+import shapely.geometry.base
+
+from .imo_001_22_area_notice import AreaNotice
+from .notice_index import ActiveNotices, NoticeKey
+
+# Tile width and height in degrees.
+DEFAULT_TILE_SIZE: float = 1.0
+
+_POLYGONAL = frozenset(("Polygon", "MultiPolygon"))
+
+# (group, column, row)
+TileKey = tuple[Hashable, int, int]
+
+
+class NoticeUnion(ActiveNotices):
+    """Union of the notices in each group, maintained tile by tile.
+
+    Attributes:
+        tile_size: Width and height of a tile in degrees.
+        tile_rebuilds: Number of times the union of a tile was computed.
+    """
+
+    tile_size: float
+    tile_rebuilds: int
+
+    def __init__(
+        self,
+        group: Callable[[AreaNotice], Hashable] = operator.attrgetter("area_type"),
+        tile_size: float = DEFAULT_TILE_SIZE,
+    ) -> None:
+        """Initialize an empty union.
+
+        Args:
+            group: Returns the group of a notice.  Defaults to its area_type.
+            tile_size: Width and height of a tile in degrees.
+
+        Raises:
+            ValueError: If the tile size is not positive.
+        """
+        if not tile_size > 0:
+            raise ValueError(f"Invalid tile size: {tile_size}")
+        super().__init__()
+        self.tile_size = tile_size
+        self.tile_rebuilds = 0
+        self._group = group
+        # Group and tiles of each notice.
+        self._entries: dict[NoticeKey, tuple[Hashable, list[TileKey]]] = {}
+        self._members: dict[
+            TileKey, dict[NoticeKey, list[shapely.geometry.base.BaseGeometry]]
+        ] = {}
+        self._group_tiles: dict[Hashable, set[TileKey]] = {}
+        self._tile_unions: dict[TileKey, shapely.geometry.base.BaseGeometry] = {}
+        self._unions: dict[Hashable, shapely.geometry.base.BaseGeometry] = {}
+
+    def groups(self) -> list[Hashable]:
+        """Return the groups that have notices."""
+        return list(self._group_tiles)
+
+    def _add(
+        self, key: NoticeKey, notice: AreaNotice, start: float, end: float
+    ) -> None:
+        """Add the geometries of a notice to the tiles they overlap."""
+        group = self._group(notice)
+        tiles: list[TileKey] = []
+        for geom in notice.geoms():
+            for tile in self._tiles(group, geom):
+                members = self._members.setdefault(tile, {})
+                if key not in members:
+                    members[key] = []
+                    tiles.append(tile)
+                members[key].append(geom)
+        self._entries[key] = (group, tiles)
+        if tiles:
+            self._group_tiles.setdefault(group, set()).update(tiles)
+        self._changed(group, tiles)
+
+    def _discard(self, key: NoticeKey) -> None:
+        """Take the geometries of a notice out of its tiles."""
+        group, tiles = self._entries.pop(key)
+        for tile in tiles:
+            members = self._members[tile]
+            del members[key]
+            if not members:
+                del self._members[tile]
+                self._group_tiles[group].discard(tile)
+        if tiles and not self._group_tiles[group]:
+            del self._group_tiles[group]
+        self._changed(group, tiles)
+
+    def _tiles(
+        self, group: Hashable, geom: shapely.geometry.base.BaseGeometry
+    ) -> list[TileKey]:
+        """Tiles that the bounds of a geometry overlap."""
+        lon0, lat0, lon1, lat1 = shapely.bounds(geom).tolist()
+        size = self.tile_size
+        return [
+            (group, col, row)
+            for col in range(math.floor(lon0 / size), math.floor(lon1 / size) + 1)
+            for row in range(math.floor(lat0 / size), math.floor(lat1 / size) + 1)
+        ]
+
+    def _changed(self, group: Hashable, tiles: list[TileKey]) -> None:
+        for tile in tiles:
+            self._tile_unions.pop(tile, None)
+        self._unions.pop(group, None)
+
+    def _tile_union(self, tile: TileKey) -> shapely.geometry.base.BaseGeometry:
+        result = self._tile_unions.get(tile)
+        if result is None:
+            _, col, row = tile
+            size = self.tile_size
+            geoms = [geom for member in self._members[tile].values() for geom in member]
+            box = shapely.box(
+                col * size, row * size, (col + 1) * size, (row + 1) * size
+            )
+            result = shapely.intersection(shapely.union_all(geoms), box)
+            self._tile_unions[tile] = result
+            self.tile_rebuilds += 1
+        return result
+
+    def union(self, group: Hashable) -> shapely.geometry.base.BaseGeometry:
+        """Return the union of the notices in a group.
+
+        Args:
+            group: Group as returned by the group function.
+
+        Returns:
+            The merged geometry, which is empty if the group has no notices.
+        """
+        result = self._unions.get(group)
+        if result is None:
+            tiles = sorted(self._group_tiles.get(group, ()), key=lambda t: t[1:])
+            pieces = [self._tile_union(tile) for tile in tiles]
+            if all(piece.geom_type in _POLYGONAL for piece in pieces):
+                # Tiles do not overlap, so only their shared edges dissolve.
+                result = shapely.coverage_union_all(pieces)
+            else:
+                result = shapely.union_all(pieces)
+            self._unions[group] = result
+        return result
+
+    @property
+    def __geo_interface__(self) -> dict[str, Any]:
+        """Provide a Geo Interface with one feature per group."""
+        features = []
+        for group in self.groups():
+            keys = {
+                key for tile in self._group_tiles[group] for key in self._members[tile]
+            }
+            features.append(
+                {
+                    "type": "Feature",
+                    "properties": {"group": group, "notices": len(keys)},
+                    "geometry": self.union(group).__geo_interface__,
+                }
+            )
+        return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,566 @@
+"""Export the sensor reports of 8:1:26 Environment messages as tables.
+
+str() of an Environment is meant to be read by people.  SensorReportWriter
+writes the fields of each sensor report as columns instead, with one file
+per report type in a directory:
+
+- csv: wind.csv, water_level.csv, ... with a header row.
+- npy: wind.npy, water_level.npy, ... each a structured array that np.load
+  can memory map and that pandas.DataFrame takes as is.
+
+Each row starts with the mmsi of the message, the time of the report and
+the site_id, followed by REPORT_FIELDS of the report type.  The time is
+built from the day, hour and minute of the report and the year and month
+that decoding took from the reference time.  It is blank in a CSV, or NaN
+UNIX seconds in a .npy, when the report has no valid time.  The levels of
+the current reports are flattened into speed_1, dir_1, level_1, ...
+
+With lookups=True, each coded field also gets a column with its meaning
+from the lookup tables of imo_001_26_environment, such as vdatum_str and
+data_descr_str, after the fields.
+
+Messages can be written decoded or as the bits of the whole message.
+Rows are buffered and written chunk_size at a time.  The rows of a .npy
+go to a temporary file that gets its header on close, so memory does not
+grow with the number of reports.
+"""
+
+import csv
+import datetime
+import functools
+import itertools
+import math
+import operator
+import os
+import pathlib
+import shutil
+from collections.abc import Callable, Iterable, Mapping
+from typing import IO, Any, Literal, Self
+
+import numpy as np
+from BitVector import BitVector
+
+from . import ais_string
+from .decode_context import DecodeContext
+from .imo_001_26_environment import (
+    Current2dEntry,
+    Current3dEntry,
+    CurrentHorzEntry,
+    Environment,
+    SensorReport,
+    SensorReportAirGap,
+    SensorReportCurrent2d,
+    SensorReportCurrent3d,
+    SensorReportCurrentHorz,
+    SensorReportId,
+    SensorReportLocation,
+    SensorReportSalinity,
+    SensorReportSeaState,
+    SensorReportWaterLevel,
+    SensorReportWeather,
+    SensorReportWind,
+    beaufort_scale,
+    data_timeout_hrs_lut,
+    salinity_type_lut,
+    sensor_owner_lut,
+    sensor_type_lut,
+    trend_lut,
+    vdatum_lut,
+)
+
+# Stem of the file of each report type.
+FILE_NAMES: dict[type[SensorReport], str] = {
+    SensorReportLocation: "location",
+    SensorReportId: "id",
+    SensorReportWind: "wind",
+    SensorReportWaterLevel: "water_level",
+    SensorReportCurrent2d: "current_2d",
+    SensorReportCurrent3d: "current_3d",
+    SensorReportCurrentHorz: "current_horz",
+    SensorReportSeaState: "sea_state",
+    SensorReportSalinity: "salinity",
+    SensorReportWeather: "weather",
+    SensorReportAirGap: "air_gap",
+}
+
+# Entry type and number of entries in the cur list of the current reports.
+CURRENT_LEVELS: dict[type[SensorReport], tuple[type[Any], int]] = {
+    SensorReportCurrent2d: (Current2dEntry, 3),
+    SensorReportCurrent3d: (Current3dEntry, 2),
+    SensorReportCurrentHorz: (CurrentHorzEntry, 2),
+}
+
+# Attributes of each report type other than the header and the levels.
+_ATTRIBUTES: dict[type[SensorReport], tuple[str, ...]] = {
+    SensorReportLocation: ("lon", "lat", "alt", "owner", "timeout"),
+    SensorReportId: ("id_str",),
+    SensorReportWind: (
+        "speed",
+        "gust",
+        "dir",
+        "gust_dir",
+        "data_descr",
+        "forecast_speed",
+        "forecast_gust",
+        "forecast_dir",
+        "forecast_day",
+        "forecast_hour",
+        "forecast_minute",
+        "duration_min",
+    ),
+    SensorReportWaterLevel: (
+        "wl_type",
+        "wl",
+        "trend",
+        "vdatum",
+        "data_descr",
+        "forecast_type",
+        "forecast_wl",
+        "forecast_day",
+        "forecast_hour",
+        "forecast_minute",
+        "duration_min",
+    ),
+    SensorReportCurrent2d: ("data_descr",),
+    SensorReportCurrent3d: ("data_descr",),
+    SensorReportCurrentHorz: (),
+    SensorReportSeaState: (
+        "swell_height",
+        "swell_period",
+        "swell_dir",
+        "sea_state",
+        "swell_data_descr",
+        "temp",
+        "temp_depth",
+        "temp_data_descr",
+        "wave_height",
+        "wave_period",
+        "wave_dir",
+        "wave_data_descr",
+        "salinity",
+    ),
+    SensorReportSalinity: (
+        "temp",
+        "cond",
+        "pres",
+        "salinity",
+        "salinity_type",
+        "data_descr",
+    ),
+    SensorReportWeather: (
+        "air_temp",
+        "air_temp_data_descr",
+        "precip",
+        "vis",
+        "dew",
+        "dew_data_descr",
+        "air_pres",
+        "air_pres_trend",
+        "air_pres_data_descr",
+        "salinity",
+    ),
+    SensorReportAirGap: (
+        "draft",
+        "gap",
+        "gap_trend",
+        "forecast_gap",
+        "forecast_day",
+        "forecast_hour",
+        "forecast_minute",
+    ),
+}
+
+
+def _level_fields(report_cls: type[SensorReport]) -> tuple[str, ...]:
+    if report_cls not in CURRENT_LEVELS:
+        return ()
+    entry, count = CURRENT_LEVELS[report_cls]
+    return tuple(
+        f"{key}_{i}" for i in range(1, count + 1) for key in entry.__annotations__
+    )
+
+
+# Columns of each report type after mmsi, time and site_id.  The levels of
+# the current reports are named like the arguments of their constructors.
+REPORT_FIELDS: dict[type[SensorReport], tuple[str, ...]] = {
+    report_cls: (*_level_fields(report_cls), *attributes)
+    for report_cls, attributes in _ATTRIBUTES.items()
+}
+
+# Column and lookup table that lookups=True adds for each coded field.
+LOOKUPS: dict[str, tuple[str, Mapping[int, str | float | None]]] = {
+    "owner": ("owner_str", sensor_owner_lut),
+    "timeout": ("timeout_hrs", data_timeout_hrs_lut),
+    "trend": ("trend_str", trend_lut),
+    "vdatum": ("vdatum_str", vdatum_lut),
+    "sea_state": ("sea_state_str", beaufort_scale),
+    "salinity_type": ("salinity_type_str", salinity_type_lut),
+    "air_pres_trend": ("air_pres_trend_str", trend_lut),
+    "gap_trend": ("gap_trend_str", trend_lut),
+    **{
+        field: (f"{field}_str", sensor_type_lut)
+        for field in (
+            "data_descr",
+            "swell_data_descr",
+            "temp_data_descr",
+            "wave_data_descr",
+            "air_temp_data_descr",
+            "dew_data_descr",
+            "air_pres_data_descr",
+        )
+    },
+}
+
+# Rows of a report type that are buffered before they are written.
+CHUNK_SIZE: int = 65536
+
+_HEADER_DTYPE = [("mmsi", "<u4"), ("time", "<f8"), ("site_id", "u1")]
+_DTYPES: dict[type[Any], str] = {int: "<i4", float: "<f8", str: "S14"}
+
+
+_time_fields = operator.attrgetter("year", "month", "day", "hour", "minute")
+_id_str = operator.attrgetter("id_str")
+
+
+def _report_time(
+    fields: tuple[int, int, int, int, int],
+) -> datetime.datetime | None:
+    """Time of a report's year to minute, or None if it is not valid."""
+    try:
+        return datetime.datetime(*fields, tzinfo=datetime.UTC)
+    except ValueError:
+        return None
+
+
+# The reports of a site and of a batch of messages repeat their times.
+@functools.lru_cache(maxsize=4096)
+def _iso_time(fields: tuple[int, int, int, int, int]) -> str | None:
+    when = _report_time(fields)
+    return None if when is None else when.isoformat(timespec="minutes")
+
+
+@functools.lru_cache(maxsize=4096)
+def _unix_time(fields: tuple[int, int, int, int, int]) -> float:
+    when = _report_time(fields)
+    return math.nan if when is None else when.timestamp()
+
+
+def _tuple_getter(
+    getter: Callable[..., Callable[[Any], Any]], names: tuple[str, ...]
+) -> Callable[[Any], tuple[Any, ...]]:
+    """attrgetter or itemgetter that always returns a tuple."""
+    if not names:
+        return lambda _: ()
+    get = getter(*names)
+    if len(names) == 1:
+        return lambda obj: (get(obj),)
+    return get
+
+
+def _values_getter(
+    report_cls: type[SensorReport],
+) -> Callable[[SensorReport], tuple[Any, ...]]:
+    """Function that returns the REPORT_FIELDS values of a report."""
+    if report_cls is SensorReportId:
+        # Without the @ padding of the 6-bit text.
+        return lambda report: (ais_string.strip(_id_str(report)),)
+    attribute_values = _tuple_getter(operator.attrgetter, _ATTRIBUTES[report_cls])
+    if report_cls not in CURRENT_LEVELS:
+        return attribute_values
+    entry, _ = CURRENT_LEVELS[report_cls]
+    level_values = _tuple_getter(operator.itemgetter, tuple(entry.__annotations__))
+
+    def values(report: Any) -> tuple[Any, ...]:
+        return (
+            *itertools.chain.from_iterable(map(level_values, report.cur)),
+            *attribute_values(report),
+        )
+
+    return values
+
+
+def _field_dtype(report_cls: type[SensorReport], field: str) -> str:
+    if field in report_cls.__annotations__:
+        return _DTYPES[report_cls.__annotations__[field]]
+    entry, _ = CURRENT_LEVELS[report_cls]
+    key, _ = field.rsplit("_", 1)
+    return _DTYPES[entry.__annotations__[key]]
+
+
+def report_dtype(
+    report_cls: type[SensorReport], lookups: bool = False
+) -> np.dtype[np.void]:
+    """Structured dtype of the .npy file of a report type.
+
+    Args:
+        report_cls: SensorReport subclass.
+        lookups: Include the lookup columns.
+
+    Returns:
+        The dtype with mmsi, time, site_id and the REPORT_FIELDS.
+    """
+    fields = REPORT_FIELDS[report_cls]
+    dtype = [
+        *_HEADER_DTYPE,
+        *((field, _field_dtype(report_cls, field)) for field in fields),
+    ]
+    if lookups:
+        for field in fields:
+            if field not in LOOKUPS:
+                continue
+            column, lut = LOOKUPS[field]
+            if lut is data_timeout_hrs_lut:
+                dtype.append((column, "<f8"))
+            else:
+                size = max(len(str(value)) for value in lut.values())
+                dtype.append((column, f"S{size}"))
+    return np.dtype(dtype)
+
+
+class _Table:
+    """Buffered rows of one report type and the file that they go to."""
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        report_cls: type[SensorReport],
+        lookups: bool,
+        chunk_size: int,
+    ) -> None:
+        self.path = path
+        self.rows = 0
+        self._values = _values_getter(report_cls)
+        fields = REPORT_FIELDS[report_cls]
+        self._lookups: list[tuple[int, Mapping[int, Any], Any]] = []
+        self._columns = ["mmsi", "time", "site_id", *fields]
+        if lookups:
+            for index, field in enumerate(fields):
+                if field in LOOKUPS:
+                    column, lut = LOOKUPS[field]
+                    self._columns.append(column)
+                    self._lookups.append((index, lut, self._missing(lut)))
+        self._chunk_size = chunk_size
+        self._pending: list[tuple[Any, ...]] = []
+
+    def _missing(self, lut: Mapping[int, Any]) -> Any:
+        """Value of a lookup column for codes that are not in the table."""
+        return None
+
+    def _time(self, report: SensorReport) -> Any:
+        raise NotImplementedError  # pragma: no cover
+
+    def add(self, mmsi: int, report: SensorReport) -> None:
+        values = self._values(report)
+        if self._lookups:
+            values += tuple(
+                missing if (value := lut.get(values[index])) is None else value
+                for index, lut, missing in self._lookups
+            )
+        self._pending.append((mmsi, self._time(report), report.site_id, *values))
+        if len(self._pending) >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._write(self._pending)
+            self.rows += len(self._pending)
+            self._pending.clear()
+
+    def _write(self, rows: list[tuple[Any, ...]]) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def close(self) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+class _CsvTable(_Table):
+    """Rows written to a CSV file with a header row."""
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        report_cls: type[SensorReport],
+        lookups: bool,
+        chunk_size: int,
+    ) -> None:
+        super().__init__(path, report_cls, lookups, chunk_size)
+        self._out = open(path, "w", encoding="ascii", newline="")  # noqa: SIM115
+        self._writer = csv.writer(self._out, lineterminator="\n")
+        self._writer.writerow(self._columns)
+
+    def _time(self, report: SensorReport) -> str | None:
+        return _iso_time(_time_fields(report))
+
+    def _write(self, rows: list[tuple[Any, ...]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self.flush()
+        self._out.close()
+
+
+class _NpyTable(_Table):
+    """Rows written to a temporary file and given a .npy header on close."""
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        report_cls: type[SensorReport],
+        lookups: bool,
+        chunk_size: int,
+    ) -> None:
+        super().__init__(path, report_cls, lookups, chunk_size)
+        self._dtype = report_dtype(report_cls, lookups)
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._tmp: IO[bytes] = open(self._tmp_path, "w+b")  # noqa: SIM115
+
+    def _missing(self, lut: Mapping[int, Any]) -> Any:
+        return math.nan if lut is data_timeout_hrs_lut else ""
+
+    def _time(self, report: SensorReport) -> float:
+        return _unix_time(_time_fields(report))
+
+    def _write(self, rows: list[tuple[Any, ...]]) -> None:
+        self._tmp.write(np.array(rows, dtype=self._dtype).tobytes())
+
+    def close(self) -> None:
+        self.flush()
+        header = {
+            "descr": np.lib.format.dtype_to_descr(self._dtype),
+            "fortran_order": False,
+            "shape": (self.rows,),
+        }
+        with open(self.path, "wb") as out:
+            np.lib.format.write_array_header_1_0(out, header)
+            self._tmp.seek(0)
+            shutil.copyfileobj(self._tmp, out, 1 << 20)
+        self._tmp.close()
+        self._tmp_path.unlink()
+
+
+class SensorReportWriter:
+    """Write the sensor reports of many messages to one file per report type.
+
+    Attributes:
+        directory: Directory of the files.
+        chunk_size: Number of rows of a report type to buffer before writing.
+        rows: Number of reports written so far.
+    """
+
+    directory: pathlib.Path
+    chunk_size: int
+    rows: int
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        fmt: Literal["csv", "npy"] = "csv",
+        lookups: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """Start writing.
+
+        Args:
+            directory: Existing directory for the files.  The files of the
+                report types that are written are replaced.
+            fmt: Write CSV files or .npy structured arrays.
+            lookups: Add the meaning of each coded field from the lookup
+                tables.
+            chunk_size: Number of rows of a report type to buffer before
+                writing.
+
+        Raises:
+            ValueError: If fmt is not csv or npy.
+        """
+        if fmt not in ("csv", "npy"):
+            raise ValueError(f"Unknown format: {fmt}")
+        self.directory = pathlib.Path(directory)
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._fmt = fmt
+        self._lookups = lookups
+        self._context = DecodeContext()
+        self._tables: dict[type[SensorReport], _Table] = {}
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def paths(self) -> dict[type[SensorReport], pathlib.Path]:
+        """Files of the report types written so far."""
+        return {report_cls: table.path for report_cls, table in self._tables.items()}
+
+    def _table(self, report_cls: type[SensorReport]) -> _Table:
+        table = self._tables.get(report_cls)
+        if table is None:
+            path = self.directory / f"{FILE_NAMES[report_cls]}.{self._fmt}"
+            table_cls = _CsvTable if self._fmt == "csv" else _NpyTable
+            table = table_cls(path, report_cls, self._lookups, self.chunk_size)
+            self._tables[report_cls] = table
+        return table
+
+    def write(
+        self,
+        msg: Environment | BitVector,
+        reference_time: datetime.datetime | None = None,
+    ) -> int:
+        """Add the sensor reports of one message.
+
+        Args:
+            msg: Decoded message or the bits of the whole message.
+            reference_time: For bits, the time that the day, hour and minute
+                of the reports resolve against, usually the receive time.
+                Defaults to the previous reference time or, at first, now.
+
+        Returns:
+            The number of reports added.
+        """
+        if isinstance(msg, BitVector):
+            if reference_time is not None:
+                self._context.reference_time = reference_time
+            msg = Environment(bits=msg, context=self._context)
+        mmsi = msg.source_mmsi or 0
+        for report in msg.sensor_reports:
+            self._table(type(report)).add(mmsi, report)
+        self.rows += len(msg.sensor_reports)
+        return len(msg.sensor_reports)
+
+    def write_all(
+        self,
+        msgs: Iterable[Environment | BitVector],
+        reference_time: datetime.datetime | None = None,
+    ) -> int:
+        """Add the sensor reports of many messages.
+
+        Args:
+            msgs: Decoded messages or the bits of whole messages.
+            reference_time: For bits, the time that the reports resolve
+                against.
+
+        Returns:
+            The number of reports added.
+        """
+        before = self.rows
+        for msg in msgs:
+            self.write(msg, reference_time)
+        return self.rows - before
+
+    def flush(self) -> None:
+        """Write the buffered rows.
+
+        The rows of a .npy file only get their header on close.
+        """
+        for table in self._tables.values():
+            table.flush()
+
+    def close(self) -> None:
+        """Write the buffered rows and close the files."""
+        if self._closed:
+            return
+        self._closed = True
+        for table in self._tables.values():
+            table.close()
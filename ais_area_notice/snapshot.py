@@ -0,0 +1,439 @@
+"""Binary snapshots of decoded messages for a fast restart.
+
+A service that keeps the active Area Notices and Environment messages has
+to decode hours of NMEA again to rebuild them after a restart.  A snapshot
+keeps the payload bits of each message with the time it was received, so
+that loading one only maps the file and the messages are decoded with
+decode_bits when they are asked for.
+
+Each snapshot is one file, little-endian, with every section starting on
+an 8 byte boundary:
+
+- header: HEADER_DTYPE with MAGIC, FORMAT_VERSION and the section sizes.
+- records: RECORD_DTYPE, the index with one row per message.
+- geometries: GEOMETRY_DTYPE, one row per sub-area with stored vertices.
+- vertices: VERTEX_DTYPE (lon, lat) of the geometries.
+- payload: the bits of each message packed into whole bytes.
+
+The geometry of the sub-areas of Area Notices can be stored too.  It is
+only used if the geometry engine and level of detail at load match the
+ones at write.
+"""
+
+import datetime
+import math
+import os
+import pathlib
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+import shapely.geometry.base
+from BitVector import BitVector
+
+from .decode_context import DecodeContext
+from .geometry_cache import seed_geometry
+from .imo_001_22_area_notice import (
+    AreaNotice,
+    get_geometry_engine,
+    get_max_chord_error,
+)
+from .imo_001_26_environment import Environment
+
+MAGIC: bytes = b"AISNSNAP"
+FORMAT_VERSION: int = 1
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("geometry_engine", "S16"),
+        ("max_chord_error", "<f8"),  # NaN for None.
+        ("record_count", "<i8"),
+        ("geometry_count", "<i8"),
+        ("vertex_count", "<i8"),
+        ("payload_size", "<i8"),  # Bytes.
+    ]
+)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("received", "<f8"),  # UNIX time in seconds.
+        ("station", "S16"),
+        ("dac", "<u2"),
+        ("fi", "u1"),
+        ("bit_count", "<u2"),
+        ("payload_offset", "<i8"),  # Bytes into the payload.
+        ("geometry_offset", "<i8"),
+        ("geometry_count", "u1"),
+    ]
+)
+
+GEOMETRY_DTYPE = np.dtype(
+    [
+        ("sub_area", "u1"),
+        ("geom_type", "u1"),  # shapely.GeometryType
+        ("vertex_offset", "<i8"),
+        ("vertex_count", "<u4"),
+    ]
+)
+
+VERTEX_DTYPE = np.dtype([("lon", "<f8"), ("lat", "<f8")])
+
+# Message classes by (dac, fi).
+MESSAGE_TYPES: dict[tuple[int, int], type[AreaNotice | Environment]] = {
+    (1, 22): AreaNotice,
+    (1, 26): Environment,
+}
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _sections(header: npt.NDArray[Any]) -> list[tuple[int, int]]:
+    """Byte offset and size of records, geometries, vertices and payload."""
+    sections = []
+    offset = _align(HEADER_DTYPE.itemsize)
+    for dtype, count in (
+        (RECORD_DTYPE, header["record_count"]),
+        (GEOMETRY_DTYPE, header["geometry_count"]),
+        (VERTEX_DTYPE, header["vertex_count"]),
+        (np.dtype("u1"), header["payload_size"]),
+    ):
+        size = dtype.itemsize * int(count)
+        sections.append((offset, size))
+        offset = _align(offset + size)
+    return sections
+
+
+def _geometry_settings() -> tuple[bytes, float]:
+    chord_error = get_max_chord_error()
+    return (
+        get_geometry_engine().encode("ascii"),
+        math.nan if chord_error is None else chord_error,
+    )
+
+
+class SnapshotWriter:
+    """Collect messages and write them as a snapshot when closed.
+
+    The file is written to a temporary name and renamed, so a snapshot
+    that is being replaced stays whole until the new one is complete.
+
+    Attributes:
+        records: Number of messages written so far.
+    """
+
+    records: int
+
+    def __init__(
+        self, path: str | os.PathLike[str], with_geometry: bool = True
+    ) -> None:
+        """Start a snapshot.
+
+        Args:
+            path: File to write.
+            with_geometry: Store the vertices of the sub-areas of Area
+                Notices.
+        """
+        self._path = pathlib.Path(path)
+        self._with_geometry = with_geometry
+        self._records: list[tuple[Any, ...]] = []
+        self._geometries: list[tuple[int, int, int, int]] = []
+        self._vertices: list[npt.NDArray[np.float64]] = []
+        self._vertex_count = 0
+        self._payload = bytearray()
+        self._closed = False
+        self.records = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write_bits(
+        self,
+        bits: BitVector,
+        received: datetime.datetime | float | None = None,
+        station: str = "",
+        geoms: Iterable[tuple[int, shapely.geometry.base.BaseGeometry]] = (),
+    ) -> None:
+        """Add the bits of a received message.
+
+        Args:
+            bits: Bits of the whole message, starting with the message id.
+            received: When the message was received.  Defaults to now.
+            station: Receiving station, ASCII of up to 16 characters.
+            geoms: Sub-area index and geometry of each sub-area to store.
+
+        Raises:
+            ValueError: If the bits are too short for the DAC and FI, or the
+                station does not fit in the record.
+        """
+        size = len(bits)
+        if size < 56:
+            raise ValueError(f"Message too short: {size} bits")
+        station_bytes = station.encode("ascii")
+        if len(station_bytes) > RECORD_DTYPE["station"].itemsize:
+            raise ValueError(f"Station too long: {station!r}")
+        if received is None:
+            received = time.time()
+        elif isinstance(received, datetime.datetime):
+            received = received.timestamp()
+        value = int(bits)
+        pad = -size % 8
+        payload_offset = len(self._payload)
+        self._payload += (value << pad).to_bytes((size + pad) // 8, "big")
+
+        geometry_offset = len(self._geometries)
+        for sub_area, geom in geoms:
+            coords = shapely.get_coordinates(geom)
+            self._geometries.append(
+                (
+                    sub_area,
+                    int(shapely.get_type_id(geom)),
+                    self._vertex_count,
+                    len(coords),
+                )
+            )
+            self._vertices.append(coords)
+            self._vertex_count += len(coords)
+
+        self._records.append(
+            (
+                received,
+                station_bytes,
+                (value >> (size - 50)) & 0x3FF,
+                (value >> (size - 56)) & 0x3F,
+                size,
+                payload_offset,
+                geometry_offset,
+                len(self._geometries) - geometry_offset,
+            )
+        )
+        self.records += 1
+
+    def write(
+        self,
+        msg: AreaNotice | Environment,
+        received: datetime.datetime | float | None = None,
+        station: str = "",
+    ) -> None:
+        """Add a decoded message.
+
+        Args:
+            msg: Area Notice or Environment message.
+            received: When the message was received.  Defaults to now.
+            station: Receiving station.
+        """
+        geoms: list[tuple[int, shapely.geometry.base.BaseGeometry]] = []
+        if self._with_geometry and isinstance(msg, AreaNotice):
+            geoms = [
+                (index, geom)
+                for index, area in enumerate(msg.areas)
+                if (geom := area.geom()) is not None
+            ]
+        self.write_bits(msg.get_bits(include_bin_hdr=True), received, station, geoms)
+
+    def write_all(
+        self,
+        msgs: Iterable[AreaNotice | Environment],
+        received: datetime.datetime | float | None = None,
+    ) -> int:
+        """Add many decoded messages received at the same time.
+
+        Args:
+            msgs: Area Notice or Environment messages.
+            received: When the messages were received.  Defaults to now.
+
+        Returns:
+            The number of messages added.
+        """
+        if received is None:
+            received = time.time()
+        before = self.records
+        for msg in msgs:
+            self.write(msg, received)
+        return self.records - before
+
+    def close(self) -> None:
+        """Write the snapshot."""
+        if self._closed:
+            return
+        self._closed = True
+        engine, chord_error = _geometry_settings()
+        header = np.array(
+            [
+                (
+                    MAGIC,
+                    FORMAT_VERSION,
+                    engine if self._geometries else b"",
+                    chord_error,
+                    len(self._records),
+                    len(self._geometries),
+                    self._vertex_count,
+                    len(self._payload),
+                )
+            ],
+            dtype=HEADER_DTYPE,
+        )
+        vertices = np.zeros(self._vertex_count, dtype=VERTEX_DTYPE)
+        if self._vertices:
+            coords = np.concatenate(self._vertices)
+            vertices["lon"] = coords[:, 0]
+            vertices["lat"] = coords[:, 1]
+        sections = (
+            np.array(self._records, dtype=RECORD_DTYPE).tobytes(),
+            np.array(self._geometries, dtype=GEOMETRY_DTYPE).tobytes(),
+            vertices.tobytes(),
+            bytes(self._payload),
+        )
+
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, "wb") as out:
+            out.write(header.tobytes())
+            for (offset, _), data in zip(_sections(header[0]), sections, strict=True):
+                out.write(b"\0" * (offset - out.tell()))
+                out.write(data)
+        os.replace(tmp_path, self._path)
+
+
+class Snapshot:
+    """Memory mapped snapshot that decodes messages when asked.
+
+    The file stays mapped until the snapshot and the arrays taken from it
+    are garbage collected.
+
+    Attributes:
+        records: The index, with RECORD_DTYPE.  Filter it with NumPy to
+            pick the messages to decode.
+    """
+
+    records: npt.NDArray[Any]
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Map a snapshot.
+
+        Args:
+            path: File written by SnapshotWriter.
+
+        Raises:
+            ValueError: If the file is not a snapshot or has another version.
+        """
+        if os.path.getsize(path) < HEADER_DTYPE.itemsize:
+            raise ValueError(f"Not a snapshot: {path}")
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = data[: HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"Not a snapshot: {path}")
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header['version']}")
+        engine = header["geometry_engine"]
+        chord_error = float(header["max_chord_error"])
+        self._geometry_settings = (engine, chord_error)
+
+        (records, geometries, vertices, payload) = (
+            data[offset : offset + size] for offset, size in _sections(header)
+        )
+        self.records = records.view(RECORD_DTYPE)
+        self._geometries = geometries.view(GEOMETRY_DTYPE)
+        self._vertices = vertices.view(VERTEX_DTYPE)
+        self._payload = payload
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[AreaNotice | Environment]:
+        for index in range(len(self.records)):
+            yield self.message(index)
+
+    def bits(self, index: int) -> BitVector:
+        """Return the bits of a message.
+
+        Args:
+            index: Row in records.
+        """
+        record = self.records[index]
+        size = int(record["bit_count"])
+        offset = int(record["payload_offset"])
+        pad = -size % 8
+        value = int.from_bytes(
+            self._payload[offset : offset + (size + pad) // 8].tobytes(), "big"
+        )
+        return BitVector.from_int(value >> pad, size)
+
+    def geoms(self, index: int) -> list[tuple[int, shapely.geometry.base.BaseGeometry]]:
+        """Return the stored geometries of a message without decoding it.
+
+        Args:
+            index: Row in records.
+
+        Returns:
+            The sub-area index and geometry of each stored sub-area.
+        """
+        record = self.records[index]
+        offset = int(record["geometry_offset"])
+        result: list[tuple[int, shapely.geometry.base.BaseGeometry]] = []
+        for row in self._geometries[offset : offset + int(record["geometry_count"])]:
+            start = int(row["vertex_offset"])
+            vertices = self._vertices[start : start + int(row["vertex_count"])]
+            coords = np.column_stack((vertices["lon"], vertices["lat"]))
+            geom_type = int(row["geom_type"])
+            if geom_type == shapely.GeometryType.POINT:
+                geom = shapely.points(coords[0])
+            elif geom_type == shapely.GeometryType.LINESTRING:
+                geom = shapely.linestrings(coords)
+            else:
+                geom = shapely.polygons(coords)
+            result.append((int(row["sub_area"]), geom))
+        return result
+
+    def message(
+        self, index: int, context: DecodeContext | None = None
+    ) -> AreaNotice | Environment:
+        """Decode a message.
+
+        Args:
+            index: Row in records.
+            context: Shared decode state.  The message is decoded with a
+                copy whose reference time is the time it was received.
+
+        Returns:
+            The decoded message, with the stored geometry of its sub-areas.
+
+        Raises:
+            ValueError: If the snapshot has a message type that this
+                version cannot decode.
+        """
+        record = self.records[index]
+        key = (int(record["dac"]), int(record["fi"]))
+        if key not in MESSAGE_TYPES:
+            raise ValueError(f"No decoder for DAC {key[0]} FI {key[1]}")
+        received = datetime.datetime.fromtimestamp(
+            float(record["received"]), datetime.UTC
+        )
+        if context is None:
+            context = DecodeContext(received)
+        else:
+            context = context.with_reference_time(received)
+        bits = self.bits(index)
+        if MESSAGE_TYPES[key] is Environment:
+            return Environment(bits=bits, context=context)
+
+        notice = AreaNotice.from_bits(bits, context=context)
+        if record["geometry_count"] and self._geometry_settings_match():
+            for sub_area, geom in self.geoms(index):
+                seed_geometry(notice.areas[sub_area], "geom", geom)
+        return notice
+
+    def _geometry_settings_match(self) -> bool:
+        engine, chord_error = _geometry_settings()
+        stored_engine, stored_chord_error = self._geometry_settings
+        if math.isnan(chord_error):
+            return stored_engine == engine and math.isnan(stored_chord_error)
+        return stored_engine == engine and stored_chord_error == chord_error
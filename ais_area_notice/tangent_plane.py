@@ -0,0 +1,183 @@
+"""Sub-area vertices from east and north offsets without map projections.
+
+The 8:1:22 shapes are offsets in meters from a start point.  Projecting
+them through UTM costs two pyproj calls per shape, only works well near
+the central meridian of a zone and breaks down at the antimeridian and in
+polar regions.
+
+This module treats an offset (east, north) as the azimuth and distance of
+a geodesic from the start point on the WGS 84 ellipsoid.  When a shape is
+small compared to its distance from the pole, the longitude and latitude
+come from the second order expansion of the geodesic around the start
+point, which is a handful of array operations.  Other shapes use the
+closed form solution on the sphere that osculates the ellipsoid at the
+start point.
+
+Longitudes are not wrapped, so a shape that crosses the antimeridian has
+longitudes past +/-180 degrees and stays contiguous.
+"""
+
+import math
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+# WGS 84 ellipsoid.
+SEMI_MAJOR_AXIS: float = 6378137.0
+FLATTENING: float = 1 / 298.257223563
+ECCENTRICITY_SQUARED: float = FLATTENING * (2 - FLATTENING)
+
+# Largest offset that uses the expansion, as a change in longitude in
+# radians.  The error of the expansion is below 0.5 m at this size.
+EXPANSION_LIMIT: float = 0.005
+
+_DEG: float = 180 / math.pi
+
+
+def _radii(sin_lat: Any) -> tuple[Any, Any, Any]:
+    """Meridional and prime vertical radii of curvature and 1 - e^2 sin^2."""
+    w = 1 - ECCENTRICITY_SQUARED * sin_lat * sin_lat
+    root_w = w**0.5
+    meridional = SEMI_MAJOR_AXIS * (1 - ECCENTRICITY_SQUARED) / (w * root_w)
+    return meridional, SEMI_MAJOR_AXIS / root_w, w
+
+
+def _expansion(
+    sin_lat: Any, cos_lat: Any, meridional: Any, prime_vertical: Any, w: Any
+) -> tuple[Any, Any, Any, Any, Any]:
+    """Coefficients of the second order expansion of the geodesic.
+
+    The change in degrees from the start point is:
+
+        lon = (lon_scale + lon_north * north) * east
+        lat = (lat_scale + lat_north * north) * north - lat_east * east**2
+
+    Returns:
+        lon_scale, lon_north, lat_scale, lat_north and lat_east.
+    """
+    tan_lat = sin_lat / cos_lat
+    lon_scale = _DEG / (prime_vertical * cos_lat)
+    lat_north = (
+        -1.5 * _DEG * ECCENTRICITY_SQUARED * sin_lat * cos_lat / (w * meridional**2)
+    )
+    return (
+        lon_scale,
+        lon_scale * tan_lat / meridional,
+        _DEG / meridional,
+        lat_north,
+        0.5 * _DEG * tan_lat / prime_vertical**2,
+    )
+
+
+def _spherical(
+    lon: Any,
+    sin_lat: Any,
+    cos_lat: Any,
+    meridional: Any,
+    prime_vertical: Any,
+    east: Any,
+    north: Any,
+) -> tuple[Any, Any]:
+    """Geodesic from (lon, lat) on the osculating sphere."""
+    x = east / prime_vertical
+    y = north / meridional
+    angle = np.hypot(x, y)
+    cos_angle = np.cos(angle)
+    # sin(angle) / angle, which is 1 for the start point.
+    ratio = np.sinc(angle / math.pi)
+    sin_lats = sin_lat * cos_angle + cos_lat * ratio * y
+    lats = _DEG * np.arcsin(np.clip(sin_lats, -1, 1))
+    lons = lon + _DEG * np.arctan2(ratio * x, cos_lat * cos_angle - sin_lat * ratio * y)
+    return lons, lats
+
+
+def local_to_ll(
+    lon: float, lat: float, offsets: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Convert the offsets of one shape to longitude and latitude.
+
+    Args:
+        lon: Longitude of the start point in degrees.
+        lat: Latitude of the start point in degrees.
+        offsets: (N, 2) array of meters east and north of the start point.
+
+    Returns:
+        An (N, 2) array of (lon, lat).
+    """
+    east = offsets[:, 0]
+    north = offsets[:, 1]
+    phi = math.radians(lat)
+    sin_lat = math.sin(phi)
+    cos_lat = math.cos(phi)
+    extent = float(np.abs(offsets).max(initial=0.0))
+    meridional, prime_vertical, w = _radii(sin_lat)
+    if extent >= EXPANSION_LIMIT * prime_vertical * cos_lat:
+        lons, lats = _spherical(
+            lon, sin_lat, cos_lat, meridional, prime_vertical, east, north
+        )
+        return np.column_stack((lons, lats))
+
+    lon_scale, lon_north, lat_scale, lat_north, lat_east = _expansion(
+        sin_lat, cos_lat, meridional, prime_vertical, w
+    )
+    # In place, as the arrays are small and each operation has an overhead.
+    result = np.empty_like(offsets)
+    lons = result[:, 0]
+    np.multiply(north, lon_north, out=lons)
+    lons += lon_scale
+    lons *= east
+    lons += lon
+    lats = result[:, 1]
+    np.multiply(north, lat_north, out=lats)
+    lats += lat_scale
+    lats *= north
+    lats -= lat_east * east * east
+    lats += lat
+    return result
+
+
+def local_to_ll_many(
+    lons: npt.NDArray[np.float64],
+    lats: npt.NDArray[np.float64],
+    offsets: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Convert offsets from many start points to longitude and latitude.
+
+    Unlike local_to_ll, which picks a method for the whole shape, each
+    vertex uses the expansion if its own offset is small enough.
+
+    Args:
+        lons: Longitude of the start point of each vertex in degrees.
+        lats: Latitude of the start point of each vertex in degrees.
+        offsets: (N, 2) array of meters east and north of the start points.
+
+    Returns:
+        An (N, 2) array of (lon, lat).
+    """
+    east = offsets[:, 0]
+    north = offsets[:, 1]
+    phi = np.radians(lats)
+    sin_lat = np.sin(phi)
+    cos_lat = np.cos(phi)
+    meridional, prime_vertical, w = _radii(sin_lat)
+    small = np.abs(offsets).max(axis=1) < EXPANSION_LIMIT * prime_vertical * cos_lat
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lon_scale, lon_north, lat_scale, lat_north, lat_east = _expansion(
+            sin_lat, cos_lat, meridional, prime_vertical, w
+        )
+        result_lons = (lon_north * north + lon_scale) * east + lons
+        result_lats = (lat_north * north + lat_scale) * north - lat_east * east * east
+        result_lats += lats
+    if not small.all():
+        far = ~small
+        result_lons[far], result_lats[far] = _spherical(
+            lons[far],
+            sin_lat[far],
+            cos_lat[far],
+            meridional[far],
+            prime_vertical[far],
+            east[far],
+            north[far],
+        )
+    return np.column_stack((result_lons, result_lats))
@@ -0,0 +1,171 @@
+"""Check vessel tracks against Area Notices in bulk.
+
+Speed restrictions for right whales are announced with reduce-speed and
+stay-clear Area Notices.  Checking compliance means finding every
+position report that is inside an active notice and turning those into
+visits: when each vessel entered and left each notice, and how fast it
+went while inside.
+
+Tracks are column arrays with one element per position report, in any
+order.  track_hits finds the positions inside active notices with one
+vectorized STRtree query, and track_visits groups consecutive hits of
+one vessel in one notice into visits.
+"""
+
+from collections.abc import Container, Iterable
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+
+from .imo_001_22_area_notice import AreaNotice, notice_type
+
+SPEED_RESTRICTION_TYPES: frozenset[int] = frozenset(
+    notice_type[name]
+    for name in (
+        "cau_mammals_reduce_speed",
+        "cau_mammals_stay_clear",
+        "cau_habitat_reduce_speed",
+        "cau_habitat_stay_clear",
+    )
+)
+
+# entry and exit are indices into the track arrays.  exit is the last
+# position inside the notice.
+VISIT_DTYPE = np.dtype(
+    [
+        ("vessel", "<i8"),
+        ("notice", "<i8"),  # Index into the notices.
+        ("entry", "<i8"),
+        ("exit", "<i8"),
+        ("entry_time", "<f8"),  # UNIX time in seconds.
+        ("exit_time", "<f8"),
+        ("count", "<i8"),  # Positions inside the notice.
+        ("max_speed", "<f8"),  # NaN without speeds.
+    ]
+)
+
+
+def track_hits(
+    lons: npt.ArrayLike,
+    lats: npt.ArrayLike,
+    times: npt.ArrayLike,
+    notices: Iterable[AreaNotice],
+    area_types: Container[int] | None = SPEED_RESTRICTION_TYPES,
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Find the positions inside active notices.
+
+    Args:
+        lons: Longitude of each position in degrees.
+        lats: Latitude of each position in degrees.
+        times: UNIX time in seconds of each position.
+        notices: Area Notices to check against.
+        area_types: Only check notices with these area types.  None checks
+            all of them.
+
+    Returns:
+        The index of the position and the index into notices of each hit,
+        sorted by position and then notice.  A notice is listed once per
+        position even if more than one of its sub-areas contain it.
+    """
+    notices = list(notices)
+    times = np.asarray(times, dtype=np.float64)
+    empty = np.empty(0, dtype=np.intp)
+    if not len(times):
+        return empty, empty
+    first, last = float(times.min()), float(times.max())
+
+    geoms: list[shapely.Geometry] = []
+    owners: list[int] = []
+    starts = np.empty(len(notices))
+    ends = np.empty(len(notices))
+    for i, notice in enumerate(notices):
+        starts[i], ends[i] = notice.valid_interval()
+        if area_types is not None and notice.area_type not in area_types:
+            continue
+        # Skip notices that are not active during the tracks.
+        if ends[i] <= first or last < starts[i]:
+            continue
+        for geom in notice.geoms():
+            geoms.append(geom)
+            owners.append(i)
+    if not geoms:
+        return empty, empty
+
+    tree = shapely.STRtree(geoms)
+    points = shapely.points(np.asarray(lons), np.asarray(lats))
+    point_indices, rows = tree.query(points, predicate="intersects")
+    notice_indices = np.array(owners, dtype=np.intp)[rows]
+    when = times[point_indices]
+    keep = (starts[notice_indices] <= when) & (when < ends[notice_indices])
+    pairs = np.unique(
+        np.column_stack((point_indices[keep], notice_indices[keep])), axis=0
+    ).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def track_visits(
+    vessels: npt.ArrayLike,
+    times: npt.ArrayLike,
+    point_indices: npt.ArrayLike,
+    notice_indices: npt.ArrayLike,
+    speeds: npt.ArrayLike | None = None,
+) -> npt.NDArray[np.void]:
+    """Group the hits of track_hits into visits.
+
+    A visit is a run of positions of one vessel, in time order, that are
+    all inside the same notice.  The vessel left between the exit and its
+    next position.
+
+    Args:
+        vessels: Vessel ID, such as the MMSI, of each position.
+        times: UNIX time in seconds of each position.
+        point_indices: Position of each hit.
+        notice_indices: Notice of each hit.
+        speeds: Speed of each position.  NaN speeds are skipped.
+
+    Returns:
+        Array of VISIT_DTYPE sorted by vessel and entry time.
+    """
+    vessels = np.asarray(vessels)
+    times = np.asarray(times, dtype=np.float64)
+    point_indices = np.asarray(point_indices, dtype=np.intp)
+    notice_indices = np.asarray(notice_indices, dtype=np.intp)
+    if not len(point_indices):
+        return np.empty(0, dtype=VISIT_DTYPE)
+
+    # Rank of each position when sorted by vessel and time.
+    order = np.lexsort((times, vessels))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    ranks = rank[point_indices]
+    hit_order = np.lexsort((ranks, notice_indices))
+    ranks = ranks[hit_order]
+    notice_indices = notice_indices[hit_order]
+
+    sorted_vessels = vessels[order]
+    new_visit = np.ones(len(ranks), dtype=bool)
+    new_visit[1:] = (
+        (notice_indices[1:] != notice_indices[:-1])
+        | (ranks[1:] != ranks[:-1] + 1)
+        | (sorted_vessels[ranks[1:]] != sorted_vessels[ranks[:-1]])
+    )
+    first = np.flatnonzero(new_visit)
+    last = np.append(first[1:], len(ranks)) - 1
+
+    visits = np.empty(len(first), dtype=VISIT_DTYPE)
+    entries = order[ranks[first]]
+    exits = order[ranks[last]]
+    visits["vessel"] = vessels[entries]
+    visits["notice"] = notice_indices[first]
+    visits["entry"] = entries
+    visits["exit"] = exits
+    visits["entry_time"] = times[entries]
+    visits["exit_time"] = times[exits]
+    visits["count"] = last - first + 1
+    if speeds is None:
+        visits["max_speed"] = np.nan
+    else:
+        speeds = np.asarray(speeds, dtype=np.float64)
+        visits["max_speed"] = np.fmax.reduceat(speeds[order[ranks]], first)
+    return visits[np.argsort(ranks[first], kind="stable")]
@@ -0,0 +1,84 @@
+"""Process-wide cache of UTM projections.
+
+Creating a pyproj projection costs far more than projecting the handful of
+points in a sub-area, so all of the geometry code shares one forward and
+one inverse Transformer per UTM zone and hemisphere.  Transformers are
+safe to share between threads, and the cache is filled under a lock.
+"""
+
+import threading
+from typing import Any
+
+from pyproj import CRS, Transformer
+
+
+class UtmProjection:
+    """Forward and inverse transformers for one UTM zone.
+
+    Called like a pyproj.Proj, so it can be used in place of one.
+
+    Attributes:
+        zone: UTM zone number (1 to 60).
+        south: True for the southern hemisphere variant of the zone.
+        forward: Transformer from longitude and latitude to UTM x and y.
+        inverse: Transformer from UTM x and y to longitude and latitude.
+    """
+
+    __slots__ = ("forward", "inverse", "south", "zone")
+
+    zone: int
+    south: bool
+    forward: Transformer
+    inverse: Transformer
+
+    def __init__(self, zone: int, south: bool = False) -> None:
+        """Create the transformers.
+
+        Args:
+            zone: UTM zone number (1 to 60).
+            south: Use the southern hemisphere false northing.
+        """
+        params: dict[str, Any] = {"proj": "utm", "zone": zone}
+        if south:
+            params["south"] = True
+        crs = CRS.from_dict(params)
+        self.zone = zone
+        self.south = south
+        self.forward = Transformer.from_crs(crs.geodetic_crs, crs, always_xy=True)
+        self.inverse = Transformer.from_crs(crs, crs.geodetic_crs, always_xy=True)
+
+    def __call__(self, x: Any, y: Any, inverse: bool = False) -> tuple[Any, Any]:
+        """Project coordinates.
+
+        Args:
+            x: Longitude, or UTM x if inverse.  A number or an array.
+            y: Latitude, or UTM y if inverse.  A number or an array.
+            inverse: Convert from UTM to longitude and latitude.
+
+        Returns:
+            The converted x and y.
+        """
+        transformer = self.inverse if inverse else self.forward
+        return transformer.transform(x, y)
+
+
+_projections: dict[tuple[int, bool], UtmProjection] = {}
+_projections_lock = threading.Lock()
+
+
+def utm_projection(zone: int, south: bool = False) -> UtmProjection:
+    """Return the shared projection for a UTM zone, creating it only once.
+
+    Args:
+        zone: UTM zone number (1 to 60).
+        south: Use the southern hemisphere false northing.
+
+    Returns:
+        The UtmProjection for the zone.
+    """
+    key = (zone, south)
+    with _projections_lock:
+        projection = _projections.get(key)
+        if projection is None:
+            projection = _projections[key] = UtmProjection(zone, south)
+    return projection
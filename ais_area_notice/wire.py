@@ -0,0 +1,203 @@
+"""Compact form of decoded messages for sending to other processes.
+
+Pickling a decoded message copies every attribute of the message and of
+each of its sub-areas.  The wire form is only the bits of the message,
+packed into bytes, with the reference time that decoding needs to fill in
+the year and month and the receiving station:
+
+- version: u1, WIRE_VERSION.
+- reference time: little-endian f8 UNIX time in seconds, NaN for none.
+- bit count: little-endian u2.
+- station size: u1, followed by the ASCII station.
+- payload: the bits, padded with zeros to whole bytes.
+
+The message classes convert with to_wire and from_wire.  Plain pickling
+of a message still copies the whole object, which is exact and faster
+than re-encoding the bits.  Pickle a Wire instead to send the compact
+form: it holds the bytes and only decodes them when the message is asked
+for, so that a process can pass messages along or look at the header
+without decoding them.  Only what the bits encode survives the wire form,
+so coordinates are quantized to the message resolution.
+"""
+
+import datetime
+import math
+import struct
+from typing import Protocol, Self
+
+from BitVector import BitVector
+
+from .decode_context import DecodeContext, default_context
+
+WIRE_VERSION: int = 1
+
+_HEADER = struct.Struct("<BdHB")
+
+
+class WireMessage(Protocol):
+    """Message with a wire form."""
+
+    def to_wire(self, station: str = "") -> bytes:
+        """Return the wire form of the message."""
+        ...  # pragma: no cover
+
+    @classmethod
+    def from_wire(cls, data: bytes, context: DecodeContext | None = None) -> Self:
+        """Decode the wire form of a message."""
+        ...  # pragma: no cover
+
+
+def encode(
+    bits: BitVector, reference_time: datetime.datetime | None, station: str = ""
+) -> bytes:
+    """Pack the bits of a message into its wire form.
+
+    Args:
+        bits: Bits of the whole message, starting with the message id.
+        reference_time: Time that the partial timestamps of the message are
+            resolved against, if they need one.
+        station: Receiving station.
+
+    Returns:
+        The wire form.
+    """
+    size = len(bits)
+    pad = -size % 8
+    station_bytes = station.encode("ascii")
+    header = _HEADER.pack(
+        WIRE_VERSION,
+        math.nan if reference_time is None else reference_time.timestamp(),
+        size,
+        len(station_bytes),
+    )
+    value = int(bits) if size else 0
+    return header + station_bytes + (value << pad).to_bytes((size + pad) // 8, "big")
+
+
+def _header(data: bytes) -> tuple[float, int, int]:
+    """Reference time, bit count and station size of a wire form.
+
+    Raises:
+        ValueError: If data is not a wire form of this version.
+    """
+    if len(data) < _HEADER.size or data[0] != WIRE_VERSION:
+        raise ValueError("Not a wire form message")
+    _, reference, size, station_size = _HEADER.unpack_from(data)
+    return reference, size, station_size
+
+
+def decode(
+    data: bytes, context: DecodeContext | None = None
+) -> tuple[BitVector, DecodeContext]:
+    """Unpack the bits of a message from its wire form.
+
+    Args:
+        data: Wire form from encode.
+        context: Shared decode state.  If the wire form has a reference
+            time, a copy with that time is returned and context itself is
+            not changed.
+
+    Returns:
+        The bits and the context to decode them with.
+
+    Raises:
+        ValueError: If data is not a wire form of this version.
+    """
+    reference, size, station_size = _header(data)
+    if not math.isnan(reference):
+        when = datetime.datetime.fromtimestamp(reference, datetime.UTC)
+        if context is None:
+            context = DecodeContext(when)
+        else:
+            context = context.with_reference_time(when)
+    elif context is None:
+        context = default_context()
+    pad = -size % 8
+    value = int.from_bytes(data[_HEADER.size + station_size :], "big")
+    return BitVector.from_int(value >> pad, size), context
+
+
+class Wire[M: WireMessage]:
+    """Wire form of a message that is decoded when it is first asked for.
+
+    Attributes:
+        cls: Class of the message.
+        data: The wire form.
+    """
+
+    __slots__ = ("_message", "cls", "data")
+
+    cls: type[M]
+    data: bytes
+
+    def __init__(self, cls: type[M], data: bytes) -> None:
+        """Hold a wire form.
+
+        Args:
+            cls: Class of the message.
+            data: Wire form from the to_wire method of the message.
+        """
+        self.cls = cls
+        self.data = data
+        self._message: M | None = None
+
+    @classmethod
+    def from_message(cls, msg: M, station: str = "") -> Self:
+        """Hold the wire form of a decoded message.
+
+        Args:
+            msg: The message.
+            station: Receiving station.
+        """
+        wire = cls(type(msg), msg.to_wire(station))
+        wire._message = msg
+        return wire
+
+    @classmethod
+    def from_bits(
+        cls,
+        msg_cls: type[M],
+        bits: BitVector,
+        reference_time: datetime.datetime | None = None,
+        station: str = "",
+    ) -> Self:
+        """Hold the bits of a received message without decoding them.
+
+        Args:
+            msg_cls: Class of the message.
+            bits: Bits of the whole message, starting with the message id.
+            reference_time: Time that the partial timestamps resolve against,
+                usually the receive time.
+            station: Receiving station.
+        """
+        return cls(msg_cls, encode(bits, reference_time, station))
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return type(self), (self.cls, self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def reference_time(self) -> datetime.datetime | None:
+        """Time that the partial timestamps of the message resolve against."""
+        reference, _, _ = _header(self.data)
+        if math.isnan(reference):
+            return None
+        return datetime.datetime.fromtimestamp(reference, datetime.UTC)
+
+    @property
+    def station(self) -> str:
+        """Receiving station."""
+        _, _, station_size = _header(self.data)
+        return self.data[_HEADER.size : _HEADER.size + station_size].decode("ascii")
+
+    def message(self, context: DecodeContext | None = None) -> M:
+        """Decode the message the first time and return it.
+
+        Args:
+            context: Shared decode state for the first call.
+        """
+        if self._message is None:
+            self._message = self.cls.from_wire(self.data, context)
+        return self._message
@@ -123,3 +123,52 @@ def test_build_bits_add_text_value_error() -> None:
     bb = an_util.BuildBits()
     with pytest.raises(ValueError, match=r"num_bits \(7\) must be a multiple of 6"):
         bb.AddText("A", 7)
+
+
+@pytest.mark.parametrize(
+    "bits",
+    [
+        BitVector.from_bitstring("0010111000000100"),
+        "0010111000000100",
+        [0, 0, 1, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0],
+    ],
+)
+def test_bit_buffer(bits: BitVector | str | list[int]) -> None:
+    """Test BitBuffer reads fields by offset from any kind of input."""
+    buf = an_util.BitBuffer(bits)
+    assert len(buf) == 16
+    assert buf.get_uint(0, 4) == 2
+    assert buf.get_int(0, 4) == 2
+    assert buf.get_uint(4, 4) == 14
+    assert buf.get_int(4, 4) == -2
+    assert buf.get_int(4, 1) == -1
+    assert buf.get_text(4, 12) == "8D"
+    assert buf.get_uint(0, 16) == 0b0010111000000100
+
+
+def test_bit_buffer_empty() -> None:
+    """Test BitBuffer with no bits."""
+    assert not len(an_util.BitBuffer(BitVector(size=0)))
+    assert not len(an_util.BitBuffer(""))
+
+
+def test_bit_buffer_errors() -> None:
+    """Test BitBuffer rejects fields outside of the bits and unaligned text."""
+    buf = an_util.BitBuffer("10101010")
+    with pytest.raises(an_util.Error, match="outside of 8 bits"):
+        buf.get_uint(4, 5)
+    with pytest.raises(an_util.Error, match="outside of 8 bits"):
+        buf.get_uint(-1, 2)
+    with pytest.raises(an_util.Error, match="six bit aligned"):
+        buf.get_text(0, 4)
+
+
+def test_decode_bits_offset() -> None:
+    """Test DecodeBits shares a BitBuffer and starts at an offset."""
+    buf = an_util.BitBuffer("1111" + "00010100")
+    db = an_util.DecodeBits(buf, 4)
+    assert db.bits is buf
+    assert db.get_int(4) == 1
+    assert db.get_signed_int(4) == 4
+    assert db.pos == 8
+    db.verify(8)
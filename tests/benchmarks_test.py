@@ -4,22 +4,66 @@ Covers:
 - ais_string.py
 - an_util.py
 - binary.py
+- columnar.py
+- coverage_grid.py
+- geojson_writer.py
+- geometry.py
+- geometry_cache.py
+- html_template.py
 - imo_001_22_area_notice.py
 - imo_001_26_environment.py
 - imo_001_31_met_hydro.py
+- interval_index.py
 - m366_22.py
 - m367_22.py
+- network_link.py
+- notice_index.py
+- notice_union.py
+- sensor_report_writer.py
+- snapshot.py
+- tangent_plane.py
+- tracks.py
+- utm.py
+- wire.py
 """
 
 import datetime
+import io
+import pathlib
+import pickle
 
+import numpy as np
+import shapely
+import shapely.geometry
 from BitVector import BitVector
+from pyproj import Proj
 from pytest_benchmark.fixture import BenchmarkFixture
 
-from ais_area_notice import ais_string, an_util, binary, m366_22, m367_22
+from ais_area_notice import (
+    ais_string,
+    an_util,
+    binary,
+    columnar,
+    coverage_grid,
+    geojson_writer,
+    geometry,
+    interval_index,
+    m366_22,
+    m367_22,
+    network_link,
+    notice_index,
+    notice_union,
+    sensor_report_writer,
+    snapshot,
+    tangent_plane,
+    tracks,
+    utm,
+    wire,
+)
 from ais_area_notice import imo_001_22_area_notice as area_notice_22
 from ais_area_notice import imo_001_26_environment as environment_26
 from ais_area_notice import imo_001_31_met_hydro as met_hydro_31
+from ais_area_notice.decode_context import DecodeContext
 
 # ------------------------------------------------------------------------------
 # 1. ais_string benchmarks
@@ -175,6 +219,27 @@ def test_benchmark_imo_001_22_area_notice_decode(
     benchmark(_decode)
 
 
+def test_benchmark_imo_001_22_area_notice_decode_nine_sub_areas(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark IMO 8:1:22 Area Notice decoding with the most sub-areas."""
+    an = _create_area_notice_22()
+    for i in range(6):
+        an.add_subarea(
+            area_notice_22.AreaNoticeSector(
+                lon=-70.5 + i / 10,
+                lat=41.5,
+                radius=4000,
+                left_bound_deg=10,
+                right_bound_deg=50,
+            )
+        )
+    bits = an.get_bits(include_bin_hdr=True, mmsi=123456789)
+    context = DecodeContext()
+
+    benchmark(area_notice_22.AreaNotice.from_bits, bits, context)
+
+
 def test_benchmark_imo_001_22_area_notice_kml(
     benchmark: BenchmarkFixture,
 ) -> None:
@@ -183,6 +248,63 @@ def test_benchmark_imo_001_22_area_notice_kml(
     benchmark(an.kml)
 
 
+def test_benchmark_imo_001_22_area_notice_html(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark IMO 8:1:22 Area Notice HTML description."""
+    an = _create_area_notice_22()
+    benchmark(an.html)
+
+
+def test_benchmark_imo_001_22_area_notice_kml_writer(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark streaming 1000 Area Notices with KmlWriter."""
+    notices = [_create_area_notice_22() for _ in range(1000)]
+
+    def _write() -> int:
+        with area_notice_22.KmlWriter(io.StringIO(), with_time=True) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+def test_benchmark_imo_001_22_area_notice_kmz_writer(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark streaming 1000 Area Notices into a KMZ archive."""
+    notices = [_create_area_notice_22() for _ in range(1000)]
+
+    def _write() -> int:
+        with area_notice_22.KmlWriter(
+            io.BytesIO(), with_time=True, precision=5, kmz=True
+        ) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+def test_benchmark_imo_001_22_area_notice_fetcher_formatter(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark IMO 8:1:22 Area Notice Fetcher Formatter CSV rows."""
+    an = _create_area_notice_22()
+    benchmark(area_notice_22.message_2_fetcherformatter, an, timestamp=0)
+
+
+def test_benchmark_imo_001_22_area_notice_fetcher_formatter_writer(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark writing 1000 Area Notices with FetcherFormatterWriter."""
+    notices = [_create_area_notice_22() for _ in range(1000)]
+
+    def _write() -> int:
+        with area_notice_22.FetcherFormatterWriter(io.StringIO()) as writer:
+            return writer.write_all(notices, timestamp=0)
+
+    benchmark(_write)
+
+
 def test_benchmark_imo_001_22_area_notice_geo_interface(
     benchmark: BenchmarkFixture,
 ) -> None:
@@ -195,6 +317,85 @@ def test_benchmark_imo_001_22_area_notice_geo_interface(
     benchmark(_geo)
 
 
+def test_benchmark_imo_001_22_area_notice_geom(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark IMO 8:1:22 Area Notice sub-area geometry construction."""
+    areas = [
+        area_notice_22.AreaNoticeCirclePt(lon=-70.5, lat=41.5, radius=500),
+        area_notice_22.AreaNoticeRectangle(
+            lon=-70.5, lat=41.5, east_dim=10, north_dim=20, orientation_deg=15
+        ),
+        area_notice_22.AreaNoticeSector(
+            lon=-70.5, lat=41.5, radius=4000, left_bound_deg=10, right_bound_deg=50
+        ),
+        area_notice_22.AreaNoticePolygon([(10, 1400), (90, 1950)], lon=-70.5, lat=41.5),
+    ]
+
+    def _geom() -> list[object]:
+        return [area.geom() for area in areas]
+
+    benchmark(_geom)
+
+
+def _small_sector_contains() -> bool:
+    sector = area_notice_22.AreaNoticeSector(
+        lon=-70.5, lat=41.5, radius=10, left_bound_deg=0, right_bound_deg=359
+    )
+    geom = sector.geom()
+    return geom.contains(shapely.geometry.Point(-70.5, 41.50005))
+
+
+def test_benchmark_imo_001_22_area_notice_sector_contains(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark building a 10 m sector and testing a point in it."""
+    benchmark(_small_sector_contains)
+
+
+def test_benchmark_imo_001_22_area_notice_sector_contains_lod(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark the same with a 1 m level of detail."""
+    area_notice_22.set_max_chord_error(1.0)
+    try:
+        benchmark(_small_sector_contains)
+    finally:
+        area_notice_22.set_max_chord_error(None)
+
+
+def test_benchmark_geometry_build_notice_geometries(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark building the geometries of 100 Area Notices in one batch."""
+    notices = [_create_area_notice_22() for _ in range(100)]
+    for notice in notices:
+        notice.add_subarea(
+            area_notice_22.AreaNoticeSector(
+                lon=-70.5, lat=41.5, radius=4000, left_bound_deg=10, right_bound_deg=50
+            )
+        )
+    benchmark(geometry.build_notice_geometries, notices)
+
+
+def test_benchmark_geometry_geom_per_sub_area(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark calling geom() on the sub-areas of 100 Area Notices."""
+    notices = [_create_area_notice_22() for _ in range(100)]
+    for notice in notices:
+        notice.add_subarea(
+            area_notice_22.AreaNoticeSector(
+                lon=-70.5, lat=41.5, radius=4000, left_bound_deg=10, right_bound_deg=50
+            )
+        )
+
+    def _geoms() -> list[object]:
+        return [area.geom() for notice in notices for area in notice.areas]
+
+    benchmark(_geoms)
+
+
 # ------------------------------------------------------------------------------
 # 5. imo_001_26_environment benchmarks
 # ------------------------------------------------------------------------------
@@ -360,6 +561,15 @@ def test_benchmark_imo_001_31_met_hydro_decode(
     )
 
 
+def test_benchmark_imo_001_31_met_hydro_from_bits(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark IMO 8:1:31 Met/Hydro decoding without the constructor."""
+    mh = _create_met_hydro_31()
+    bits = mh.get_bits(include_bin_hdr=True)
+    benchmark(met_hydro_31.MetHydro31.from_bits, bits)
+
+
 # ------------------------------------------------------------------------------
 # 7. m366_22 benchmarks
 # ------------------------------------------------------------------------------
@@ -441,3 +651,516 @@ def test_benchmark_m367_22_decode(benchmark: BenchmarkFixture) -> None:
         return decoded
 
     benchmark(_decode)
+
+
+# ------------------------------------------------------------------------------
+# 9. utm benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_utm_new_proj(benchmark: BenchmarkFixture) -> None:
+    """Benchmark creating a Proj for each geometry, as the code used to."""
+
+    def _project() -> tuple[float, float]:
+        proj = Proj({"proj": "utm", "zone": 19})
+        x, y = proj(-70.5, 41.5)
+        return proj(x + 100, y + 100, inverse=True)
+
+    benchmark(_project)
+
+
+def test_benchmark_utm_projection(benchmark: BenchmarkFixture) -> None:
+    """Benchmark projecting with the shared UTM projection cache."""
+
+    def _project() -> tuple[float, float]:
+        proj = utm.utm_projection(19)
+        x, y = proj(-70.5, 41.5)
+        return proj(x + 100, y + 100, inverse=True)
+
+    benchmark(_project)
+
+
+# ------------------------------------------------------------------------------
+# 10. tangent_plane benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_tangent_plane_utm_circle(benchmark: BenchmarkFixture) -> None:
+    """Benchmark converting circle vertices through UTM for comparison."""
+    circle = area_notice_22.AreaNoticeCirclePt(lon=-70.5, lat=41.5, radius=4000)
+    offsets = circle.local_vertices()
+    benchmark(circle._local_to_ll, offsets)  # pylint: disable=protected-access
+
+
+def test_benchmark_tangent_plane_local_to_ll(benchmark: BenchmarkFixture) -> None:
+    """Benchmark converting circle vertices with the tangent plane engine."""
+    circle = area_notice_22.AreaNoticeCirclePt(lon=-70.5, lat=41.5, radius=4000)
+    benchmark(tangent_plane.local_to_ll, -70.5, 41.5, circle.local_vertices())
+
+
+def test_benchmark_tangent_plane_build_notice_geometries(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark building the geometries of 100 Area Notices without UTM."""
+    notices = [_create_area_notice_22() for _ in range(100)]
+    benchmark(geometry.build_notice_geometries, notices, "tangent_plane")
+
+
+# ------------------------------------------------------------------------------
+# 11. notice_index benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_notice_index_query_many(benchmark: BenchmarkFixture) -> None:
+    """Benchmark 10,000 positions against 1,000 indexed notices."""
+    index = notice_index.AreaNoticeIndex()
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    for i in range(1000):
+        notice = area_notice_22.AreaNotice(0, when, 60, i, source_mmsi=123456789)
+        notice.add_subarea(
+            area_notice_22.AreaNoticeCirclePt(
+                lon=-75 + (i % 40) / 4, lat=38 + (i // 40) / 4, radius=5000
+            )
+        )
+        index.insert(notice)
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(-75, -65, 10_000)
+    lats = rng.uniform(38, 44, 10_000)
+    times = np.full(10_000, when.timestamp() + 60)
+
+    benchmark(index.query_many, lons, lats, times)
+
+
+# ------------------------------------------------------------------------------
+# 12. interval_index benchmarks
+# ------------------------------------------------------------------------------
+
+
+def _interval_index(count: int) -> interval_index.IntervalIndex[int]:
+    """Intervals over a year that last about an hour."""
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 365 * 86400, count)
+    ends = starts + rng.exponential(3600, count)
+    index: interval_index.IntervalIndex[int] = interval_index.IntervalIndex()
+    for key, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        index.add(key, start, end, key)
+    return index
+
+
+def test_benchmark_interval_index_active_at(benchmark: BenchmarkFixture) -> None:
+    """Benchmark a stabbing query of 1,000,000 intervals."""
+    index = _interval_index(1_000_000)
+    index.active_at(0)
+    benchmark(index.active_at, 180 * 86400)
+
+
+def test_benchmark_interval_index_active_at_many(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark 1,000 stabbing queries of 100,000 intervals."""
+    index = _interval_index(100_000)
+    times = np.linspace(0, 365 * 86400, 1000)
+    benchmark(index.active_at_many, times)
+
+
+def test_benchmark_interval_index_expire(benchmark: BenchmarkFixture) -> None:
+    """Benchmark expiring half of 100,000 intervals."""
+
+    def setup() -> tuple[tuple[interval_index.IntervalIndex[int], float], dict]:
+        return (_interval_index(100_000), 180 * 86400.0), {}
+
+    benchmark.pedantic(lambda index, now: index.expire(now), setup=setup, rounds=5)
+
+
+# ------------------------------------------------------------------------------
+# 13. tracks benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_tracks_hits_and_visits(benchmark: BenchmarkFixture) -> None:
+    """Benchmark 100 tracks of 1,000 positions against 1,000 notices."""
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    notices = []
+    for i in range(1000):
+        notice = area_notice_22.AreaNotice(1, when, 600, i, source_mmsi=123456789)
+        notice.add_subarea(
+            area_notice_22.AreaNoticeCirclePt(
+                lon=-75 + (i % 40) / 4, lat=38 + (i // 40) / 4, radius=5000
+            )
+        )
+        notices.append(notice)
+    rng = np.random.default_rng(0)
+    steps = rng.normal(0, 0.005, (2, 100, 1000)).cumsum(axis=2)
+    lons = (rng.uniform(-75, -65, (100, 1)) + steps[0]).ravel()
+    lats = (rng.uniform(38, 44, (100, 1)) + steps[1]).ravel()
+    times = np.tile(when.timestamp() + 10 * np.arange(1000), 100)
+    vessels = np.repeat(np.arange(100), 1000)
+    speeds = rng.uniform(0, 20, 100_000)
+
+    def run() -> None:
+        points, indices = tracks.track_hits(lons, lats, times, notices)
+        tracks.track_visits(vessels, times, points, indices, speeds)
+
+    benchmark(run)
+
+
+# ------------------------------------------------------------------------------
+# 14. coverage_grid benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_coverage_grid_query_many(benchmark: BenchmarkFixture) -> None:
+    """Benchmark 1,000,000 positions against 1,000 rasterized notices."""
+    grid = coverage_grid.CoverageGrid(-75, 38, -65, 44, cell_size=0.02)
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    for i in range(1000):
+        notice = area_notice_22.AreaNotice(0, when, 60, i, source_mmsi=123456789)
+        notice.add_subarea(
+            area_notice_22.AreaNoticeCirclePt(
+                lon=-75 + (i % 40) / 4, lat=38 + (i // 40) / 4, radius=5000
+            )
+        )
+        grid.insert(notice)
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(-75, -65, 1_000_000)
+    lats = rng.uniform(38, 44, 1_000_000)
+    times = np.full(1_000_000, when.timestamp() + 60)
+
+    benchmark(grid.query_many, lons, lats, times)
+
+
+# ------------------------------------------------------------------------------
+# 15. notice_union benchmarks
+# ------------------------------------------------------------------------------
+
+
+def _union_notices() -> list[area_notice_22.AreaNotice]:
+    """1,001 overlapping 20 km circles."""
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    notices = []
+    for i in range(1001):
+        notice = area_notice_22.AreaNotice(1, when, 60, i, source_mmsi=123456789)
+        notice.add_subarea(
+            area_notice_22.AreaNoticeCirclePt(
+                lon=-75 + (i % 40) / 4, lat=38 + (i // 40) / 4, radius=20000
+            )
+        )
+        notice.geoms()
+        notices.append(notice)
+    return notices
+
+
+def test_benchmark_notice_union_update(benchmark: BenchmarkFixture) -> None:
+    """Benchmark the tiled union after replacing one of 1,001 notices."""
+    notices = _union_notices()
+    union = notice_union.NoticeUnion(tile_size=0.5)
+    for notice in notices:
+        union.insert(notice)
+    union.union(1)
+
+    def update() -> None:
+        union.remove((123456789, 1000))
+        union.insert(notices[1000])
+        union.union(1)
+
+    benchmark(update)
+
+
+def test_benchmark_notice_union_union_all(benchmark: BenchmarkFixture) -> None:
+    """Benchmark the union of all 1,001 notices for comparison."""
+    geoms = [notice.geoms()[0] for notice in _union_notices()]
+    benchmark(shapely.union_all, geoms)
+
+
+# ------------------------------------------------------------------------------
+# 16. network_link benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_network_link_update(benchmark: BenchmarkFixture) -> None:
+    """Benchmark an update after one of 1,001 notices moved."""
+    notices = _union_notices()
+    moved = _union_notices()[1000]
+    moved.areas[0].lon += 0.1
+    updater = network_link.KmlUpdater("http://localhost/area_notices.kml")
+    updater.document(notices)
+
+    states = [[*notices[:1000], moved], notices]
+
+    def update() -> str:
+        states.reverse()
+        return updater.update(states[0])
+
+    benchmark(update)
+
+
+# ------------------------------------------------------------------------------
+# 17. geojson_writer benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_geojson_writer_table(benchmark: BenchmarkFixture) -> None:
+    """Benchmark writing the 40,000 sub-areas of a table as GeoJSONSeq."""
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    table = columnar.AreaNoticeTable()
+    for i in range(10000):
+        notice = area_notice_22.AreaNotice(
+            1, when, 60, i % 1000, source_mmsi=366000000 + i
+        )
+        for k in range(4):
+            notice.add_subarea(
+                area_notice_22.AreaNoticeCirclePt(lon=-70 + k / 10, lat=42, radius=500)
+            )
+        table.append(notice)
+
+    def _write() -> int:
+        with geojson_writer.GeoJsonWriter(
+            io.StringIO(), seq=True, precision=5
+        ) as writer:
+            return writer.write_table(table)
+
+    benchmark(_write)
+
+
+def test_benchmark_geojson_writer_area_notices(benchmark: BenchmarkFixture) -> None:
+    """Benchmark writing 1000 Area Notices as a FeatureCollection."""
+    notices = [_create_area_notice_22() for _ in range(1000)]
+
+    def _write() -> int:
+        with geojson_writer.GeoJsonWriter(io.StringIO(), precision=5) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+# ------------------------------------------------------------------------------
+# 18. snapshot benchmarks
+# ------------------------------------------------------------------------------
+
+
+def _snapshot_notices() -> list[area_notice_22.AreaNotice]:
+    notices = [_create_area_notice_22() for _ in range(1000)]
+    for i, notice in enumerate(notices):
+        notice.link_id = i % 1000
+    return notices
+
+
+def test_benchmark_snapshot_write(
+    benchmark: BenchmarkFixture, tmp_path: pathlib.Path
+) -> None:
+    """Benchmark writing a snapshot of 1000 Area Notices with geometry."""
+    notices = _snapshot_notices()
+    path = tmp_path / "notices.snap"
+
+    def _write() -> int:
+        with snapshot.SnapshotWriter(path) as writer:
+            return writer.write_all(notices, received=0)
+
+    benchmark(_write)
+
+
+def test_benchmark_snapshot_restore(
+    benchmark: BenchmarkFixture, tmp_path: pathlib.Path
+) -> None:
+    """Benchmark loading 1000 Area Notices and their geometry from a snapshot."""
+    path = tmp_path / "notices.snap"
+    with snapshot.SnapshotWriter(path) as writer:
+        writer.write_all(_snapshot_notices(), received=0)
+
+    def _restore() -> int:
+        return sum(
+            len(notice.geoms())
+            for notice in snapshot.Snapshot(path)
+            if isinstance(notice, area_notice_22.AreaNotice)
+        )
+
+    benchmark(_restore)
+
+
+def test_benchmark_snapshot_restore_from_nmea(benchmark: BenchmarkFixture) -> None:
+    """Benchmark decoding the same 1000 Area Notices and geometry from NMEA."""
+    sentences = [
+        notice.get_aivdm(byte_align=True, source_mmsi=123456789)
+        for notice in _snapshot_notices()
+    ]
+
+    def _restore() -> int:
+        context = DecodeContext()
+        return sum(
+            len(
+                area_notice_22.AreaNotice(nmea_strings=strings, context=context).geoms()
+            )
+            for strings in sentences
+        )
+
+    benchmark(_restore)
+
+
+# ------------------------------------------------------------------------------
+# 19. wire benchmarks
+# ------------------------------------------------------------------------------
+
+
+def _wire_notices() -> list[area_notice_22.AreaNotice]:
+    notices = _snapshot_notices()
+    for notice in notices:
+        notice.geoms()
+    return notices
+
+
+def test_benchmark_wire_pickle_area_notices(benchmark: BenchmarkFixture) -> None:
+    """Benchmark a plain pickle round trip of 1000 Area Notices."""
+    notices = _wire_notices()
+
+    def _round_trip() -> int:
+        return len(pickle.loads(pickle.dumps(notices, pickle.HIGHEST_PROTOCOL)))
+
+    benchmark(_round_trip)
+
+
+def test_benchmark_wire_area_notices(benchmark: BenchmarkFixture) -> None:
+    """Benchmark encoding and decoding the wire form of the same notices."""
+    notices = _wire_notices()
+    cls = area_notice_22.AreaNotice
+
+    def _round_trip() -> int:
+        return len([cls.from_wire(notice.to_wire()) for notice in notices])
+
+    benchmark(_round_trip)
+
+
+def test_benchmark_wire_pickle_wires(benchmark: BenchmarkFixture) -> None:
+    """Benchmark a pickle round trip of 1000 received notices left encoded."""
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    wires = [
+        wire.Wire.from_bits(
+            area_notice_22.AreaNotice, notice.get_bits(include_bin_hdr=True), when
+        )
+        for notice in _snapshot_notices()
+    ]
+
+    def _round_trip() -> int:
+        return len(pickle.loads(pickle.dumps(wires, pickle.HIGHEST_PROTOCOL)))
+
+    benchmark(_round_trip)
+
+
+# ------------------------------------------------------------------------------
+# 20. sensor_report_writer benchmarks
+# ------------------------------------------------------------------------------
+
+
+def test_benchmark_sensor_report_writer_csv(
+    benchmark: BenchmarkFixture, tmp_path: pathlib.Path
+) -> None:
+    """Benchmark writing the 2000 reports of 1000 messages as CSV with lookups."""
+    messages = [_create_environment_26() for _ in range(1000)]
+
+    def _write() -> int:
+        with sensor_report_writer.SensorReportWriter(tmp_path, lookups=True) as writer:
+            return writer.write_all(messages)
+
+    benchmark(_write)
+
+
+def test_benchmark_sensor_report_writer_npy(
+    benchmark: BenchmarkFixture, tmp_path: pathlib.Path
+) -> None:
+    """Benchmark writing the 2000 reports of 1000 messages as .npy files."""
+    messages = [_create_environment_26() for _ in range(1000)]
+
+    def _write() -> int:
+        with sensor_report_writer.SensorReportWriter(tmp_path, fmt="npy") as writer:
+            return writer.write_all(messages)
+
+    benchmark(_write)
+
+
+def test_benchmark_sensor_report_writer_bits(
+    benchmark: BenchmarkFixture, tmp_path: pathlib.Path
+) -> None:
+    """Benchmark writing the reports of 100 raw payloads, decoding included."""
+    bits = _create_environment_26().get_bits(include_bin_hdr=True)
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+
+    def _write() -> int:
+        with sensor_report_writer.SensorReportWriter(tmp_path, fmt="npy") as writer:
+            return writer.write_all([bits] * 100, when)
+
+    benchmark(_write)
+
+
+# ------------------------------------------------------------------------------
+# 21. transmitted precision benchmarks
+# ------------------------------------------------------------------------------
+
+
+def _create_coarse_area_notices() -> list[area_notice_22.AreaNotice]:
+    """1000 Area Notices with 3 km circles sent with a precision of 1."""
+    when = datetime.datetime(2026, 1, 1, 12, 0, 0, tzinfo=datetime.UTC)
+    notices = []
+    for i in range(1000):
+        notice = area_notice_22.AreaNotice(1, when, 60, i, source_mmsi=366000000 + i)
+        notice.add_subarea(
+            area_notice_22.AreaNoticeCirclePt(
+                lon=-70 + i / 1000, lat=42, radius=3000, precision=1
+            )
+        )
+        notices.append(notice)
+    return notices
+
+
+def test_benchmark_transmitted_precision_kml_full(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark KML of the coarse circles at 5 decimals."""
+    notices = _create_coarse_area_notices()
+
+    def _write() -> int:
+        with area_notice_22.KmlWriter(io.StringIO(), precision=5) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+def test_benchmark_transmitted_precision_kml(benchmark: BenchmarkFixture) -> None:
+    """Benchmark KML of the coarse circles at their transmitted precision."""
+    notices = _create_coarse_area_notices()
+
+    def _write() -> int:
+        with area_notice_22.KmlWriter(
+            io.StringIO(), precision=area_notice_22.TRANSMITTED_PRECISION
+        ) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+def test_benchmark_transmitted_precision_geojson_full(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark GeoJSON of the coarse circles at 5 decimals."""
+    notices = _create_coarse_area_notices()
+
+    def _write() -> int:
+        with geojson_writer.GeoJsonWriter(
+            io.StringIO(), seq=True, precision=5
+        ) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
+
+
+def test_benchmark_transmitted_precision_geojson(
+    benchmark: BenchmarkFixture,
+) -> None:
+    """Benchmark GeoJSON of the coarse circles at their transmitted precision."""
+    notices = _create_coarse_area_notices()
+
+    def _write() -> int:
+        with geojson_writer.GeoJsonWriter(
+            io.StringIO(), seq=True, precision=area_notice_22.TRANSMITTED_PRECISION
+        ) as writer:
+            return writer.write_all(notices)
+
+    benchmark(_write)
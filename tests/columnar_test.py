@@ -0,0 +1,239 @@
+"""Tests for the columnar Area Notice table."""
+
+import datetime
+import math
+import pathlib
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from BitVector import BitVector
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.an_util import BitBuffer
+from ais_area_notice.columnar import (
+    NOTICE_DTYPE,
+    POINT_DTYPE,
+    SUB_AREA_DTYPE,
+    AreaNoticeTable,
+)
+from ais_area_notice.decode_context import DecodeContext
+
+WHEN = datetime.datetime(2026, 7, 6, 1, 2, tzinfo=datetime.UTC)
+
+
+def build_notice() -> area_notice.AreaNotice:
+    """Area Notice with one of each sub-area shape."""
+    notice = area_notice.AreaNotice(
+        area_notice.notice_type["cau_mammals_not_obs"],
+        WHEN,
+        60,
+        10,
+        source_mmsi=666555444,
+    )
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-69.8, 40.202, radius=2000))
+    notice.add_subarea(area_notice.AreaNoticeRectangle(-69.6, 40.3, 2000, 1000, 10))
+    notice.add_subarea(area_notice.AreaNoticeSector(-69.4, 40.4, 6000, 10, 50))
+    notice.add_subarea(
+        area_notice.AreaNoticePolygon([(10, 1400), (90, 1950)], -69.0, 40.6)
+    )
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="Some Text"))
+    return notice
+
+
+def test_append() -> None:
+    """Each notice is copied into the three tables."""
+    table = AreaNoticeTable()
+    assert not len(table)
+    assert table.append(build_notice()) == 0
+
+    assert len(table) == 1
+    assert table.notices.dtype == NOTICE_DTYPE
+    assert table.sub_areas.dtype == SUB_AREA_DTYPE
+    assert table.points.dtype == POINT_DTYPE
+
+    notice = table.notices[0]
+    assert notice["mmsi"] == 666555444
+    assert notice["dac"] == 1
+    assert notice["fi"] == 22
+    assert notice["link_id"] == 10
+    assert notice["area_type"] == area_notice.notice_type["cau_mammals_not_obs"]
+    assert notice["start"] == WHEN.timestamp()
+    assert notice["duration"] == 60
+    assert notice["sub_area_offset"] == 0
+    assert notice["sub_area_count"] == 5
+
+    sub_areas = table.notice_sub_areas(0)
+    assert list(sub_areas["shape"]) == [0, 1, 2, 4, 5]
+    circle, rect, sector, polygon, text = sub_areas
+    assert circle["lon"] == -69.8
+    assert circle["radius"] == 2000
+    assert math.isnan(circle["e_dim"])
+    assert rect["e_dim"] == 2000
+    assert rect["n_dim"] == 1000
+    assert rect["orientation"] == 10
+    assert math.isnan(rect["radius"])
+    assert sector["radius"] == 6000
+    assert sector["left_bound"] == 10
+    assert sector["right_bound"] == 50
+    assert polygon["lat"] == 40.6
+    assert polygon["point_count"] == 2
+    assert text["text"] == b"SOME TEXT"
+    assert math.isnan(text["lon"])
+
+    points = table.sub_area_points(3)
+    assert points.tolist() == [(10.0, 1400.0), (90.0, 1950.0)]
+
+
+def test_growth() -> None:
+    """The tables grow past the initial chunk and keep earlier rows."""
+    table = AreaNoticeTable(chunk_size=2)
+    for link_id in range(5):
+        notice = build_notice()
+        notice.link_id = link_id
+        table.append(notice)
+    assert len(table) == 5
+    assert list(table.notices["link_id"]) == [0, 1, 2, 3, 4]
+    assert list(table.notices["sub_area_offset"]) == [0, 5, 10, 15, 20]
+    assert len(table.sub_areas) == 25
+    assert len(table.points) == 10
+    assert table.sub_area_points(23).tolist() == [(10.0, 1400.0), (90.0, 1950.0)]
+
+
+def test_decode_nmea() -> None:
+    """Decoding NMEA fills the tables like appending the decoded notice."""
+    notice = build_notice()
+    context = DecodeContext(WHEN)
+    table = AreaNoticeTable()
+    assert table.decode_nmea(list(notice.get_aivdm()), context=context) == 0
+    assert table.notices[0]["start"] == WHEN.timestamp()
+    assert table.notices[0]["sub_area_count"] == 5
+    assert table.sub_areas["lon"][0] == pytest.approx(-69.8)
+    assert table.points["dist"].tolist() == [1400.0, 1950.0]
+    assert context.stats["area_notices"] == 1
+
+
+def chained_bits() -> BitVector:
+    """Message with a rectangle and a polyline that continues twice."""
+    notice = area_notice.AreaNotice(
+        area_type=1, when=WHEN, duration=60, source_mmsi=123456789
+    )
+    notice.add_subarea(area_notice.AreaNoticeRectangle(-69.6, 40.3, 2000, 1000, 10))
+    first = area_notice.AreaNoticePolyline([(0, 1000), (90, 1000)], -70.0, 42.0)
+    more = area_notice.AreaNoticePolyline([(180, 1000), (270, 500)], 0.0, 0.0)
+    continuation = more.get_bits()[area_notice.SUB_AREA_SIZE :]
+    return (
+        notice.get_bits(include_bin_hdr=True)
+        + first.get_bits()
+        + continuation
+        + continuation
+    )
+
+
+def assert_rows_equal(actual: npt.NDArray[Any], expected: npt.NDArray[Any]) -> None:
+    """Structured arrays are equal field by field, with NaN equal to NaN."""
+    assert actual.dtype == expected.dtype
+    assert expected.dtype.names is not None
+    for name in expected.dtype.names:
+        np.testing.assert_array_equal(actual[name], expected[name], err_msg=name)
+
+
+@pytest.mark.parametrize(
+    "bits",
+    [build_notice().get_bits(include_bin_hdr=True), chained_bits()],
+    ids=["shapes", "chain"],
+)
+def test_decode_bits(bits: BitVector) -> None:
+    """Direct decoding gives the rows of appending the decoded notice."""
+    expected = AreaNoticeTable()
+    expected.append(area_notice.AreaNotice.from_bits(bits, DecodeContext(WHEN)))
+    context = DecodeContext(WHEN)
+    table = AreaNoticeTable(chunk_size=1)
+    assert table.decode_bits(bits, context) == 0
+    assert table.decode_bits(BitBuffer(bits), context) == 1
+
+    assert context.stats["area_notices"] == 2
+    assert context.stats["sub_areas"] == 2 * len(expected.sub_areas)
+    sub_area_count = len(expected.sub_areas)
+    point_count = len(expected.points)
+    assert_rows_equal(table.notices[:1], expected.notices)
+    assert_rows_equal(table.sub_areas[:sub_area_count], expected.sub_areas)
+    assert_rows_equal(table.points[:point_count], expected.points)
+    assert table.notices[1]["sub_area_offset"] == sub_area_count
+    assert len(table.points) == 2 * point_count
+
+
+def test_decode_bits_chain() -> None:
+    """Continuations start where the chain so far ends."""
+    table = AreaNoticeTable()
+    table.decode_bits(chained_bits(), DecodeContext(WHEN))
+    _, first, second, third = table.sub_areas
+    chain = area_notice.PolylineChain(
+        area_notice.AreaNoticePolyline([(0, 1000), (90, 1000)], -70.0, 42.0)
+    )
+    assert (second["lon"], second["lat"]) == pytest.approx(chain.end)
+    assert first["lon"] == pytest.approx(-70.0)
+    assert third["lat"] == pytest.approx(42.0, abs=1e-3)
+    assert third["lon"] == pytest.approx(-70.0 + 500 / 82_700, abs=1e-3)
+
+
+def test_decode_bits_errors(capsys: pytest.CaptureFixture[str]) -> None:
+    """Unknown shapes are skipped and polylines need a start."""
+    header = area_notice.AreaNotice(area_type=1, when=WHEN, duration=60).get_bits(
+        include_bin_hdr=True
+    )
+    unknown = BitVector.from_int(6) + BitVector(size=area_notice.SUB_AREA_SIZE - 3)
+    table = AreaNoticeTable()
+    table.decode_bits(header + unknown)
+    assert "unknown shape type 6" in capsys.readouterr().err
+    assert table.notices[0]["sub_area_count"] == 0
+
+    polyline = area_notice.AreaNoticePolyline([(0, 1000)], -70.0, 42.0)
+    with pytest.raises(area_notice.AisPackingException, match="must precede"):
+        table.decode_bits(
+            header + polyline.get_bits()[area_notice.SUB_AREA_SIZE :],
+            DecodeContext(WHEN),
+        )
+
+
+def test_decode_bits_reserved() -> None:
+    """Reserved values are rejected like when decoding an AreaNotice."""
+    notice = build_notice()
+    circle = notice.areas[0]
+    assert isinstance(circle, area_notice.AreaNoticeCirclePt)
+    circle.precision = 6
+    table = AreaNoticeTable()
+    with pytest.raises(
+        area_notice.AisUnpackingException, match="Reserved values: precision=6"
+    ):
+        table.decode_bits(notice.get_bits(include_bin_hdr=True), DecodeContext(WHEN))
+    assert not len(table)
+    assert not len(table.sub_areas)
+
+
+def test_save_and_load(tmp_path: pathlib.Path) -> None:
+    """Saved tables can be memory mapped and appended to."""
+    table = AreaNoticeTable()
+    table.append(build_notice())
+    table.save(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "notices.npy",
+        "points.npy",
+        "sub_areas.npy",
+    ]
+
+    loaded = AreaNoticeTable.load(tmp_path)
+    assert isinstance(loaded.notices, np.memmap)
+    assert loaded.notices.tolist() == table.notices.tolist()
+    assert loaded.points.tolist() == table.points.tolist()
+    np.testing.assert_array_equal(loaded.sub_areas["lon"], table.sub_areas["lon"])
+
+    loaded.append(build_notice())
+    assert len(loaded) == 2
+    assert loaded.notices[1]["sub_area_offset"] == 5
+    assert loaded.sub_area_points(8).tolist() == [(10.0, 1400.0), (90.0, 1950.0)]
+
+    in_memory = AreaNoticeTable.load(str(tmp_path), mmap_mode=None)
+    assert not isinstance(in_memory.notices, np.memmap)
+    assert len(in_memory) == 1
@@ -0,0 +1,120 @@
+"""Tests for the raster of cells covered by Area Notices."""
+
+import datetime
+
+import numpy as np
+import pytest
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.coverage_grid import CoverageGrid
+from ais_area_notice.notice_index import AreaNoticeIndex
+from tests.notice_index_test import make_notice
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = WHEN.timestamp()
+
+
+def test_invalid() -> None:
+    """Empty bounds and cells are rejected."""
+    with pytest.raises(ValueError):
+        CoverageGrid(-70, 42, -71, 43)
+    with pytest.raises(ValueError):
+        CoverageGrid(-71, 42, -70, 43, cell_size=0)
+
+
+def test_query() -> None:
+    """Inside, boundary and outside cells of a circle."""
+    grid = CoverageGrid(-71, 41, -69, 43)
+    assert grid.shape == (200, 200)
+    notice = make_notice(radius=4000)
+    assert grid.insert(notice)
+    assert len(grid) == 1
+    assert (123456789, 1) in grid
+    assert list(grid) == [notice]
+
+    assert grid.query(-70.0, 42.0, WHEN) == [notice]
+    # Near the edge, 3.9 and 4.1 km east.
+    assert grid.query(-70.0 + 3900 / 82800, 42.0, T0) == [notice]
+    assert grid.query(-70.0 + 4100 / 82800, 42.0, T0) == []
+    assert grid.query(-70.0, 42.0, T0 + 3600) == []
+    assert grid.query(-72.0, 42.0, T0) == []
+
+
+def test_matches_index() -> None:
+    """Random positions give the same hits as AreaNoticeIndex."""
+    grid = CoverageGrid(-71, 41, -69, 43, cell_size=0.02)
+    index = AreaNoticeIndex()
+    areas = [
+        area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=20000),
+        area_notice.AreaNoticeCirclePt(-70.1, 42.1, radius=5000),
+        area_notice.AreaNoticeRectangle(-70.5, 41.5, 30000, 20000, 30),
+        area_notice.AreaNoticeSector(-69.5, 42.5, 20000, 10, 100),
+        area_notice.AreaNoticePolygon(
+            [(0, 9000), (90, 9000), (200, 9000)], -70.3, 42.6
+        ),
+        # Partly off the grid.
+        area_notice.AreaNoticeCirclePt(-69.0, 41.0, radius=30000),
+    ]
+    for link_id, area in enumerate(areas):
+        notice = make_notice(area=area, link_id=link_id, duration=10 * (link_id + 1))
+        grid.insert(notice)
+        index.insert(notice)
+
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(-71.2, -68.8, 20_000)
+    lats = rng.uniform(40.8, 43.2, 20_000)
+    times = T0 + rng.uniform(0, 3600, 20_000)
+    positions, notices = grid.query_many(lons, lats, times)
+    expected_positions, expected_notices = index.query_many(lons, lats, times)
+    on_grid = (lons >= -71) & (lons < -69) & (lats >= 41) & (lats < 43)
+    keep = on_grid[expected_positions]
+    assert positions.tolist() == expected_positions[keep].tolist()
+    assert sorted(map(id, notices)) == sorted(
+        id(notice) for notice, k in zip(expected_notices, keep, strict=True) if k
+    )
+    assert len(positions) > 500
+
+
+def test_replace_remove_expire() -> None:
+    """Bits are cleared and reused as notices come and go."""
+    grid = CoverageGrid(-71, 41, -69, 43)
+    old = make_notice()
+    new = make_notice(-69.5, when=WHEN + datetime.timedelta(minutes=5))
+    grid.insert(old)
+    assert grid.insert(new)
+    assert not grid.insert(old)
+    assert grid.get((123456789, 1)) is new
+    assert grid.query(-70.0, 42.0, T0 + 600) == []
+    assert grid.query(-69.5, 42.0, T0 + 600) == [new]
+
+    cancel = make_notice(
+        when=WHEN + datetime.timedelta(minutes=6),
+        area_type=area_notice.notice_type["cancel_area_notice"],
+    )
+    assert grid.insert(cancel)
+    assert len(grid) == 0
+    assert grid.remove((123456789, 1)) is None
+    assert grid.query(-69.5, 42.0, T0 + 600) == []
+
+    notices = [make_notice(link_id=i, duration=i + 1) for i in range(70)]
+    for notice in notices:
+        grid.insert(notice)
+    positions, hits = grid.query_many([-70.0], [42.0], [T0])
+    assert positions.tolist() == [0] * 70
+    assert sorted(map(id, hits)) == sorted(map(id, notices))
+    assert grid.expire(T0 + 600) == notices[:10]
+    assert len(grid.query(-70.0, 42.0, T0 + 30)) == 60
+    assert grid.query(-70.0, 42.0, T0 + 4199) == [notices[69]]
+
+
+def test_lines_and_text() -> None:
+    """Polylines never contain positions and free text covers nothing."""
+    grid = CoverageGrid(-71, 41, -69, 43)
+    line = make_notice(area=area_notice.AreaNoticePolyline([(90, 5000)], -70.0, 42.0))
+    text = make_notice(area=area_notice.AreaNoticeFreeText(text="WHALES"), link_id=2)
+    point = make_notice(-70.5, 42.5, radius=0, link_id=3)
+    for notice in (line, text, point):
+        grid.insert(notice)
+    assert grid.query(-70.0, 42.0, T0) == []
+    assert grid.query(-70.5, 42.5, T0) == [point]
+    assert grid.query(-70.5, 42.5001, T0) == []
@@ -0,0 +1,179 @@
+"""Tests for the shared decode state."""
+
+import datetime
+from typing import Self
+
+import pytest
+
+from ais_area_notice import decode_context
+from ais_area_notice.decode_context import DecodeContext
+
+
+def utc(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0
+) -> datetime.datetime:
+    """Build a UTC datetime."""
+    return datetime.datetime(
+        year, month, day, hour, minute, second, tzinfo=datetime.UTC
+    )
+
+
+def test_reference_time_clock_read_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The clock is only read the first time the reference time is needed."""
+    calls = []
+
+    class FakeDatetime(datetime.datetime):
+        """datetime with a counting now()."""
+
+        @classmethod
+        def now(cls, tz: datetime.tzinfo | None = None) -> Self:
+            calls.append(tz)
+            return cls(2026, 3, 4, 5, 6, tzinfo=tz)
+
+    monkeypatch.setattr(datetime, "datetime", FakeDatetime)
+    context = DecodeContext()
+    assert not calls
+    assert context.reference_time.year == 2026
+    assert context.reference_time.month == 3
+    assert len(calls) == 1
+
+
+def test_reference_time_setter_adds_utc() -> None:
+    """Naive reference times are treated as UTC."""
+    context = DecodeContext()
+    context.reference_time = datetime.datetime(2020, 1, 2, 3, 4)
+    assert context.reference_time == utc(2020, 1, 2, 3, 4)
+    context.reference_time = utc(2021, 5, 6)
+    assert context.reference_time == utc(2021, 5, 6)
+
+
+def test_reference_time_constructor_adds_utc() -> None:
+    """A naive reference time passed to the constructor is treated as UTC."""
+    context = DecodeContext(datetime.datetime(2024, 6, 1, 12))
+    assert context.reference_time == utc(2024, 6, 1, 12)
+    assert context.infer_datetime(5, 31, 8, 0) == utc(2024, 5, 31, 8)
+
+
+def test_update_from_nmea() -> None:
+    """The NMEA time_stamp trailer replaces the reference time."""
+    context = DecodeContext(utc(2000, 1, 1))
+    context.update_from_nmea({"time_stamp": None})
+    assert context.reference_time == utc(2000, 1, 1)
+    context.update_from_nmea({"time_stamp": "1297555217"})
+    assert context.reference_time == utc(2011, 2, 13, 0, 0, 17)
+    context.update_from_nmea({"time_stamp": "1297555217.5"})
+    assert context.reference_time.microsecond == 500000
+
+
+@pytest.mark.parametrize(
+    ("reference", "month", "day", "expected_year"),
+    [
+        (utc(2026, 6, 15), 6, 1, 2026),
+        (utc(2026, 1, 1, 0, 5), 12, 31, 2025),
+        (utc(2025, 12, 31, 23, 55), 1, 1, 2026),
+        (utc(2026, 1, 10), 7, 1, 2026),
+        (utc(2026, 1, 10), 7, 20, 2025),
+        # Only valid in the leap year.
+        (utc(2025, 1, 1), 2, 29, 2024),
+    ],
+)
+def test_infer_datetime(
+    reference: datetime.datetime, month: int, day: int, expected_year: int
+) -> None:
+    """Pick the year closest to the reference time."""
+    context = DecodeContext(reference)
+    when = context.infer_datetime(month, day, 12, 30)
+    assert when == utc(expected_year, month, day, 12, 30)
+
+
+def test_infer_datetime_invalid() -> None:
+    """Dates that do not exist in any candidate year raise ValueError."""
+    context = DecodeContext(utc(2026, 6, 1))
+    with pytest.raises(ValueError, match="month=0"):
+        context.infer_datetime(0, 1, 0, 0)
+    with pytest.raises(ValueError):
+        context.infer_datetime(6, 1, 24, 0)
+
+
+@pytest.mark.parametrize(
+    ("reference", "day", "expected"),
+    [
+        (utc(2026, 6, 15), 15, (2026, 6)),
+        (utc(2026, 1, 1, 0, 5), 31, (2025, 12)),
+        (utc(2025, 12, 31, 22), 1, (2026, 1)),
+        # There is no February 30.
+        (utc(2026, 3, 1), 30, (2026, 3)),
+        # Day 31 does not exist in April, so use March.
+        (utc(2026, 4, 20), 31, (2026, 3)),
+        # Not a valid day at all.
+        (utc(2026, 4, 20), 0, (2026, 4)),
+    ],
+)
+def test_infer_year_month(
+    reference: datetime.datetime, day: int, expected: tuple[int, int]
+) -> None:
+    """Pick the month closest to the reference time."""
+    context = DecodeContext(reference)
+    assert context.infer_year_month(day) == expected
+
+
+def test_intern() -> None:
+    """Equal strings come back as the same object."""
+    context = DecodeContext()
+    first = str(123456789)
+    second = str(123456789)
+    assert first is not second
+    assert context.intern(first) is first
+    assert context.intern(second) is first
+
+
+def test_get_proj_cached() -> None:
+    """Projections are created once per zone."""
+    context = DecodeContext()
+    proj = context.get_proj(19)
+    assert context.get_proj(19) is proj
+    assert context.get_proj(20) is not proj
+    x, y = proj(-69.0, 42.0)
+    assert x == pytest.approx(500000, abs=1)
+    assert y > 0
+
+
+def test_count() -> None:
+    """Counters accumulate."""
+    context = DecodeContext()
+    context.count("sub_areas", 3)
+    context.count("sub_areas")
+    context.count("area_notices")
+    assert context.stats == {"sub_areas": 4, "area_notices": 1}
+
+
+def test_default_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The default context reads the clock at most once a minute."""
+    clock = [1000.0]
+    monkeypatch.setattr(decode_context.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(decode_context, "_shared", decode_context._SharedContext())
+    context = decode_context.default_context()
+    assert decode_context.default_context() is context
+    clock[0] += decode_context.CLOCK_REFRESH_SECONDS - 1
+    assert decode_context.default_context() is context
+    clock[0] += 1
+    newer = decode_context.default_context()
+    assert newer is not context
+    assert newer.reference_time >= context.reference_time
+
+
+def test_nmea_context() -> None:
+    """The receive time of the sentences becomes the reference time."""
+    stamped: list[dict[str, str | None]] = [
+        {"time_stamp": None},
+        {"time_stamp": "1297555217"},
+    ]
+    context = decode_context.nmea_context(stamped)
+    assert context.reference_time == utc(2011, 2, 13, 0, 0, 17)
+    assert context is not decode_context.default_context()
+    assert decode_context.nmea_context(stamped[:1]) is (
+        decode_context.default_context()
+    )
+    shared = DecodeContext(utc(2000, 1, 1))
+    assert decode_context.nmea_context(stamped, shared) is shared
+    assert shared.reference_time == utc(2011, 2, 13, 0, 0, 17)
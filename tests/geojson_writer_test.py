@@ -0,0 +1,225 @@
+"""Tests for streaming GeoJSON output."""
+
+import datetime
+import io
+import json
+import pathlib
+
+import pytest
+import shapely
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import imo_001_26_environment as env
+from ais_area_notice import imo_001_31_met_hydro as met_hydro
+from ais_area_notice.columnar import AreaNoticeTable
+from ais_area_notice.geojson_writer import RECORD_SEPARATOR, GeoJsonWriter
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = int(WHEN.timestamp())
+MMSI = 366123456
+
+
+def build_notice() -> area_notice.AreaNotice:
+    notice = area_notice.AreaNotice(1, WHEN, 60, 7, source_mmsi=MMSI)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=2000))
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.1, 42.1, radius=0))
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+    notice.add_subarea(
+        area_notice.AreaNoticePolyline([(10, 1400), (90, 1950)], -69.0, 40.6)
+    )
+    return notice
+
+
+def build_environment() -> env.Environment:
+    msg = env.Environment(source_mmsi=MMSI)
+    msg.append(
+        env.SensorReportLocation(
+            day=6, hour=12, minute=0, site_id=11, lon=-70.5, lat=41.25, alt=3.5
+        )
+    )
+    msg.append(env.SensorReportLocation(day=6, hour=12, minute=0, site_id=12))
+    msg.append(env.SensorReportId(day=6, hour=12, minute=0, site_id=11, id_str="A"))
+    return msg
+
+
+def test_feature_collection() -> None:
+    """Each supported message writes features that json can read."""
+    out = io.StringIO()
+    notice = build_notice()
+    with GeoJsonWriter(out) as writer:
+        assert writer.write(notice) == 3
+        assert writer.write(build_environment()) == 1
+        assert writer.write(met_hydro.MetHydro31(MMSI, lon=-71.0, lat=41.5)) == 1
+        assert writer.write(met_hydro.MetHydro31(MMSI)) == 0
+        with pytest.raises(TypeError):
+            writer.write(area_notice.BBM())  # type: ignore[arg-type]
+    assert writer.features == 5
+    collection = json.loads(out.getvalue())
+    assert collection["type"] == "FeatureCollection"
+    features = collection["features"]
+    assert [f["geometry"]["type"] for f in features] == [
+        "Polygon",
+        "Point",
+        "LineString",
+        "Point",
+        "Point",
+    ]
+
+    circle = features[0]
+    assert circle["properties"] == {
+        "mmsi": MMSI,
+        "link_id": 7,
+        "area_type": 1,
+        "start": T0,
+        "stop": T0 + 3600,
+        "sub_area": 0,
+        "area_shape": 0,
+    }
+    assert shapely.geometry.shape(circle["geometry"]).equals(notice.areas[0].geom())
+    assert features[2]["properties"]["sub_area"] == 3
+    line = notice.areas[3].geom()
+    assert isinstance(line, shapely.geometry.LineString)
+    assert features[2]["geometry"]["coordinates"] == [list(xy) for xy in line.coords]
+
+    site = features[3]
+    assert site["geometry"]["coordinates"] == [-70.5, 41.25]
+    assert site["properties"]["site_id"] == 11
+    assert site["properties"]["alt"] == 3.5
+
+    station = features[4]
+    assert station["geometry"]["coordinates"] == [-71.0, 41.5]
+    assert station["properties"]["mmsi"] == MMSI
+    assert station["properties"]["air_temp"] == -102.4
+    assert station["properties"]["cur_level_2"] == 31
+
+    out = io.StringIO()
+    GeoJsonWriter(out).close()
+    assert json.loads(out.getvalue())["features"] == []
+
+
+def test_without_mmsi() -> None:
+    """Unknown values are null."""
+    notice = area_notice.AreaNotice(1, WHEN, 60, 7)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=0))
+    out = io.StringIO()
+    with GeoJsonWriter(out, seq=True) as writer:
+        writer.write(notice)
+    assert json.loads(out.getvalue()[1:])["properties"]["mmsi"] is None
+
+
+def test_sequence(tmp_path: pathlib.Path) -> None:
+    """Text sequences write one feature per record."""
+    path = tmp_path / "notices.geojsons"
+    with GeoJsonWriter(path, seq=True, precision=3) as writer:
+        writer.write_all([build_notice(), build_environment()])
+    text = path.read_text()
+    records = text.split(RECORD_SEPARATOR)
+    assert records[0] == ""
+    features = [json.loads(record) for record in records[1:]]
+    assert len(features) == 4
+    assert features[1]["geometry"]["coordinates"] == [-70.1, 42.1]
+    for feature in features:
+        for x, y in shapely.get_coordinates(
+            shapely.geometry.shape(feature["geometry"])
+        ):
+            assert round(x, 3) == x
+            assert round(y, 3) == y
+
+    out = io.StringIO()
+    writer = GeoJsonWriter(out, seq=True, record_separator=False)
+    writer.write(build_environment())
+    writer.close()
+    writer.close()
+    assert out.getvalue().count("\n") == 1
+    assert RECORD_SEPARATOR not in out.getvalue()
+    assert not out.closed
+
+    with pytest.raises(ValueError, match="precision"):
+        GeoJsonWriter(io.StringIO(), precision=-1)
+
+
+def test_transmitted_precision() -> None:
+    """Sub-areas are rounded to the precision they were sent with."""
+    notice = area_notice.AreaNotice(1, WHEN, 60, 7, source_mmsi=MMSI)
+    notice.add_subarea(
+        area_notice.AreaNoticeCirclePt(-70.123, 42.456, radius=3000, precision=0)
+    )
+    notice.add_subarea(
+        area_notice.AreaNoticeCirclePt(-70.12345, 42.45678, radius=0, precision=1)
+    )
+    notice.add_subarea(
+        area_notice.AreaNoticePolyline([(10, 1400)], -70.12345, 42.45678)
+    )
+    out = io.StringIO()
+    with GeoJsonWriter(out, precision=area_notice.TRANSMITTED_PRECISION) as writer:
+        writer.write(notice)
+        writer.write(build_environment())
+    circle, point, line, site = json.loads(out.getvalue())["features"]
+    (ring,) = circle["geometry"]["coordinates"]
+    assert 4 <= len(ring) < len(shapely.get_coordinates(notice.areas[0].geom()))
+    assert ring[0] == ring[-1]
+    assert all(round(x, 2) == x and round(y, 2) == y for x, y in ring)
+    assert point["geometry"]["coordinates"] == [-70.123, 42.457]
+    # Polylines have no precision field and sensor sites are written as is.
+    assert line["geometry"]["coordinates"][0] == [-70.12345, 42.45678]
+    assert site["geometry"]["coordinates"] == [-70.5, 41.25]
+
+    with pytest.raises(ValueError, match="precision"):
+        GeoJsonWriter(io.StringIO(), precision="exact")
+
+    out = io.StringIO()
+    with GeoJsonWriter(out, precision=area_notice.TRANSMITTED_PRECISION) as writer:
+        table = AreaNoticeTable()
+        table.append(notice)
+        writer.write_table(table)
+    anchor = json.loads(out.getvalue())["features"][1]["geometry"]["coordinates"]
+    assert anchor == [-70.12345, 42.45678]
+
+
+def test_write_table() -> None:
+    """Tables write a point at the anchor of each sub-area."""
+    out = io.StringIO()
+    with GeoJsonWriter(out) as writer:
+        table = AreaNoticeTable()
+        table.append(build_notice())
+        writer.write_table(table)
+    assert json.loads(out.getvalue())["features"][0]["geometry"] == {
+        "type": "Point",
+        "coordinates": [-70.0, 42.0],
+    }
+
+    table = AreaNoticeTable(chunk_size=2)
+    notice = build_notice()
+    notice.add_subarea(area_notice.AreaNoticeRectangle(-69.6, 40.3, 2000, 1000, 10))
+    table.append(notice)
+    other = area_notice.AreaNotice(2, WHEN, 30, 8, source_mmsi=MMSI)
+    other.add_subarea(area_notice.AreaNoticeSector(-69.4, 40.4, 6000, 10, 50))
+    table.append(other)
+
+    out = io.StringIO()
+    with GeoJsonWriter(out, precision=2) as writer:
+        assert writer.write_table(table) == 5
+        assert writer.write_table(AreaNoticeTable()) == 0
+    features = json.loads(out.getvalue())["features"]
+    assert [f["properties"]["sub_area"] for f in features] == [0, 1, 3, 4, 0]
+    assert features[0]["geometry"] == {"type": "Point", "coordinates": [-70.0, 42.0]}
+    assert features[0]["properties"] == {
+        "mmsi": MMSI,
+        "link_id": 7,
+        "area_type": 1,
+        "start": T0,
+        "stop": T0 + 3600,
+        "sub_area": 0,
+        "area_shape": 0,
+        "radius": 2000.0,
+        "e_dim": None,
+        "n_dim": None,
+        "orientation": None,
+        "left_bound": None,
+        "right_bound": None,
+    }
+    assert features[3]["properties"]["e_dim"] == 2000.0
+    sector = features[4]["properties"]
+    assert sector["stop"] == T0 + 1800
+    assert sector["left_bound"] == 10.0
+    assert sector["area_type"] == 2
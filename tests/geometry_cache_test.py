@@ -0,0 +1,96 @@
+"""Tests for memoized sub-area geometry."""
+
+from collections.abc import Iterator
+
+import pytest
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import geometry_cache
+
+
+@pytest.fixture
+def shared_cache() -> Iterator[geometry_cache.GeometryCache]:
+    """Turn on the process-wide cache for one test."""
+    cache = geometry_cache.GeometryCache(maxsize=8)
+    geometry_cache.set_geometry_cache(cache)
+    try:
+        yield cache
+    finally:
+        geometry_cache.set_geometry_cache(None)
+
+
+def test_lru() -> None:
+    """The least recently used result is dropped first."""
+    cache = geometry_cache.GeometryCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_memoized_on_object() -> None:
+    """Geometry is built once and rebuilt when the shape changes."""
+    assert geometry_cache.get_geometry_cache() is None
+    circle = area_notice.AreaNoticeCirclePt(-69.5, 42.3, radius=1000)
+    geom = circle.geom()
+    assert circle.geom() is geom
+    assert circle.__geo_interface__ == circle.__geo_interface__
+
+    circle.radius = 2000
+    bigger = circle.geom()
+    assert bigger is not geom
+    assert bigger.area > geom.area
+    assert circle.geom() is bigger
+
+
+def test_polyline_points_changed() -> None:
+    """Appending a point invalidates the memoized polyline."""
+    line = area_notice.AreaNoticePolyline([(10, 1400)], -69.5, 42.3)
+    coords = line.__geo_interface__["geometry"]["coordinates"]
+    assert len(coords) == 2
+    line.points.append((90, 1950))
+    coords = line.__geo_interface__["geometry"]["coordinates"]
+    assert len(coords) == 3
+
+
+def test_geo_interface_not_shared() -> None:
+    """Changing a returned dict does not change the next one."""
+    polygon = area_notice.AreaNoticePolygon([(10, 1400), (90, 1950)], -69.5, 42.3)
+    geo = polygon.__geo_interface__
+    geo["geometry"]["type"] = "Changed"
+    assert polygon.__geo_interface__["geometry"]["type"] == "Polygon"
+    coords = polygon.__geo_interface__["geometry"]["coordinates"]
+    assert coords[0] == coords[-1]
+
+
+def test_shared_cache(shared_cache: geometry_cache.GeometryCache) -> None:
+    """Sub-areas with the same shape share one geometry."""
+    assert geometry_cache.get_geometry_cache() is shared_cache
+    first = area_notice.AreaNoticeRectangle(-69.5, 42.3, 2000, 1000, 10)
+    second = area_notice.AreaNoticeRectangle(-69.5, 42.3, 2000, 1000, 10)
+    other = area_notice.AreaNoticeSector(-69.5, 42.3, 2000, 10, 50)
+    assert second.geom() is first.geom()
+    assert other.geom() is not first.geom()
+    assert shared_cache.hits == 1
+    assert shared_cache.misses == 2
+
+
+def test_seed_geometry() -> None:
+    """A seeded result is returned until the shape changes."""
+    circle = area_notice.AreaNoticeCirclePt(-69.5, 42.3, radius=1000)
+    seeded = area_notice.AreaNoticeCirclePt(-69.5, 42.3, radius=500).geom()
+    geometry_cache.seed_geometry(circle, "geom", seeded)
+    assert circle.geom() is seeded
+
+    circle.radius = 2000
+    assert circle.geom() is not seeded
+    assert circle.geom().area > seeded.area
@@ -0,0 +1,89 @@
+"""Tests for building sub-area geometries in batches."""
+
+import datetime
+
+import shapely
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.geometry import build_geometries, build_notice_geometries
+
+WHEN = datetime.datetime(2026, 7, 6, 1, 2, tzinfo=datetime.UTC)
+
+
+def build_notice(lon: float) -> area_notice.AreaNotice:
+    """Area Notice with one of each sub-area shape starting near lon."""
+    notice = area_notice.AreaNotice(
+        area_notice.notice_type["cau_mammals_not_obs"], WHEN, 60, 10
+    )
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(lon, 40.2, radius=2000))
+    notice.add_subarea(area_notice.AreaNoticeRectangle(lon, 40.3, 2000, 1000, 10))
+    notice.add_subarea(area_notice.AreaNoticeSector(lon + 0.2, 40.4, 6000, 10, 50))
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(lon + 0.4, 40.5, radius=0))
+    notice.add_subarea(
+        area_notice.AreaNoticePolyline([(10, 1400), (90, 1950)], lon, 40.6)
+    )
+    notice.add_subarea(
+        area_notice.AreaNoticePolygon([(10, 1400), (90, 1950)], lon + 0.4, 40.6)
+    )
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="Some Text"))
+    return notice
+
+
+def test_build_geometries_matches_geom() -> None:
+    """The batch geometries are the same as the ones from geom()."""
+    areas = build_notice(-69.8).areas
+    geoms = build_geometries(areas)
+    assert len(geoms) == len(areas)
+    assert geoms[-1] is None
+    for area, geom in zip(areas[:-1], geoms[:-1], strict=True):
+        expected = area.geom()
+        assert geom is not None
+        assert expected is not None
+        assert geom.geom_type == expected.geom_type
+        assert shapely.equals_exact(geom, expected, tolerance=1e-9)
+
+
+def test_build_notice_geometries() -> None:
+    """Notices in several UTM zones keep their sub-areas in order."""
+    notices = [build_notice(lon) for lon in (-69.8, -63.9, 10.1, -69.5)]
+    per_notice = build_notice_geometries(notices)
+    assert [len(geoms) for geoms in per_notice] == [7, 7, 7, 7]
+    for notice, geoms in zip(notices, per_notice, strict=True):
+        types = [None if geom is None else geom.geom_type for geom in geoms]
+        assert types == [
+            "Polygon",
+            "Polygon",
+            "Polygon",
+            "Point",
+            "LineString",
+            "Polygon",
+            None,
+        ]
+        for area, geom in zip(notice.areas[:-1], geoms, strict=False):
+            assert shapely.equals_exact(geom, area.geom(), tolerance=1e-9)
+
+
+def test_build_geometries_empty() -> None:
+    """No sub-areas give no geometries."""
+    assert build_geometries([]) == []
+    assert build_notice_geometries([]) == []
+    text = area_notice.AreaNoticeFreeText(text="ONLY TEXT")
+    assert build_geometries([text]) == [None]
+
+
+def test_build_geometries_tangent_plane() -> None:
+    """With the tangent_plane engine, the batch matches geom() as well."""
+    notices = [build_notice(lon) for lon in (-69.8, 10.1, 179.5)]
+    areas = [area for notice in notices for area in notice.areas]
+    area_notice.set_geometry_engine("tangent_plane")
+    try:
+        geoms = build_geometries(areas)
+        expected = [area.geom() for area in areas]
+    finally:
+        area_notice.set_geometry_engine("utm")
+    assert build_geometries(areas, "tangent_plane") == geoms
+    for geom, want in zip(geoms, expected, strict=True):
+        if want is None:
+            assert geom is None
+        else:
+            assert shapely.equals_exact(geom, want, tolerance=1e-9)
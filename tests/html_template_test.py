@@ -0,0 +1,38 @@
+"""Tests for the precompiled HTML templates."""
+
+import pytest
+
+from ais_area_notice.html_template import HtmlTemplate, escape, summary_list
+
+
+def test_escape() -> None:
+    """Markup in values is escaped."""
+    assert escape('<b>"A" & B</b>') == "&lt;b&gt;&quot;A&quot; &amp; B&lt;/b&gt;"
+    assert escape(1.5) == "1.5"
+
+
+def test_render() -> None:
+    """Fields are escaped unless they hold markup."""
+    template = HtmlTemplate("<p title={{x}}>{text}</p>{extra:html}{text}")
+    assert template.fields == ("text", "extra", "text")
+    assert template.render(text="a<b", extra="<br>") == (
+        "<p title={x}>a&lt;b</p><br>a&lt;b"
+    )
+    assert HtmlTemplate("plain").render() == "plain"
+    with pytest.raises(KeyError):
+        template.render(text="a")
+
+
+@pytest.mark.parametrize("template", ["{}", "{a!r}", "{a:>5}"])
+def test_invalid(template: str) -> None:
+    """Only named fields with no spec or the html spec are allowed."""
+    with pytest.raises(ValueError, match="Unsupported field"):
+        HtmlTemplate(template)
+
+
+def test_summary_list() -> None:
+    """A paragraph and an ordered list."""
+    assert summary_list("S & T", ["<1>", 2]) == (
+        "<div><p>S &amp; T</p><ol><li>&lt;1&gt;</li><li>2</li></ol></div>"
+    )
+    assert summary_list("S", []) == "<div><p>S</p><ol></ol></div>"
@@ -5,18 +5,26 @@ TODO(schwehr): Need to test the year and month roll overs in time.
 """
 
 import datetime
+import io
 import math
 import pathlib
+import re
 import runpy
 import sys
-from collections.abc import Sequence
+import zipfile
+from collections.abc import Iterator, Sequence
 from typing import Any
 
 import geojson
+import numpy as np
 import pytest
+import shapely.geometry
 from BitVector import BitVector
+from lxml import etree
 
 import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.an_util import BitBuffer
+from ais_area_notice.decode_context import DecodeContext
 
 PI_2 = math.pi / 2
 PI_4 = math.pi / 4
@@ -843,6 +851,24 @@ def test_ll_to_polyline_and_helpers() -> None:
     assert len(offsets) == 2
 
 
+def test_lon_to_utm_zone_wraps() -> None:
+    """Longitudes at and past the antimeridian give valid zones."""
+    assert area_notice.lon_to_utm_zone(-180) == 1
+    assert area_notice.lon_to_utm_zone(-70.5) == 19
+    assert area_notice.lon_to_utm_zone(179.99) == 60
+    assert area_notice.lon_to_utm_zone(180) == 1
+    assert area_notice.lon_to_utm_zone(181) == 1
+
+
+def test_ll_to_delta_m_across_antimeridian() -> None:
+    """The offset between points on either side of 180 is the short way."""
+    dx, dy = area_notice.ll_to_delta_m(179.9, 0, -179.9, 0)
+    assert dx == pytest.approx(22_286, abs=1)
+    assert dy == pytest.approx(0, abs=1e-6)
+    dx, _ = area_notice.ll_to_delta_m(-179.9, 0, 179.9, 0)
+    assert dx == pytest.approx(-22_286, abs=1)
+
+
 def test_frange_defaults() -> None:
     """Test floating point range generator defaults."""
     r1 = list(area_notice.frange(5))
@@ -972,13 +998,12 @@ def test_area_notice_kml_options(
     assert "<ExtendedData>" in kml_str
     assert "<TimeSpan>" in kml_str
 
-    styles_file = tmp_path / "areanotice_styles.kml"
-    styles_file.write_text('<Style id="test"></Style>')
+    # Styles come from the package, not the current directory.
     monkeypatch.chdir(tmp_path)
-
     full_kml = an.kml(full=True)
-    assert '<Style id="test"></Style>' in full_kml
-    assert "</kml>" in full_kml
+    assert full_kml.startswith(area_notice.kml_head)
+    assert '<StyleMap id="AreaNotice_1">' in full_kml
+    assert full_kml.endswith("</kml>")
 
     class NoGeomSubArea(area_notice.AreaNoticeSubArea):
         """Mock subarea without geometry for KML export testing."""
@@ -1007,6 +1032,225 @@ def test_area_notice_kml_options(
     assert an_nogeom.kml() == ""
 
 
+def test_kml_writer(tmp_path: pathlib.Path) -> None:
+    """KmlWriter streams placemarks into folders of a valid document."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    notices = []
+    for area_type, mmsi in ((1, 123456789), (1, 987654321), (2, 987654321)):
+        notice = area_notice.AreaNotice(
+            area_type=area_type, when=when, duration=60, source_mmsi=mmsi
+        )
+        notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=100))
+        notice.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+        notices.append(notice)
+    empty = area_notice.AreaNotice(area_type=1, when=when, duration=60)
+
+    path = tmp_path / "notices.kml"
+    with area_notice.KmlWriter(path, folders="area_type", with_time=True) as writer:
+        assert writer.write_all([*notices, empty]) == 3
+        assert writer.placemarks == 3
+    root = etree.parse(str(path)).getroot()
+    kml = "{http://www.opengis.net/kml/2.2}"
+    folders = root.findall(f"{kml}Document/{kml}Folder")
+    assert [folder.findtext(f"{kml}name") for folder in folders] == [
+        "1: cau mammals reduce speed",
+        "2: cau mammals stay clear",
+    ]
+    assert [len(folder.findall(f"{kml}Placemark")) for folder in folders] == [2, 1]
+    placemark = folders[0].find(f"{kml}Placemark")
+    assert placemark is not None
+    assert placemark.findtext(f"{kml}styleUrl") == "#AreaNotice_1"
+    assert placemark.find(f"{kml}TimeSpan") is not None
+
+    out = io.StringIO()
+    writer = area_notice.KmlWriter(out, document=False, folders="mmsi")
+    writer.write_all(notices)
+    writer.close()
+    writer.close()
+    assert out.getvalue().count("<Folder>") == 2
+    assert "<name>987654321</name>" in out.getvalue()
+    assert not out.closed
+
+    out = io.StringIO()
+    with area_notice.KmlWriter(
+        out, document=False, folders=lambda notice: notice.source_mmsi % 2
+    ) as writer:
+        writer.write_all(notices)
+    assert out.getvalue().count("<Folder>") == 1
+    assert "<Folder><name>1</name>" in out.getvalue()
+
+    out = io.StringIO()
+    with area_notice.KmlWriter(
+        out, document=False, folders=lambda notice: "Ships & <Boats>"
+    ) as writer:
+        writer.write_all(notices)
+    assert "<Folder><name>Ships &amp; &lt;Boats&gt;</name>" in out.getvalue()
+
+
+def test_kml_writer_kmz(tmp_path: pathlib.Path) -> None:
+    """KmlWriter compresses placemarks into a KMZ with the styles bundled."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    notice = area_notice.AreaNotice(area_type=2, when=when, duration=60)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=100))
+
+    path = tmp_path / "notices.KMZ"
+    with area_notice.KmlWriter(path, precision=4) as writer:
+        writer.write_all([notice] * 50)
+    with zipfile.ZipFile(path) as kmz:
+        assert kmz.namelist() == ["areanotice_styles.kml", "doc.kml"]
+        info = kmz.getinfo("doc.kml")
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert info.compress_size < info.file_size
+        doc = etree.fromstring(kmz.read("doc.kml"))
+        styles = etree.fromstring(kmz.read("areanotice_styles.kml"))
+    kml = "{http://www.opengis.net/kml/2.2}"
+    placemarks = doc.findall(f"{kml}Document/{kml}Placemark")
+    assert len(placemarks) == 50
+    assert (
+        placemarks[0].findtext(f"{kml}styleUrl") == "areanotice_styles.kml#AreaNotice_2"
+    )
+    assert doc.find(f"{kml}Document/{kml}StyleMap") is None
+    assert styles.find(f"{kml}Document/{kml}StyleMap[@id='AreaNotice_2']") is not None
+    coords = placemarks[0].findtext(f".//{kml}coordinates")
+    assert coords is not None
+    assert coords.split()[0] == "-69.9988,42.0000,0"
+
+    buf = io.BytesIO()
+    with area_notice.KmlWriter(buf, kmz=True) as writer:
+        writer.write(notice)
+    assert not buf.closed
+    with zipfile.ZipFile(buf) as kmz:
+        assert b"<Placemark>" in kmz.read("doc.kml")
+
+    with pytest.raises(ValueError, match="precision"):
+        area_notice.KmlWriter(io.StringIO(), precision=-1)
+    with pytest.raises(TypeError, match="binary file"):
+        area_notice.KmlWriter(io.StringIO(), kmz=True)
+
+
+def test_geom2kml_precision() -> None:
+    """geom2kml rounds coordinates to the requested decimals."""
+    point = {"geometry": {"type": "Point", "coordinates": (-70.123456789, 42.5)}}
+    assert area_notice.geom2kml(point) == (
+        "<Point><coordinates>-70.123456789,42.5,0</coordinates></Point>"
+    )
+    assert area_notice.geom2kml(point, precision=2) == (
+        "<Point><coordinates>-70.12,42.50,0</coordinates></Point>"
+    )
+    line = {"geometry": {"type": "LineString", "coordinates": [(1.23456, 2.0), (3, 4)]}}
+    assert "\t1.234560,2.000000,0" in area_notice.geom2kml(line)
+    assert "\t1.2,2.0,0\n\t3.0,4.0,0" in area_notice.geom2kml(line, precision=1)
+    with pytest.raises(ValueError, match="precision"):
+        area_notice.geom2kml(line, precision=-1)
+    line["geometry"]["coordinates"] = [(1.0, 2.0), (1.01, 2.0), (3, 4)]
+    assert area_notice.geom2kml(line, precision=1).count(",0") == 2
+
+
+def test_round_vertices() -> None:
+    """Vertices that round to the previous one are dropped."""
+    line = [(1.0, 2.0), (1.004, 2.001), (1.5, 2.0), (1.5, 2.0)]
+    assert area_notice.round_vertices(line, 2).tolist() == [[1.0, 2.0], [1.5, 2.0]]
+    # Shapes that would collapse are rounded to more decimals.
+    assert area_notice.round_vertices(line[:2], 2).tolist() == [
+        [1.0, 2.0],
+        [1.004, 2.001],
+    ]
+    ring = [(0.0, 0.0), (0.001, 0.0), (0.001, 0.001), (0.0, 0.0)]
+    assert area_notice.round_vertices(ring, 2, closed=True).tolist() == list(
+        map(list, ring)
+    )
+    ring = [(0.0, 0.0), (1e-12, 0.0), (0.0, 0.0)]
+    assert area_notice.round_vertices(ring, 2, closed=True).tolist() == list(
+        map(list, ring)
+    )
+    ring = [(0.0, 0.0), (1.001, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 0.0)]
+    assert len(area_notice.round_vertices(ring, 2, closed=True)) == 4
+
+
+@pytest.mark.parametrize("precision", [0, 1])
+@pytest.mark.parametrize(
+    "sub_area",
+    [
+        area_notice.AreaNoticeCirclePt(-70.1, 42.2, radius=20),
+        area_notice.AreaNoticeSector(-70.1, 42.2, 50, 10, 50),
+    ],
+)
+def test_round_vertices_small_shape(
+    sub_area: area_notice.AreaNoticeSubArea, precision: int
+) -> None:
+    """Small shapes stay valid polygons at a coarse precision."""
+    geom = sub_area.geom()
+    assert isinstance(geom, shapely.Polygon)
+    decimals = area_notice.coordinate_decimals(precision)
+    rounded = area_notice.round_vertices(geom.exterior.coords, decimals, closed=True)
+    assert len(rounded) >= 4
+    assert shapely.is_valid(shapely.Polygon(rounded))
+
+
+def test_kml_small_shapes() -> None:
+    """Shapes smaller than the precision keep distinct, valid vertices."""
+    circle = area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=1000)
+    kml = area_notice.geom2kml(circle.__geo_interface__, precision=1)
+    vertices = re.findall(r"\t(-?[\d.]+),(-?[\d.]+),0", kml)
+    assert len(set(vertices)) >= 3
+    ring = shapely.Polygon([(float(lon), float(lat)) for lon, lat in vertices])
+    assert ring.is_valid
+
+    when = datetime.datetime(2026, 10, 19, 0, 0, tzinfo=datetime.UTC)
+    notice = area_notice.AreaNotice(area_type=2, when=when, duration=60)
+    notice.add_subarea(
+        area_notice.AreaNoticeSector(-70.1, 42.2, 50, 10, 50, precision=0)
+    )
+    notice.add_subarea(
+        area_notice.AreaNoticeRectangle(-70.1, 42.2, 30, 20, 0, precision=0)
+    )
+    for _, placemark in area_notice.kml_placemarks(
+        notice, precision=area_notice.TRANSMITTED_PRECISION
+    ):
+        vertices = re.findall(r"\t(-?[\d.]+),(-?[\d.]+),0", placemark)
+        assert len(set(vertices)) >= 3
+        ring = shapely.Polygon([(float(lon), float(lat)) for lon, lat in vertices])
+        assert ring.is_valid
+
+
+def test_transmitted_precision() -> None:
+    """Sub-areas are written with the precision they were sent with."""
+    assert area_notice.coordinate_decimals(0) == 2
+    assert area_notice.coordinate_decimals(4) == 5
+    assert area_notice.coordinate_decimals(7) == 5
+    assert area_notice.coordinate_decimals(4, resolution=4) == 6
+    assert area_notice.AreaNoticeFreeText(text="A").coordinate_decimals() is None
+
+    when = datetime.datetime(2026, 10, 19, 0, 0, tzinfo=datetime.UTC)
+    notice = area_notice.AreaNotice(area_type=2, when=when, duration=60)
+    for precision in (0, 4):
+        notice.add_subarea(
+            area_notice.AreaNoticeCirclePt(
+                -70.123, 42.456, radius=3000, precision=precision
+            )
+        )
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.123, 42.456, radius=0))
+    coarse, fine, point = (
+        placemark
+        for _, placemark in area_notice.kml_placemarks(
+            notice, precision=area_notice.TRANSMITTED_PRECISION
+        )
+    )
+    coarse_vertices = re.findall(r"\t(-?\d+)\.(\d+),", coarse)
+    fine_vertices = re.findall(r"\t(-?\d+)\.(\d+),", fine)
+    assert 4 <= len(coarse_vertices) < len(fine_vertices)
+    assert {len(decimals) for _, decimals in coarse_vertices} == {2}
+    assert {len(decimals) for _, decimals in fine_vertices} == {5}
+    assert "<coordinates>-70.12300,42.45600,0</coordinates>" in point
+    kml = notice.kml(precision=area_notice.TRANSMITTED_PRECISION)
+    assert kml.count("<Placemark>") == 3
+
+    with pytest.raises(ValueError, match="Invalid precision: exact"):
+        area_notice.kml_placemarks(notice, precision="exact")
+    with pytest.raises(ValueError, match="precision"):
+        area_notice.KmlWriter(io.StringIO(), precision="exact")
+
+
 def test_bbm_errors_and_multisentence() -> None:
     """Test BBM validation errors and multi-sentence NMEA payload generation."""
     bbm = area_notice.BBM(message_id=8)
@@ -1136,6 +1380,108 @@ def test_sector_scale_factors_decoding_unicode() -> None:
     assert s_tup.radius == 5000
 
 
+@pytest.fixture
+def chord_error() -> Iterator[None]:
+    """Use a 1 m level of detail for one test."""
+    area_notice.set_max_chord_error(1.0)
+    try:
+        yield
+    finally:
+        area_notice.set_max_chord_error(None)
+
+
+def test_arc_segments() -> None:
+    """Segment counts follow the radius within the limits."""
+    assert area_notice.arc_segments(100, 360, 1) == 23
+    assert area_notice.arc_segments(100, 90, 1) == 6
+    assert area_notice.arc_segments(400_000, 360, 1) == 720
+    assert area_notice.arc_segments(0.5, 360, 1) == 8
+    assert area_notice.arc_segments(100, 0, 1) == 1
+
+
+def test_set_max_chord_error() -> None:
+    """The level of detail must be positive."""
+    for meters in (0, -1):
+        with pytest.raises(ValueError, match="positive"):
+            area_notice.set_max_chord_error(meters)
+    assert area_notice.get_max_chord_error() is None
+
+
+@pytest.mark.usefixtures("chord_error")
+def test_level_of_detail_circle() -> None:
+    """Circle vertex counts grow with the radius and stay within 1 m."""
+    assert area_notice.get_max_chord_error() == 1.0
+    # MAX_CIRCLE_SEGMENTS limits the largest circle, which is within 4 m.
+    for radius, count, error in ((100, 24, 1), (4000, 142, 1), (400_000, 721, 4)):
+        circle = area_notice.AreaNoticeCirclePt(-70.5, 41.5, radius=radius)
+        vertices = circle.local_vertices()
+        assert len(vertices) == count
+        assert tuple(vertices[0]) == tuple(vertices[-1])
+        middles = (vertices[1:] + vertices[:-1]) / 2
+        assert np.hypot(middles[:, 0], middles[:, 1]).min() >= radius - error
+        geo = circle.__geo_interface__["geometry"]["coordinates"]
+        assert len(geo) == count
+
+
+@pytest.mark.usefixtures("chord_error")
+def test_level_of_detail_sector() -> None:
+    """A small sector no longer has a vertex every 0.5 degrees."""
+    sector = area_notice.AreaNoticeSector(-70.5, 41.5, 10, 0, 359)
+    vertices = sector.local_vertices()
+    assert len(vertices) == 11
+    assert np.hypot(vertices[1:-1, 0], vertices[1:-1, 1]) == pytest.approx(10)
+    assert sector.geom().is_valid
+
+
+@pytest.mark.parametrize("max_chord_error", [None, 1.0])
+def test_sector_crossing_north(max_chord_error: float | None) -> None:
+    """A sector from 350 to 10 degrees sweeps 20 degrees through north."""
+    area_notice.set_max_chord_error(max_chord_error)
+    try:
+        sector = area_notice.AreaNoticeSector(-70.5, 41.5, 4000, 350, 10)
+        arc = sector.local_vertices()[1:-1]
+    finally:
+        area_notice.set_max_chord_error(None)
+    assert len(arc) > 2
+    bearings = np.degrees(np.arctan2(arc[:, 0], arc[:, 1]))
+    assert bearings[0] == pytest.approx(-10)
+    assert bearings[-1] == pytest.approx(10)
+    assert (np.diff(bearings) > 0).all()
+    whole = area_notice.AreaNoticeCirclePt(-70.5, 41.5, radius=4000).geom().area
+    assert sector.geom().is_valid
+    assert sector.geom().area == pytest.approx(whole * 20 / 360, rel=1e-2)
+
+
+@pytest.mark.usefixtures("chord_error")
+def test_level_of_detail_rectangle() -> None:
+    """Long rectangle edges are split to follow the Earth."""
+    small = area_notice.AreaNoticeRectangle(-70.5, 41.5, 2000, 1000, 10)
+    assert len(small.local_vertices()) == 4
+    large = area_notice.AreaNoticeRectangle(-70.5, 41.5, 100_000, 10_000, 10)
+    vertices = large.local_vertices()
+    assert len(vertices) == 34
+    assert large.geom().area == pytest.approx(
+        shapely.geometry.Polygon(large._local_to_ll(vertices[[0, 15, 17, 32]])).area,
+        rel=1e-4,
+    )
+
+
+def test_level_of_detail_memoized() -> None:
+    """Memoized geometry follows the level of detail."""
+    circle = area_notice.AreaNoticeCirclePt(-70.5, 41.5, radius=100)
+    default = circle.geom()
+    assert isinstance(default, shapely.geometry.Polygon)
+    assert len(default.exterior.coords) == 65
+    area_notice.set_max_chord_error(1.0)
+    try:
+        coarse = circle.geom()
+        assert isinstance(coarse, shapely.geometry.Polygon)
+        assert len(coarse.exterior.coords) == 24
+    finally:
+        area_notice.set_max_chord_error(None)
+    assert circle.geom().equals_exact(default, tolerance=0)
+
+
 def test_polyline_scale_factors_decoding_errors_unicode(
     capsys: pytest.CaptureFixture[str],
 ) -> None:
@@ -1284,6 +1630,14 @@ def test_area_notice_init_and_methods_and_errors() -> None:
     )
     an_freetext.add_subarea(area_notice.AreaNoticeFreeText(text="TEST"))
     assert "FreeText: TEST" in str(an_freetext.html())
+    an_freetext.add_subarea(area_notice.AreaNoticeFreeText(text="<B>&"))
+    div = etree.fromstring(an_freetext.html())
+    assert div.findtext("p") == str(an_freetext)
+    assert [li.text for li in div.iterfind("ol/li")] == [
+        "FreeText: TEST<B>&",
+        'AreaNoticeFreeText: "TEST"',
+        'AreaNoticeFreeText: "<B>&"',
+    ]
 
     an_no_attrs = area_notice.AreaNotice(
         area_type=1, when=when, duration=60, source_mmsi=123456789
@@ -1401,6 +1755,274 @@ def test_subarea_factory_and_get_shapes() -> None:
         an_rect.subarea_factory(bits=poly_bits)
 
 
+def chained_notice_bits(shape: int) -> BitVector:
+    """Message with a point followed by two chained polyline or polygon sub-areas."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    notice = area_notice.AreaNotice(
+        area_type=1, when=when, duration=60, source_mmsi=123456789
+    )
+    poly_class = (
+        area_notice.AreaNoticePolyline if shape == 3 else area_notice.AreaNoticePolygon
+    )
+    first = poly_class(lon=-70.0, lat=42.0, points=[(0, 1000), (90, 1000)])
+    second = poly_class(lon=0.0, lat=0.0, points=[(180, 1000), (270, 500)])
+    return (
+        notice.get_bits(include_bin_hdr=True)
+        + first.get_bits()
+        + second.get_bits()[area_notice.SUB_AREA_SIZE :]
+    )
+
+
+WHEN_CHAIN = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+
+
+def test_polyline_chain_decode() -> None:
+    """A polyline continued in the next sub-area is merged into one chain."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    an = area_notice.AreaNotice(area_type=1, when=when, duration=60)
+    an.decode_bits(chained_notice_bits(3), context=DecodeContext(when))
+
+    assert len(an.areas) == 2
+    first, second = an.areas
+    assert isinstance(first, area_notice.AreaNoticePolyline)
+    assert isinstance(second, area_notice.AreaNoticePolyline)
+    end = area_notice.polyline_to_ll((first.lon, first.lat), first.points)[-1]
+    assert second.lon == pytest.approx(end[0], abs=1e-9)
+    assert second.lat == pytest.approx(end[1], abs=1e-9)
+
+    assert len(an.polyline_chains) == 1
+    chain = an.polyline_chains[0]
+    assert len(chain) == 2
+    assert chain.areas == [first, second]
+    expected = first.get_points() + second.get_points()[1:]
+    assert_almost_equal_series(
+        [c for pt in chain.get_points() for c in pt],
+        [c for pt in expected for c in pt],
+        places=7,
+    )
+    assert chain.end == pytest.approx(chain.get_points()[-1])
+    geom = chain.geom()
+    assert geom.geom_type == "LineString"
+    assert len(geom.coords) == 5
+    geo = chain.__geo_interface__
+    assert geo["area_shape"] == 3
+    assert geo["num_sub_areas"] == 2
+    assert geo["geometry"]["type"] == "LineString"
+
+
+def test_polygon_chain_decode() -> None:
+    """A polygon continued in the next sub-area becomes one polygon."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    an = area_notice.AreaNotice(area_type=1, when=when, duration=60)
+    an.decode_bits(chained_notice_bits(4))
+    assert [type(area) for area in an.areas] == [area_notice.AreaNoticePolygon] * 2
+    (chain,) = an.polyline_chains
+    geom = chain.geom()
+    assert geom.geom_type == "Polygon"
+    # 5 vertices and the closing point.
+    assert len(geom.exterior.coords) == 6
+
+
+def test_polyline_chain_memoized() -> None:
+    """Chain geometry is built once and rebuilt when the chain grows."""
+    an = area_notice.AreaNotice(area_type=1, when=WHEN_CHAIN, duration=60)
+    an.decode_bits(chained_notice_bits(3), context=DecodeContext(WHEN_CHAIN))
+    (chain,) = an.polyline_chains
+    geom = chain.geom()
+    assert chain.geom() is geom
+    assert an.geoms()[-1] is geom
+    chain.append(area_notice.AreaNoticePolyline(lon=0, lat=0, points=[(0, 100)]))
+    assert chain.geom() is not geom
+    assert len(chain.geom().coords) == 6
+
+
+def test_polyline_chain_antimeridian() -> None:
+    """Chains use the geometry engine of the sub-areas across 180 degrees."""
+    area_notice.set_geometry_engine("tangent_plane")
+    try:
+        an = area_notice.AreaNotice(area_type=1, when=WHEN_CHAIN, duration=60)
+        an.add_subarea(area_notice.AreaNoticeCirclePt(179.9, 10.0, radius=0))
+        polygon = area_notice.AreaNoticePolygon(
+            lon=179.9, lat=10.0, points=[(90, 20000), (0, 10000), (270, 20000)]
+        )
+        an.add_subarea(polygon)
+        point, geom = an.geoms()
+        assert isinstance(point, shapely.geometry.Point)
+        assert point.x == pytest.approx(179.9)
+        assert geom.is_valid
+        assert geom.bounds == pytest.approx(polygon.geom().bounds)
+        min_lon, _, max_lon, _ = geom.bounds
+        assert 179.89 < min_lon < max_lon < 180.2
+    finally:
+        area_notice.set_geometry_engine("utm")
+
+
+def test_polyline_chain_add_subarea() -> None:
+    """Polylines added directly each start their own chain."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    an = area_notice.AreaNotice(area_type=1, when=when, duration=60)
+    an.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=0))
+    assert not an.polyline_chains
+    line1 = area_notice.AreaNoticePolyline(lon=-70.0, lat=42.0, points=[(0, 100)])
+    line2 = area_notice.AreaNoticePolyline(lon=-71.0, lat=42.0, points=[(0, 100)])
+    an.add_subarea(line1)
+    an.add_subarea(line2)
+    assert [chain.areas for chain in an.polyline_chains] == [[line1], [line2]]
+
+    # A continuation of a polyline that is not the end of a chain.
+    an.polyline_chains.clear()
+    poly_bits = area_notice.AreaNoticePolyline(
+        lon=0.0, lat=0.0, points=[(90, 100)]
+    ).get_bits()[area_notice.SUB_AREA_SIZE :]
+    line3 = an.subarea_factory(poly_bits)
+    assert isinstance(line3, area_notice.AreaNoticePolyline)
+    assert [chain.areas for chain in an.polyline_chains] == [[line2, line3]]
+    assert line3.lon == pytest.approx(line2.get_points()[-1][0])
+
+
+def test_sub_area_bit_buffer() -> None:
+    """Sub-areas decode the same from a shared BitBuffer at an offset."""
+    circle = area_notice.AreaNoticeCirclePt(-70.25, 42.5, radius=300)
+    rect = area_notice.AreaNoticeRectangle(-70.0, 42.0, 1000, 2000, 45)
+    sector = area_notice.AreaNoticeSector(-69.5, 41.5, 4000, 10, 50)
+    line = area_notice.AreaNoticePolyline([(10, 2400), (90, 100)], -69.8, 42.4)
+    text = area_notice.AreaNoticeFreeText(text="OFFSET TEST")
+    bits = (
+        BitVector.from_bitstring("101")
+        + circle.get_bits()
+        + rect.get_bits()
+        + sector.get_bits()
+        + line.get_bits()[area_notice.SUB_AREA_SIZE :]
+        + text.get_bits()
+    )
+    buf = BitBuffer(bits)
+    size = area_notice.SUB_AREA_SIZE
+
+    circle_b = area_notice.AreaNoticeCirclePt(bits=buf, bit_offset=3)
+    assert str(circle_b) == str(circle)
+    rect_b = area_notice.AreaNoticeRectangle(bits=buf, bit_offset=3 + size)
+    assert (rect_b.lon, rect_b.lat) == (-70.0, 42.0)
+    assert (rect_b.e_dim, rect_b.n_dim, rect_b.orientation_deg) == (1000, 2000, 45)
+    sector_b = area_notice.AreaNoticeSector(bits=buf, bit_offset=3 + 2 * size)
+    assert (sector_b.lon, sector_b.lat, sector_b.radius) == (-69.5, 41.5, 4000)
+    assert (sector_b.left_bound_deg, sector_b.right_bound_deg) == (10, 50)
+    line_b = area_notice.AreaNoticePolyline(
+        lon=-69.8, lat=42.4, bits=buf, bit_offset=3 + 3 * size
+    )
+    assert line_b.points == line.points
+    text_b = area_notice.AreaNoticeFreeText(bits=buf, bit_offset=3 + 4 * size)
+    assert text_b.text == "OFFSET TEST"
+
+    with pytest.raises(area_notice.AisUnpackingException, match="bit length 86"):
+        area_notice.AreaNoticeCirclePt(bits=buf, bit_offset=len(buf) - 86)
+
+
+def test_from_bits() -> None:
+    """The trusted decode path matches decoding through the constructors."""
+    circle = area_notice.AreaNoticeCirclePt(-70.25, 42.5, radius=300)
+    circle_b = area_notice.AreaNoticeCirclePt.from_bits(circle.get_bits())
+    assert str(circle_b) == str(circle)
+    assert circle_b.precision == 4
+
+    line = area_notice.AreaNoticePolyline([(10, 2400), (90, 100)], -69.8, 42.4)
+    line_b = area_notice.AreaNoticePolyline.from_bits(
+        line.get_bits()[area_notice.SUB_AREA_SIZE :], lon=-69.8, lat=42.4
+    )
+    assert (line_b.lon, line_b.lat) == (-69.8, 42.4)
+    assert line_b.points == line.points
+
+    when = datetime.datetime(2026, 7, 6, 1, 2, tzinfo=datetime.UTC)
+    notice = area_notice.AreaNotice(
+        area_notice.notice_type["cau_mammals_not_obs"], when, 60, 10, source_mmsi=1
+    )
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-69.8, 40.2, radius=0))
+    notice.add_subarea(area_notice.AreaNoticePolyline([(10, 1400)], -69.8, 40.2))
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="FROM BITS"))
+    bits = notice.get_bits(include_bin_hdr=True)
+    decoded = area_notice.AreaNotice.from_bits(bits, context=DecodeContext(when))
+    assert decoded.when == when
+    assert decoded.source_mmsi == 1
+    assert len(decoded.polyline_chains) == 1
+    assert decoded.get_merged_text() == "FROM BITS"
+    assert decoded.__geo_interface__ == notice.__geo_interface__
+
+
+def test_check_decoded_values() -> None:
+    """Every reserved value is named in the error."""
+    circle = area_notice.AreaNoticeCirclePt(-70.25, 42.5, radius=300)
+    area_notice.check_decoded_values(circle, {"precision": range(5)})
+    circle.precision = 6
+    circle.scale_factor_raw = 2
+    with pytest.raises(
+        area_notice.AisUnpackingException,
+        match="^Reserved values: precision=6, scale_factor_raw=2$",
+    ):
+        area_notice.check_decoded_values(
+            circle, {"precision": range(5), "scale_factor_raw": (0, 1)}
+        )
+
+
+def test_check_decoded_values_mapping() -> None:
+    """Mappings are checked by key and scaled values with a tolerance."""
+    allowed = {"speed": area_notice.ValueRange(0.0, 24.7, 25.5)}
+    area_notice.check_decoded_values({"speed": 247 / 10.0}, allowed)
+    area_notice.check_decoded_values({"speed": 25.5}, allowed)
+    with pytest.raises(area_notice.AisUnpackingException, match="speed=25.0"):
+        area_notice.check_decoded_values({"speed": 25.0}, allowed)
+    assert "text" not in allowed["speed"]
+    assert repr(allowed["speed"]) == "ValueRange(0.0, 24.7, *(25.5,))"
+
+
+@pytest.mark.parametrize(
+    ("area", "field", "value"),
+    [
+        (area_notice.AreaNoticeCirclePt(-70.25, 42.5, radius=300), "precision", 6),
+        (area_notice.AreaNoticeCirclePt(-70.25, 42.5, radius=300), "lon", 200.0),
+        (area_notice.AreaNoticeRectangle(-70.0, 42.0, 100, 100), "lat", -91.0),
+        (
+            area_notice.AreaNoticeRectangle(-70.0, 42.0, 100, 100),
+            "orientation_deg",
+            400,
+        ),
+        (area_notice.AreaNoticeSector(-70.0, 42.0, 100, 10, 20), "left_bound_deg", 370),
+        (
+            area_notice.AreaNoticeSector(-70.0, 42.0, 100, 10, 20),
+            "right_bound_deg",
+            511,
+        ),
+    ],
+)
+def test_sub_area_from_bits_reserved(
+    area: area_notice.AreaNoticeCirclePt
+    | area_notice.AreaNoticeRectangle
+    | area_notice.AreaNoticeSector,
+    field: str,
+    value: float,
+) -> None:
+    """Decoding rejects reserved codes that the constructor decodes as is."""
+    cls = type(area)
+    assert cls.from_bits(area.get_bits()).get_bits() == area.get_bits()
+    setattr(area, field, value)
+    bits = area.get_bits()
+    with pytest.raises(
+        area_notice.AisUnpackingException, match=f"^Reserved values: {field}="
+    ):
+        cls.from_bits(bits)
+    assert getattr(cls(bits=bits), field) == pytest.approx(value)
+
+
+def test_polyline_from_bits_reserved() -> None:
+    """Angles past 359.5 degrees are reserved."""
+    line = area_notice.AreaNoticePolyline([(359.5, 100), (400, 100)], -70.0, 42.0)
+    bits = line.get_bits()[area_notice.SUB_AREA_SIZE :]
+    with pytest.raises(area_notice.AisUnpackingException, match="angle=400.0"):
+        area_notice.AreaNoticePolyline.from_bits(bits, lon=-70.0, lat=42.0)
+    assert area_notice.AreaNoticePolyline(bits=bits, lon=-70.0, lat=42.0).points == [
+        (359.5, 100.0),
+        (400.0, 100.0),
+    ]
+
+
 def test_message_2_fetcherformatter_and_normqueue() -> None:
     """Test CSV message formatting and NormQueue multi-sentence NMEA reassembly."""
     when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
@@ -1457,6 +2079,73 @@ def test_message_2_fetcherformatter_and_normqueue() -> None:
     nq.put(m_bad)
 
 
+def test_fetcher_formatter_writer(tmp_path: pathlib.Path) -> None:
+    """Rows match message_2_fetcherformatter, which matches the BitVectors."""
+    when = datetime.datetime(2026, 8, 7, 0, 0, tzinfo=datetime.UTC)
+    notices = []
+    for link_id in range(3):
+        an = area_notice.AreaNotice(1, when, 60, link_id, source_mmsi=123456789)
+        an.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=100))
+        an.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+        notices.append(an)
+
+    line = area_notice.message_2_fetcherformatter(notices[0], timestamp=when)
+    fields = line.split(",")
+    assert fields[:10] == [
+        "BMS",
+        "SBNMS",
+        "-71.3",
+        "43.0",
+        "-68.3",
+        "41.0",
+        "0",
+        "1001",
+        "0",
+        str(int(when.timestamp()) + 24 * 3600),
+    ]
+    assert fields[10] == str(BitVector.from_int(1, 10) + BitVector.from_int(22, 6))
+    assert fields[11] == str(notices[0].get_bits(include_dac_fi=False))
+
+    out = io.StringIO()
+    with area_notice.FetcherFormatterWriter(out, chunk_size=2) as writer:
+        assert writer.write_all(notices, timestamp=when) == 3
+        assert out.getvalue().count("\n") == 2
+        writer.write(notices[0], timestamp=when, link_id=9, message_type=5)
+    assert writer.rows == 4
+    rows = out.getvalue().splitlines()
+    assert rows[:3] == [
+        area_notice.message_2_fetcherformatter(an, timestamp=when) for an in notices
+    ]
+    assert rows[3] == area_notice.message_2_fetcherformatter(
+        notices[0], timestamp=when, link_id=9, message_type=5
+    )
+
+    path = tmp_path / "notices.csv"
+    writer = area_notice.FetcherFormatterWriter(
+        path, site_name="TEST", xmin=-1.5, xmax=1.5, ymin=-2.0, ymax=2.0, priority=3
+    )
+    writer.write_all(notices[:1], timestamp=1000)
+    writer.close()
+    writer.close()
+    assert path.read_text() == (
+        area_notice.message_2_fetcherformatter(
+            notices[0],
+            site_name="TEST",
+            xmin=-1.5,
+            xmax=1.5,
+            ymin=-2.0,
+            ymax=2.0,
+            priority=3,
+            timestamp=1000,
+        )
+        + "\n"
+    )
+    assert path.read_text().split(",")[9] == str(1000 + 24 * 3600)
+
+    with pytest.raises(NotImplementedError):
+        area_notice.FetcherFormatterWriter(io.StringIO()).write(area_notice.BBM())
+
+
 def test_nmea_checksum_hex() -> None:
     """Test nmea_checksum_hex calculation with and without asterisk."""
     sentence = "!AIVDM,1,1,,A,12345,0*2A"
@@ -1497,8 +2186,6 @@ def test_main_cli(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> No
         an_multi.add_subarea(area_notice.AreaNoticeFreeText(text=f"TEXT {i}"))
     multi_sentences = "\n".join(an_multi.get_aivdm(sequence_num=1)) + "\n"
 
-    styles_file = tmp_path / "areanotice_styles.kml"
-    styles_file.write_text('<Style id="test"></Style>')
     monkeypatch.chdir(tmp_path)
 
     monkeypatch.setattr(sys, "argv", ["main", sentence])
@@ -1516,6 +2203,13 @@ def test_main_cli(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> No
     monkeypatch.setattr(sys, "argv", ["main", str(nmea_file)])
     area_notice.main()
 
+    monkeypatch.setattr(
+        sys, "argv", ["main", "-o", "out.kmz", "--precision", "5", str(nmea_file)]
+    )
+    area_notice.main()
+    with zipfile.ZipFile(tmp_path / "out.kmz") as kmz:
+        assert "<Placemark>" in kmz.read("doc.kml").decode()
+
     monkeypatch.setattr(sys, "argv", ["main", sentence])
     runpy.run_module("ais_area_notice.imo_001_22_area_notice", run_name="__main__")
 
@@ -7,12 +7,14 @@ TODO(schwehr): Test NMEA decoding.
 import datetime
 import math
 import random
+from collections.abc import Callable
 
 import pytest
 from BitVector import BitVector
 
 import ais_area_notice.imo_001_26_environment as env
 from ais_area_notice import ais_string
+from ais_area_notice.decode_context import DecodeContext
 
 # How many loops to do on fuzz testing
 FUZZ_COUNT = 30
@@ -697,6 +699,75 @@ class TestSensorReports:
             sr_b = env.SensorReportWind(bits=sr.get_bits())
             assert sr == sr_b
 
+    def test_sr_wind_from_bits(self) -> None:
+        """Decoding skips the constructor, but rejects reserved values."""
+        sr = random_wind()
+        assert env.SensorReportWind.from_bits(sr.get_bits()) == sr
+
+        sr.speed = 125
+        sr.forecast_minute = 63
+        with pytest.raises(
+            env.AisUnpackingException,
+            match="^Reserved values: speed=125, forecast_minute=63$",
+        ):
+            env.SensorReportWind.from_bits(sr.get_bits())
+
+        sr = random_wind()
+        sr.hour = 25
+        with pytest.raises(
+            env.AisUnpackingException, match="^Reserved values: hour=25$"
+        ):
+            env.SensorReportWind.from_bits(sr.get_bits())
+
+    def test_sr_from_bits_fuzz(self) -> None:
+        """Valid reports of every type pass the reserved value checks."""
+        for _ in range(FUZZ_COUNT):
+            sr = random_sensorreport()
+            assert type(sr).from_bits(sr.get_bits()) == sr
+
+    @pytest.mark.parametrize(
+        ("make", "field", "value"),
+        [
+            (random_loc, "owner", 10),
+            (random_waterlevel, "vdatum", 20),
+            (random_seastate, "swell_period", 62),
+            (random_salinity, "salinity_type", 3),
+            (random_weather, "air_pres", 1300),
+            (random_airgap, "gap", 0.5),
+        ],
+    )
+    def test_sr_from_bits_reserved(
+        self, make: Callable[[], env.SensorReport], field: str, value: float
+    ) -> None:
+        """Each report type rejects its reserved values when decoding."""
+        sr = make()
+        setattr(sr, field, value)
+        bits = sr.get_bits()
+        with pytest.raises(
+            env.AisUnpackingException, match=f"^Reserved values: {field}="
+        ):
+            type(sr).from_bits(bits)
+        assert getattr(type(sr)(bits=bits), field) == pytest.approx(value)
+
+    @pytest.mark.parametrize(
+        ("make", "field", "value"),
+        [
+            (random_current2d, "level", 400),
+            (random_current3d, "z", 25.0),
+            (random_currenthorz, "dist", 125),
+        ],
+    )
+    def test_sr_current_from_bits_reserved(
+        self, make: Callable[[], env.SensorReport], field: str, value: float
+    ) -> None:
+        """Every current entry is checked."""
+        sr = make()
+        sr.cur[-1][field] = value  # type: ignore[attr-defined]
+        with pytest.raises(
+            env.AisUnpackingException, match=f"^Reserved values: {field}="
+        ):
+            type(sr).from_bits(sr.get_bits())
+
     def test_sr_water_level(self) -> None:
         """SensorReport WaterLevel"""
         site_id = math.floor(random.random() * 128)
@@ -1457,6 +1528,21 @@ class TestEnvironment:
             e_b = env.Environment(bits=e.get_bits(include_bin_hdr=True))
             assert e == e_b
 
+    def test_context_year_month(self) -> None:
+        """Test sensor reports get the year and month from the context."""
+        e = env.Environment(source_mmsi=123456789)
+        e.append(env.SensorReportWind(day=31, hour=23, minute=50, site_id=1))
+        e.append(env.SensorReportWind(day=1, hour=0, minute=10, site_id=1))
+        context = DecodeContext(
+            datetime.datetime(2011, 1, 1, 0, 5, tzinfo=datetime.UTC)
+        )
+        e_b = env.Environment(bits=e.get_bits(include_bin_hdr=True), context=context)
+        assert [(sr.year, sr.month) for sr in e_b.sensor_reports] == [
+            (2010, 12),
+            (2011, 1),
+        ]
+        assert context.stats == {"environment": 1, "sensor_reports": 2}
+
     def test_salinity_eq_trouble(self) -> None:
         """based on a failing random case of salinity report"""
         sr = env.SensorReportSalinity(
@@ -1639,7 +1725,9 @@ class TestEnvironment:
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test Environment init, unicode formatting, and comparison with different reports."""
-        monkeypatch.setattr(env.Environment, "decode_nmea", lambda self, strings: None)
+        monkeypatch.setattr(
+            env.Environment, "decode_nmea", lambda self, strings, context=None: None
+        )
         e = env.Environment(
             nmea_strings=["!AIVDM,1,1,0,A,85M:Ih1KmPAU6jAs85`03cJm;1NHQhPFP000,0*19"]
         )
@@ -1652,8 +1740,12 @@ class TestEnvironment:
         assert e2 != e3
         assert "SensorReport" in e2.__unicode__(verbose=True)
 
-        with pytest.raises(NotImplementedError):
-            e2.html()
+        html = e2.html()
+        assert html.startswith(
+            "<div><p>Environment: mmsi=123456 sensor_reports: [1]</p>"
+        )
+        assert html.count("<li>SensorReport") == 1
+        assert e3.html().endswith("<ol></ol></div>")
 
     def test_current_horz_coverage(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test SensorReportCurrentHorz exception handling and unicode formatting."""
@@ -1998,8 +2090,50 @@ class TestEnvironment:
             e.sensor_report_factory(BitVector(size=100))
 
     def test_decode_nmea_valid_completion(self) -> None:
-        """Test decode_nmea completes loop successfully on valid sentences and empty input."""
-        e = env.Environment(source_mmsi=123456)
-        sentence = "!AIVDM,1,1,0,A,85M:Ih1KmPAU6jAs85`03cJm;1NHQhPFP000,0*19"
+        """Test decode_nmea decodes the sensor reports of the sentences."""
+        sent = env.Environment(source_mmsi=123456)
+        sent.append(
+            env.SensorReportWind(
+                year=2011, month=2, day=13, hour=0, minute=0, site_id=3, speed=12
+            )
+        )
+        sent.append(
+            env.SensorReportSeaState(
+                year=2011, month=2, day=13, hour=0, minute=0, site_id=3
+            )
+        )
+        e = env.Environment(source_mmsi=1)
+        # Two reports need fill bits.
+        (sentence,) = sent.get_aivdm()
+        assert sentence.endswith(",2*" + sentence[-2:])
         e.decode_nmea([sentence])
-        e.decode_nmea([])
+        assert e.source_mmsi == 123456
+        assert len(e.sensor_reports) == 2
+        wind = e.sensor_reports[0]
+        assert isinstance(wind, env.SensorReportWind)
+        assert wind.speed == 12
+
+        with pytest.raises(env.AisUnpackingException, match="No NMEA lines"):
+            e.decode_nmea([])
+        with pytest.raises(env.AisUnpackingException, match="trouble"):
+            e.decode_nmea(["!AIVDM,1,1,0,A,85M:Ih1KmPAU6jAs85`03cJm;1NHQhPFP000,0*19"])
+
+    def test_decode_nmea_time_stamp_context(self) -> None:
+        """Test decode_nmea passes the NMEA receive time to the context."""
+        sent = env.Environment(source_mmsi=123456)
+        sent.append(
+            env.SensorReportWind(
+                year=2011, month=1, day=31, hour=23, minute=0, site_id=3
+            )
+        )
+        (sentence,) = sent.get_aivdm()
+        sentence += ",b003669953,1297555217"
+        context = DecodeContext()
+        e = env.Environment(nmea_strings=[sentence], context=context)
+        assert context.reference_time == datetime.datetime(
+            2011, 2, 13, 0, 0, 17, tzinfo=datetime.UTC
+        )
+        assert e.sensor_reports[0].month == 1
+        # Without a context, the receive time of the sentence is used.
+        e = env.Environment(nmea_strings=[sentence])
+        assert (e.sensor_reports[0].year, e.sensor_reports[0].month) == (2011, 1)
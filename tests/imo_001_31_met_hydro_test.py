@@ -10,6 +10,7 @@ import pytest
 from BitVector import BitVector
 
 import ais_area_notice.imo_001_31_met_hydro as met_hydro
+from ais_area_notice.decode_context import DecodeContext
 
 from .imo_001_26_environment_test import random_date
 
@@ -75,6 +76,39 @@ def test_empty() -> None:
     assert mh == mh_b
 
 
+def test_decode_bits_context() -> None:
+    """Test decoding counts messages in the context."""
+    mh = met_hydro.MetHydro31(source_mmsi=123456789)
+    context = DecodeContext()
+    mh_b = met_hydro.MetHydro31(bits=mh.get_bits(), context=context)
+    assert mh == mh_b
+    assert context.stats == {"met_hydro": 1}
+
+
+def test_from_bits() -> None:
+    """Test the trusted decode path matches the constructor."""
+    mh = random_msg()
+    context = DecodeContext()
+    mh_b = met_hydro.MetHydro31.from_bits(mh.get_bits(), context=context)
+    assert mh == mh_b
+    assert mh_b == met_hydro.MetHydro31(bits=mh.get_bits())
+    assert context.stats == {"met_hydro": 1}
+
+
+def test_decode_reserved_values() -> None:
+    """Test reserved codes are rejected when decoding."""
+    mh = met_hydro.MetHydro31(source_mmsi=123456789)
+    mh.precip = 6
+    mh.ice = 2
+    bits = mh.get_bits()
+    match = "Reserved values: precip=6, ice=2"
+    with pytest.raises(met_hydro.AisUnpackingException, match=match):
+        met_hydro.MetHydro31.from_bits(bits)
+    # The constructor decodes without the checks, as it always has.
+    decoded = met_hydro.MetHydro31(bits=bits)
+    assert (decoded.precip, decoded.ice) == (6, 2)
+
+
 def test_random() -> None:
     """fuzz test"""
     for _ in range(FUZZ_COUNT):
@@ -86,12 +120,15 @@ def test_random() -> None:
 
 
 def test_ne_and_html_and_geo_interface() -> None:
-    """Test inequality operator and unimplemented html / geo interface properties."""
+    """Test inequality operator, html and the unimplemented geo interface."""
     mh1 = met_hydro.MetHydro31(source_mmsi=123456789)
-    mh2 = met_hydro.MetHydro31(source_mmsi=987654321)
+    mh2 = met_hydro.MetHydro31(source_mmsi=987654321, lon=-70.25, lat=42.5)
     assert mh1 != mh2
-    with pytest.raises(NotImplementedError):
-        mh1.html()
+    html = mh2.html()
+    assert html.startswith("<div><p>MetHydro31: mmsi=987654321 lon=-70.25 lat=42.5</p>")
+    assert "<tr><td>air_temp</td><td>-102.4</td></tr>" in html
+    assert "<tr><td>cur_level_3</td><td>31</td></tr>" in html
+    assert html.count("<tr>") == len(met_hydro.SCALAR_FIELDS) + 9
     with pytest.raises(NotImplementedError):
         _ = mh1.__geo_interface__
 
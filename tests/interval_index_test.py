@@ -0,0 +1,123 @@
+"""Tests for the index of items valid over a time interval."""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from ais_area_notice.interval_index import IntervalIndex
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = WHEN.timestamp()
+
+
+def brute_force(intervals: list[tuple[float, float]], when: float) -> list[int]:
+    return [key for key, (start, end) in enumerate(intervals) if start <= when < end]
+
+
+def test_add_and_remove() -> None:
+    """Items are replaced by key and can be removed."""
+    index: IntervalIndex[str] = IntervalIndex()
+    index.add("a", WHEN, T0 + 600, "first")
+    index.add("b", T0 + 60, T0 + 120, "second")
+    assert len(index) == 2
+    assert "a" in index
+    assert list(index) == ["first", "second"]
+    assert index.get("a") == "first"
+    assert index.get("c") is None
+    assert index.interval("b") == (T0 + 60, T0 + 120)
+    with pytest.raises(KeyError):
+        index.interval("c")
+
+    assert index.active_at(T0) == ["first"]
+    assert index.active_at(WHEN + datetime.timedelta(seconds=60)) == [
+        "first",
+        "second",
+    ]
+    assert index.active_at(T0 + 120) == ["first"]
+    assert index.active_at(T0 + 600) == []
+
+    index.add("a", T0 + 100, T0 + 200, "replaced")
+    assert index.active_at(T0) == []
+    assert index.active_at(T0 + 110) == ["second", "replaced"]
+    assert index.remove("b") == "second"
+    assert index.remove("b") is None
+    assert index.active_at(T0 + 110) == ["replaced"]
+
+
+def test_expire() -> None:
+    """Items leave in the order that they end."""
+    index: IntervalIndex[int] = IntervalIndex()
+    assert index.next_expiry() is None
+    for key, end in enumerate([300, 100, 200, 100, 400]):
+        index.add(key, T0, T0 + end, key)
+    index.remove(1)
+    assert index.next_expiry() == T0 + 100
+    assert index.expire(T0 + 99) == []
+    assert index.expire(WHEN + datetime.timedelta(seconds=200)) == [3, 2]
+    assert index.next_expiry() == T0 + 300
+    assert sorted(index) == [0, 4]
+    assert index.active_at(T0 + 50) == [0, 4]
+    index.add(5, T0, T0 + 350, 5)
+    index.remove(5)
+    assert index.expire(T0 + 1000) == [0, 4]
+    assert len(index) == 0
+    assert index.next_expiry() is None
+
+
+def test_expiring() -> None:
+    """Items that end within a window, soonest first."""
+    index: IntervalIndex[int] = IntervalIndex()
+    for key, end in enumerate([300, 100, 200, 600]):
+        index.add(key, T0, T0 + end, key)
+    assert index.expiring(T0, 300) == [1, 2, 0]
+    assert index.expiring(WHEN, 99) == []
+    assert index.expiring(T0 + 100, 500) == [2, 0, 3]
+
+
+@pytest.mark.parametrize("count", [10, 1000, 5000])
+def test_matches_brute_force(count: int) -> None:
+    """Queries match a scan of every interval through rebuilds."""
+    rng = np.random.default_rng(count)
+    starts = rng.uniform(0, 100_000, count)
+    ends = starts + rng.exponential(3000, count)
+    intervals = list(zip(starts.tolist(), ends.tolist(), strict=True))
+    index: IntervalIndex[int] = IntervalIndex()
+    for key, (start, end) in enumerate(intervals):
+        index.add(key, start, end, key)
+        if key % 997 == 0:
+            assert index.active_at(start) == brute_force(intervals[: key + 1], start)
+
+    times = rng.uniform(-1000, 110_000, 50)
+    times[:5] = times[5]
+    time_indices, values = index.active_at_many(times)
+    expected = [
+        (i, key) for i, when in enumerate(times) for key in brute_force(intervals, when)
+    ]
+    assert list(zip(time_indices.tolist(), values, strict=True)) == expected
+    for i in (0, 10, 20):
+        assert index.active_at(times[i]) == brute_force(intervals, times[i])
+
+    assert index.expiring(50_000, 1000) == sorted(
+        (key for key, (_, end) in enumerate(intervals) if 50_000 < end <= 51_000),
+        key=lambda key: intervals[key][1],
+    )
+
+    rebuilds = index.rebuilds
+    for key in range(count):
+        if key % 3:
+            index.remove(key)
+            intervals[key] = (0.0, 0.0)
+    when = float(times[30])
+    assert index.active_at(when) == brute_force(intervals, when)
+    assert index.rebuilds == rebuilds + 1
+
+
+def test_empty() -> None:
+    """An empty index finds nothing."""
+    index: IntervalIndex[int] = IntervalIndex()
+    time_indices, values = index.active_at_many([T0, T0 + 1])
+    assert time_indices.tolist() == []
+    assert values == []
+    assert index.active_at(T0) == []
+    assert index.expiring(T0, 100) == []
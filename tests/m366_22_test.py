@@ -6,6 +6,7 @@ import pytest
 from BitVector import BitVector
 
 from ais_area_notice import binary, m366_22
+from ais_area_notice.decode_context import DecodeContext
 
 
 def test_empty_init() -> None:
@@ -42,6 +43,18 @@ def test_circle() -> None:
     assert circle.radius == 1800
 
 
+def test_circle_nmea_time_stamp() -> None:
+    """Test the year comes from the NMEA receive time stamp."""
+    aivdm = (
+        "!AIVDM,1,1,0,A,85M:Ih1KUQU6jAs85`0MK4lh<7=B42l0000,2*7F,b003669953,1297555217"
+    )
+    context = DecodeContext()
+    an = m366_22.AreaNotice(nmea_strings=[aivdm], context=context)
+    # Received 2011-02-13, so September is from the previous year.
+    assert an.when == datetime.datetime(2010, 9, 4, 15, 25, tzinfo=datetime.UTC)
+    assert context.stats == {"area_notices": 1, "sub_areas": 1}
+
+
 def test_decode_nmea_zero_fill_bits() -> None:
     """Test decoding AreaNotice NMEA sentence with zero fill bits."""
     body_34 = "85M:Ih1KUQU6jAs85`0MK4lh<7=B42l000"
@@ -227,3 +240,13 @@ def test_subarea_factory_shapes_1_2_3_4_5(monkeypatch: pytest.MonkeyPatch) -> No
     # Shape 5 (Text)
     with pytest.raises(NameError, match="name 'AreaNoticeText' is not defined"):
         an.subarea_factory(BitVector.from_bitstring("101" + "0" * 90))
+
+
+def test_coordinate_decimals() -> None:
+    """Positions are in 1/10,000 minute."""
+    for precision, decimals in ((0, 2), (3, 5), (4, 6), (7, 6)):
+        circle = m366_22.AreaNoticeCircle(
+            lon=1.0, lat=-2.0, radius=4, precision=precision
+        )
+        assert circle.coordinate_decimals() == decimals
+    assert m366_22.AreaNoticeSubArea().coordinate_decimals() is None
@@ -8,6 +8,7 @@ import pytest
 from BitVector import BitVector
 
 from ais_area_notice import binary, m367_22
+from ais_area_notice.decode_context import DecodeContext
 from ais_area_notice.imo_001_22_area_notice import (
     AisPackingException,
     AisUnpackingException,
@@ -269,6 +270,16 @@ class TestAreaNotice:
             radius=1800,
         )
 
+    def test_circle_nmea_time_stamp(self) -> None:
+        """Test the year comes from the NMEA receive time stamp."""
+        msg = "!AIVDM,1,1,0,A,85M:Ih1KmPAU6jAs85`03cJm;1NHQhPFP000,0*19,b003669953,1297555217"
+        context = DecodeContext()
+        area_notice = AreaNotice(nmea_strings=[msg], context=context)
+        assert area_notice.when == datetime.datetime(
+            2010, 9, 4, 15, 25, tzinfo=datetime.UTC
+        )
+        assert context.stats == {"area_notices": 1, "sub_areas": 1}
+
     def test_only_circle_encode(self) -> None:
         """Test AreaNoticeCircle standalone encoding and decoding."""
         lon = 1.0
@@ -670,6 +681,23 @@ class TestAreaNotice:
         with pytest.raises(NotImplementedError):
             subarea.get_bits()
 
+    def test_coordinate_decimals(self) -> None:
+        """Positions are in 1/10,000 minute."""
+        sector = AreaNoticeSector(
+            lon=1.0,
+            lat=-2.0,
+            radius=4,
+            left_bound_deg=0,
+            right_bound_deg=90,
+            precision=2,
+        )
+        assert sector.coordinate_decimals() == 4
+        rectangle = AreaNoticeRectangle(
+            lon=1.0, lat=-2.0, east_dim=10, north_dim=10, orientation_deg=0, precision=4
+        )
+        assert rectangle.coordinate_decimals() == 6
+        assert AreaNoticeText(text="A").coordinate_decimals() is None
+
     def test_subarea_factory_invalid_preceding_shape(self) -> None:
         """Test subarea factory throws error for invalid shape sequence."""
         when = datetime.datetime(2026, 9, 4, 15, 25, tzinfo=datetime.UTC)
@@ -706,6 +734,44 @@ class TestAreaNotice:
         with pytest.raises(AisPackingException, match="Unsupported shape type: 6"):
             an.subarea_factory(unsupported_bits)
 
+    def test_polyline_chain(self) -> None:
+        """Test a polyline continued in the next sub-area starts at its end."""
+        when = datetime.datetime(2026, 9, 4, 15, 25, tzinfo=datetime.UTC)
+        an = AreaNotice(
+            area_type=13, when=when, duration_min=60, link_id=1, mmsi=366123456
+        )
+        line1 = AreaNoticePoly(SHAPES["POLYLINE"], [(90.0, 1000)], scale_factor=1)
+        line2 = AreaNoticePoly(SHAPES["POLYLINE"], [(0.0, 1000)], scale_factor=1)
+        bits = (
+            an.get_bits(include_bin_hdr=True)
+            + AreaNoticeCircle(-70.0, 42.0, 0).get_bits()
+            + line1.get_bits()
+            + line2.get_bits()
+        )
+        decoded = AreaNotice(nmea_strings=None)
+        decoded.decode_bits(bits, context=DecodeContext(when))
+        first, second = decoded.areas
+        assert isinstance(second, AreaNoticePoly)
+        assert first.lon == pytest.approx(-70.0)
+        # About 1 km east of the start.
+        assert second.lon == pytest.approx(-70.0 + 1000 / 82800, abs=1e-3)
+        assert second.lat == pytest.approx(42.0, abs=1e-3)
+        (chain,) = decoded.polyline_chains
+        assert chain.areas == [first, second]
+        assert len(chain.get_points()) == 3
+
+        # Polylines added directly each start a chain.
+        decoded.add_subarea(line1)
+        assert decoded.polyline_chains[-1].areas == [line1]
+
+        # A continuation of a polyline that is not the end of a chain.
+        decoded.polyline_chains.clear()
+        decoded.areas.pop()
+        third = decoded.subarea_factory(line2.get_bits())
+        assert isinstance(third, AreaNoticePoly)
+        assert [chain.areas for chain in decoded.polyline_chains] == [[second, third]]
+        assert third.lat == pytest.approx(42.009, abs=1e-3)
+
     def test_decode_bits_verify_log(self) -> None:
         """Test DecodeBits verification failure logging."""
         db = DecodeBits(BitVector.from_bitstring("0000"))
@@ -0,0 +1,132 @@
+"""Tests for incremental KML updates of Area Notices."""
+
+import datetime
+
+from lxml import etree
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.network_link import KmlUpdater, placemark_id
+from tests.notice_index_test import WHEN, make_notice
+
+KML = "{http://www.opengis.net/kml/2.2}"
+MMSI = 123456789
+# Free text before the circle, so placemarks are for sub-area 1.
+TEXT = "WHALES"
+
+
+def targets(root: etree._Element, path: str) -> list[str | None]:
+    """Return the ids of the placemarks at path in an update."""
+    return [
+        placemark.get("targetId") or placemark.get("id")
+        for placemark in root.iterfind(f"{KML}NetworkLinkControl/{KML}Update/{path}")
+    ]
+
+
+def test_document() -> None:
+    """The document gives the Document and each placemark an id."""
+    updater = KmlUpdater("http://example.com/notices.kml", with_time=True)
+    notices = [
+        make_notice(text=TEXT, link_id=1),
+        make_notice(-69.0, text=TEXT, link_id=2),
+    ]
+    root = etree.fromstring(updater.document(notices).encode())
+    document = root.find(f"{KML}Document")
+    assert document is not None
+    assert document.get("id") == "area_notices"
+    assert document.find(f"{KML}StyleMap") is not None
+    ids = [placemark.get("id") for placemark in document.iterfind(f"{KML}Placemark")]
+    assert ids == [placemark_id(MMSI, 1, 1), placemark_id(MMSI, 2, 1)]
+    assert ids[0] == "an_123456789_1_1"
+    assert len(updater) == 2
+    assert ids[1] in updater
+
+
+def test_update() -> None:
+    """Only the placemarks that appeared, changed or went away are sent."""
+    updater = KmlUpdater("http://example.com/notices.kml", document_id="live")
+    notices = [
+        make_notice(text=TEXT, link_id=1),
+        make_notice(text=TEXT, link_id=2),
+        make_notice(text=TEXT, link_id=3),
+    ]
+    updater.document(notices)
+
+    root = etree.fromstring(updater.update(notices).encode())
+    assert root.find(f"{KML}NetworkLinkControl/{KML}Update") is None
+    assert updater.cycles == 1
+
+    newer = make_notice(
+        text=TEXT, link_id=2, radius=3000, when=WHEN + datetime.timedelta(minutes=5)
+    )
+    older = make_notice(text=TEXT, link_id=4, when=WHEN - datetime.timedelta(minutes=5))
+    cancel = make_notice(
+        text=TEXT, link_id=5, area_type=area_notice.notice_type["cancel_area_notice"]
+    )
+    current = [
+        notices[0],
+        newer,
+        notices[1],
+        make_notice(text=TEXT, link_id=4),
+        older,
+        cancel,
+    ]
+    root = etree.fromstring(updater.update(current).encode())
+    update = root.find(f"{KML}NetworkLinkControl/{KML}Update")
+    assert update is not None
+    assert update.findtext(f"{KML}targetHref") == "http://example.com/notices.kml"
+    assert targets(root, f"{KML}Delete/{KML}Placemark") == ["an_123456789_3_1"]
+    assert targets(root, f"{KML}Change/{KML}Placemark") == ["an_123456789_2_1"]
+    created = root.find(
+        f"{KML}NetworkLinkControl/{KML}Update/{KML}Create/{KML}Document"
+    )
+    assert created is not None
+    assert created.get("targetId") == "live"
+    assert targets(root, f"{KML}Create/{KML}Document/{KML}Placemark") == [
+        "an_123456789_4_1"
+    ]
+    changed = root.find(f".//{KML}Change/{KML}Placemark")
+    assert changed is not None
+    assert changed.find(f"{KML}Polygon") is not None
+    assert len(updater) == 3
+    assert "an_123456789_3_1" not in updater
+
+    # A circle that shrinks to a point needs a new element.
+    point = make_notice(text=TEXT, link_id=1, radius=0)
+    root = etree.fromstring(
+        updater.update([point, newer, make_notice(text=TEXT, link_id=4)]).encode()
+    )
+    assert targets(root, f"{KML}Delete/{KML}Placemark") == ["an_123456789_1_1"]
+    assert targets(root, f"{KML}Change/{KML}Placemark") == []
+    assert targets(root, f"{KML}Create/{KML}Document/{KML}Placemark") == [
+        "an_123456789_1_1"
+    ]
+
+    root = etree.fromstring(updater.update([]).encode())
+    assert len(targets(root, f"{KML}Delete/{KML}Placemark")) == 3
+    assert len(updater) == 0
+    assert updater.cycles == 4
+
+    root = etree.fromstring(
+        updater.update([make_notice(text=TEXT, link_id=1)]).encode()
+    )
+    assert targets(root, f"{KML}Delete/{KML}Placemark") == []
+    assert len(updater) == 1
+
+
+def test_escaped_href_and_id() -> None:
+    """URLs with query strings and odd ids give well-formed KML."""
+    href = "http://example.com/notices.kml?a=1&b=2"
+    updater = KmlUpdater(href, document_id='live "1" & <2>')
+    root = etree.fromstring(updater.document([]).encode())
+    document = root.find(f"{KML}Document")
+    assert document is not None
+    assert document.get("id") == 'live "1" & <2>'
+
+    root = etree.fromstring(
+        updater.update([make_notice(text=TEXT, link_id=1)]).encode()
+    )
+    update = f"{KML}NetworkLinkControl/{KML}Update"
+    assert root.findtext(f"{update}/{KML}targetHref") == href
+    create = root.find(f"{update}/{KML}Create/{KML}Document")
+    assert create is not None
+    assert create.get("targetId") == 'live "1" & <2>'
@@ -0,0 +1,215 @@
+"""Tests for the spatial and temporal index of Area Notices."""
+
+import datetime
+
+import numpy as np
+import pytest
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import notice_index
+from ais_area_notice.notice_index import ActiveNotices, AreaNoticeIndex, NoticeKey
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = WHEN.timestamp()
+
+
+def make_notice(
+    lon: float = -70.0,
+    lat: float = 42.0,
+    *,
+    radius: float = 2000,
+    area: area_notice.AreaNoticeSubArea | None = None,
+    text: str | None = None,
+    mmsi: int = 123456789,
+    link_id: int = 1,
+    area_type: int = area_notice.notice_type["cau_mammals_reduce_speed"],
+    when: datetime.datetime = WHEN,
+    duration: int = 60,
+) -> area_notice.AreaNotice:
+    """Notice with a circle at (lon, lat), or with area instead.
+
+    A free text sub-area goes before the circle if text is given.
+    """
+    notice = area_notice.AreaNotice(
+        area_type, when, duration, link_id, source_mmsi=mmsi
+    )
+    if text is not None:
+        notice.add_subarea(area_notice.AreaNoticeFreeText(text=text))
+    if area is None:
+        area = area_notice.AreaNoticeCirclePt(lon, lat, radius=radius)
+    notice.add_subarea(area)
+    return notice
+
+
+def test_notice_helpers() -> None:
+    """valid_interval and geoms of an Area Notice."""
+    notice = make_notice(-70.0)
+    assert notice.valid_interval() == (T0, T0 + 3600)
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+    notice.add_subarea(
+        area_notice.AreaNoticePolygon([(0, 1000), (90, 1000), (180, 1000)], -70.0, 42)
+    )
+    assert [geom.geom_type for geom in notice.geoms()] == ["Polygon", "Polygon"]
+    assert notice_index.notice_key(notice) == (123456789, 1)
+
+
+def test_query() -> None:
+    """Only notices that are active and contain the position are returned."""
+    index = AreaNoticeIndex()
+    first = make_notice(-70.0, link_id=1)
+    second = make_notice(-69.0, link_id=2, duration=10)
+    assert index.insert(first)
+    assert index.insert(second)
+    assert len(index) == 2
+    assert (123456789, 2) in index
+    assert list(index) == [first, second]
+
+    assert index.query(-70.0, 42.0, WHEN) == [first]
+    assert index.query(-69.0, 42.0, T0 + 300) == [second]
+    assert index.query(-69.0, 42.0, T0 + 600) == []
+    assert index.query(-69.0, 42.0, T0 - 1) == []
+    assert index.query(-68.0, 42.0, T0) == []
+
+
+def test_query_many() -> None:
+    """Bulk queries list each position and notice pair once."""
+    index = AreaNoticeIndex()
+    notice = make_notice(-70.0)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=500))
+    index.insert(notice)
+    other = make_notice(-70.01, link_id=2)
+    index.insert(other)
+
+    positions, notices = index.query_many(
+        [-68.0, -70.0, -70.01, -70.0], [42.0, 42.0, 42.0, 42.0], [T0, T0, T0, T0 - 60]
+    )
+    assert positions.tolist() == [1, 1, 2, 2]
+    assert notices == [notice, other, notice, other]
+
+
+def test_query_empty() -> None:
+    """An empty index finds nothing."""
+    positions, notices = AreaNoticeIndex().query_many([-70.0], [42.0], [T0])
+    assert positions.tolist() == []
+    assert notices == []
+
+
+def test_replace_and_cancel() -> None:
+    """Newer notices with the same key replace older ones."""
+    index = AreaNoticeIndex()
+    old = make_notice(-70.0)
+    new = make_notice(-69.0, when=WHEN + datetime.timedelta(minutes=5))
+    index.insert(old)
+    assert index.insert(new)
+    assert len(index) == 1
+    assert index.get((123456789, 1)) is new
+    assert index.query(-70.0, 42.0, T0 + 600) == []
+    assert index.query(-69.0, 42.0, T0 + 600) == [new]
+
+    assert not index.insert(old)
+    assert index.get((123456789, 1)) is new
+
+    cancel = make_notice(
+        -69.0,
+        when=WHEN + datetime.timedelta(minutes=6),
+        area_type=area_notice.notice_type["cancel_area_notice"],
+    )
+    assert index.insert(cancel)
+    assert len(index) == 0
+    assert index.query(-69.0, 42.0, T0 + 600) == []
+    assert index.remove((123456789, 1)) is None
+
+
+def test_expire() -> None:
+    """Expired notices are removed and returned."""
+    index = AreaNoticeIndex()
+    short = make_notice(-70.0, link_id=1, duration=10)
+    long = make_notice(-70.0, link_id=2, duration=100)
+    index.insert(short)
+    index.insert(long)
+    assert index.expire(T0 + 300) == []
+    assert index.active_at(T0 + 300) == [short, long]
+    assert index.expire(WHEN + datetime.timedelta(minutes=10)) == [short]
+    assert index.active_at(T0 + 600) == [long]
+    assert list(index) == [long]
+    assert index.query(-70.0, 42.0, T0 + 300) == [long]
+
+
+def test_incremental_rebuilds() -> None:
+    """The main tree is only rebuilt once enough changes pile up."""
+    index = AreaNoticeIndex()
+    lons = np.linspace(-75, -65, 200)
+    for i, lon in enumerate(lons[:20]):
+        index.insert(make_notice(lon, link_id=i))
+        assert len(index.query(lon, 42.0, T0)) == 1
+    assert index.rebuilds == 0
+
+    for i, lon in enumerate(lons[20:], start=20):
+        index.insert(make_notice(lon, link_id=i))
+    positions, _ = index.query_many(lons, np.full(200, 42.0), np.full(200, T0))
+    assert positions.tolist() == list(range(200))
+    assert index.rebuilds == 1
+
+    index.insert(make_notice(-60.0, link_id=500))
+    assert len(index.query(-60.0, 42.0, T0)) == 1
+    assert index.rebuilds == 1
+
+    for i in range(150):
+        index.remove((123456789, i))
+    assert len(index.query(lons[0], 42.0, T0)) == 0
+    assert len(index.query(lons[199], 42.0, T0)) == 1
+    assert index.rebuilds == 2
+    assert len(index) == 51
+
+
+class Recorder(ActiveNotices):
+    """ActiveNotices that records the calls of its hooks."""
+
+    def __init__(self) -> None:
+        """Initialize with no notices or calls."""
+        super().__init__()
+        self.calls: list[tuple[str, NoticeKey]] = []
+
+    def _add(
+        self, key: NoticeKey, notice: area_notice.AreaNotice, start: float, end: float
+    ) -> None:
+        """Record an added notice."""
+        assert (start, end) == notice.valid_interval()
+        self.calls.append(("add", key))
+
+    def _discard(self, key: NoticeKey) -> None:
+        """Record a dropped notice."""
+        self.calls.append(("discard", key))
+
+
+def test_active_notices() -> None:
+    """The hooks see every notice that is added and dropped."""
+    key = (123456789, 1)
+    notices = Recorder()
+    assert notices.insert(make_notice(-70.0))
+    later = make_notice(-70.0, when=WHEN + datetime.timedelta(minutes=10))
+    assert notices.insert(later)
+    assert not notices.insert(make_notice(-70.0))
+    assert list(notices) == [later]
+    assert notices.calls == [("add", key), ("discard", key), ("add", key)]
+
+    cancel = make_notice(
+        -70.0,
+        when=WHEN + datetime.timedelta(minutes=20),
+        area_type=area_notice.notice_type["cancel_area_notice"],
+    )
+    assert notices.insert(cancel)
+    assert key not in notices
+    assert notices.remove(key) is None
+    assert notices.calls[3:] == [("discard", key)]
+
+    notices.insert(make_notice(-70.0, link_id=2))
+    assert notices.active_at(T0 + 60) == [notices.get((123456789, 2))]
+    assert len(notices.expire(T0 + 3600)) == 1
+    assert notices.calls[-1] == ("discard", (123456789, 2))
+    assert not len(notices)
+
+    with pytest.raises(NotImplementedError):
+        ActiveNotices().insert(make_notice(-70.0))
+    with pytest.raises(NotImplementedError):
+        ActiveNotices()._discard(key)
@@ -0,0 +1,146 @@
+"""Tests for the tiled union of Area Notices."""
+
+import datetime
+
+import pytest
+import shapely
+import shapely.geometry.base
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice.notice_union import NoticeUnion
+from tests.notice_index_test import make_notice
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = WHEN.timestamp()
+REDUCE_SPEED = area_notice.notice_type["cau_mammals_reduce_speed"]
+STAY_CLEAR = area_notice.notice_type["cau_mammals_stay_clear"]
+
+
+def same(
+    a: shapely.geometry.base.BaseGeometry, b: shapely.geometry.base.BaseGeometry
+) -> bool:
+    """Equal apart from the vertices that tiles add to the edges."""
+    return bool(shapely.area(shapely.symmetric_difference(a, b)) < 1e-9 * b.area)
+
+
+def test_invalid() -> None:
+    """Tiles need a size."""
+    with pytest.raises(ValueError):
+        NoticeUnion(tile_size=0)
+
+
+def test_matches_union_all() -> None:
+    """The tiled union is the union of all of the geometries."""
+    union = NoticeUnion(tile_size=0.25)
+    notices = [
+        make_notice(-70.0 + 0.2 * i, 42.0 + 0.05 * i, radius=20000, link_id=i)
+        for i in range(8)
+    ]
+    notices.append(
+        make_notice(-69.0, 41.0, radius=20000, link_id=20, area_type=STAY_CLEAR)
+    )
+    notices[0].add_subarea(area_notice.AreaNoticeCirclePt(-70.1, 42.0, radius=5000))
+    for notice in notices:
+        union.insert(notice)
+    assert len(union) == 9
+    assert (123456789, 20) in union
+    assert union.groups() == [REDUCE_SPEED, STAY_CLEAR]
+
+    expected = shapely.union_all(
+        [geom for notice in notices[:8] for geom in notice.geoms()]
+    )
+    result = union.union(REDUCE_SPEED)
+    assert result.geom_type == "Polygon"
+    assert same(result, expected)
+    assert same(union.union(STAY_CLEAR), notices[8].geoms()[0])
+    assert union.union(99).is_empty
+    assert union.union(REDUCE_SPEED) is result
+
+
+def test_incremental() -> None:
+    """Only the tiles that a notice overlaps are recomputed."""
+    union = NoticeUnion(tile_size=0.25)
+    for i in range(8):
+        union.insert(make_notice(-70.0 + 0.5 * i, link_id=i, radius=5000))
+    union.union(REDUCE_SPEED)
+    rebuilds = union.tile_rebuilds
+    assert rebuilds >= 8
+
+    union.insert(make_notice(-66.0, link_id=8, radius=5000))
+    before = union.union(REDUCE_SPEED)
+    assert union.tile_rebuilds - rebuilds <= 4
+
+    rebuilds = union.tile_rebuilds
+    assert union.remove((123456789, 8)) is not None
+    assert union.remove((123456789, 8)) is None
+    after = union.union(REDUCE_SPEED)
+    assert union.tile_rebuilds - rebuilds <= 4
+    assert after.area < before.area
+
+
+def test_replace_expire_and_cancel() -> None:
+    """Groups follow the notices that come and go."""
+    union = NoticeUnion(group=lambda notice: notice.area_type < 4)
+    old = make_notice(-70.0, radius=20000)
+    new = make_notice(-69.0, radius=20000, when=WHEN + datetime.timedelta(minutes=5))
+    short = make_notice(
+        -68.0, radius=20000, link_id=2, duration=10, area_type=STAY_CLEAR
+    )
+    union.insert(old)
+    assert union.insert(new)
+    assert not union.insert(old)
+    union.insert(short)
+    assert union.groups() == [True]
+    assert union.union(True).geom_type == "MultiPolygon"
+
+    assert union.expire(T0 + 600) == [short]
+    assert same(union.union(True), new.geoms()[0])
+
+    text = area_notice.AreaNotice(REDUCE_SPEED, WHEN, 60, 3, source_mmsi=123456789)
+    text.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+    union.insert(text)
+    assert len(union) == 2
+    assert union.remove((123456789, 3)) is text
+
+    cancel = make_notice(
+        -69.0,
+        link_id=1,
+        when=WHEN + datetime.timedelta(minutes=6),
+        area_type=area_notice.notice_type["cancel_area_notice"],
+    )
+    assert union.insert(cancel)
+    assert len(union) == 0
+    assert union.groups() == []
+    assert union.union(True).is_empty
+
+
+def test_geo_interface() -> None:
+    """One feature per group."""
+    union = NoticeUnion()
+    union.insert(make_notice(-70.0, radius=20000))
+    union.insert(make_notice(-70.1, radius=20000, link_id=2))
+    union.insert(make_notice(-60.0, radius=20000, link_id=3, area_type=STAY_CLEAR))
+    geo = union.__geo_interface__
+    assert geo["type"] == "FeatureCollection"
+    assert [feature["properties"] for feature in geo["features"]] == [
+        {"group": REDUCE_SPEED, "notices": 2},
+        {"group": STAY_CLEAR, "notices": 1},
+    ]
+    assert same(
+        shapely.geometry.shape(geo["features"][0]["geometry"]),
+        union.union(REDUCE_SPEED),
+    )
+
+
+def test_lines() -> None:
+    """Polylines are merged with polygons of the same group."""
+    union = NoticeUnion(tile_size=0.25)
+    union.insert(make_notice(-70.0, radius=5000))
+    line = area_notice.AreaNotice(REDUCE_SPEED, WHEN, 60, 2, source_mmsi=123456789)
+    line.add_subarea(area_notice.AreaNoticePolyline([(90, 50000)], -70.0, 42.5))
+    union.insert(line)
+    result = union.union(REDUCE_SPEED)
+    assert isinstance(result, shapely.GeometryCollection)
+    assert {part.geom_type for part in result.geoms} == {"LineString", "Polygon"}
+    lines = [part for part in result.geoms if part.geom_type == "LineString"]
+    assert sum(part.length for part in lines) == pytest.approx(line.geoms()[0].length)
@@ -0,0 +1,213 @@
+"""Tests for exporting sensor reports as tables."""
+
+import csv
+import datetime
+import math
+import pathlib
+from typing import TypedDict
+
+import numpy as np
+import pytest
+
+from ais_area_notice import imo_001_26_environment as env
+from ais_area_notice import sensor_report_writer
+
+WHEN = datetime.datetime(2019, 2, 6, 12, 0, tzinfo=datetime.UTC)
+MMSI = 366123456
+
+
+class Date(TypedDict):
+    """Date fields of a sensor report."""
+
+    year: int
+    month: int
+    day: int
+    hour: int
+    minute: int
+
+
+DATE = Date(year=2019, month=2, day=6, hour=12, minute=0)
+
+
+def build_messages() -> list[env.Environment]:
+    """Two messages with every report type."""
+    first = env.Environment(source_mmsi=MMSI)
+    first.append(
+        env.SensorReportLocation(
+            site_id=11, lon=-70.5, lat=41.25, alt=3.5, owner=1, timeout=0, **DATE
+        )
+    )
+    first.append(env.SensorReportId(site_id=11, id_str="BUOY A", **DATE))
+    first.append(
+        env.SensorReportWind(
+            site_id=11, speed=10, gust=15, dir=200, data_descr=1, **DATE
+        )
+    )
+    first.append(
+        env.SensorReportWaterLevel(
+            site_id=11, wl=1.23, trend=1, vdatum=0, data_descr=2, **DATE
+        )
+    )
+    first.append(
+        env.SensorReportCurrent2d(
+            site_id=11, speed_1=1.5, dir_1=90, level_1=3, data_descr=1, **DATE
+        )
+    )
+    first.append(
+        env.SensorReportCurrent3d(
+            site_id=11, n_1=1.0, e_1=2.0, z_1=0.5, level_1=4, **DATE
+        )
+    )
+    second = env.Environment(source_mmsi=MMSI + 1)
+    second.append(
+        env.SensorReportCurrentHorz(
+            site_id=12, bearing_1=45, dist_1=10, speed_1=2.5, dir_1=180, **DATE
+        )
+    )
+    second.append(env.SensorReportSeaState(site_id=12, sea_state=3, **DATE))
+    second.append(
+        env.SensorReportSalinity(site_id=12, salinity=35.1, salinity_type=1, **DATE)
+    )
+    second.append(env.SensorReportWeather(site_id=12, air_pres_trend=2, **DATE))
+    second.append(env.SensorReportAirGap(site_id=12, gap=30.5, gap_trend=0, **DATE))
+    return [first, second]
+
+
+def read_csv(path: pathlib.Path) -> list[dict[str, str]]:
+    """Rows of a CSV file."""
+    with open(path, encoding="ascii", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_fields() -> None:
+    """Every report type has a file, fields and a dtype."""
+    assert set(sensor_report_writer.FILE_NAMES) == set(env.sensor_report_classes)
+    fields = sensor_report_writer.REPORT_FIELDS
+    assert fields[env.SensorReportCurrent2d][:4] == (
+        "speed_1",
+        "dir_1",
+        "level_1",
+        "speed_2",
+    )
+    assert fields[env.SensorReportCurrent2d][-1] == "data_descr"
+    assert len(fields[env.SensorReportCurrentHorz]) == 10
+    for report_cls in env.sensor_report_classes:
+        report = report_cls(**DATE, site_id=1)
+        for field in fields[report_cls]:
+            if report_cls not in sensor_report_writer.CURRENT_LEVELS:
+                assert hasattr(report, field)
+        dtype = sensor_report_writer.report_dtype(report_cls, lookups=True)
+        assert dtype.names is not None
+        assert dtype.names[:3] == ("mmsi", "time", "site_id")
+    dtype = sensor_report_writer.report_dtype(env.SensorReportLocation, lookups=True)
+    assert dtype["lat"] == np.dtype("<f8")
+    assert dtype["owner"] == np.dtype("<i4")
+    assert dtype["owner_str"] == np.dtype("S25")
+    assert dtype["timeout_hrs"] == np.dtype("<f8")
+
+
+def test_csv(tmp_path: pathlib.Path) -> None:
+    """One CSV per report type, with the date and the lookups."""
+    with sensor_report_writer.SensorReportWriter(
+        tmp_path, lookups=True, chunk_size=1
+    ) as writer:
+        assert writer.write_all(build_messages()) == 11
+    assert writer.rows == 11
+    assert len(writer.paths) == 11
+    assert writer.paths[env.SensorReportWind] == tmp_path / "wind.csv"
+
+    (wind,) = read_csv(tmp_path / "wind.csv")
+    assert wind["mmsi"] == str(MMSI)
+    assert wind["time"] == "2019-02-06T12:00+00:00"
+    assert (wind["site_id"], wind["speed"], wind["dir"]) == ("11", "10", "200")
+    assert wind["data_descr_str"] == "raw real time"
+
+    (water_level,) = read_csv(tmp_path / "water_level.csv")
+    assert water_level["wl"] == "1.23"
+    assert water_level["vdatum_str"] == "MLLW"
+    assert water_level["trend_str"] == "rising"
+    assert water_level["data_descr_str"] == "real time with quality control"
+
+    (location,) = read_csv(tmp_path / "location.csv")
+    assert location["owner_str"] == "hydrographic office"
+    assert location["timeout_hrs"] == ""
+
+    (current,) = read_csv(tmp_path / "current_horz.csv")
+    assert current["mmsi"] == str(MMSI + 1)
+    assert (current["bearing_1"], current["speed_1"]) == ("45", "2.5")
+    assert current["level_2"] == "361"
+
+    (station,) = read_csv(tmp_path / "id.csv")
+    assert station["id_str"] == "BUOY A"
+    assert read_csv(tmp_path / "sea_state.csv")[0]["sea_state_str"] == (
+        "Large wavelets"
+    )
+    assert read_csv(tmp_path / "weather.csv")[0]["air_pres_trend_str"] == "falling"
+
+
+def test_npy(tmp_path: pathlib.Path) -> None:
+    """The .npy files are structured arrays."""
+    messages = build_messages()
+    with sensor_report_writer.SensorReportWriter(
+        tmp_path, fmt="npy", lookups=True
+    ) as writer:
+        writer.write_all(messages * 3)
+        writer.flush()
+    writer.close()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    wind = np.load(tmp_path / "wind.npy", mmap_mode="r")
+    assert wind.dtype == sensor_report_writer.report_dtype(
+        env.SensorReportWind, lookups=True
+    )
+    assert len(wind) == 3
+    assert wind["time"].tolist() == [WHEN.timestamp()] * 3
+    assert wind["speed"].tolist() == [10] * 3
+    assert wind["data_descr_str"][0] == b"raw real time"
+
+    location = np.load(tmp_path / "location.npy")
+    assert location["lon"][0] == -70.5
+    assert math.isnan(location["timeout_hrs"][0])
+    assert location["owner_str"][0] == b"hydrographic office"
+
+    current = np.load(tmp_path / "current_2d.npy")
+    assert current["speed_1"][0] == 1.5
+    assert current["mmsi"][0] == MMSI
+    assert np.load(tmp_path / "id.npy")["id_str"][0] == b"BUOY A"
+
+
+def test_bits(tmp_path: pathlib.Path) -> None:
+    """The year and month of raw payloads come from the reference time."""
+    first, _ = build_messages()
+    bits = first.get_bits(include_bin_hdr=True)
+    with sensor_report_writer.SensorReportWriter(tmp_path) as writer:
+        assert writer.write(bits, WHEN + datetime.timedelta(days=10)) == 6
+        assert writer.write_all([bits], WHEN - datetime.timedelta(days=20)) == 6
+        writer.write(bits)
+    times = [row["time"] for row in read_csv(tmp_path / "wind.csv")]
+    # The previous reference time is kept when there is no new one.
+    assert times == [
+        "2019-02-06T12:00+00:00",
+        "2019-01-06T12:00+00:00",
+        "2019-01-06T12:00+00:00",
+    ]
+    rows = read_csv(tmp_path / "wind.csv")
+    assert "data_descr_str" not in rows[0]
+
+
+def test_no_time(tmp_path: pathlib.Path) -> None:
+    """Reports without a valid time have a blank or NaN time."""
+    msg = env.Environment(source_mmsi=MMSI)
+    msg.append(env.SensorReportWind(site_id=1, **DATE))
+    msg.sensor_reports[0].hour = 24
+    for fmt in ("csv", "npy"):
+        with sensor_report_writer.SensorReportWriter(tmp_path, fmt=fmt) as writer:
+            writer.write(msg)
+    assert read_csv(tmp_path / "wind.csv")[0]["time"] == ""
+    assert math.isnan(np.load(tmp_path / "wind.npy")["time"][0])
+
+
+def test_invalid(tmp_path: pathlib.Path) -> None:
+    """An unknown format is rejected."""
+    with pytest.raises(ValueError, match="Unknown format: json"):
+        sensor_report_writer.SensorReportWriter(tmp_path, fmt="json")  # type: ignore[arg-type]
@@ -0,0 +1,213 @@
+"""Tests for binary snapshots of decoded messages."""
+
+import datetime
+import pathlib
+
+import numpy as np
+import pytest
+import shapely
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import imo_001_26_environment as env
+from ais_area_notice import snapshot
+from ais_area_notice.decode_context import DecodeContext
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+MMSI = 366123456
+
+
+def build_notice(link_id: int = 7) -> area_notice.AreaNotice:
+    """An Area Notice with a circle, text, a point and a polyline."""
+    notice = area_notice.AreaNotice(1, WHEN, 60, link_id, source_mmsi=MMSI)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=2000))
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.1, 42.1, radius=0))
+    notice.add_subarea(
+        area_notice.AreaNoticePolyline([(10, 1400), (90, 1950)], -69.0, 40.6)
+    )
+    return notice
+
+
+def build_environment() -> env.Environment:
+    """An Environment message with a station location."""
+    msg = env.Environment(source_mmsi=MMSI)
+    msg.append(
+        env.SensorReportLocation(
+            day=6, hour=12, minute=0, site_id=11, lon=-70.5, lat=41.25, alt=3.5
+        )
+    )
+    return msg
+
+
+def not_rebuilt(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail if the geometry of a circle is built."""
+
+    def local_vertices(self: area_notice.AreaNoticeCirclePt) -> None:
+        """Fail instead of building the vertices."""
+        raise AssertionError("geometry rebuilt")
+
+    monkeypatch.setattr(
+        area_notice.AreaNoticeCirclePt, "local_vertices", local_vertices
+    )
+
+
+def test_round_trip(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Messages decode to what was written, with the stored geometry."""
+    path = tmp_path / "cache.snap"
+    notice = build_notice()
+    environment = build_environment()
+    with snapshot.SnapshotWriter(path) as writer:
+        writer.write(notice, received=WHEN, station="r003669945")
+        writer.write(environment, received=WHEN.timestamp() + 60)
+        assert writer.write_all([build_notice(8)]) == 1
+    assert writer.records == 3
+    assert not path.with_name("cache.snap.tmp").exists()
+
+    snap = snapshot.Snapshot(path)
+    assert len(snap) == 3
+    records = snap.records
+    assert records["station"][0] == b"r003669945"
+    assert records["received"][0] == WHEN.timestamp()
+    assert records["dac"].tolist() == [1, 1, 1]
+    assert records["fi"].tolist() == [22, 26, 22]
+    assert records["geometry_count"].tolist() == [3, 0, 3]
+
+    decoded = snap.message(0)
+    assert isinstance(decoded, area_notice.AreaNotice)
+    assert decoded.when == WHEN
+    assert decoded.link_id == 7
+    assert decoded.source_mmsi == MMSI
+    assert str(snap.bits(0)) == str(notice.get_bits(include_bin_hdr=True))
+    assert [type(area) for area in decoded.areas] == [
+        type(area) for area in notice.areas
+    ]
+    # The geometry comes from the file rather than being built again.
+    stored = dict(snap.geoms(0))
+    with monkeypatch.context() as patch:
+        not_rebuilt(patch)
+        geom = decoded.areas[0].geom()
+        assert geom is not None
+        assert geom.equals(stored[0])
+    assert stored[0].equals(notice.areas[0].geom())
+    assert stored[2].equals(notice.areas[2].geom())
+    assert stored[3].equals(notice.areas[3].geom())
+    assert [geom.geom_type for geom in stored.values()] == [
+        "Polygon",
+        "Point",
+        "LineString",
+    ]
+
+    messages = list(snap)
+    assert messages[1] == environment
+    assert isinstance(messages[2], area_notice.AreaNotice)
+    assert messages[2].link_id == 8
+
+
+def test_geometry_settings(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Stored geometry is ignored when the level of detail changed."""
+    path = tmp_path / "cache.snap"
+    with snapshot.SnapshotWriter(path) as writer:
+        writer.write(build_notice(), received=WHEN)
+    snap = snapshot.Snapshot(path)
+    stored = dict(snap.geoms(0))
+    assert isinstance(stored[0], shapely.Polygon)
+
+    area_notice.set_max_chord_error(10)
+    try:
+        geom = snap.message(0).areas[0].geom()
+        assert isinstance(geom, shapely.Polygon)
+        assert len(geom.exterior.coords) != len(stored[0].exterior.coords)
+    finally:
+        area_notice.set_max_chord_error(None)
+
+    path = tmp_path / "coarse.snap"
+    area_notice.set_max_chord_error(10)
+    try:
+        with snapshot.SnapshotWriter(path) as writer:
+            writer.write(build_notice(), received=WHEN)
+        snap = snapshot.Snapshot(path)
+        decoded = snap.message(0)
+        with monkeypatch.context() as patch:
+            not_rebuilt(patch)
+            geom = decoded.areas[0].geom()
+            assert geom is not None
+            assert geom.equals(dict(snap.geoms(0))[0])
+    finally:
+        area_notice.set_max_chord_error(None)
+    decoded = snap.message(0)
+    with monkeypatch.context() as patch:
+        not_rebuilt(patch)
+        with pytest.raises(AssertionError, match="rebuilt"):
+            decoded.areas[0].geom()
+
+
+def test_without_geometry(tmp_path: pathlib.Path) -> None:
+    """Geometry is optional."""
+    path = tmp_path / "cache.snap"
+    with snapshot.SnapshotWriter(path, with_geometry=False) as writer:
+        writer.write_all([build_notice()], received=WHEN)
+    writer.close()
+    snap = snapshot.Snapshot(path)
+    assert snap.geoms(0) == []
+    # The caller's context keeps its reference time and shares its counts.
+    earlier = WHEN - datetime.timedelta(days=40)
+    context = DecodeContext(earlier)
+    decoded = snap.message(0, context)
+    assert isinstance(decoded, area_notice.AreaNotice)
+    assert decoded.when == WHEN
+    assert context.reference_time == earlier
+    assert context.stats["area_notices"] == 1
+    geom = decoded.areas[0].geom()
+    assert geom is not None
+    assert geom.equals(build_notice().areas[0].geom())
+
+    path = tmp_path / "empty.snap"
+    snapshot.SnapshotWriter(path).close()
+    assert len(snapshot.Snapshot(path)) == 0
+
+
+def test_write_bits(tmp_path: pathlib.Path) -> None:
+    """Raw message bits keep their DAC and FI."""
+    path = tmp_path / "cache.snap"
+    bits = build_notice().get_bits(include_bin_hdr=True)
+    other = bits.__class__.from_bitstring(
+        str(bits)[:40] + f"{366:010b}{1:06b}" + str(bits)[56:]
+    )
+    with snapshot.SnapshotWriter(path) as writer:
+        writer.write_bits(bits)
+        writer.write_bits(other)
+        with pytest.raises(ValueError, match="too short"):
+            writer.write_bits(bits[:50])
+        writer.write_bits(bits, station="s" * 16)
+        with pytest.raises(ValueError, match="Station too long"):
+            writer.write_bits(bits, station="s" * 17)
+    snap = snapshot.Snapshot(path)
+    assert snap.records["dac"].tolist() == [1, 366, 1]
+    assert snap.records["fi"].tolist() == [22, 1, 22]
+    assert snap.records["station"][2] == b"s" * 16
+    assert np.all(snap.records["received"] > WHEN.timestamp())
+    with pytest.raises(ValueError, match="No decoder"):
+        snap.message(1)
+
+
+def test_invalid(tmp_path: pathlib.Path) -> None:
+    """Other files are rejected."""
+    path = tmp_path / "short.snap"
+    path.write_bytes(b"AISNSNAP")
+    with pytest.raises(ValueError, match="Not a snapshot"):
+        snapshot.Snapshot(path)
+
+    path = tmp_path / "other.snap"
+    path.write_bytes(bytes(snapshot.HEADER_DTYPE.itemsize))
+    with pytest.raises(ValueError, match="Not a snapshot"):
+        snapshot.Snapshot(path)
+
+    path = tmp_path / "future.snap"
+    snapshot.SnapshotWriter(path).close()
+    data = bytearray(path.read_bytes())
+    data[8] = 99
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="version: 99"):
+        snapshot.Snapshot(path)
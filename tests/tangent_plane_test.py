@@ -0,0 +1,153 @@
+"""Tests for sub-area vertices from the tangent plane geometry engine.
+
+The accuracy tests compare against pyproj.Geod.fwd, which solves the same
+geodesic problem on the WGS 84 ellipsoid, and against the UTM path.  The
+UTM path measures offsets along grid north with the 0.9996 scale of the
+central meridian, so it differs from true east and north by up to 0.04%
+of the offset on the central meridian and by the grid convergence, a few
+percent, at the edges of a zone.
+"""
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+import shapely
+from pyproj import Geod
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import tangent_plane
+
+GEOD = Geod(ellps="WGS84")
+ANGLES = np.linspace(0, 2 * np.pi, 65)
+UNIT_CIRCLE = np.column_stack((np.sin(ANGLES), np.cos(ANGLES)))
+
+
+def geod_fwd(
+    lon: float, lat: float, offsets: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Exact ellipsoidal result for the offsets."""
+    azimuths = np.degrees(np.arctan2(offsets[:, 0], offsets[:, 1]))
+    distances = np.hypot(offsets[:, 0], offsets[:, 1])
+    count = len(offsets)
+    lons, lats, _ = GEOD.fwd(
+        np.full(count, lon), np.full(count, lat), azimuths, distances
+    )
+    return np.column_stack((lons, lats))
+
+
+def error_m(a: npt.NDArray[np.float64], b: npt.NDArray[np.float64]) -> float:
+    """Largest distance in meters between matching vertices."""
+    _, _, distances = GEOD.inv(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+    return float(np.max(distances))
+
+
+@pytest.mark.parametrize("lat", [0, 41.5, 60, 75, 85, 89, 89.99, 90, -89.5])
+@pytest.mark.parametrize("radius", [500, 4000, 10_000, 20_000])
+def test_accuracy_notice_sizes(lat: float, radius: float) -> None:
+    """Shapes up to 20 km are within 0.3 m of the ellipsoidal geodesics."""
+    offsets = radius * UNIT_CIRCLE
+    result = tangent_plane.local_to_ll(-70.5, lat, offsets)
+    assert error_m(result, geod_fwd(-70.5, lat, offsets)) < 0.3
+
+
+@pytest.mark.parametrize("lat", [0, 41.5, 75, 89])
+@pytest.mark.parametrize("radius", [50_000, 200_000, 1_000_000])
+def test_accuracy_large(lat: float, radius: float) -> None:
+    """Larger shapes are within 0.1% of their size."""
+    offsets = radius * UNIT_CIRCLE
+    result = tangent_plane.local_to_ll(-70.5, lat, offsets)
+    assert error_m(result, geod_fwd(-70.5, lat, offsets)) < 0.001 * radius
+
+
+@pytest.mark.parametrize(
+    ("lon", "lat", "percent"),
+    [
+        (-69.0, 0, 0.045),
+        (-69.0, 41.5, 0.045),
+        (-69.0, 80, 0.045),
+        (-70.5, 0, 0.01),
+        (-70.5, 41.5, 1.8),
+        (-70.5, 80, 2.6),
+        (-71.99, 41.5, 3.5),
+        (-71.99, 80, 5.2),
+    ],
+)
+def test_accuracy_against_utm(lon: float, lat: float, percent: float) -> None:
+    """Differences from the UTM path, as a percentage of the radius."""
+    circle = area_notice.AreaNoticeCirclePt(lon, lat, radius=4000)
+    offsets = circle.local_vertices()
+    utm = circle._local_to_ll(offsets)  # pylint: disable=protected-access
+    result = tangent_plane.local_to_ll(lon, lat, offsets)
+    assert error_m(result, utm) < percent / 100 * circle.radius
+
+
+def test_start_point() -> None:
+    """A zero offset is the start point, including at the pole."""
+    for lat in (41.5, 90):
+        result = tangent_plane.local_to_ll(-70.5, lat, np.zeros((1, 2)))
+        assert result.tolist() == [[-70.5, lat]]
+    assert tangent_plane.local_to_ll(-70.5, 41.5, np.zeros((0, 2))).shape == (0, 2)
+
+
+def test_antimeridian() -> None:
+    """A circle across 180 degrees stays contiguous."""
+    offsets = 4000 * UNIT_CIRCLE
+    result = tangent_plane.local_to_ll(179.99, 10, offsets)
+    assert result[:, 0].max() > 180
+    polygon = shapely.Polygon(result)
+    assert polygon.is_valid
+    assert polygon.bounds[2] - polygon.bounds[0] < 0.1
+
+    expected = geod_fwd(179.99, 10, offsets)
+    expected[:, 0] %= 360
+    assert error_m(result, expected) < 0.01
+
+
+def test_around_the_pole() -> None:
+    """A circle around the pole covers every longitude."""
+    result = tangent_plane.local_to_ll(-70.5, 89.99, 4000 * UNIT_CIRCLE)
+    assert result[:, 1].min() > 89.95
+    assert np.ptp(result[:, 0]) > 350
+
+
+def test_many_matches_one() -> None:
+    """local_to_ll_many gives the same vertices as one shape at a time."""
+    starts = [(-70.5, 41.5, 4000), (179.99, 10, 4000), (10, 89.99, 4000)]
+    starts.append((10, 60, 500_000))
+    lons = []
+    lats = []
+    offsets = []
+    expected = []
+    for lon, lat, radius in starts:
+        shape = radius * UNIT_CIRCLE
+        lons.append(np.full(len(shape), lon))
+        lats.append(np.full(len(shape), lat))
+        offsets.append(shape)
+        expected.append(tangent_plane.local_to_ll(lon, lat, shape))
+
+    result = tangent_plane.local_to_ll_many(
+        np.concatenate(lons), np.concatenate(lats), np.concatenate(offsets)
+    )
+    assert result == pytest.approx(np.concatenate(expected), abs=1e-6)
+
+
+def test_geometry_engine() -> None:
+    """Sub-area geometry follows the engine and is rebuilt when it changes."""
+    with pytest.raises(ValueError):
+        area_notice.set_geometry_engine("lambert")
+    assert area_notice.get_geometry_engine() == "utm"
+
+    sector = area_notice.AreaNoticeSector(-70.5, 41.5, 4000, 10, 50)
+    utm = sector.geom()
+    area_notice.set_geometry_engine("tangent_plane")
+    try:
+        assert area_notice.get_geometry_engine() == "tangent_plane"
+        geodesic = sector.geom()
+        assert geodesic is not utm
+        assert sector.geom() is geodesic
+        vertices = np.array(geodesic.exterior.coords)
+        expected = geod_fwd(-70.5, 41.5, sector.local_vertices())
+        assert error_m(vertices, expected) < 0.01
+    finally:
+        area_notice.set_geometry_engine("utm")
+    assert sector.geom().equals_exact(utm, tolerance=0)
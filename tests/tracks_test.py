@@ -0,0 +1,93 @@
+"""Tests for checking vessel tracks against Area Notices."""
+
+import datetime
+
+import numpy as np
+import pytest
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import tracks
+from tests.notice_index_test import make_notice
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+T0 = WHEN.timestamp()
+
+
+NOTICES = [
+    make_notice(-70.0, area_type=area_notice.notice_type["cau_divers"]),
+    make_notice(-70.0, area_type=area_notice.notice_type["cau_mammals_reduce_speed"]),
+    make_notice(-69.9, area_type=area_notice.notice_type["cau_habitat_stay_clear"]),
+]
+
+# Two vessels heading east along 42N, 0.01 degrees (830 m) a minute.  The
+# second one starts 55 minutes later so the notices end while it is in
+# the first one.
+LONS = np.tile(np.linspace(-70.05, -69.85, 21), 2)
+LATS = np.full(42, 42.0)
+TIMES = np.concatenate((T0 + 60 * np.arange(21), T0 + 3300 + 60 * np.arange(21)))
+VESSELS = np.repeat([366000001, 366000002], 21)
+SPEEDS = np.tile(np.arange(21.0), 2)
+
+
+def test_track_hits() -> None:
+    """Hits are in active speed restriction notices only."""
+    points, notices = tracks.track_hits(LONS, LATS, TIMES, NOTICES)
+    inside_first = np.abs(LONS - -70.0) < 0.024
+    inside_second = np.abs(LONS - -69.9) < 0.024
+    active = TIMES < T0 + 3600
+    expected = sorted(
+        [(i, 1) for i in np.flatnonzero(inside_first & active)]
+        + [(i, 2) for i in np.flatnonzero(inside_second & active)]
+    )
+    assert list(zip(points.tolist(), notices.tolist(), strict=True)) == expected
+
+    points, notices = tracks.track_hits(LONS, LATS, TIMES, NOTICES, area_types=None)
+    assert set(notices.tolist()) == {0, 1, 2}
+    assert points.tolist() == sorted(points.tolist())
+
+
+def test_track_hits_empty() -> None:
+    """Nothing is hit without positions or matching notices."""
+    points, notices = tracks.track_hits([], [], [], NOTICES)
+    assert points.tolist() == notices.tolist() == []
+    points, notices = tracks.track_hits(LONS, LATS, TIMES + 86400, NOTICES)
+    assert points.tolist() == notices.tolist() == []
+
+
+def test_track_visits() -> None:
+    """Consecutive hits become visits with entry and exit times."""
+    rng = np.random.default_rng(0)
+    shuffle = rng.permutation(42)
+    points, notices = tracks.track_hits(
+        LONS[shuffle], LATS[shuffle], TIMES[shuffle], NOTICES
+    )
+    visits = tracks.track_visits(
+        VESSELS[shuffle], TIMES[shuffle], points, notices, SPEEDS[shuffle]
+    )
+    assert visits.dtype == tracks.VISIT_DTYPE
+    assert visits["vessel"].tolist() == [366000001, 366000001, 366000002]
+    assert visits["notice"].tolist() == [1, 2, 1]
+    assert visits["count"].tolist() == [5, 5, 2]
+    assert (visits["entry_time"] - T0).tolist() == [180, 780, 3480]
+    assert (visits["exit_time"] - T0).tolist() == [420, 1020, 3540]
+    assert visits["max_speed"].tolist() == [7, 17, 4]
+    assert LONS[shuffle][visits["entry"]] == pytest.approx([-70.02, -69.92, -70.02])
+    assert LONS[shuffle][visits["exit"]] == pytest.approx([-69.98, -69.88, -70.01])
+
+    visits = tracks.track_visits(VESSELS, TIMES, [], [])
+    assert len(visits) == 0
+
+
+def test_track_visits_gaps() -> None:
+    """Leaving and coming back, or another vessel in between, is a new visit."""
+    vessels = np.array([1, 1, 1, 2, 1])
+    times = np.array([0.0, 10, 20, 25, 30])
+    points = np.array([0, 1, 3, 4])
+    notices = np.array([7, 7, 7, 7])
+    visits = tracks.track_visits(vessels, times, points, notices)
+    assert visits[["vessel", "entry", "exit", "count"]].tolist() == [
+        (1, 0, 1, 2),
+        (1, 4, 4, 1),
+        (2, 3, 3, 1),
+    ]
+    assert np.isnan(visits["max_speed"]).all()
@@ -0,0 +1,56 @@
+"""Tests for the shared UTM projection cache."""
+
+import threading
+
+import pytest
+from pyproj import Proj
+
+from ais_area_notice import utm
+
+
+def test_matches_proj() -> None:
+    """Projections give the same results as a pyproj Proj for the zone."""
+    proj = Proj({"proj": "utm", "zone": 19})
+    projection = utm.utm_projection(19)
+    assert projection.zone == 19
+    assert not projection.south
+
+    x, y = projection(-69.5, 42.3)
+    assert (x, y) == proj(-69.5, 42.3)
+    assert projection(x + 100, y - 50, inverse=True) == proj(
+        x + 100, y - 50, inverse=True
+    )
+
+    lons, lats = projection([x, x + 10], [y, y + 10], inverse=True)
+    assert lons[0] == pytest.approx(-69.5)
+    assert lats[0] == pytest.approx(42.3)
+    assert len(lons) == 2
+
+
+def test_south() -> None:
+    """The southern hemisphere variant adds a false northing."""
+    north = utm.utm_projection(19)
+    south = utm.utm_projection(19, south=True)
+    assert south is not north
+    assert south.south
+    x, y = south(-69.5, -42.3)
+    assert y == pytest.approx(north(-69.5, -42.3)[1] + 10_000_000)
+    lon, lat = south(x, y, inverse=True)
+    assert (lon, lat) == pytest.approx((-69.5, -42.3))
+
+
+def test_cached() -> None:
+    """Every thread gets the same projection for a zone."""
+    results: list[utm.UtmProjection] = []
+
+    def _get() -> None:
+        results.append(utm.utm_projection(33))
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert utm.utm_projection(34) is not results[0]
@@ -0,0 +1,193 @@
+"""Tests for the compact wire form of decoded messages."""
+
+import datetime
+import pickle
+from typing import Any
+
+import pytest
+from BitVector import BitVector
+
+import ais_area_notice.imo_001_22_area_notice as area_notice
+from ais_area_notice import imo_001_26_environment as env
+from ais_area_notice import imo_001_31_met_hydro as met_hydro
+from ais_area_notice import m366_22, m367_22, wire
+from ais_area_notice.decode_context import DecodeContext
+
+WHEN = datetime.datetime(2026, 7, 6, 12, 0, tzinfo=datetime.UTC)
+MMSI = 366123456
+M366_AIVDM = "!AIVDM,1,1,0,A,85M:Ih1KUQU6jAs85`0MK4lh<7=B42l0000,2*7F"
+M367_AIVDM = "!AIVDM,1,1,0,A,85M:Ih1KmPAU6jAs85`03cJm;1NHQhPFP000,0*19"
+
+
+def build_notice() -> area_notice.AreaNotice:
+    """Area Notice with a circle, a rectangle and text."""
+    notice = area_notice.AreaNotice(1, WHEN, 60, 7, source_mmsi=MMSI)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.0, 42.0, radius=2000))
+    notice.add_subarea(
+        area_notice.AreaNoticeRectangle(-69.5, 41.5, 1000, 2000, orientation_deg=15)
+    )
+    notice.add_subarea(area_notice.AreaNoticeFreeText(text="WHALES"))
+    return notice
+
+
+def round_trip(msg: Any) -> Any:
+    """Send a message through its wire form."""
+    return type(msg).from_wire(msg.to_wire())
+
+
+def test_pickle() -> None:
+    """Plain pickling keeps the whole message."""
+    notice = area_notice.AreaNotice(1, WHEN, 60, 7)
+    notice.add_subarea(area_notice.AreaNoticeCirclePt(-70.123456789, 42.0, radius=10))
+    notice.geoms()
+    copy = pickle.loads(pickle.dumps(notice, protocol=pickle.HIGHEST_PROTOCOL))
+    assert copy.source_mmsi is None
+    assert copy.areas[0].lon == -70.123456789
+    assert copy.geoms()[0].equals(notice.geoms()[0])
+
+    wired = round_trip(notice)
+    assert wired.source_mmsi != notice.source_mmsi
+    assert wired.areas[0].lon != -70.123456789
+
+
+def test_encode_decode() -> None:
+    """The bits, reference time and station survive."""
+    bits = BitVector.from_bitstring("1011001")
+    data = wire.encode(bits, WHEN, "r003669945")
+    assert len(data) == 12 + len("r003669945") + 1
+    shared = DecodeContext(WHEN - datetime.timedelta(days=400))
+    decoded, context = wire.decode(data, shared)
+    assert str(decoded) == "1011001"
+    assert context.reference_time == WHEN
+    assert shared.reference_time == WHEN - datetime.timedelta(days=400)
+    context.count("decoded")
+    assert shared.stats["decoded"] == 1
+
+    decoded, context = wire.decode(data)
+    assert context.reference_time == WHEN
+
+    decoded, context = wire.decode(wire.encode(BitVector(size=0), None), shared)
+    assert len(decoded) == 0
+    assert context is shared
+
+    with pytest.raises(ValueError, match="wire form"):
+        wire.decode(b"\x01")
+    with pytest.raises(ValueError, match="wire form"):
+        wire.decode(b"\x09" + data[1:])
+
+
+def test_area_notice() -> None:
+    """Area Notices keep what their bits encode."""
+    notice = build_notice()
+    # Notices that were indexed or drawn carry their memoized geometry.
+    notice.geoms()
+    data = notice.to_wire()
+    graph = pickle.dumps(notice, protocol=pickle.HIGHEST_PROTOCOL)
+    assert len(data) * 10 < len(graph)
+
+    copy = area_notice.AreaNotice.from_wire(data)
+    assert copy.when == WHEN
+    assert (copy.area_type, copy.duration, copy.link_id) == (1, 60, 7)
+    assert copy.source_mmsi == MMSI
+    assert str(copy.get_bits(include_bin_hdr=True)) == str(
+        notice.get_bits(include_bin_hdr=True)
+    )
+    text = copy.areas[2]
+    assert isinstance(text, area_notice.AreaNoticeFreeText)
+    assert text.text == "WHALES"
+
+
+def test_environment() -> None:
+    """The reports keep their year and month."""
+    msg = env.Environment(source_mmsi=MMSI)
+    msg.append(
+        env.SensorReportLocation(
+            year=2019, month=2, day=6, hour=12, minute=0, site_id=11
+        )
+    )
+    msg.append(
+        env.SensorReportId(
+            year=2019, month=2, day=6, hour=12, minute=0, site_id=11, id_str="A"
+        )
+    )
+    copy = round_trip(msg)
+    assert copy == msg
+    assert copy.sensor_reports[0].get_date() == datetime.datetime(
+        2019, 2, 6, 12, 0, tzinfo=datetime.UTC
+    )
+
+    empty = env.Environment(source_mmsi=MMSI)
+    assert round_trip(empty) == empty
+
+
+def test_met_hydro() -> None:
+    """Met/hydro messages need no reference time."""
+    msg = met_hydro.MetHydro31(
+        source_mmsi=MMSI, lon=-70.5, lat=41.25, day=6, hour=12, minute=0
+    )
+    assert round_trip(msg) == msg
+    assert wire.Wire.from_message(msg).reference_time is None
+
+
+def test_uscg_notices() -> None:
+    """The USCG notices keep what their bits encode."""
+    context = DecodeContext(WHEN)
+    notice = m366_22.AreaNotice(nmea_strings=[M366_AIVDM], context=context)
+    copy = round_trip(notice)
+    assert isinstance(copy, m366_22.AreaNotice)
+    for name in ("mmsi", "dac", "fi", "link_id", "area_type", "when", "duration_min"):
+        assert getattr(copy, name) == getattr(notice, name)
+    assert len(copy.areas) == len(notice.areas) == 1
+    area = copy.areas[0]
+    assert isinstance(area, m366_22.AreaNoticeCircle)
+    assert area.__dict__ == notice.areas[0].__dict__
+
+    built = m366_22.AreaNotice(area_type=1, when=WHEN)
+    built.add_subarea(m366_22.AreaNoticeCircle(-70.0, 42.0, radius=5000))
+    copy = round_trip(built)
+    assert (copy.mmsi, copy.link_id, copy.duration_min) == (0, 0, 0)
+    assert copy.areas[0].radius == 5000
+    assert len(built.get_bits(include_bin_hdr=False)) == 55 + 93
+    with pytest.raises(NotImplementedError):
+        m366_22.AreaNoticeSubArea().get_bits()
+    for _ in range(10):
+        built.areas.append(built.areas[0])
+    with pytest.raises(area_notice.AisPackingException):
+        built.get_bits()
+
+    notice_367 = m367_22.AreaNotice(nmea_strings=[M367_AIVDM], context=context)
+    copy_367 = round_trip(notice_367)
+    assert isinstance(copy_367, m367_22.AreaNotice)
+    assert (copy_367.link_id, copy_367.area_type, copy_367.duration_min) == (
+        101,
+        13,
+        2880,
+    )
+    assert copy_367.when == notice_367.when
+    assert str(copy_367.get_bits(include_bin_hdr=True)) == str(
+        notice_367.get_bits(include_bin_hdr=True)
+    )
+
+
+def test_wire() -> None:
+    """A Wire only decodes when the message is asked for."""
+    notice = build_notice()
+    held = wire.Wire.from_message(notice, station="b003669953")
+    assert held.message() is notice
+
+    copy = pickle.loads(pickle.dumps(held, protocol=pickle.HIGHEST_PROTOCOL))
+    assert copy.cls is area_notice.AreaNotice
+    assert copy.data == held.data
+    assert len(copy) == len(held.data)
+    assert copy.station == "b003669953"
+    assert copy.reference_time == WHEN
+    context = DecodeContext()
+    decoded = copy.message(context)
+    assert decoded.link_id == 7
+    assert copy.message() is decoded
+    assert context.stats["area_notices"] == 1
+
+    bits = notice.get_bits(include_bin_hdr=True)
+    received = wire.Wire.from_bits(area_notice.AreaNotice, bits, WHEN)
+    assert received.station == ""
+    assert received.message().when == WHEN